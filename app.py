@@ -354,7 +354,12 @@ def create_app(config_name=None):
         # Initialize stream manager and attach to Flask app
         from services.stream_manager import StreamManager
 
-        app.stream_manager = StreamManager(app_context_factory=app_context_factory)
+        app.stream_manager = StreamManager(
+            app_context_factory=app_context_factory,
+            poll_scheduler_config=app.config.get("POLL_SCHEDULER"),
+            stream_shards_config=app.config.get("STREAM_SHARDS"),
+            stream_status_config=app.config.get("STREAM_STATUS"),
+        )
 
         # Initialize plugin manager and attach to Flask app
         from plugins.plugin_manager import PluginManager
@@ -542,6 +547,9 @@ def configure_flask_app(app, config_instance):
         config_instance.HTTP_MAX_CONNECTIONS_PER_HOST
     )
     app.config["ASYNC_TIMEOUT"] = config_instance.ASYNC_TIMEOUT
+    app.config["POLL_SCHEDULER"] = config_instance.POLL_SCHEDULER
+    app.config["STREAM_SHARDS"] = config_instance.STREAM_SHARDS
+    app.config["STREAM_STATUS"] = config_instance.STREAM_STATUS
 
     # Logging settings
     app.config["LOG_LEVEL"] = config_instance.LOG_LEVEL
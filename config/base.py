@@ -470,6 +470,21 @@ class BaseConfig:
             )
         )
 
+    @property
+    def POLL_SCHEDULER(self) -> Dict[str, Any]:
+        """Poll scheduler settings from threading.yaml"""
+        return dict(self.threading_config.get("poll_scheduler", {}))
+
+    @property
+    def STREAM_SHARDS(self) -> Dict[str, Any]:
+        """Stream shard event loop settings from threading.yaml"""
+        return dict(self.threading_config.get("stream_shards", {}))
+
+    @property
+    def STREAM_STATUS(self) -> Dict[str, Any]:
+        """Stream status write-behind settings from threading.yaml"""
+        return dict(self.threading_config.get("stream_status", {}))
+
     @property
     def LOG_LEVEL(self) -> str:
         return self.secret_manager.get_secret(
@@ -17,14 +17,27 @@ Key features:
     - No database session dependencies for cross-thread usage
     - Comprehensive field coverage for all stream and server data
     - Factory methods for creating DTOs from various sources
+    - TAK server DTOs reused per server revision with lazy password decryption
 
 Author: Emfour Solutions
 Created: 2025-09-26
 """
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+# TakServerDTO instances keyed by (server id, updated_at) so unchanged servers
+# are not converted (and their certificate copied) again on every stream load
+_tak_server_dto_cache: Dict[Tuple[int, Any], "TakServerDTO"] = {}
+_tak_server_dto_lock = threading.Lock()
+
+
+def clear_tak_server_dto_cache():
+    """Drop all cached TAK server DTOs"""
+    with _tak_server_dto_lock:
+        _tak_server_dto_cache.clear()
 
 
 @dataclass(frozen=True)
@@ -45,17 +58,38 @@ class TakServerDTO:
     cert_p12: Optional[str] = None
     cert_password: Optional[str] = None
     has_cert_password: bool = False
+    updated_at: Optional[datetime] = None
+    # Stored (encrypted) password, decrypted on first get_cert_password()
+    encrypted_cert_password: Optional[str] = field(default=None, repr=False)
 
     @classmethod
     def from_orm(cls, tak_server) -> "TakServerDTO":
-        """Convert SQLAlchemy TAK server object to clean DTO"""
-        # Get cert password safely
-        cert_password = None
-        try:
-            if hasattr(tak_server, "get_cert_password"):
-                cert_password = tak_server.get_cert_password()
-        except Exception:
-            cert_password = None
+        """
+        Convert SQLAlchemy TAK server object to clean DTO.
+
+        The DTO built for a server revision (id and updated_at) is reused
+        for later loads of the same revision, so the certificate column is
+        only read when the server changed.
+        """
+        revision = getattr(tak_server, "updated_at", None)
+        if revision is None:
+            return cls._build(tak_server)
+
+        cache_key = (tak_server.id, revision)
+        dto = _tak_server_dto_cache.get(cache_key)
+        if dto is None:
+            dto = cls._build(tak_server)
+            with _tak_server_dto_lock:
+                for key in [k for k in _tak_server_dto_cache if k[0] == dto.id]:
+                    del _tak_server_dto_cache[key]
+                _tak_server_dto_cache[cache_key] = dto
+        return dto
+
+    @classmethod
+    def _build(cls, tak_server) -> "TakServerDTO":
+        encrypted_cert_password = getattr(tak_server, "cert_password", None)
+        if not isinstance(encrypted_cert_password, str):
+            encrypted_cert_password = None
 
         return cls(
             id=tak_server.id,
@@ -70,15 +104,54 @@ class TakServerDTO:
             ca_file=getattr(tak_server, "ca_file", None),
             verify_ssl=getattr(tak_server, "verify_ssl", True),
             cert_p12=getattr(tak_server, "cert_p12", None),
-            cert_password=cert_password,
-            has_cert_password=getattr(tak_server, "has_cert_password", False),
+            has_cert_password=bool(encrypted_cert_password),
+            updated_at=getattr(tak_server, "updated_at", None),
+            encrypted_cert_password=encrypted_cert_password,
         )
 
     def get_cert_password(self) -> Optional[str]:
-        """Backward compatibility method for getting certificate password"""
+        """Get the certificate password, decrypting it on first use"""
+        if self.cert_password is None:
+            password = ""
+            if self.encrypted_cert_password:
+                from services.encryption_service import get_encryption_service
+
+                try:
+                    password = get_encryption_service().decrypt_value(
+                        self.encrypted_cert_password
+                    )
+                except Exception:
+                    password = ""
+            object.__setattr__(self, "cert_password", password)
         return self.cert_password
 
 
+@dataclass(frozen=True)
+class CallsignMappingDTO:
+    """Clean, immutable data transfer object for a tracker callsign mapping"""
+
+    identifier_value: str
+    custom_callsign: str
+    cot_type: Optional[str] = None
+    enabled: bool = True
+    cot_type_override: Optional[str] = None
+    team_role: Optional[str] = None
+    team_color: Optional[str] = None
+
+    @classmethod
+    def from_orm(cls, mapping) -> "CallsignMappingDTO":
+        """Convert SQLAlchemy callsign mapping object to clean DTO"""
+        return cls(
+            identifier_value=mapping.identifier_value,
+            custom_callsign=mapping.custom_callsign,
+            cot_type=getattr(mapping, "cot_type", None),
+            enabled=getattr(mapping, "enabled", True),
+            cot_type_override=getattr(mapping, "cot_type_override", None),
+            team_role=getattr(mapping, "team_role", None),
+            team_color=getattr(mapping, "team_color", None),
+        )
+
+
 @dataclass(frozen=True)
 class StreamDTO:
     """Clean, immutable data transfer object for stream information"""
@@ -15,6 +15,7 @@ import logging
 # Local application imports
 from database import TimestampMixin, db
 from plugins.base_plugin import BaseGPSPlugin
+from services.encryption_service import decrypted_config_cache
 from utils.json_validator import JSONValidationError, safe_json_loads
 
 # Module-level logger
@@ -127,6 +128,13 @@ class Stream(db.Model, TimestampMixin):
         """Parse plugin configuration from JSON with decryption for sensitive fields"""
         if not self.plugin_config:
             return {}
+
+        # Unchanged stored configs are decrypted once per process
+        cache_key = (self.plugin_type, self.plugin_config)
+        cached_config = decrypted_config_cache.get(cache_key)
+        if cached_config is not None:
+            return cached_config
+
         try:
             # Use secure JSON parsing with validation
             config = safe_json_loads(
@@ -135,7 +143,14 @@ class Stream(db.Model, TimestampMixin):
                 context=f"stream_{self.id}_plugin_config",
             )
             # Decrypt sensitive fields for use
-            return BaseGPSPlugin.decrypt_config_from_storage(self.plugin_type, config)
+            decrypted = BaseGPSPlugin.decrypt_config_from_storage(
+                self.plugin_type, config
+            )
+            # The same dict comes back when nothing was decrypted (e.g. plugin
+            # metadata not loaded yet); only cache real decryptions
+            if decrypted is not config:
+                decrypted_config_cache.put(cache_key, decrypted)
+            return decrypted
         except JSONValidationError as e:
             logger.warning(
                 f"JSON validation failed for stream {self.id} plugin config: {e}. "
@@ -154,6 +154,18 @@ class BaseGPSPlugin(ABC):
         self._circuit_breaker = None
         self._circuit_breaker_initialized = False
 
+        # Conditional GET validators for this stream's feed URLs
+        from services.session_manager import ConditionalRequestValidators
+
+        self.http_validators = ConditionalRequestValidators()
+        # Set when the last fetch got 304 Not Modified for its feed
+        self.last_fetch_not_modified = False
+        # Set when the last fetch was short-circuited by an open circuit breaker
+        self.last_fetch_circuit_open = False
+        # Plugins with a push feed set an asyncio.Event here; the stream
+        # worker starts its next poll as soon as the event is set
+        self.push_event = None
+
     @property
     @abstractmethod
     def plugin_name(self) -> str:
@@ -466,6 +478,8 @@ class BaseGPSPlugin(ABC):
         fault tolerance, providing automatic failure detection and recovery.
         """
         circuit_breaker = self._get_circuit_breaker()
+        self.last_fetch_not_modified = False
+        self.last_fetch_circuit_open = False
 
         if circuit_breaker:
             try:
@@ -478,6 +492,7 @@ class BaseGPSPlugin(ABC):
                     get_logger().warning(
                         f"Circuit breaker is OPEN for {self.plugin_name}: {e}"
                     )
+                    self.last_fetch_circuit_open = True
                     # Return empty list when circuit is open to prevent cascading failures
                     return []
                 else:
@@ -490,6 +505,39 @@ class BaseGPSPlugin(ABC):
             )
             return await self.fetch_locations(session)
 
+    def conditional_headers(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        Request headers revalidating url against the last full response.
+
+        Validators are dropped after half the CoT stale time so positions of
+        an unchanged feed are still re-sent before TAK clients mark them stale.
+        """
+        try:
+            max_age = max(
+                30.0, float(self.get_stream_config_value("cot_stale_time", 300)) / 2
+            )
+        except (TypeError, ValueError):
+            max_age = 150.0
+        return self.http_validators.request_headers(url, headers, max_age=max_age)
+
+    def check_not_modified(self, url: str, response) -> bool:
+        """
+        Record a response's validators for the next conditional request.
+
+        Returns:
+            True if the server answered 304 Not Modified, in which case the
+            plugin should return no locations without parsing anything
+        """
+        not_modified = self.http_validators.record(
+            url, response.status, response.headers
+        )
+        if not_modified:
+            self.last_fetch_not_modified = True
+            get_logger().debug(f"[{self.plugin_name}] Feed not modified: {url}")
+        return not_modified
+
     async def _health_check(self) -> bool:
         """
         Default health check implementation.
@@ -547,6 +595,15 @@ class BaseGPSPlugin(ABC):
         """
         pass
 
+    async def close(self):
+        """
+        Release long-lived resources such as push connections.
+
+        Called by the stream worker when the stream stops. The default
+        implementation has nothing to release.
+        """
+        return None
+
     async def process_and_enqueue_locations(
         self, locations: List[Dict[str, Any]], stream
     ) -> None:
@@ -36,6 +36,7 @@ import certifi
 # Local application imports
 from plugins.base_plugin import BaseGPSPlugin, PluginConfigField
 from services.logging_service import get_module_logger
+from utils.json_stream import DEFAULT_CHUNK_SIZE, JSONArrayNotFound, iter_json_array
 
 # Module-level logger
 logger = get_module_logger(__name__)
@@ -47,6 +48,9 @@ class DeepstatePlugin(BaseGPSPlugin):
     PLUGIN_NAME = "deepstate"
     DEFAULT_API_URL = "https://deepstatemap.live/api/history/last"
 
+    # Where the features array may live in the response, in lookup order
+    FEATURE_PATHS = [("map", "features"), ("features",), ()]
+
     # Regex pattern to extract English name from multilingual strings
     ENGLISH_NAME_PATTERN = re.compile(
         r"///[ \t\u00A0]*([A-Za-z0-9\-.,' ]+?)[ \t\u00A0]*///", re.UNICODE
@@ -342,8 +346,14 @@ class DeepstatePlugin(BaseGPSPlugin):
             )
 
             async with session.get(
-                api_url, timeout=timeout_config, headers=headers, ssl=ssl_context
+                api_url,
+                timeout=timeout_config,
+                headers=self.conditional_headers(api_url, headers),
+                ssl=ssl_context,
             ) as response:
+                if self.check_not_modified(api_url, response):
+                    return []
+
                 if response.status != 200:
                     error_text = await response.text(encoding="utf-8")
                     logger.error(
@@ -356,49 +366,12 @@ class DeepstatePlugin(BaseGPSPlugin):
                         }
                     ]
 
-                data = await response.json()
-                logger.debug(f"Raw API response type: {type(data)}")
-                # logger.info(f"Raw API response: {data}")
-
-                # Handle different response formats
-                features = []
-                if isinstance(data, dict):
-                    # Try different possible structures
-                    if "map" in data and isinstance(data["map"], dict):
-                        features = data["map"].get("features", [])
-                        logger.debug(
-                            f"Found {len(features)} features in nested map structure"
-                        )
-                    elif "features" in data:
-                        features = data.get("features", [])
-                        logger.debug(
-                            f"Found {len(features)} features in direct structure"
-                        )
-                    else:
-                        logger.error(
-                            f"No features found in dict response. Available keys: {list(data.keys())}"
-                        )
-                        return [
-                            {
-                                "_error": "json_error",
-                                "_error_message": "No features found in response",
-                            }
-                        ]
-                elif isinstance(data, list):
-                    features = data
-                    logger.debug(f"Found {len(features)} features in list response")
-                else:
-                    logger.error(f"Unexpected data format: {type(data)}")
-                    return [
-                        {
-                            "_error": "json_error",
-                            "_error_message": "Unexpected data format",
-                        }
-                    ]
-
-                logger.info(f"Features to process: {len(features)}")
-                if features:
-                    logger.debug(f"First feature: {features[0]}")
+                # Decode features one at a time so the loop below can stop at
+                # max_events without reading the rest of the body
+                features = iter_json_array(
+                    response.content.iter_chunked(DEFAULT_CHUNK_SIZE),
+                    self.FEATURE_PATHS,
+                )
 
                 # Get the CoT type mode and stream's default CoT type from stream object
                 # Use new helper methods for configuration management
@@ -421,43 +394,65 @@ class DeepstatePlugin(BaseGPSPlugin):
                 locations = []
                 processed_count = 0
 
-                logger.info(f"Starting to process {len(features)} total features")
-
                 point_features = 0
-                for feature in features:
-                    if processed_count >= max_events:
-                        logger.debug(f"Reached max_events limit ({max_events})")
-                        break
+                seen_features = 0
+                try:
+                    async for feature in features:
+                        seen_features += 1
+                        if seen_features == 1:
+                            logger.debug(f"First feature: {feature}")
 
-                    geometry_type = feature.get("geometry", {}).get("type", "Unknown")
-                    feature_name = feature.get("properties", {}).get("name", "Unknown")
+                        geometry_type = feature.get("geometry", {}).get(
+                            "type", "Unknown"
+                        )
+                        feature_name = feature.get("properties", {}).get(
+                            "name", "Unknown"
+                        )
 
-                    logger.debug(
-                        f"Checking feature: {feature_name} (geometry: {geometry_type})"
-                    )
+                        logger.debug(
+                            f"Checking feature: {feature_name} (geometry: {geometry_type})"
+                        )
 
-                    if not self._should_process_feature(feature):
-                        continue
+                        if not self._should_process_feature(feature):
+                            continue
 
-                    point_features += 1
-                    # Pass the stream's CoT type and mode to the conversion function
-                    logger.debug(
-                        f"Converting feature with mode={cot_type_mode}, default_cot={stream_default_cot_type}"
-                    )
-                    location = self._convert_feature_to_location(
-                        feature, stream_default_cot_type, cot_type_mode
-                    )
-                    if location:
-                        locations.append(location)
-                        processed_count += 1
+                        point_features += 1
+                        # Pass the stream's CoT type and mode to the conversion function
                         logger.debug(
-                            f"Successfully converted Point feature: {feature_name}"
+                            f"Converting feature with mode={cot_type_mode}, default_cot={stream_default_cot_type}"
                         )
-                    else:
-                        logger.debug(f"Failed to convert Point feature: {feature_name}")
+                        location = self._convert_feature_to_location(
+                            feature, stream_default_cot_type, cot_type_mode
+                        )
+                        if location:
+                            locations.append(location)
+                            processed_count += 1
+                            logger.debug(
+                                f"Successfully converted Point feature: {feature_name}"
+                            )
+                        else:
+                            logger.debug(
+                                f"Failed to convert Point feature: {feature_name}"
+                            )
+
+                        if processed_count >= max_events:
+                            logger.debug(
+                                f"Reached max_events limit ({max_events})"
+                            )
+                            break
+                except JSONArrayNotFound:
+                    logger.error("No features found in response")
+                    return [
+                        {
+                            "_error": "json_error",
+                            "_error_message": "No features found in response",
+                        }
+                    ]
+                finally:
+                    await features.aclose()
 
                 logger.info(
-                    f"Found {point_features} Point features out of {len(features)} total features"
+                    f"Found {point_features} Point features out of {seen_features} features read"
                 )
                 logger.info(f"Successfully processed {len(locations)} locations")
                 return locations
@@ -10,6 +10,7 @@ Created: 2025-07-05
 """
 
 import asyncio
+import io
 import logging
 import ssl
 from datetime import datetime, timezone
@@ -19,6 +20,7 @@ import aiohttp
 import certifi
 import defusedxml.ElementTree as ET
 from fastkml import kml
+from lxml import etree
 
 from plugins.base_plugin import (
     BaseGPSPlugin,
@@ -39,6 +41,7 @@ class GarminPlugin(BaseGPSPlugin, CallsignMappable):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.kml_extractor = KMLDataExtractor()
+        self.streaming_kml_extractor = StreamingKMLExtractor()
 
     @property
     def plugin_name(self) -> str:
@@ -119,6 +122,22 @@ class GarminPlugin(BaseGPSPlugin, CallsignMappable):
                     max_value=300,
                     help_text="Delay between retry attempts on connection failure",
                 ),
+                PluginConfigField(
+                    name="kml_parser",
+                    label="KML Parser",
+                    field_type="select",
+                    required=False,
+                    default_value="streaming",
+                    options=[
+                        {
+                            "value": "streaming",
+                            "label": "Streaming (fast, low memory)",
+                        },
+                        {"value": "fastkml", "label": "fastkml object model"},
+                    ],
+                    help_text="Parser used for the KML feed. Use fastkml only if "
+                    "the streaming parser misreads a feed",
+                ),
             ],
         }
 
@@ -186,6 +205,8 @@ class GarminPlugin(BaseGPSPlugin, CallsignMappable):
 
         try:
             kml_data = await self._fetch_kml_feed(session, config)
+            if self.last_fetch_not_modified:
+                return []
 
             # Handle error cases
             if kml_data is None:
@@ -193,7 +214,7 @@ class GarminPlugin(BaseGPSPlugin, CallsignMappable):
             if isinstance(kml_data, dict):  # Error dictionary
                 return [kml_data]
 
-            placemarks = self.kml_extractor.extract_placemarks(kml_data)
+            placemarks = self._get_kml_extractor(config).extract_placemarks(kml_data)
             locations = self._process_placemarks(placemarks, config)
 
             logger.info(f"Successfully fetched {len(locations)} locations from Garmin")
@@ -203,6 +224,12 @@ class GarminPlugin(BaseGPSPlugin, CallsignMappable):
             logger.error(f"Error fetching Garmin locations: {e}")
             return []
 
+    def _get_kml_extractor(self, config: Dict[str, Any]) -> "KMLDataExtractor":
+        """Return the KML extractor selected by the kml_parser setting"""
+        if config.get("kml_parser", "streaming") == "fastkml":
+            return self.kml_extractor
+        return self.streaming_kml_extractor
+
     def _process_placemarks(
         self, placemarks: List[Dict[str, Any]], config: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -281,8 +308,13 @@ class GarminPlugin(BaseGPSPlugin, CallsignMappable):
         for attempt in range(3):
             try:
                 async with session.get(
-                    config["url"], auth=auth, ssl=ssl_context
+                    config["url"],
+                    auth=auth,
+                    headers=self.conditional_headers(config["url"]),
+                    ssl=ssl_context,
                 ) as response:
+                    if self.check_not_modified(config["url"], response):
+                        return ""
                     if response.status == 200:
                         content = await response.text(encoding="utf-8")
                         return self._validate_kml_content(content)
@@ -836,3 +868,152 @@ class KMLDataExtractor:
             f"[Garmin] IMEI extraction failed completely, using timestamp-based ID: TS-{timestamp_id}"
         )
         return f"TS-{timestamp_id}"
+
+
+class StreamingKMLExtractor(KMLDataExtractor):
+    """
+    Single-pass KML extractor built on lxml iterparse.
+
+    Placemarks are read as they close, only the direct children the plugin
+    uses are looked at, and each processed Placemark is cleared so the tree
+    never holds more than one of them. Produces the same placemark
+    dictionaries as the XML fallback of KMLDataExtractor.
+    """
+
+    _NS = "{%s}" % KMLDataExtractor.KML_NAMESPACE["kml"]
+    PLACEMARK = _NS + "Placemark"
+    POINT = _NS + "Point"
+    COORDINATES = _NS + "coordinates"
+    NAME = _NS + "name"
+    DESCRIPTION = _NS + "description"
+    TIMESTAMP = _NS + "TimeStamp"
+    WHEN = _NS + "when"
+    EXTENDED_DATA = _NS + "ExtendedData"
+    DATA = _NS + "Data"
+    VALUE = _NS + "value"
+    MULTI_GEOMETRY = _NS + "MultiGeometry"
+    NESTED_COORDINATES = ".//%sPoint/%scoordinates" % (_NS, _NS)
+
+    def extract_placemarks(self, kml_data: str) -> List[Dict[str, Any]]:
+        """Extract Point placemarks, falling back to fastkml if none are found"""
+        try:
+            placemarks = self._extract_with_iterparse(kml_data)
+        except (etree.XMLSyntaxError, ValueError) as e:
+            logger.warning(f"Streaming KML parse failed, using fastkml: {e}")
+            placemarks = []
+
+        if placemarks:
+            return placemarks
+        return super().extract_placemarks(kml_data)
+
+    def _extract_with_iterparse(self, kml_data: str) -> List[Dict[str, Any]]:
+        # Same protections as defusedxml: no entity expansion, DTDs or network
+        context = etree.iterparse(
+            io.BytesIO(kml_data.encode("utf-8")),
+            events=("end",),
+            tag=self.PLACEMARK,
+            encoding="utf-8",
+            resolve_entities=False,
+            load_dtd=False,
+            no_network=True,
+        )
+
+        placemarks = []
+        for _, element in context:
+            placemark = self._read_placemark(element)
+            if placemark:
+                placemarks.append(placemark)
+
+            # Drop the processed Placemark and any siblings already passed
+            element.clear(keep_tail=False)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+        return placemarks
+
+    def _read_placemark(self, element) -> Optional[Dict[str, Any]]:
+        """Read one Placemark element, visiting only its direct children"""
+        coordinates = None
+        name = None
+        description = None
+        when = None
+        extended_data = {}
+
+        # Plain child iteration; find()/findtext() path lookups cost more
+        # than the rest of the placemark put together
+        for child in element:
+            tag = child.tag
+            if tag == self.POINT:
+                coordinates = self._child_text(child, self.COORDINATES)
+            elif tag == self.EXTENDED_DATA:
+                for data in child:
+                    data_name = data.get("name")
+                    if data.tag != self.DATA or not data_name:
+                        continue
+                    for value in data:
+                        if value.tag == self.VALUE:
+                            extended_data[data_name] = value.text
+                            break
+            elif tag == self.TIMESTAMP:
+                when = self._child_text(child, self.WHEN)
+            elif tag == self.NAME:
+                name = child.text
+            elif tag == self.DESCRIPTION:
+                description = child.text
+            elif tag == self.MULTI_GEOMETRY and coordinates is None:
+                coordinates = child.findtext(self.NESTED_COORDINATES)
+
+        if not coordinates:
+            return None
+
+        try:
+            coord_parts = coordinates.strip().split(",")
+            if len(coord_parts) < 2:
+                return None
+            lon, lat = float(coord_parts[0]), float(coord_parts[1])
+        except ValueError as e:
+            logger.warning(f"Error parsing XML placemark: {e}")
+            return None
+
+        display_name = extended_data.get("Map Display Name", "Unknown")
+        if display_name == "Unknown":
+            display_name = name if name is not None else "Unknown"
+
+        placemark_id = self._extract_device_imei(extended_data, display_name)
+        clean_name = str(display_name).replace(" ", "")
+        clean_id = str(placemark_id).replace(" ", "")
+
+        return {
+            "uid": f"{clean_name}-{clean_id}",
+            "name": display_name,
+            "lat": lat,
+            "lon": lon,
+            "description": description or "",
+            "timestamp": self._parse_timestamp(when, extended_data),
+            "extended_data": extended_data,
+        }
+
+    @staticmethod
+    def _child_text(element, tag: str) -> Optional[str]:
+        """Text of the first direct child with the given tag"""
+        for child in element:
+            if child.tag == tag:
+                return child.text
+        return None
+
+    @staticmethod
+    def _parse_timestamp(
+        when: Optional[str], extended_data: Dict[str, Any]
+    ) -> Optional[datetime]:
+        """TimeStamp/when first, then the Time UTC / Time ExtendedData fields"""
+        if when is not None:
+            return TimestampParser.parse(when)
+
+        for data_name, value in extended_data.items():
+            if data_name in ("Time UTC", "Time"):
+                parsed = TimestampParser.parse(value)
+                if parsed:
+                    return parsed
+        return None
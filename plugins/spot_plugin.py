@@ -11,6 +11,8 @@ Description:
 
 Key features:
     - Fetches the latest location updates from SPOT API
+    - Polls several feed IDs concurrently in one stream
+    - Optionally reports the latest position of every messenger in a feed
     - Parses and normalizes raw SPOT message data into a common location format
     - Provides user-friendly setup and help instructions as metadata
     - Validates SPOT-specific configuration parameters
@@ -21,10 +23,11 @@ Created: 2025-07-05
 """
 
 # Standard library imports
+import asyncio
 import logging
 import ssl
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Third-party imports
 import aiohttp
@@ -49,6 +52,19 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
     # Class-level plugin name for easier discovery
     PLUGIN_NAME = "spot"
 
+    FEED_URL = (
+        "https://api.findmespot.com/spot-main-web/consumer/rest-api/2.0/public/feed"
+    )
+
+    # Upper bound on pages requested per feed in per-messenger mode
+    MAX_FEED_PAGES = 10
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Messages last selected per feed, reused when a feed answers 304
+        # while other feeds in the same stream changed
+        self._feed_messages: Dict[str, List[Dict[str, Any]]] = {}
+
     @property
     def plugin_name(self) -> str:
         return self.PLUGIN_NAME
@@ -83,6 +99,10 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
                         "Feed updates depend on your SPOT device tracking settings",
                         "Connection may take 15-30 seconds to establish",
                         "Maximum 200 location points can be fetched per request",
+                        "Several feed IDs can be entered separated by commas; "
+                        "they are polled together in one cycle",
+                        "Use 'Latest position per messenger' to show every device "
+                        "of a shared feed instead of only the newest message",
                         "Feed password is only required if you've set one in your SPOT account",
                     ],
                 },
@@ -94,7 +114,8 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
                     field_type="text",
                     required=True,
                     placeholder="0abcdef1234567890abcdef123456789",
-                    help_text="Your SPOT device feed ID from your SPOT account shared page",
+                    help_text="Your SPOT device feed ID from your SPOT account shared "
+                    "page. Separate several feed IDs with commas",
                 ),
                 PluginConfigField(
                     name="feed_password",
@@ -115,6 +136,22 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
                     max_value=200,
                     help_text="Maximum number of location points to fetch per request",
                 ),
+                PluginConfigField(
+                    name="position_mode",
+                    label="Positions",
+                    field_type="select",
+                    required=False,
+                    default_value="newest",
+                    options=[
+                        {"value": "newest", "label": "Newest message in the feed"},
+                        {
+                            "value": "per_messenger",
+                            "label": "Latest position per messenger",
+                        },
+                    ],
+                    help_text="Per messenger reads further pages of the feed when a "
+                    "page is full so every device's latest position is found",
+                ),
             ],
         }
 
@@ -184,22 +221,134 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
         """
         Fetch location data from SPOT API
 
+        All configured feeds are fetched concurrently on the given session.
+
         Returns:
             List of location dictionaries with standardized format
         """
         decrypted_config = self.get_decrypted_config()
         try:
-
-            feed_id = decrypted_config["feed_id"]
-            feed_password = decrypted_config["feed_password"]
-            max_results = decrypted_config["max_results"]
+            feed_ids = self._parse_feed_ids(decrypted_config["feed_id"])
+            per_messenger = (
+                decrypted_config.get("position_mode", "newest") == "per_messenger"
+            )
 
             # Create SSL context for certificate verification
             ssl_context = ssl.create_default_context(cafile=certifi.where())
 
-            # Build SPOT API URL
-            base_url = "https://api.findmespot.com/spot-main-web/consumer/rest-api/2.0/public/feed"
-            url = f"{base_url}/{feed_id}/message.json"
+            results = await asyncio.gather(
+                *(
+                    self._fetch_feed(
+                        session, feed_id, decrypted_config, ssl_context, per_messenger
+                    )
+                    for feed_id in feed_ids
+                )
+            )
+
+            if len(feed_ids) == 1:
+                return self._feed_result_locations(
+                    feed_ids[0], results[0], per_messenger
+                )
+
+            return self._merge_feed_results(feed_ids, results, per_messenger)
+
+        except Exception as e:
+            logger.error(f"Error fetching SPOT locations: {e}")
+            return []
+
+    @staticmethod
+    def _parse_feed_ids(feed_id_value: Any) -> List[str]:
+        """Split the feed_id setting into unique feed IDs, keeping their order"""
+        feed_ids = []
+        for feed_id in str(feed_id_value or "").split(","):
+            feed_id = feed_id.strip()
+            if feed_id and feed_id not in feed_ids:
+                feed_ids.append(feed_id)
+        if not feed_ids:
+            raise ValueError("No SPOT feed ID configured")
+        return feed_ids
+
+    def _feed_result_locations(
+        self,
+        feed_id: str,
+        result: Optional[List[Dict[str, Any]]],
+        per_messenger: bool,
+    ) -> List[Dict[str, Any]]:
+        """Turn one feed's result into locations; None means not modified"""
+        if result is None:
+            return []
+        if result and "_error" in result[0]:
+            return result
+        return [
+            self._message_to_location(message, feed_id, per_messenger)
+            for message in result
+        ]
+
+    def _merge_feed_results(
+        self,
+        feed_ids: List[str],
+        results: List[Optional[List[Dict[str, Any]]]],
+        per_messenger: bool,
+    ) -> List[Dict[str, Any]]:
+        """
+        Combine the results of several feeds into one location list.
+
+        Feeds that answered 304 contribute their previously selected messages
+        so their markers keep being refreshed while other feeds change. Feed
+        errors are logged; they are only returned if no feed produced data.
+        """
+        if all(result is None for result in results):
+            return []
+        # At least one feed changed, so this poll has data to send
+        self.last_fetch_not_modified = False
+
+        # Forget feeds that were removed from the configuration
+        for feed_id in set(self._feed_messages) - set(feed_ids):
+            del self._feed_messages[feed_id]
+
+        locations = []
+        errors = []
+        for feed_id, result in zip(feed_ids, results):
+            if result is None:
+                result = self._feed_messages.get(feed_id, [])
+            if result and "_error" in result[0]:
+                logger.warning(
+                    f"SPOT feed {feed_id}: {result[0].get('_error_message')}"
+                )
+                errors.extend(result)
+                continue
+            locations.extend(
+                self._message_to_location(message, feed_id, per_messenger)
+                for message in result
+            )
+
+        logger.info(
+            f"Fetched {len(locations)} SPOT locations from {len(feed_ids)} feeds"
+        )
+        if not locations and errors:
+            return errors[:1]
+        return locations
+
+    async def _fetch_feed(
+        self,
+        session: aiohttp.ClientSession,
+        feed_id: str,
+        config: Dict[str, Any],
+        ssl_context: ssl.SSLContext,
+        per_messenger: bool,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch one SPOT feed and select the messages to report.
+
+        Returns:
+            Selected messages, a single-item error list, or None if the feed
+            answered 304 Not Modified
+        """
+        try:
+            feed_password = config["feed_password"]
+            max_results = config["max_results"]
+
+            url = f"{self.FEED_URL}/{feed_id}/message.json"
 
             params = {}
             if feed_password:
@@ -209,100 +358,39 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
 
             logger.info(f"Fetching SPOT data from feed ID: {feed_id}")
 
-            async with session.get(url, params=params, ssl=ssl_context) as response:
+            async with session.get(
+                url,
+                params=params,
+                headers=self.conditional_headers(url),
+                ssl=ssl_context,
+            ) as response:
+                if self.check_not_modified(url, response):
+                    return None
+
                 if response.status == 200:
                     data = await response.json()
                     messages = self._parse_spot_response(data)
 
                     if not messages:
-                        # Check if this was due to a JSON error (like feed not found)
-                        if "response" in data and "errors" in data.get("response", {}):
-                            # Extract the actual error code from the response
-                            errors = (
-                                data.get("response", {})
-                                .get("errors", {})
-                                .get("error", {})
-                            )
-                            if isinstance(errors, dict):
-                                error_code = errors.get("code", "Unknown")
-                                error_text = errors.get("text", "Unknown error")
-
-                                # Handle E-0195 as success (no devices found)
-                                if error_code == "E-0195":
-                                    logger.info(
-                                        f"SPOT API: Authentication successful "
-                                        f"but no devices found ({error_text})"
-                                    )
-                                    return [
-                                        {
-                                            "_error": "no_devices",
-                                            "_error_message": (
-                                                f"SPOT API error: {error_code} - {error_text}"
-                                            ),
-                                        }
-                                    ]
-
-                                # Map other error codes
-                                mapped_error_code = self._map_spot_error_code(
-                                    error_code
-                                )
-                                return [
-                                    {
-                                        "_error": mapped_error_code,
-                                        "_error_message": (
-                                            f"SPOT API error: {error_code} - {error_text}"
-                                        ),
-                                    }
-                                ]
-                            else:
-                                return [
-                                    {
-                                        "_error": "json_error",
-                                        "_error_message": "SPOT API returned error in response",
-                                    }
-                                ]
-                        else:
-                            logger.info("No messages found from SPOT")
-                            return []
-
-                    # Find the newest message by timestamp
-                    newest_message = max(
-                        messages,
-                        key=lambda msg: datetime.fromisoformat(
-                            msg["dateTime"].replace("Z", "+00:00")
-                        ),
-                    )
+                        return self._empty_feed_result(data)
+                    if "_error" in messages[0]:
+                        return messages
 
-                    # Convert to standardized location format
-                    location = {
-                        "uid": (
-                            f"{newest_message.get('messengerName', f'SPOT-{feed_id[:8]}')}"
-                            f"-{newest_message['id']}"
-                        ),
-                        "name": newest_message.get(
-                            "messengerName", f"SPOT-{feed_id[:8]}"
-                        ),
-                        "lat": float(newest_message["latitude"]),
-                        "lon": float(newest_message["longitude"]),
-                        "timestamp": datetime.fromisoformat(
-                            newest_message["dateTime"].replace("Z", "+00:00")
-                        ),
-                        "description": self._build_description(newest_message),
-                        "additional_data": {
-                            "source": "spot",
-                            "message_type": newest_message.get("messageType"),
-                            "battery_state": self._map_battery_state(
-                                newest_message.get("batteryState")
-                            ),
-                            "raw_message": newest_message,
-                        },
-                    }
+                    if per_messenger:
+                        messages = await self._fetch_remaining_pages(
+                            session, url, params, ssl_context, data, messages
+                        )
+                        selected = self._latest_per_messenger(messages)
+                    else:
+                        # Find the newest message by timestamp
+                        selected = [max(messages, key=self._message_time)]
 
+                    self._feed_messages[feed_id] = selected
                     logger.info(
-                        f"Successfully fetched newest location from SPOT "
-                        f"(timestamp: {location['timestamp']})"
+                        f"Selected {len(selected)} of {len(messages)} SPOT messages "
+                        f"from feed {feed_id}"
                     )
-                    return [location]
+                    return selected
 
                 elif response.status == 401:
                     logger.error(
@@ -324,9 +412,150 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
                     ]
 
         except Exception as e:
-            logger.error(f"Error fetching SPOT locations: {e}")
+            logger.error(f"Error fetching SPOT feed {feed_id}: {e}")
             return []
 
+    async def _fetch_remaining_pages(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        params: Dict[str, Any],
+        ssl_context: ssl.SSLContext,
+        first_page: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Follow the feed's pages via the start parameter while pages are full.
+
+        Later pages are plain requests; only the first page is revalidated
+        with the feed's ETag/Last-Modified validators.
+        """
+        feed_response = first_page.get("response", {}).get("feedMessageResponse", {})
+        try:
+            total_count = int(feed_response.get("totalCount", len(messages)))
+        except (TypeError, ValueError):
+            total_count = len(messages)
+
+        limit = int(params.get("limit") or 0)
+        page_size = len(messages)
+        pages = 1
+        while (
+            (not limit or page_size >= limit)
+            and len(messages) < total_count
+            and pages < self.MAX_FEED_PAGES
+        ):
+            page_params = dict(params, start=len(messages))
+            async with session.get(
+                url, params=page_params, ssl=ssl_context
+            ) as response:
+                if response.status != 200:
+                    logger.warning(
+                        f"Stopped paging SPOT feed at {len(messages)} messages: "
+                        f"HTTP {response.status}"
+                    )
+                    break
+                page = self._parse_spot_response(await response.json())
+
+            if not page or "_error" in page[0]:
+                break
+            messages.extend(page)
+            page_size = len(page)
+            pages += 1
+
+        return messages
+
+    def _empty_feed_result(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Result for a 200 response without messages"""
+        # Check if this was due to a JSON error (like feed not found)
+        if "response" in data and "errors" in data.get("response", {}):
+            # Extract the actual error code from the response
+            errors = data.get("response", {}).get("errors", {}).get("error", {})
+            if isinstance(errors, dict):
+                error_code = errors.get("code", "Unknown")
+                error_text = errors.get("text", "Unknown error")
+
+                # Handle E-0195 as success (no devices found)
+                if error_code == "E-0195":
+                    logger.info(
+                        f"SPOT API: Authentication successful "
+                        f"but no devices found ({error_text})"
+                    )
+                    return [
+                        {
+                            "_error": "no_devices",
+                            "_error_message": (
+                                f"SPOT API error: {error_code} - {error_text}"
+                            ),
+                        }
+                    ]
+
+                # Map other error codes
+                mapped_error_code = self._map_spot_error_code(error_code)
+                return [
+                    {
+                        "_error": mapped_error_code,
+                        "_error_message": (
+                            f"SPOT API error: {error_code} - {error_text}"
+                        ),
+                    }
+                ]
+            else:
+                return [
+                    {
+                        "_error": "json_error",
+                        "_error_message": "SPOT API returned error in response",
+                    }
+                ]
+
+        logger.info("No messages found from SPOT")
+        return []
+
+    @staticmethod
+    def _message_time(message: Dict[str, Any]) -> datetime:
+        return datetime.fromisoformat(message["dateTime"].replace("Z", "+00:00"))
+
+    @classmethod
+    def _latest_per_messenger(
+        cls, messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Newest message of every messenger, newest messenger first"""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for message in messages:
+            key = str(message.get("messengerId") or message.get("messengerName"))
+            current = latest.get(key)
+            if current is None or cls._message_time(message) > cls._message_time(
+                current
+            ):
+                latest[key] = message
+        return sorted(latest.values(), key=cls._message_time, reverse=True)
+
+    def _message_to_location(
+        self, message: Dict[str, Any], feed_id: str, per_messenger: bool
+    ) -> Dict[str, Any]:
+        """Convert a SPOT message to the standardized location format"""
+        name = message.get("messengerName", f"SPOT-{feed_id[:8]}")
+        if per_messenger:
+            # One marker per device that keeps its UID across messages
+            uid = f"{name}-{message.get('messengerId') or feed_id[:8]}"
+        else:
+            uid = f"{name}-{message['id']}"
+
+        return {
+            "uid": uid,
+            "name": name,
+            "lat": float(message["latitude"]),
+            "lon": float(message["longitude"]),
+            "timestamp": self._message_time(message),
+            "description": self._build_description(message),
+            "additional_data": {
+                "source": "spot",
+                "feed_id": feed_id,
+                "message_type": message.get("messageType"),
+                "battery_state": self._map_battery_state(message.get("batteryState")),
+                "raw_message": message,
+            },
+        }
+
     @staticmethod
     def _map_spot_error_code(spot_error_code: str) -> str:
         """
@@ -477,9 +706,10 @@ class SpotPlugin(BaseGPSPlugin, CallsignMappable):
             return False
 
         # Additional SPOT-specific validation
-        feed_id = self.config.get("feed_id", "")
-        if len(feed_id) < 32:  # SPOT feed IDs are typically 32+ characters
-            logger.warning("SPOT feed ID seems unusually short")
+        for feed_id in str(self.config.get("feed_id", "")).split(","):
+            # SPOT feed IDs are typically 32+ characters
+            if len(feed_id.strip()) < 32:
+                logger.warning("SPOT feed ID seems unusually short")
 
         # Validate max_results if provided
         max_results = self.config.get("max_results")
@@ -22,6 +22,12 @@ Key features:
     - Handles SSL context and connection optimizations to prevent timeouts
     - Provides async connection testing with detailed success/error feedback and device
       counts
+    - Converts positions to locations as the response is parsed, without
+      buffering the positions list
+    - Caches the device table between polls, refreshing it periodically or when an
+      unknown device reports
+    - Optional push mode that listens on Traccar's /api/socket WebSocket and sends
+      only the positions that changed
 
 Author: Emfour Solutions
 Created: 2025-07-05
@@ -32,10 +38,11 @@ import asyncio
 import json
 import logging
 import ssl
+import time
 from datetime import datetime, timezone
 
 # Third-party imports
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 import certifi
@@ -48,6 +55,7 @@ from plugins.base_plugin import (
     PluginConfigField,
 )
 from services.logging_service import get_module_logger
+from utils.json_stream import DEFAULT_CHUNK_SIZE, JSONArrayNotFound, iter_json_array
 
 # Module-level logger
 logger = get_module_logger(__name__)
@@ -58,6 +66,22 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
 
     PLUGIN_NAME = "traccar"
 
+    # Seconds between full /api/devices refreshes of the cached device table
+    DEVICE_REFRESH_INTERVAL = 600.0
+    # Minimum seconds between refreshes triggered by an unknown deviceId
+    UNKNOWN_DEVICE_REFRESH_INTERVAL = 60.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._device_map: Dict[Any, Dict[str, Any]] = {}
+        self._device_cache_key = None
+        self._devices_fetched_at = float("-inf")
+
+        self._push_listener: Optional["TraccarPushListener"] = None
+        # Listener connection the REST positions were last synced for
+        self._push_synced_connection = 0
+        self._last_full_fetch = float("-inf")
+
     @property
     def plugin_name(self) -> str:
         return self.PLUGIN_NAME
@@ -149,6 +173,23 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
                     help_text="Comma-separated list of device names to include "
                     "(leave empty for all devices)",
                 ),
+                PluginConfigField(
+                    name="update_mode",
+                    label="Update Mode",
+                    field_type="select",
+                    required=False,
+                    default_value="poll",
+                    options=[
+                        {"value": "poll", "label": "Poll the REST API"},
+                        {
+                            "value": "push",
+                            "label": "Push via WebSocket (near real-time)",
+                        },
+                    ],
+                    help_text="Push keeps a WebSocket open to /api/socket and sends "
+                    "positions as Traccar reports them. The REST API is still "
+                    "used to resynchronise after reconnects",
+                ),
             ],
         }
 
@@ -291,87 +332,240 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
     ) -> List[Dict[str, Any]]:
         """
         Internal method to fetch locations with a given session
+
+        Positions are converted to locations one at a time as they are
+        decoded. Positions of devices missing from the cached device table
+        are held back until the table has been refreshed.
         """
-        positions = await self._fetch_positions_from_api(session, config)
+        # Get device information to enrich position data
+        device_map = await self._get_device_map(session, config, [])
+        device_filter = self._parse_device_filter(config.get("device_filter", ""))
 
-        # Check for error indicators first
-        if (
-            positions
-            and len(positions) > 0
-            and isinstance(positions[0], dict)
-            and "_error" in positions[0]
-        ):
+        locations = []
+        unknown_positions = []
+
+        def add_position(position: Dict[str, Any]):
+            if position.get("deviceId") not in device_map:
+                unknown_positions.append(position)
+                return
+            location = self._position_to_location(position, device_map, device_filter)
+            if location is not None:
+                locations.append(location)
+
+        if config.get("update_mode", "poll") == "push":
+            errors = await self._fetch_pushed_positions(session, config, add_position)
+        else:
+            errors = await self._fetch_positions_from_api(session, config, add_position)
+
+        if errors:
             # Return the error indicator as-is for the base plugin to handle
-            return positions
+            return errors
 
-        if not positions:
+        if self.last_fetch_not_modified:
+            return []
+
+        if unknown_positions:
+            device_map = await self._get_device_map(session, config, unknown_positions)
+            for position in unknown_positions:
+                location = self._position_to_location(
+                    position, device_map, device_filter
+                )
+                if location is not None:
+                    locations.append(location)
+
+        if not locations:
             logger.warning("No position data received from Traccar API")
             return []
 
-        # Get device information to enrich position data
-        devices = await self._fetch_devices_from_api(session, config)
-        device_map = {device["id"]: device for device in devices} if devices else {}
+        logger.info(f"Successfully fetched {len(locations)} positions from Traccar")
+        return locations
 
-        # Convert positions to standardized location format
-        locations = []
-        device_filter = self._parse_device_filter(config.get("device_filter", ""))
+    def _position_to_location(
+        self,
+        position: Dict[str, Any],
+        device_map: Dict[Any, Dict[str, Any]],
+        device_filter: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Convert a Traccar position to the standardized location format"""
+        device_info = device_map.get(position.get("deviceId"), {})
+        device_name = device_info.get(
+            "name", f"Device {position.get('deviceId', 'Unknown')}"
+        )
 
-        for position in positions:
-            device_info = device_map.get(position.get("deviceId"), {})
-            device_name = device_info.get(
-                "name", f"Device {position.get('deviceId', 'Unknown')}"
-            )
+        # Apply device filter if specified
+        if device_filter and not self._device_matches_filter(
+            device_name, device_filter
+        ):
+            return None
+
+        location = {
+            "name": device_name,
+            "lat": float(position.get("latitude", 0)),
+            "lon": float(position.get("longitude", 0)),
+            "timestamp": self._parse_timestamp(
+                position.get("deviceTime") or position.get("fixTime")
+            ),
+            "description": self._build_description(position, device_info),
+            "uid": f"traccar-{position.get('deviceId', 'unknown')}",
+            "additional_data": {
+                "source": "traccar",
+                "device_id": position.get("deviceId"),
+                "position_id": position.get("id"),
+                "altitude": position.get("altitude"),
+                "accuracy": position.get("accuracy"),
+                "attributes": position.get("attributes", {}),
+                "device_info": device_info,
+            },
+        }
 
-            # Apply device filter if specified
-            if device_filter and not self._device_matches_filter(
-                device_name, device_filter
-            ):
-                continue
-
-            location = {
-                "name": device_name,
-                "lat": float(position.get("latitude", 0)),
-                "lon": float(position.get("longitude", 0)),
-                "timestamp": self._parse_timestamp(
-                    position.get("deviceTime") or position.get("fixTime")
-                ),
-                "description": self._build_description(position, device_info),
-                "uid": f"traccar-{position.get('deviceId', 'unknown')}",
-                "additional_data": {
-                    "source": "traccar",
-                    "device_id": position.get("deviceId"),
-                    "position_id": position.get("id"),
-                    "altitude": position.get("altitude"),
-                    "accuracy": position.get("accuracy"),
-                    "attributes": position.get("attributes", {}),
-                    "device_info": device_info,
-                },
-            }
+        # Add speed and course as top-level fields for CoT processing
+        if position.get("speed") is not None:
+            location["speed"] = float(position.get("speed"))
+        if position.get("course") is not None:
+            location["course"] = float(position.get("course"))
 
-            # Add speed and course as top-level fields for CoT processing
-            if position.get("speed") is not None:
-                location["speed"] = float(position.get("speed"))
-            if position.get("course") is not None:
-                location["course"] = float(position.get("course"))
+        return location
 
-            locations.append(location)
+    async def _get_device_map(
+        self,
+        session: aiohttp.ClientSession,
+        config: Dict[str, Any],
+        positions: List[Dict[str, Any]],
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Device table keyed by device ID, cached between polls.
 
-        logger.info(f"Successfully fetched {len(locations)} positions from Traccar")
-        return locations
+        The table is refreshed every DEVICE_REFRESH_INTERVAL seconds, or
+        sooner (at most every UNKNOWN_DEVICE_REFRESH_INTERVAL seconds) when a
+        position reports a device that is not in the table. Device updates
+        pushed over the WebSocket are merged in as they arrive.
+        """
+        cache_key = (config.get("server_url"), config.get("username"))
+        if cache_key != self._device_cache_key:
+            self._device_cache_key = cache_key
+            self._device_map = {}
+            self._devices_fetched_at = float("-inf")
+
+        if self._push_listener is not None:
+            for device in self._push_listener.drain_devices():
+                self._device_map[device.get("id")] = device
+
+        now = time.monotonic()
+        age = now - self._devices_fetched_at
+        unknown = any(
+            position.get("deviceId") not in self._device_map for position in positions
+        )
+        if age >= self.DEVICE_REFRESH_INTERVAL or (
+            unknown and age >= self.UNKNOWN_DEVICE_REFRESH_INTERVAL
+        ):
+            devices = await self._fetch_devices_from_api(session, config)
+            # Keep the previous table if the refresh failed
+            if devices:
+                self._device_map = {device["id"]: device for device in devices}
+            self._devices_fetched_at = now
+
+        return self._device_map
+
+    def _full_sync_interval(self) -> float:
+        """Seconds between REST resyncs in push mode (half the CoT stale time)"""
+        try:
+            return max(
+                30.0, float(self.get_stream_config_value("cot_stale_time", 300)) / 2
+            )
+        except (TypeError, ValueError):
+            return 150.0
+
+    async def _fetch_pushed_positions(
+        self,
+        session: aiohttp.ClientSession,
+        config: Dict[str, Any],
+        on_position: Callable[[Dict[str, Any]], None],
+    ) -> List[Dict[str, Any]]:
+        """
+        Positions for push mode, passed to on_position.
+
+        While the WebSocket is connected and synced this hands over only the
+        positions pushed since the last poll, without any HTTP request. The
+        REST API is used after every (re)connect, while the socket is down,
+        and every half CoT stale time so unmoved devices are re-sent before
+        TAK clients mark them stale.
+        """
+        listener = self._push_listener
+        if listener is None:
+            server_url = config["server_url"].rstrip("/")
+            listener = TraccarPushListener(
+                server_url,
+                str(config["username"]) if config["username"] is not None else "",
+                str(config["password"]) if config["password"] is not None else "",
+                self._create_ssl_context(),
+            )
+            self._push_listener = listener
+            self.push_event = listener.push_event
+        listener.start()
+
+        now = time.monotonic()
+        if (
+            listener.connected
+            and listener.connections == self._push_synced_connection
+            and now - self._last_full_fetch < self._full_sync_interval()
+        ):
+            positions = listener.drain_positions()
+            if not positions:
+                # Nothing moved since the last poll
+                self.last_fetch_not_modified = True
+            else:
+                logger.debug(f"Received {len(positions)} pushed Traccar positions")
+            for position in positions:
+                on_position(position)
+            return []
+
+        # Pushed positions are superseded by the full REST snapshot; anything
+        # pushed while the request is in flight stays buffered for next poll
+        connections = listener.connections
+        was_connected = listener.connected
+        listener.drain_positions()
+
+        received = 0
+
+        def count_position(position: Dict[str, Any]):
+            nonlocal received
+            received += 1
+            on_position(position)
+
+        errors = await self._fetch_positions_from_api(session, config, count_position)
+        if (received and not errors) or self.last_fetch_not_modified:
+            self._last_full_fetch = now
+            if was_connected:
+                self._push_synced_connection = connections
+        return errors
+
+    async def close(self):
+        """Stop the WebSocket listener of push mode"""
+        if self._push_listener is not None:
+            await self._push_listener.close()
+            self._push_listener = None
+            self.push_event = None
 
-    @staticmethod
     async def _fetch_positions_from_api(
-        session: aiohttp.ClientSession, config: Dict[str, Any]
+        self,
+        session: aiohttp.ClientSession,
+        config: Dict[str, Any],
+        on_position: Callable[[Dict[str, Any]], None],
     ) -> List[Dict[str, Any]]:
         """
         Fetch positions from Traccar API
 
+        Positions are decoded from the response one at a time and passed to
+        on_position as they arrive, so the positions list is never held in
+        memory as a whole.
+
         Args:
             session: aiohttp session
             config: Decrypted configuration
+            on_position: Called with each position dictionary
 
         Returns:
-            List of position dictionaries
+            Error indicator list, or an empty list
         """
         server_url = config["server_url"].rstrip("/")
         url = f"{server_url}/api/positions"
@@ -387,14 +581,24 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
 
         try:
             async with session.get(
-                url, auth=auth, timeout=timeout, ssl=ssl_context
+                url,
+                auth=auth,
+                timeout=timeout,
+                headers=self.conditional_headers(url),
+                ssl=ssl_context,
             ) as response:
+                if self.check_not_modified(url, response):
+                    return []
+
                 if response.status == 200:
-                    data = await response.json()
-                    logger.info(
-                        f"Successfully fetched {len(data)} positions from Traccar API"
-                    )
-                    return data
+                    received = 0
+                    async for position in iter_json_array(
+                        response.content.iter_chunked(DEFAULT_CHUNK_SIZE), [()]
+                    ):
+                        received += 1
+                        on_position(position)
+                    logger.debug(f"Received {received} positions from Traccar API")
+                    return []
                 elif response.status == 401:
                     error_text = await response.text(encoding="utf-8")
                     logger.error(
@@ -433,6 +637,9 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON response: {e}")
             return []
+        except JSONArrayNotFound:
+            logger.error("Traccar positions response is not a JSON array")
+            return []
         except Exception as e:
             logger.error(f"Unexpected error fetching positions: {e}")
             return []
@@ -468,7 +675,13 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
                 url, auth=auth, timeout=timeout, ssl=ssl_context
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    # The device list is kept as the device table cache
+                    data = [
+                        device
+                        async for device in iter_json_array(
+                            response.content.iter_chunked(DEFAULT_CHUNK_SIZE), [()]
+                        )
+                    ]
                     logger.debug(
                         f"Successfully fetched {len(data)} devices from Traccar API"
                     )
@@ -643,3 +856,150 @@ class TraccarPlugin(BaseGPSPlugin, CallsignMappable):
             return False
 
         return True
+
+
+class TraccarPushListener:
+    """
+    Keeps a Traccar /api/socket WebSocket open and buffers pushed updates.
+
+    Traccar pushes JSON messages with "positions", "devices" and "events"
+    lists. Positions are buffered latest-per-device until the plugin drains
+    them on its next poll, and push_event is set so the stream worker can
+    start that poll straight away. The socket uses its own client session
+    because Traccar authenticates it with a session cookie.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        username: str,
+        password: str,
+        ssl_context: ssl.SSLContext,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 300.0,
+    ):
+        self.server_url = server_url.rstrip("/")
+        self._username = username
+        self._password = password
+        self._ssl_context = ssl_context
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.push_event = asyncio.Event()
+        self.connected = False
+        # Incremented on every successful connect so the plugin can tell
+        # when positions may have been missed and a REST resync is needed
+        self.connections = 0
+
+        self._positions: Dict[Any, Dict[str, Any]] = {}
+        self._devices: Dict[Any, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def socket_url(self) -> str:
+        if self.server_url.startswith("https://"):
+            return "wss://" + self.server_url[len("https://") :] + "/api/socket"
+        if self.server_url.startswith("http://"):
+            return "ws://" + self.server_url[len("http://") :] + "/api/socket"
+        return self.server_url + "/api/socket"
+
+    def start(self):
+        """Start the listener task on the running loop if it is not running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.connected = False
+
+    def drain_positions(self) -> List[Dict[str, Any]]:
+        """Positions pushed since the last drain, latest per device"""
+        positions = list(self._positions.values())
+        self._positions = {}
+        self.push_event.clear()
+        return positions
+
+    def drain_devices(self) -> List[Dict[str, Any]]:
+        """Device updates pushed since the last drain"""
+        devices = list(self._devices.values())
+        self._devices = {}
+        return devices
+
+    def handle_message(self, data: str):
+        """Buffer the positions and devices of one socket message"""
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            logger.debug("Ignoring non-JSON Traccar socket message")
+            return
+        if not isinstance(payload, dict):
+            return
+
+        for device in payload.get("devices") or []:
+            if isinstance(device, dict):
+                self._devices[device.get("id")] = device
+
+        positions = [
+            position
+            for position in payload.get("positions") or []
+            if isinstance(position, dict)
+        ]
+        for position in positions:
+            self._positions[position.get("deviceId")] = position
+        if positions:
+            self.push_event.set()
+
+    async def _login(self, session: aiohttp.ClientSession):
+        """Open a Traccar session; the cookie authenticates the socket"""
+        async with session.post(
+            f"{self.server_url}/api/session",
+            data={"email": self._username, "password": self._password},
+            ssl=self._ssl_context,
+        ) as response:
+            if response.status != 200:
+                raise RuntimeError(
+                    f"Traccar session login failed: HTTP {response.status}"
+                )
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with aiohttp.ClientSession(
+                    cookie_jar=aiohttp.CookieJar(unsafe=True),
+                    timeout=aiohttp.ClientTimeout(total=None, sock_connect=30),
+                ) as session:
+                    await self._login(session)
+                    async with session.ws_connect(
+                        self.socket_url, heartbeat=30, ssl=self._ssl_context
+                    ) as ws:
+                        self.connected = True
+                        self.connections += 1
+                        delay = self.reconnect_delay
+                        logger.info(f"Connected to Traccar socket {self.socket_url}")
+
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                self.handle_message(message.data)
+                            elif message.type in (
+                                aiohttp.WSMsgType.CLOSED,
+                                aiohttp.WSMsgType.ERROR,
+                            ):
+                                break
+
+                logger.warning("Traccar socket closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Traccar socket error: {e}")
+            finally:
+                self.connected = False
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
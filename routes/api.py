@@ -49,6 +49,7 @@ from services.health_service import health_service
 
 # Module-level logger
 from services.logging_service import get_module_logger
+from services.stream_config_snapshot import invalidate_stream_config
 
 # Team member configuration constants
 TEAM_MEMBER_ROLES = [
@@ -1349,6 +1350,9 @@ def update_callsign_mappings(stream_id):
 
         db.session.commit()
 
+        # Running workers pick up the new mappings on their next poll
+        invalidate_stream_config(stream_id)
+
         return jsonify(
             {"success": True, "message": "Callsign mappings updated successfully"}
         )
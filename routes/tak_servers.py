@@ -45,6 +45,7 @@ from services.auth import operator_required, require_auth, require_permission
 
 # Module-level logger
 from services.logging_service import get_module_logger
+from services.tak_certificate_cache import get_tak_certificate_cache
 from services.tak_servers_service import TakServerService
 
 logger = get_module_logger(__name__)
@@ -379,6 +380,9 @@ def edit_tak_server(server_id):
         db.session.flush()  # Check for constraint violations
         db.session.commit()
 
+        # Drop the cached client certificate and SSL contexts for this server
+        get_tak_certificate_cache().invalidate(server_id)
+
         logger.info(f"Successfully updated TAK server ID: {server_id}")
 
         if request.is_json:
@@ -431,6 +435,7 @@ def delete_tak_server(server_id):
 
         db.session.delete(server)
         db.session.commit()
+        get_tak_certificate_cache().invalidate(server_id)
 
         logger.info(f"Successfully deleted TAK server ID: {server_id}")
         return jsonify({"success": True, "message": "TAK Server deleted"})
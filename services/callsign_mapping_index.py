@@ -0,0 +1,334 @@
+"""
+ABOUTME: Compiled, immutable callsign mapping table per stream with a single-pass
+ABOUTME: batch apply that maps, filters and re-types a whole poll of locations
+
+File: services/callsign_mapping_index.py
+
+Description:
+    Applying callsign mappings used to walk every location, re-check mapping
+    ORM attributes with getattr/hasattr, call the plugin's
+    apply_callsign_mapping once per location and finally pop skipped entries
+    out of the list by index. For streams with thousands of mapped trackers
+    that made callsign mapping one of the most expensive parts of a poll.
+
+    This module compiles a stream's mappings once per configuration snapshot
+    into plain lookup tables (identifier -> callsign, resolved CoT type and
+    team member settings) plus a set of disabled identifiers, and selects the
+    identifier extractor for the configured field up front. The apply step
+    then processes the whole batch in one pass and hands all matched
+    locations to the plugin in a single call.
+
+Key features:
+    - Identifier extractors selected once per identifier field
+    - Per-identifier CoT type / team member resolution done at compile time
+    - Disabled tracker filtering, skip handling and mapping in one pass
+    - One plugin apply_callsign_mapping call per batch
+    - In-place list update without per-index pops
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional
+
+from services.logging_service import get_module_logger
+
+logger = get_module_logger(__name__)
+
+IdentifierExtractor = Callable[[Dict[str, Any]], Optional[str]]
+
+
+def _extract_imei(location: Dict[str, Any]) -> Optional[str]:
+    # Garmin-style extraction
+    return (
+        location.get("additional_data", {})
+        .get("raw_placemark", {})
+        .get("extended_data", {})
+        .get("IMEI")
+    )
+
+
+def _extract_messenger_name(location: Dict[str, Any]) -> Optional[str]:
+    # SPOT-style extraction
+    return (
+        location.get("additional_data", {}).get("raw_message", {}).get("messengerName")
+    )
+
+
+def _additional_data_extractor(key: str) -> IdentifierExtractor:
+    def extract(location: Dict[str, Any]) -> Optional[str]:
+        return location.get("additional_data", {}).get(key)
+
+    return extract
+
+
+def _location_extractor(key: str) -> IdentifierExtractor:
+    def extract(location: Dict[str, Any]) -> Optional[str]:
+        return location.get(key)
+
+    return extract
+
+
+def _generic_extractor(field_name: str) -> IdentifierExtractor:
+    def extract(location: Dict[str, Any]) -> Optional[str]:
+        # Try direct access first, then additional_data
+        if field_name in location:
+            return location[field_name]
+        return location.get("additional_data", {}).get(field_name)
+
+    return extract
+
+
+def compile_identifier_extractor(
+    identifier_field: Optional[str],
+) -> Optional[IdentifierExtractor]:
+    """
+    Select the function that extracts a tracker identifier from a location.
+
+    Args:
+        identifier_field: Configured callsign identifier field
+
+    Returns:
+        Extractor function, or None when no identifier field is configured
+    """
+    if not identifier_field:
+        return None
+    if identifier_field == "imei":
+        return _extract_imei
+    if identifier_field in ("name", "uid"):
+        return _location_extractor(identifier_field)
+    if identifier_field == "messenger_name":
+        return _extract_messenger_name
+    if identifier_field in ("device_id", "feed_id"):
+        # Traccar device ID / SPOT feed ID
+        return _additional_data_extractor(identifier_field)
+    return _generic_extractor(identifier_field)
+
+
+@dataclass(frozen=True)
+class CompiledCallsignMapping:
+    """Resolved callsign settings for one tracker identifier"""
+
+    callsign: str
+    cot_type: Optional[str] = None
+    team_member: bool = False
+    team_role: Optional[str] = None
+    team_color: Optional[str] = None
+
+    @classmethod
+    def from_mapping(cls, mapping) -> "CompiledCallsignMapping":
+        """Resolve a callsign mapping's CoT type / team member override"""
+        team_member = mapping.cot_type_override == "team_member"
+        return cls(
+            callsign=mapping.custom_callsign,
+            # standard_point and legacy per-callsign mappings both use cot_type
+            cot_type=None if team_member else (mapping.cot_type or None),
+            team_member=team_member,
+            team_role=mapping.team_role if team_member else None,
+            team_color=mapping.team_color if team_member else None,
+        )
+
+
+@dataclass
+class CallsignMappingResult:
+    """Counters from applying a mapping index to one batch of locations"""
+
+    mapped: int = 0
+    unmapped: int = 0
+    skipped: int = 0
+    disabled: int = 0
+    unidentified: int = 0
+
+
+class CallsignMappingIndex:
+    """Immutable identifier -> callsign table compiled from a stream's mappings"""
+
+    __slots__ = (
+        "identifier_field",
+        "error_handling",
+        "per_callsign_cot_types",
+        "_extract",
+        "_mappings",
+        "_disabled",
+    )
+
+    def __init__(
+        self,
+        identifier_field: Optional[str],
+        error_handling: str,
+        per_callsign_cot_types: bool,
+        mappings: Mapping[str, CompiledCallsignMapping],
+        disabled: FrozenSet[str],
+    ):
+        self.identifier_field = identifier_field
+        self.error_handling = error_handling or "fallback"
+        self.per_callsign_cot_types = bool(per_callsign_cot_types)
+        self._extract = compile_identifier_extractor(identifier_field)
+        self._mappings = dict(mappings)
+        self._disabled = frozenset(disabled)
+
+    @classmethod
+    def compile(
+        cls,
+        config: Dict[str, Any],
+        callsign_mappings: Mapping[str, Any],
+        disabled_mappings: Mapping[str, Any],
+    ) -> "CallsignMappingIndex":
+        """
+        Compile a stream's callsign configuration into lookup tables.
+
+        Args:
+            config: Stream callsign settings (identifier field, error handling,
+                per-callsign CoT types flag)
+            callsign_mappings: Enabled mappings keyed by identifier value
+            disabled_mappings: Disabled mappings keyed by identifier value
+
+        Returns:
+            Compiled mapping index
+        """
+        return cls(
+            identifier_field=config.get("callsign_identifier_field"),
+            error_handling=config.get("callsign_error_handling", "fallback"),
+            per_callsign_cot_types=config.get("enable_per_callsign_cot_types", False),
+            mappings={
+                identifier: CompiledCallsignMapping.from_mapping(mapping)
+                for identifier, mapping in callsign_mappings.items()
+            },
+            disabled=frozenset(disabled_mappings),
+        )
+
+    def __len__(self) -> int:
+        return len(self._mappings)
+
+    def get(self, identifier: str) -> Optional[CompiledCallsignMapping]:
+        """Get the compiled mapping for an identifier"""
+        return self._mappings.get(identifier)
+
+    def extract_identifier(self, location: Dict[str, Any]) -> Optional[str]:
+        """Extract the configured identifier from a location"""
+        if self._extract is None:
+            return None
+        try:
+            return self._extract(location)
+        except Exception as e:
+            logger.debug(
+                f"Failed to extract identifier '{self.identifier_field}' from location: {e}"
+            )
+            return None
+
+    def filter_disabled(self, locations: List[Dict[str, Any]]) -> int:
+        """Remove locations of disabled trackers in place, returning the count"""
+        if not self._disabled or self._extract is None:
+            return 0
+
+        kept = [
+            location
+            for location in locations
+            if self.extract_identifier(location) not in self._disabled
+        ]
+        removed = len(locations) - len(kept)
+        if removed:
+            locations[:] = kept
+        return removed
+
+    def apply(
+        self, locations: List[Dict[str, Any]], plugin=None
+    ) -> CallsignMappingResult:
+        """
+        Map, filter and re-type a batch of locations in a single pass.
+
+        Locations of disabled trackers are dropped, unmapped identifiers are
+        dropped in "skip" mode and kept unchanged in "fallback" mode. Mapped
+        callsigns are applied through the plugin in one call when it supports
+        callsign mapping, otherwise written directly to the name field.
+
+        Args:
+            locations: Locations to update in place
+            plugin: Stream plugin, used when it supports callsign mapping
+
+        Returns:
+            Counters describing what happened to the batch
+        """
+        result = CallsignMappingResult()
+        if self._extract is None:
+            result.unidentified = len(locations)
+            return result
+
+        use_plugin = (
+            plugin is not None
+            and hasattr(plugin, "supports_callsign_mapping")
+            and plugin.supports_callsign_mapping()
+        )
+        skip_unmapped = self.error_handling == "skip"
+        mappings = self._mappings
+        disabled = self._disabled
+
+        kept = []
+        plugin_batch = []
+        plugin_map = {}
+
+        for location in locations:
+            try:
+                identifier = self._extract(location)
+            except Exception as e:
+                logger.debug(f"Failed to extract identifier from location: {e}")
+                identifier = None
+
+            if not identifier:
+                result.unidentified += 1
+                kept.append(location)
+                continue
+
+            if identifier in disabled:
+                result.disabled += 1
+                continue
+
+            mapping = mappings.get(identifier)
+            if mapping is None:
+                if skip_unmapped:
+                    result.skipped += 1
+                    continue
+                # Fallback: keep original name
+                result.unmapped += 1
+                kept.append(location)
+                continue
+
+            if use_plugin:
+                plugin_batch.append(location)
+                plugin_map[identifier] = mapping.callsign
+            else:
+                location["name"] = mapping.callsign
+
+            if self.per_callsign_cot_types:
+                if mapping.team_member:
+                    additional_data = location.get("additional_data")
+                    if not additional_data:
+                        additional_data = location["additional_data"] = {}
+                    additional_data["team_member_enabled"] = True
+                    additional_data["team_role"] = mapping.team_role
+                    additional_data["team_color"] = mapping.team_color
+                elif mapping.cot_type:
+                    location["cot_type"] = mapping.cot_type
+
+            result.mapped += 1
+            kept.append(location)
+
+        if plugin_batch:
+            try:
+                plugin.apply_callsign_mapping(
+                    plugin_batch, self.identifier_field, plugin_map
+                )
+            except Exception as e:
+                logger.error(f"Error applying callsign mapping to locations: {e}")
+                if skip_unmapped:
+                    # Skip mode drops locations whose mapping could not be applied
+                    failed = {id(location) for location in plugin_batch}
+                    kept = [loc for loc in kept if id(loc) not in failed]
+                    result.skipped += len(plugin_batch)
+                    result.mapped -= len(plugin_batch)
+
+        if len(kept) != len(locations):
+            locations[:] = kept
+
+        return result
@@ -0,0 +1,279 @@
+"""
+ABOUTME: Executor-backed CoT generation engine that moves CPU-bound XML building
+ABOUTME: off the shared stream event loop onto a thread or process pool
+
+File: services/cot_executor.py
+
+Description:
+    CoT generation is pure synchronous CPU work. Running it as asyncio tasks on
+    the StreamManager event loop does not parallelise anything and blocks every
+    other stream while a large poll (thousands of Deepstate points) is being
+    serialized. This module ships chunks of plain location dictionaries to a
+    concurrent.futures executor and awaits the results, so the event loop stays
+    responsive and, in process mode, chunks are generated on multiple cores.
+
+    Locations are projected down to the fields CoT generation reads before
+    being submitted, which keeps pickling cheap and avoids shipping plugin
+    payloads (raw placemarks, API responses) that may not be picklable.
+
+Key features:
+    - Configurable executor type: asyncio (inline), thread or process
+    - Configurable pool size, chunk size and minimum location threshold
+    - Spawned worker processes (safe alongside the application's threads)
+    - Lazily created, process-wide pool reused across polls and streams
+    - Plain-dict projection of locations for cheap inter-process transfer
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from services.logging_service import get_module_logger
+
+logger = get_module_logger(__name__)
+
+EXECUTOR_TYPES = ("asyncio", "thread", "process")
+DEFAULT_EXECUTOR_TYPE = "process"
+
+# Location keys read by QueuedCOTService._build_pytak_events
+PLAIN_LOCATION_KEYS = (
+    "_error",
+    "_error_message",
+    "uid",
+    "id",
+    "name",
+    "callsign",
+    "lat",
+    "latitude",
+    "lon",
+    "longitude",
+    "altitude",
+    "hae",
+    "accuracy",
+    "ce",
+    "linear_error",
+    "le",
+    "speed",
+    "course",
+    "heading",
+    "description",
+    "timestamp",
+    "cot_type",
+    "custom_cot_attrib",
+)
+
+# additional_data keys read during CoT generation
+PLAIN_ADDITIONAL_DATA_KEYS = (
+    "team_member_enabled",
+    "team_role",
+    "team_color",
+    "battery_state",
+)
+
+
+def to_plain_location(location: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Project a plugin location dictionary down to the fields used for CoT generation.
+
+    Args:
+        location: Location dictionary as returned by a plugin
+
+    Returns:
+        New dictionary containing only CoT-relevant keys
+    """
+    plain = {key: location[key] for key in PLAIN_LOCATION_KEYS if key in location}
+
+    additional_data = location.get("additional_data")
+    if isinstance(additional_data, dict):
+        plain["additional_data"] = {
+            key: additional_data[key]
+            for key in PLAIN_ADDITIONAL_DATA_KEYS
+            if key in additional_data
+        }
+
+    return plain
+
+
+def generate_cot_chunk(
+    locations: List[Dict[str, Any]],
+    cot_type: str,
+    stale_time: int,
+    cot_type_mode: str,
+) -> List[bytes]:
+    """
+    Generate CoT events for a chunk of plain locations (executor entry point).
+
+    Module-level so it can be pickled by reference for process pools.
+    """
+    from services.cot_service_integration import QueuedCOTService
+
+    return QueuedCOTService._build_pytak_events(
+        locations, cot_type, stale_time, cot_type_mode
+    )
+
+
+class CotGenerationExecutor:
+    """
+    Lazily created thread/process pool for CoT event generation.
+
+    The pool is sized from the parallel_processing configuration and recreated
+    only when the executor type or pool size changes.
+    """
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._executor_type: Optional[str] = None
+        self._pool_size: int = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resolve_pool_size(configured: int) -> int:
+        """Resolve a configured pool size, where 0 means CPU count capped at 4"""
+        if configured and configured > 0:
+            return int(configured)
+        return max(1, min(4, os.cpu_count() or 1))
+
+    def get_executor(self, executor_type: str, pool_size: int) -> Executor:
+        """
+        Get the pool for the given configuration, creating or replacing it as needed.
+
+        Args:
+            executor_type: "thread" or "process"
+            pool_size: Configured worker count (0 = automatic)
+
+        Returns:
+            concurrent.futures Executor
+        """
+        workers = self.resolve_pool_size(pool_size)
+        with self._lock:
+            if (
+                self._executor is not None
+                and self._executor_type == executor_type
+                and self._pool_size == workers
+            ):
+                return self._executor
+
+            previous = self._executor
+            if executor_type == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="CotGeneration"
+                )
+            self._executor_type = executor_type
+            self._pool_size = workers
+            logger.info(
+                f"Created {executor_type} CoT generation pool with {workers} workers"
+            )
+
+        if previous is not None:
+            previous.shutdown(wait=False, cancel_futures=True)
+        return self._executor
+
+    async def generate(
+        self,
+        locations: List[Dict[str, Any]],
+        cot_type: str,
+        stale_time: int,
+        cot_type_mode: str,
+        executor_type: str,
+        pool_size: int,
+        chunk_size: int,
+    ) -> List[bytes]:
+        """
+        Generate CoT events for all locations on the pool, preserving input order.
+
+        Args:
+            locations: Plugin location dictionaries
+            cot_type: Stream CoT type
+            stale_time: Stale time in seconds
+            cot_type_mode: "stream" or "per_point"
+            executor_type: "thread" or "process"
+            pool_size: Configured worker count (0 = automatic)
+            chunk_size: Locations per submitted chunk
+
+        Returns:
+            List of COT events as XML bytes
+        """
+        executor = self.get_executor(executor_type, pool_size)
+        chunk_size = max(1, int(chunk_size))
+
+        plain_locations = [to_plain_location(location) for location in locations]
+        chunks = [
+            plain_locations[i : i + chunk_size]
+            for i in range(0, len(plain_locations), chunk_size)
+        ]
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    generate_cot_chunk,
+                    chunk,
+                    cot_type,
+                    stale_time,
+                    cot_type_mode,
+                )
+                for chunk in chunks
+            ]
+        )
+
+        events: List[bytes] = []
+        for chunk_events in results:
+            events.extend(chunk_events)
+        return events
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get pool status for monitoring"""
+        return {
+            "executor_type": self._executor_type,
+            "pool_size": self._pool_size,
+            "active": self._executor is not None,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the pool, cancelling pending chunks"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._executor_type = None
+            self._pool_size = 0
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("CoT generation pool shut down")
+
+
+# Global executor instance
+_cot_generation_executor = None
+
+
+def get_cot_generation_executor() -> CotGenerationExecutor:
+    """
+    Get the global CoT generation executor (singleton pattern).
+
+    Returns:
+        CotGenerationExecutor instance
+    """
+    global _cot_generation_executor
+    if _cot_generation_executor is None:
+        _cot_generation_executor = CotGenerationExecutor()
+    return _cot_generation_executor
+
+
+def reset_cot_generation_executor():
+    """Shut down and reset the global CoT generation executor"""
+    global _cot_generation_executor
+    if _cot_generation_executor is not None:
+        _cot_generation_executor.shutdown()
+    _cot_generation_executor = None
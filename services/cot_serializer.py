@@ -0,0 +1,199 @@
+"""
+ABOUTME: Template-based CoT XML serializer for the stock TrakBridge event shape,
+ABOUTME: producing the same bytes as the lxml tree builder without building a tree
+
+File: services/cot_serializer.py
+
+Description:
+    Fast-path serializer for CoT events generated by QueuedCOTService. Every poll
+    produces one event per tracker with a fixed element layout (event, point,
+    detail, takv, contact, optional team member elements, track and remarks), so
+    building and serializing a full lxml tree per location is unnecessary work.
+    This module writes that layout directly from precompiled string templates
+    into a fragment buffer and encodes it once.
+
+    Output is byte-for-byte identical to etree.tostring() of the equivalent
+    tree: attribute and text escaping follow libxml2's rules, non-ASCII
+    characters are written as decimal character references, and values lxml
+    would reject (non-string values, control characters) raise the same
+    exception types. Events carrying custom_cot_attrib still go through the
+    lxml builder since their shape is plugin-defined.
+
+Key features:
+    - Precompiled templates for the event header, point and detail elements
+    - libxml2-compatible attribute and text escaping
+    - Single encode per event with ASCII character reference fallback
+    - No per-event tree allocation
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import re
+from typing import Any, Dict, List
+
+# Characters lxml refuses to serialize (XML 1.0 Char production)
+_INVALID_XML_CHARS = re.compile(
+    "[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+)
+
+# Characters requiring escaping in attribute values and text content
+_ATTRIBUTE_SPECIAL_CHARS = re.compile('[&<>"\t\n\r]')
+_TEXT_SPECIAL_CHARS = re.compile("[&<>\r]")
+
+_ATTRIBUTE_ESCAPES = {
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "\t": "&#9;",
+    "\n": "&#10;",
+    "\r": "&#13;",
+}
+_TEXT_ESCAPES = {
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    "\r": "&#13;",
+}
+
+COT_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Precompiled templates for the fixed parts of the stock event shape
+_EVENT_HEAD_TEMPLATE = (
+    '<event version="2.0" uid="{uid}" type="{type}" time="{time}" '
+    'start="{start}" stale="{stale}" how="{how}">'
+    '<point lat="{lat:.8f}" lon="{lon:.8f}" hae="{hae:.2f}" ce="{ce:.2f}" le="{le:.2f}"/>'
+    "<detail>"
+    '<takv os="34" version="TrakBridge" device="TrakBridge" platform="TrakBridge"/>'
+)
+_CONTACT_TEMPLATE = '<contact callsign="{callsign}"/>'
+_TEAM_MEMBER_TEMPLATE = (
+    '<contact callsign="{callsign}" endpoint="*:-1:stcp"/>'
+    '<uid Droid="{callsign}"/>'
+    '<precisionlocation altsrc="DTED0" geopointsrc="USER"/>'
+    '<__group role="{role}" name="{color}"/>'
+    '<status battery="{battery}"/>'
+)
+_EVENT_TAIL = "</detail></event>"
+
+# Track defaults for team members without speed/course data
+_TEAM_MEMBER_DEFAULT_SPEED = "0.0"
+_TEAM_MEMBER_DEFAULT_COURSE = "335.92489054527624"
+
+
+def _check_string(value: Any) -> str:
+    """Reject values lxml would refuse, raising the same exception types"""
+    if not isinstance(value, str):
+        raise TypeError(
+            f"Argument must be bytes or unicode, got '{type(value).__name__}'"
+        )
+    if _INVALID_XML_CHARS.search(value):
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, "
+            "no NULL bytes or control characters"
+        )
+    return value
+
+
+def escape_attribute(value: Any) -> str:
+    """
+    Escape a string for use inside a double-quoted XML attribute.
+
+    Args:
+        value: Attribute value (must be a string)
+
+    Returns:
+        Escaped attribute value matching libxml2 serialization
+    """
+    value = _check_string(value)
+    if _ATTRIBUTE_SPECIAL_CHARS.search(value) is None:
+        return value
+    return _ATTRIBUTE_SPECIAL_CHARS.sub(lambda m: _ATTRIBUTE_ESCAPES[m.group()], value)
+
+
+def escape_text(value: Any) -> str:
+    """
+    Escape a string for use as XML element text content.
+
+    Args:
+        value: Text content (must be a string)
+
+    Returns:
+        Escaped text matching libxml2 serialization
+    """
+    value = _check_string(value)
+    if _TEXT_SPECIAL_CHARS.search(value) is None:
+        return value
+    return _TEXT_SPECIAL_CHARS.sub(lambda m: _TEXT_ESCAPES[m.group()], value)
+
+
+def serialize_cot_event(event_data: Dict[str, Any]) -> bytes:
+    """
+    Serialize the stock TrakBridge CoT event shape to XML bytes.
+
+    Accepts the event_data dictionary built by QueuedCOTService._create_pytak_events
+    and produces output identical to QueuedCOTService._generate_cot_xml_lxml for
+    events without custom_cot_attrib.
+
+    Args:
+        event_data: Event dictionary (uid, type, time, start, stale, how, lat, lon,
+            hae, ce, le, callsign and optional team member, track and remarks keys)
+
+    Returns:
+        COT event as XML bytes
+    """
+    callsign = escape_attribute(event_data["callsign"])
+    buffer: List[str] = [
+        _EVENT_HEAD_TEMPLATE.format(
+            uid=escape_attribute(event_data["uid"]),
+            type=escape_attribute(event_data["type"]),
+            time=event_data["time"].strftime(COT_TIME_FORMAT),
+            start=event_data["start"].strftime(COT_TIME_FORMAT),
+            stale=event_data["stale"].strftime(COT_TIME_FORMAT),
+            how=escape_attribute(event_data["how"]),
+            lat=event_data["lat"],
+            lon=event_data["lon"],
+            hae=event_data["hae"],
+            ce=event_data["ce"],
+            le=event_data["le"],
+        )
+    ]
+
+    is_team_member = event_data.get("team_member_enabled", False)
+    if is_team_member:
+        buffer.append(
+            _TEAM_MEMBER_TEMPLATE.format(
+                callsign=callsign,
+                role=escape_attribute(event_data.get("team_role", "")),
+                color=escape_attribute(event_data.get("team_color", "")),
+                battery=escape_attribute(str(event_data.get("battery", 100))),
+            )
+        )
+    else:
+        buffer.append(_CONTACT_TEMPLATE.format(callsign=callsign))
+
+    has_speed = "speed" in event_data
+    has_course = "course" in event_data
+    if has_speed or has_course or is_team_member:
+        buffer.append("<track")
+        if has_speed:
+            buffer.append(f' speed="{event_data["speed"]:.2f}"')
+        elif is_team_member:
+            buffer.append(f' speed="{_TEAM_MEMBER_DEFAULT_SPEED}"')
+        if has_course:
+            buffer.append(f' course="{event_data["course"]:.2f}"')
+        elif is_team_member:
+            buffer.append(f' course="{_TEAM_MEMBER_DEFAULT_COURSE}"')
+        buffer.append("/>")
+
+    if "remarks" in event_data:
+        buffer.append("<remarks>")
+        buffer.append(escape_text(event_data["remarks"]))
+        buffer.append("</remarks>")
+
+    buffer.append(_EVENT_TAIL)
+
+    # lxml serializes to ASCII by default, writing everything else as
+    # decimal character references
+    return "".join(buffer).encode("ascii", "xmlcharrefreplace")
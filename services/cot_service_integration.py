@@ -25,22 +25,34 @@ Created: 2025-09-17
 import asyncio
 import logging
 import os
-import ssl
-import tempfile
+import random
+import time
 import yaml
 import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone, timedelta
+from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 from lxml import etree
+from services.cot_executor import (
+    DEFAULT_EXECUTOR_TYPE,
+    EXECUTOR_TYPES,
+    get_cot_generation_executor,
+)
+from services.cot_serializer import serialize_cot_event
 from services.logging_service import get_module_logger
-from services.queue_manager import get_queue_manager, reset_queue_manager
+from services.queue_manager import (
+    QUEUE_TYPES,
+    LatestByUidQueue,
+    QueuedCotEvent,
+    get_queue_manager,
+    reset_queue_manager,
+)
 from services.queue_monitoring import get_queue_monitoring_service
+from services.retry_buffer import RetryBuffer
+from services.tak_certificate_cache import get_tak_certificate_cache
 from services.device_state_manager import DeviceStateManager
 
-# Cryptography imports for P12 certificate handling
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.serialization import pkcs12
-
 # PyTAK imports
 try:
     import pytak
@@ -52,6 +64,44 @@ except ImportError:
 
 logger = get_module_logger(__name__)
 
+TRANSMISSION_WRITE_MODES = ("per_event", "coalesced")
+
+# Settings read from the parallel_processing section of performance.yaml
+COT_EXECUTOR_SETTINGS = (
+    "executor",
+    "executor_pool_size",
+    "executor_chunk_size",
+    "executor_threshold",
+)
+
+
+class TransmitResult(Enum):
+    """Outcome of a batch transmission; only SENT is truthy"""
+
+    SENT = "sent"
+    WRITE_ERROR = "write_error"  # The connection failed; it must be replaced
+    NOT_SENT = "not_sent"  # Nothing was written, e.g. the circuit is open
+
+    def __bool__(self) -> bool:
+        return self is TransmitResult.SENT
+
+
+@dataclass
+class TransmissionMetrics:
+    """Per-TAK-server transmission counters"""
+
+    batches_transmitted: int = 0
+    batches_failed: int = 0
+    events_transmitted: int = 0
+    bytes_transmitted: int = 0
+    writes: int = 0
+    last_batch_bytes: int = 0
+    last_batch_latency_ms: float = 0.0
+    average_batch_latency_ms: float = 0.0
+    max_batch_latency_ms: float = 0.0
+    reconnects: int = 0
+    connection_failures: int = 0
+
 
 class QueuedCOTService:
     """
@@ -66,6 +116,9 @@ class QueuedCOTService:
     _workers: Dict[int, asyncio.Task] = {}  # Class-level worker tracking
     _connections: Dict[int, Any] = {}  # Class-level connection tracking
 
+    # Longest a transmission worker waits on an empty queue before re-checking it
+    WORKER_IDLE_TIMEOUT_SECONDS = 5.0
+
     def __init__(
         self,
         queue_config: Optional[Dict[str, Any]] = None,
@@ -99,6 +152,16 @@ class QueuedCOTService:
         # Device state managers for queue replacement functionality
         self.device_state_managers: Dict[int, DeviceStateManager] = {}
 
+        # Transmission counters surfaced through get_worker_status
+        self.transmission_metrics: Dict[int, TransmissionMetrics] = {}
+
+        # Failed batches awaiting re-delivery, kept across worker restarts
+        self.retry_buffers: Dict[int, RetryBuffer] = {}
+
+        # Bumped whenever a worker starts, stops or exits so stream workers
+        # only re-check worker status after a change
+        self.worker_generation = 0
+
         # Configuration tracking for change detection
         self.last_config_hash = None
         self.config_change_count = 0
@@ -111,7 +174,12 @@ class QueuedCOTService:
         # Initialize queue management services after performance config is loaded
         # Extract queue configuration from performance config if not provided
         if queue_config is None:
-            queue_config = self.parallel_config.get("queue", {})
+            queue_config = {
+                **self.parallel_config.get("queue", {}),
+                "batch_timeout_ms": self.parallel_config.get("transmission", {}).get(
+                    "batch_timeout_ms", 100
+                ),
+            }
 
         # Log configuration for debugging
         logger.info(f"COT Service initialising with queue config: {queue_config}")
@@ -169,6 +237,11 @@ class QueuedCOTService:
             "fallback_on_error": True,
             "processing_timeout": 30.0,
             "enable_performance_logging": True,
+            # CoT generation executor: "asyncio" (inline), "thread" or "process"
+            "executor": DEFAULT_EXECUTOR_TYPE,
+            "executor_pool_size": 0,  # 0 = CPU count, capped at 4
+            "executor_chunk_size": 500,
+            "executor_threshold": 1000,
             "circuit_breaker": {
                 "enabled": True,
                 "failure_threshold": 3,
@@ -179,11 +252,25 @@ class QueuedCOTService:
                 "max_size": 500,
                 "batch_size": 20,  # Changed from 8 to 20 to match performance.yaml
                 "overflow_strategy": "drop_oldest",
+                "type": "fifo",
                 "flush_on_config_change": True,
             },
             "transmission": {
                 "batch_timeout_ms": 100,
                 "queue_check_interval_ms": 100,
+                "write_mode": "per_event",
+                "max_bytes_per_write": 65536,
+                "reconnect_base_delay_seconds": 1.0,
+                "reconnect_max_delay_seconds": 60.0,
+            },
+            "retry_buffer": {
+                "enabled": True,
+                "max_events": 1000,
+                "base_delay_seconds": 1.0,
+                "max_delay_seconds": 60.0,
+                "max_attempts": 5,
+                "max_age_seconds": 300.0,
+                "spill_dir": "",  # Empty = in-memory only
             },
             "monitoring": {
                 "log_queue_stats": True,
@@ -262,10 +349,20 @@ class QueuedCOTService:
                 os.environ["TRAKBRIDGE_FALLBACK_ON_ERROR"].lower() == "true"
             )
 
+        if "TRAKBRIDGE_COT_EXECUTOR" in os.environ:
+            executor = os.environ["TRAKBRIDGE_COT_EXECUTOR"].lower()
+            if executor in EXECUTOR_TYPES:
+                env_config["executor"] = executor
+            else:
+                logger.warning(f"Invalid TRAKBRIDGE_COT_EXECUTOR: {executor}")
+
         # Numeric environment variables
         for env_var, config_key in [
             ("TRAKBRIDGE_BATCH_SIZE_THRESHOLD", "batch_size_threshold"),
             ("TRAKBRIDGE_MAX_CONCURRENT_TASKS", "max_concurrent_tasks"),
+            ("TRAKBRIDGE_COT_EXECUTOR_POOL_SIZE", "executor_pool_size"),
+            ("TRAKBRIDGE_COT_EXECUTOR_CHUNK_SIZE", "executor_chunk_size"),
+            ("TRAKBRIDGE_COT_EXECUTOR_THRESHOLD", "executor_threshold"),
         ]:
             if env_var in os.environ:
                 try:
@@ -300,6 +397,13 @@ class QueuedCOTService:
             else:
                 logger.warning(f"Invalid QUEUE_OVERFLOW_STRATEGY: {strategy}")
 
+        if "QUEUE_TYPE" in os.environ:
+            queue_type = os.environ["QUEUE_TYPE"]
+            if queue_type in QUEUE_TYPES:
+                queue_config["type"] = queue_type
+            else:
+                logger.warning(f"Invalid QUEUE_TYPE: {queue_type}")
+
         if "QUEUE_FLUSH_ON_CONFIG_CHANGE" in os.environ:
             queue_config["flush_on_config_change"] = (
                 os.environ["QUEUE_FLUSH_ON_CONFIG_CHANGE"].lower() == "true"
@@ -330,9 +434,59 @@ class QueuedCOTService:
                     f"Invalid TRANSMISSION_QUEUE_CHECK_INTERVAL_MS: {os.environ['TRANSMISSION_QUEUE_CHECK_INTERVAL_MS']}"
                 )
 
+        if "TRANSMISSION_WRITE_MODE" in os.environ:
+            write_mode = os.environ["TRANSMISSION_WRITE_MODE"]
+            if write_mode in TRANSMISSION_WRITE_MODES:
+                transmission_config["write_mode"] = write_mode
+            else:
+                logger.warning(f"Invalid TRANSMISSION_WRITE_MODE: {write_mode}")
+
+        if "TRANSMISSION_MAX_BYTES_PER_WRITE" in os.environ:
+            try:
+                transmission_config["max_bytes_per_write"] = int(
+                    os.environ["TRANSMISSION_MAX_BYTES_PER_WRITE"]
+                )
+            except ValueError:
+                logger.warning(
+                    f"Invalid TRANSMISSION_MAX_BYTES_PER_WRITE: {os.environ['TRANSMISSION_MAX_BYTES_PER_WRITE']}"
+                )
+
+        for env_var, config_key in [
+            ("TRANSMISSION_RECONNECT_BASE_DELAY_SECONDS", "reconnect_base_delay_seconds"),
+            ("TRANSMISSION_RECONNECT_MAX_DELAY_SECONDS", "reconnect_max_delay_seconds"),
+        ]:
+            if env_var in os.environ:
+                try:
+                    transmission_config[config_key] = float(os.environ[env_var])
+                except ValueError:
+                    logger.warning(f"Invalid {env_var}: {os.environ[env_var]}")
+
         if transmission_config:
             env_config["transmission"] = transmission_config
 
+        # Retry buffer configuration
+        retry_config = {}
+        if "RETRY_BUFFER_ENABLED" in os.environ:
+            retry_config["enabled"] = (
+                os.environ["RETRY_BUFFER_ENABLED"].lower() == "true"
+            )
+
+        for env_var, config_key in [
+            ("RETRY_BUFFER_MAX_EVENTS", "max_events"),
+            ("RETRY_BUFFER_MAX_ATTEMPTS", "max_attempts"),
+        ]:
+            if env_var in os.environ:
+                try:
+                    retry_config[config_key] = int(os.environ[env_var])
+                except ValueError:
+                    logger.warning(f"Invalid {env_var}: {os.environ[env_var]}")
+
+        if "RETRY_BUFFER_SPILL_DIR" in os.environ:
+            retry_config["spill_dir"] = os.environ["RETRY_BUFFER_SPILL_DIR"]
+
+        if retry_config:
+            env_config["retry_buffer"] = retry_config
+
         # Monitoring configuration
         monitoring_config = {}
         if "MONITORING_LOG_QUEUE_STATS" in os.environ:
@@ -384,6 +538,33 @@ class QueuedCOTService:
                 validated[key] = defaults[key]
                 logger.warning(f"Invalid {key}: {value}, using default {defaults[key]}")
 
+        # Validate CoT generation executor settings
+        executor = config.get("executor", defaults["executor"])
+        if executor in EXECUTOR_TYPES:
+            validated["executor"] = executor
+        else:
+            validated["executor"] = defaults["executor"]
+            logger.warning(
+                f"Invalid executor: {executor}, using default {defaults['executor']}"
+            )
+
+        pool_size = config.get("executor_pool_size", defaults["executor_pool_size"])
+        if isinstance(pool_size, (int, float)) and pool_size >= 0:
+            validated["executor_pool_size"] = int(pool_size)
+        else:
+            validated["executor_pool_size"] = defaults["executor_pool_size"]
+            logger.warning(
+                f"Invalid executor_pool_size: {pool_size}, using default {defaults['executor_pool_size']}"
+            )
+
+        for key in ["executor_chunk_size", "executor_threshold"]:
+            value = config.get(key, defaults[key])
+            if isinstance(value, (int, float)) and value > 0:
+                validated[key] = int(value)
+            else:
+                validated[key] = defaults[key]
+                logger.warning(f"Invalid {key}: {value}, using default {defaults[key]}")
+
         # Validate timeout (allow 0 for no timeout)
         timeout = config.get("processing_timeout", defaults["processing_timeout"])
         if isinstance(timeout, (int, float)) and timeout >= 0:
@@ -459,6 +640,16 @@ class QueuedCOTService:
                     f"Invalid overflow_strategy: {strategy}, using default {defaults['queue']['overflow_strategy']}"
                 )
 
+            # Validate queue type
+            queue_type = queue_config.get("type", defaults["queue"]["type"])
+            if queue_type in QUEUE_TYPES:
+                validated["queue"]["type"] = queue_type
+            else:
+                validated["queue"]["type"] = defaults["queue"]["type"]
+                logger.warning(
+                    f"Invalid queue type: {queue_type}, using default {defaults['queue']['type']}"
+                )
+
             # Validate flush_on_config_change
             flush_on_change = queue_config.get(
                 "flush_on_config_change", defaults["queue"]["flush_on_config_change"]
@@ -482,9 +673,94 @@ class QueuedCOTService:
                     logger.warning(
                         f"Invalid transmission {key}: {value}, using default {defaults['transmission'][key]}"
                     )
+
+            # Validate write_mode
+            write_mode = transmission_config.get(
+                "write_mode", defaults["transmission"]["write_mode"]
+            )
+            if write_mode in TRANSMISSION_WRITE_MODES:
+                validated["transmission"]["write_mode"] = write_mode
+            else:
+                validated["transmission"]["write_mode"] = defaults["transmission"][
+                    "write_mode"
+                ]
+                logger.warning(
+                    f"Invalid transmission write_mode: {write_mode}, using default {defaults['transmission']['write_mode']}"
+                )
+
+            # Validate max_bytes_per_write (must be positive)
+            max_bytes = transmission_config.get(
+                "max_bytes_per_write", defaults["transmission"]["max_bytes_per_write"]
+            )
+            if (
+                isinstance(max_bytes, (int, float))
+                and not isinstance(max_bytes, bool)
+                and max_bytes > 0
+            ):
+                validated["transmission"]["max_bytes_per_write"] = int(max_bytes)
+            else:
+                validated["transmission"]["max_bytes_per_write"] = defaults[
+                    "transmission"
+                ]["max_bytes_per_write"]
+                logger.warning(
+                    f"Invalid transmission max_bytes_per_write: {max_bytes}, using default {defaults['transmission']['max_bytes_per_write']}"
+                )
+
+            # Validate reconnect backoff (must be positive)
+            for key in ["reconnect_base_delay_seconds", "reconnect_max_delay_seconds"]:
+                value = transmission_config.get(key, defaults["transmission"][key])
+                if (
+                    isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                    and value > 0
+                ):
+                    validated["transmission"][key] = float(value)
+                else:
+                    validated["transmission"][key] = defaults["transmission"][key]
+                    logger.warning(
+                        f"Invalid transmission {key}: {value}, using default {defaults['transmission'][key]}"
+                    )
         else:
             validated["transmission"] = defaults["transmission"]
 
+        # Validate retry buffer configuration
+        retry_config = config.get("retry_buffer", defaults["retry_buffer"])
+        retry_defaults = defaults["retry_buffer"]
+        if isinstance(retry_config, dict):
+            validated["retry_buffer"] = {
+                "enabled": bool(
+                    retry_config.get("enabled", retry_defaults["enabled"])
+                )
+            }
+
+            # Validate sizes, delays and limits (must be positive)
+            for key in [
+                "max_events",
+                "max_attempts",
+                "base_delay_seconds",
+                "max_delay_seconds",
+                "max_age_seconds",
+            ]:
+                value = retry_config.get(key, retry_defaults[key])
+                if (
+                    isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                    and value > 0
+                ):
+                    validated["retry_buffer"][key] = type(retry_defaults[key])(value)
+                else:
+                    validated["retry_buffer"][key] = retry_defaults[key]
+                    logger.warning(
+                        f"Invalid retry_buffer {key}: {value}, using default {retry_defaults[key]}"
+                    )
+
+            spill_dir = retry_config.get("spill_dir", retry_defaults["spill_dir"])
+            validated["retry_buffer"]["spill_dir"] = (
+                spill_dir if isinstance(spill_dir, str) else ""
+            )
+        else:
+            validated["retry_buffer"] = retry_defaults
+
         # Validate monitoring configuration
         monitoring_config = config.get("monitoring", defaults["monitoring"])
         if isinstance(monitoring_config, dict):
@@ -540,6 +816,20 @@ class QueuedCOTService:
         # Load from file
         file_config = self.load_performance_config()
 
+        # Only the executor settings are read from the parallel_processing
+        # section; its other keys have never been applied and stay that way
+        # so existing performance.yaml files keep their runtime behaviour
+        parallel_section = file_config.get("parallel_processing")
+        if isinstance(parallel_section, dict):
+            file_config = {
+                **file_config,
+                **{
+                    key: parallel_section[key]
+                    for key in COT_EXECUTOR_SETTINGS
+                    if key in parallel_section
+                },
+            }
+
         # Apply file configuration over defaults with deep merge
         if file_config:
             self.parallel_config = self._deep_merge_config(
@@ -556,6 +846,17 @@ class QueuedCOTService:
         # Validate configuration
         self.parallel_config = self.validate_performance_config(self.parallel_config)
 
+        if isinstance(parallel_section, dict):
+            for key, value in parallel_section.items():
+                if key in COT_EXECUTOR_SETTINGS or key not in self.parallel_config:
+                    continue
+                if self.parallel_config[key] != value:
+                    logger.info(
+                        f"performance.yaml parallel_processing.{key}={value!r} is "
+                        f"not applied (using {self.parallel_config[key]!r}); set "
+                        f"{key} at the top level of the file to change it"
+                    )
+
     # Phase 1: Critical methods for plugins - extracted from EnhancedCOTService
 
     async def create_cot_events(
@@ -564,6 +865,7 @@ class QueuedCOTService:
         cot_type: str = "a-f-G-U-C",
         stale_time: int = 300,
         cot_type_mode: str = "stream",
+        stream_id: Optional[int] = None,
     ) -> List[bytes]:
         """
         Create COT events from location data with parallel processing support
@@ -573,10 +875,31 @@ class QueuedCOTService:
             cot_type: COT type identifier (used when cot_type_mode is "stream")
             stale_time: Time in seconds before event becomes stale
             cot_type_mode: "stream" or "per_point" to determine COT type source
+            stream_id: Originating stream, recorded on each queued event
 
         Returns:
-            List of COT events as XML bytes
+            List of COT events as XML bytes (QueuedCotEvent instances carrying
+            uid, event time and stream id)
         """
+        events = await self._create_cot_events_for_mode(
+            locations, cot_type, stale_time, cot_type_mode
+        )
+
+        if stream_id is not None:
+            for event in events:
+                if isinstance(event, QueuedCotEvent):
+                    event.stream_id = stream_id
+
+        return events
+
+    async def _create_cot_events_for_mode(
+        self,
+        locations: List[Dict[str, Any]],
+        cot_type: str,
+        stale_time: int,
+        cot_type_mode: str,
+    ) -> List[bytes]:
+        """Select serial, parallel or fallback generation for a set of locations"""
         logger.debug(
             f"create_cot_events called with: cot_type_mode='{cot_type_mode}', cot_type='{cot_type}', locations={len(locations)}"
         )
@@ -674,6 +997,23 @@ class QueuedCOTService:
         cot_type_mode: str = "stream",
     ) -> List[bytes]:
         """Create COT events using PyTAK's XML generation"""
+        return QueuedCOTService._build_pytak_events(
+            locations, cot_type, stale_time, cot_type_mode
+        )
+
+    @staticmethod
+    def _build_pytak_events(
+        locations: List[Dict[str, Any]],
+        cot_type: str,
+        stale_time: int,
+        cot_type_mode: str = "stream",
+    ) -> List[bytes]:
+        """
+        Synchronously build COT events from location data.
+
+        Pure CPU work with no event loop dependency, so it can run inline or
+        on a CoT generation executor worker.
+        """
         events = []
 
         for location in locations:
@@ -814,9 +1154,16 @@ class QueuedCOTService:
                 if "custom_cot_attrib" in cleaned_location:
                     event_data["custom_cot_attrib"] = cleaned_location["custom_cot_attrib"]
 
-                # Generate complete COT XML using old logic
+                # Generate complete COT XML, keeping the UID and event time
+                # alongside the bytes so queue replacement never re-parses it
                 event_xml = QueuedCOTService._generate_cot_xml(event_data)
-                events.append(event_xml)
+                events.append(
+                    QueuedCotEvent(
+                        event_xml,
+                        uid=uid_value,
+                        event_time=QueuedCOTService._cot_event_time(event_time),
+                    )
+                )
 
             except Exception as e:
                 logger.error(f"Failed to create COT event for location {location}: {e}")
@@ -849,6 +1196,15 @@ class QueuedCOTService:
             processing_timeout = self.parallel_config.get("processing_timeout", 30.0)
             fallback_on_error = self.parallel_config.get("fallback_on_error", True)
 
+            # Large polls are generated on the executor pool so the event loop
+            # stays free for other streams
+            executor_type = self.parallel_config.get("executor", DEFAULT_EXECUTOR_TYPE)
+            executor_threshold = self.parallel_config.get("executor_threshold", 1000)
+            if executor_type != "asyncio" and len(locations) >= executor_threshold:
+                return await self._create_executor_pytak_events(
+                    locations, cot_type, stale_time, cot_type_mode
+                )
+
             logger.debug(
                 f"Parallel processing: {len(locations)} locations with "
                 f"max_concurrent_tasks={max_concurrent_tasks}, "
@@ -972,6 +1328,49 @@ class QueuedCOTService:
             else:
                 raise
 
+    async def _create_executor_pytak_events(
+        self,
+        locations: List[Dict[str, Any]],
+        cot_type: str,
+        stale_time: int,
+        cot_type_mode: str = "stream",
+    ) -> List[bytes]:
+        """
+        Create COT events on the CoT generation thread/process pool.
+
+        Chunks of plain location dictionaries are generated off the event loop;
+        failures and timeouts propagate to the caller's fallback handling.
+        """
+        executor_type = self.parallel_config.get("executor", DEFAULT_EXECUTOR_TYPE)
+        chunk_size = self.parallel_config.get("executor_chunk_size", 500)
+        pool_size = self.parallel_config.get("executor_pool_size", 0)
+        processing_timeout = self.parallel_config.get("processing_timeout", 30.0)
+
+        logger.debug(
+            f"Executor processing: {len(locations)} locations on {executor_type} pool "
+            f"(pool_size={pool_size}, chunk_size={chunk_size})"
+        )
+
+        generation = get_cot_generation_executor().generate(
+            locations,
+            cot_type,
+            stale_time,
+            cot_type_mode,
+            executor_type,
+            pool_size,
+            chunk_size,
+        )
+        if processing_timeout > 0:
+            events = await asyncio.wait_for(generation, timeout=processing_timeout)
+        else:
+            events = await generation
+
+        logger.debug(
+            f"Executor processing completed: {len(events)} total events created"
+        )
+        self._record_circuit_breaker_success()
+        return events
+
     async def _send_with_pytak(self, events: List[bytes], tak_server) -> bool:
         """Send events using PyTAK"""
         try:
@@ -1036,6 +1435,8 @@ class QueuedCOTService:
                 self._enhanced_transmission_worker(tak_server_id, tak_server)
             )
             self.workers[tak_server_id] = worker_task
+            self.worker_generation += 1
+            worker_task.add_done_callback(self._on_worker_done)
             logger.debug(
                 f"Worker-to-server mapping updated: TAK_server_{tak_server_id} -> worker_{id(worker_task)}"
             )
@@ -1059,6 +1460,10 @@ class QueuedCOTService:
             )
             return False
 
+    def _on_worker_done(self, task: asyncio.Task):
+        """Record a worker exit so stream workers re-check their routes"""
+        self.worker_generation += 1
+
     async def _enhanced_transmission_worker(self, tak_server_id: int, tak_server):
         """
         Enhanced transmission worker using queue manager for batch processing.
@@ -1075,69 +1480,93 @@ class QueuedCOTService:
                 f"Worker thread started: server_id={tak_server_id}, server_name={tak_server.name}, timestamp={datetime.now()}"
             )
 
-            # Create PyTAK connection (reusing existing logic)
-            connection = await self._create_pytak_connection(tak_server)
+            # Create PyTAK connection, retrying with backoff until it succeeds
+            connection = await self._connect_with_backoff(tak_server_id, tak_server)
             if not connection:
-                logger.error(
-                    f"Failed to create connection for TAK server {tak_server.name}"
-                )
                 return
 
-            self.connections[tak_server_id] = connection
-            logger.debug(
-                f"Connection mapping established: TAK_server_{tak_server_id} -> connection_{id(connection)}"
-            )
-
             # Main transmission loop
             batch_count = 0
+            retry_buffer = self._get_retry_buffer(tak_server_id)
+            batch_size = self.queue_manager.config.get("batch_size", 8)
             while self._running:
                 try:
-                    # Get batch of events from queue manager
-                    batch = await self.queue_manager.get_batch(tak_server_id)
-
-                    if not batch:
-                        # No events to process, longer sleep to reduce CPU usage
-                        # Use the configured queue_check_interval from performance.yaml
-                        check_interval_ms = self.parallel_config.get(
-                            "transmission", {}
-                        ).get("queue_check_interval_ms", 1000)
-                        await asyncio.sleep(check_interval_ms / 1000.0)
-                        # Log periodic status every 10 iterations with no events (reduced frequency)
+                    # Wait for the next batch; the queue wakes the worker as soon
+                    # as an event is enqueued, so an idle worker costs nothing.
+                    # The idle timeout only bounds how long a worker can sit on
+                    # a queue that was replaced or removed, and is shortened
+                    # when buffered retries become due sooner.
+                    wait_timeout = self.WORKER_IDLE_TIMEOUT_SECONDS
+                    if retry_buffer is not None:
+                        retry_due_in = retry_buffer.seconds_until_due()
+                        if retry_due_in is not None:
+                            wait_timeout = min(wait_timeout, retry_due_in)
+
+                    batch = await self.queue_manager.get_batch(
+                        tak_server_id, wait_timeout=wait_timeout
+                    )
+
+                    retries = []
+                    if retry_buffer is not None and len(retry_buffer):
+                        # Newer positions in this batch replace buffered ones
+                        retry_buffer.discard_superseded(batch)
+                        retries = retry_buffer.pop_due(batch_size)
+
+                    if not batch and not retries:
+                        # Back off when the queue is missing or was shut down
+                        if tak_server_id not in self.queue_manager.queues:
+                            check_interval_ms = self.parallel_config.get(
+                                "transmission", {}
+                            ).get("queue_check_interval_ms", 1000)
+                            await asyncio.sleep(check_interval_ms / 1000.0)
                         batch_count += 1
                         if batch_count % 10 == 0:
-                            queue_size = (
-                                self.queue_manager.get_queue_status(tak_server_id).get(
-                                    "size", 0
-                                )
-                                if self.queue_manager.get_queue_status(tak_server_id)
-                                else 0
-                            )
                             logger.debug(
-                                f"Worker {tak_server_id} idle: checked {batch_count} times, queue_size={queue_size}"
+                                f"Worker {tak_server_id} idle: {batch_count} empty waits"
                             )
                         continue  # Skip transmission when no events
 
                     # We have events to process
                     batch_count = 0  # Reset counter when we have events
+                    outgoing = [entry.event for entry in retries] + batch
                     logger.debug(
-                        f"Worker {tak_server_id} processing batch of {len(batch)} events"
+                        f"Worker {tak_server_id} processing batch of {len(outgoing)} events "
+                        f"({len(retries)} retried)"
                     )
 
                     # Transmit batch
-                    success = await self._transmit_batch(batch, connection, tak_server)
+                    result = await self._transmit_batch(
+                        outgoing, connection, tak_server
+                    )
 
-                    if success:
-                        if len(batch) > 0:  # Only log when actually transmitted events
-                            logger.debug(
-                                f"Successfully transmitted {len(batch)} events to {tak_server.name}"
+                    if result:
+                        logger.debug(
+                            f"Successfully transmitted {len(outgoing)} events to {tak_server.name}"
+                        )
+                        if retries:
+                            retry_buffer.discard_superseded(
+                                [entry.event for entry in retries]
                             )
                     else:
                         logger.warning(
-                            f"Failed to transmit batch of {len(batch)} events to {tak_server.name}"
+                            f"Failed to transmit batch of {len(outgoing)} events to {tak_server.name}"
                         )
 
-                        # On failure, could implement retry logic here
-                        # For now, events are lost (already dequeued)
+                        # Events were already dequeued; keep them for a retry
+                        if retry_buffer is not None:
+                            retry_buffer.requeue(retries)
+                            retry_buffer.add(batch)
+
+                        # A failed write leaves the stream in an unknown state;
+                        # replace the connection without restarting the worker.
+                        # Batches that never reached the socket (open circuit)
+                        # keep the connection.
+                        if result is TransmitResult.WRITE_ERROR:
+                            connection = await self._reconnect(
+                                tak_server_id, tak_server, connection
+                            )
+                            if not connection:
+                                break
 
                 except asyncio.CancelledError:
                     break
@@ -1171,6 +1600,113 @@ class QueuedCOTService:
                     f"Connection mapping removed: TAK_server_{tak_server_id} connection deleted"
                 )
 
+    async def _connect_with_backoff(self, tak_server_id: int, tak_server):
+        """
+        Connect to a TAK server, retrying with exponential backoff and jitter.
+
+        Connection attempts go through the server's circuit breaker; while the
+        breaker is open the worker waits for its recovery timeout instead of
+        retrying sooner.
+
+        Args:
+            tak_server_id: TAK server identifier
+            tak_server: TAK server configuration object
+
+        Returns:
+            Connection, or None if the service stopped before one was made
+        """
+        transmission_config = self.parallel_config.get("transmission", {})
+        base_delay = transmission_config.get("reconnect_base_delay_seconds", 1.0)
+        max_delay = transmission_config.get("reconnect_max_delay_seconds", 60.0)
+
+        attempt = 0
+        while self._running:
+            connection = await self._create_pytak_connection(tak_server)
+            if connection:
+                self.connections[tak_server_id] = connection
+                logger.debug(
+                    f"Connection mapping established: TAK_server_{tak_server_id} -> connection_{id(connection)}"
+                )
+                return connection
+
+            attempt += 1
+            self.transmission_metrics.setdefault(
+                tak_server_id, TransmissionMetrics()
+            ).connection_failures += 1
+            delay = self._reconnect_delay(
+                attempt,
+                base_delay,
+                max_delay,
+                self._get_tak_circuit_breaker(tak_server_id),
+            )
+            logger.warning(
+                f"Failed to create connection for TAK server {tak_server.name} "
+                f"(attempt {attempt}), retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        return None
+
+    async def _reconnect(self, tak_server_id: int, tak_server, connection):
+        """Close a failed connection and connect again with backoff"""
+        logger.info(f"Reconnecting to TAK server {tak_server.name}")
+        self.transmission_metrics.setdefault(
+            tak_server_id, TransmissionMetrics()
+        ).reconnects += 1
+
+        self.connections.pop(tak_server_id, None)
+        try:
+            await self._cleanup_connection(connection)
+        except Exception as e:
+            logger.debug(f"Error closing failed connection for {tak_server.name}: {e}")
+
+        return await self._connect_with_backoff(tak_server_id, tak_server)
+
+    @staticmethod
+    def _reconnect_delay(
+        attempt: int, base_delay: float, max_delay: float, circuit_breaker=None
+    ) -> float:
+        """
+        Delay before the next connection attempt.
+
+        Exponential backoff capped at max_delay, with jitter spreading retries
+        over the upper half of the window so workers feeding the same server
+        do not reconnect in lockstep. An open circuit breaker extends the
+        delay to its recovery time.
+        """
+        delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(delay / 2, delay)
+
+        if circuit_breaker is not None and circuit_breaker.last_failure_time:
+            from services.circuit_breaker import CircuitBreakerState
+
+            if circuit_breaker.state == CircuitBreakerState.OPEN:
+                recovery_at = circuit_breaker.last_failure_time + timedelta(
+                    seconds=circuit_breaker.config.recovery_timeout
+                )
+                remaining = (recovery_at - datetime.now(timezone.utc)).total_seconds()
+                delay = max(delay, remaining)
+
+        return delay
+
+    def _get_retry_buffer(self, tak_server_id: int) -> Optional[RetryBuffer]:
+        """Get or create the retry buffer for a TAK server (None when disabled)"""
+        retry_config = self.parallel_config.get("retry_buffer", {})
+        if not retry_config.get("enabled", True):
+            return None
+
+        if tak_server_id not in self.retry_buffers:
+            self.retry_buffers[tak_server_id] = RetryBuffer(
+                tak_server_id,
+                max_events=retry_config.get("max_events", 1000),
+                base_delay_seconds=retry_config.get("base_delay_seconds", 1.0),
+                max_delay_seconds=retry_config.get("max_delay_seconds", 60.0),
+                max_attempts=retry_config.get("max_attempts", 5),
+                max_age_seconds=retry_config.get("max_age_seconds", 300.0),
+                spill_dir=retry_config.get("spill_dir") or None,
+            )
+        return self.retry_buffers[tak_server_id]
+
     def _get_tak_circuit_breaker(self, tak_server_id: int):
         """Get or create circuit breaker for TAK server connection"""
         try:
@@ -1350,11 +1886,9 @@ class QueuedCOTService:
             # Handle P12 certificate if available
             if tak_server.cert_p12 and len(tak_server.cert_p12) > 0:
                 try:
-                    cert_pem, key_pem = QueuedCOTService._extract_p12_certificate(
-                        tak_server.cert_p12, tak_server.get_cert_password()
-                    )
-                    cert_path, key_path = QueuedCOTService._create_temp_cert_files(
-                        cert_pem, key_pem
+                    # Decoded once per certificate and shared across reconnects
+                    cert_path, key_path = get_tak_certificate_cache().get_cert_files(
+                        tak_server
                     )
                     config.set("pytak", "PYTAK_TLS_CLIENT_CERT", cert_path)
                     config.set("pytak", "PYTAK_TLS_CLIENT_KEY", key_path)
@@ -1366,7 +1900,9 @@ class QueuedCOTService:
         )
         return config["pytak"]
 
-    async def _transmit_batch(self, batch: List[bytes], connection, tak_server) -> bool:
+    async def _transmit_batch(
+        self, batch: List[bytes], connection, tak_server
+    ) -> TransmitResult:
         """
         Transmit a batch of events to the TAK server with circuit breaker protection.
 
@@ -1376,15 +1912,22 @@ class QueuedCOTService:
             tak_server: TAK server configuration
 
         Returns:
-            True if transmission successful
+            TransmitResult.SENT if transmission successful, WRITE_ERROR if
+            writing to the connection failed, NOT_SENT otherwise
         """
         if not batch:
-            return True
+            return TransmitResult.SENT
 
         # Get circuit breaker for this TAK server
         circuit_breaker = self._get_tak_circuit_breaker(tak_server.id)
+        transmission_config = self.parallel_config.get("transmission", {})
+        coalesce = transmission_config.get("write_mode", "per_event") == "coalesced"
+        max_bytes_per_write = transmission_config.get("max_bytes_per_write", 65536)
+        writes = 0
 
         async def _do_transmission():
+            nonlocal writes
+
             # Handle the case where connection might be a tuple (reader, writer)
             if isinstance(connection, tuple) and len(connection) == 2:
                 reader, writer = connection
@@ -1394,6 +1937,26 @@ class QueuedCOTService:
                 writer = None
                 use_writer = False
 
+            # Coalesced mode: a few large writes and a single drain per batch
+            if coalesce and use_writer and writer:
+                try:
+                    for buffer in self._coalesce_batch(batch, max_bytes_per_write):
+                        writer.write(buffer)
+                        writes += 1
+                    await writer.drain()
+                except Exception as e:
+                    logger.error(
+                        f"Error transmitting coalesced batch of {len(batch)} events "
+                        f"to TAK server '{tak_server.name}': {e}"
+                    )
+                    return TransmitResult.WRITE_ERROR
+
+                logger.debug(
+                    f"Successfully transmitted batch of {len(batch)} events in {writes} "
+                    f"writes to TAK server '{tak_server.name}'"
+                )
+                return TransmitResult.SENT
+
             # Transmit all events in the batch
             batch_success = True
             for i, event in enumerate(batch):
@@ -1402,10 +1965,12 @@ class QueuedCOTService:
                     if use_writer and writer:
                         # Use writer for TCP connections
                         writer.write(event)
+                        writes += 1
                         await writer.drain()
                     elif hasattr(reader, "send"):
                         # Use reader.send for other connection types
                         await reader.send(event)
+                        writes += 1
                     else:
                         logger.error(
                             f"No suitable send method found for TAK server '{tak_server.name}'. "
@@ -1428,18 +1993,21 @@ class QueuedCOTService:
                     f"Some events in batch failed transmission to TAK server '{tak_server.name}'"
                 )
 
-            return batch_success
+            return TransmitResult.SENT if batch_success else TransmitResult.WRITE_ERROR
 
+        started = time.perf_counter()
+        result = TransmitResult.NOT_SENT
         try:
             if circuit_breaker:
                 # Use circuit breaker to protect transmission
-                return await circuit_breaker.call(_do_transmission)
+                result = await circuit_breaker.call(_do_transmission)
             else:
                 # Fallback to direct transmission if circuit breaker not available
                 logger.debug(
                     f"Circuit breaker not available for TAK server {tak_server.id}, using direct transmission"
                 )
-                return await _do_transmission()
+                result = await _do_transmission()
+            return result
 
         except Exception as e:
             from services.circuit_breaker import CircuitOpenError
@@ -1448,10 +2016,78 @@ class QueuedCOTService:
                 logger.warning(
                     f"Circuit breaker is OPEN for TAK server {tak_server.name}: {e}"
                 )
-                return False
+                return TransmitResult.NOT_SENT
             else:
                 logger.error(f"Failed to transmit batch to {tak_server.name}: {e}")
-                return False
+                # A write that timed out leaves the stream unusable as well
+                if isinstance(e, (asyncio.TimeoutError, OSError)):
+                    result = TransmitResult.WRITE_ERROR
+                return result
+        finally:
+            self._record_transmission(
+                tak_server.id,
+                batch,
+                writes,
+                (time.perf_counter() - started) * 1000.0,
+                bool(result),
+            )
+
+    @staticmethod
+    def _coalesce_batch(batch: List[bytes], max_bytes_per_write: int) -> List[bytes]:
+        """
+        Concatenate a batch of events into as few buffers as possible.
+
+        Events are never split; an event larger than max_bytes_per_write is
+        written on its own.
+
+        Args:
+            batch: List of COT event bytes
+            max_bytes_per_write: Upper bound for a single buffer
+
+        Returns:
+            List of buffers to write in order
+        """
+        buffers = []
+        pending = []
+        pending_bytes = 0
+        for event in batch:
+            if pending and pending_bytes + len(event) > max_bytes_per_write:
+                buffers.append(b"".join(pending))
+                pending = []
+                pending_bytes = 0
+            pending.append(event)
+            pending_bytes += len(event)
+        if pending:
+            buffers.append(b"".join(pending))
+        return buffers
+
+    def _record_transmission(
+        self,
+        tak_server_id: int,
+        batch: List[bytes],
+        writes: int,
+        latency_ms: float,
+        success: bool,
+    ):
+        """Update transmission counters for a TAK server after a batch"""
+        metrics = self.transmission_metrics.setdefault(
+            tak_server_id, TransmissionMetrics()
+        )
+        if not success:
+            metrics.batches_failed += 1
+            return
+
+        batch_bytes = sum(len(event) for event in batch)
+        metrics.batches_transmitted += 1
+        metrics.events_transmitted += len(batch)
+        metrics.bytes_transmitted += batch_bytes
+        metrics.writes += writes
+        metrics.last_batch_bytes = batch_bytes
+        metrics.last_batch_latency_ms = latency_ms
+        metrics.max_batch_latency_ms = max(metrics.max_batch_latency_ms, latency_ms)
+        metrics.average_batch_latency_ms += (
+            latency_ms - metrics.average_batch_latency_ms
+        ) / metrics.batches_transmitted
 
     async def _cleanup_connection(self, connection):
         """Cleanup PyTAK connection"""
@@ -1503,69 +2139,138 @@ class QueuedCOTService:
             True if successfully processed
         """
         try:
-            # Get device state manager
-            device_manager = self.device_state_managers.get(tak_server_id)
-            if not device_manager:
-                logger.debug(f"No device state manager for TAK server {tak_server_id}")
-                device_manager = None
-
-            # Process each event and build processing plan
-            processed_events = 0
-            removed_events = 0
-            uids_to_remove = []
-            events_to_enqueue = []
+            identities = [self.get_event_identity(event) for event in events]
+            await self._enqueue_replacing(tak_server_id, events, identities)
+            return True
 
-            for event in events:
-                # Extract UID and timestamp from event
-                uid = self.extract_uid_from_cot_event(event)
-                timestamp = self.extract_timestamp_from_cot_event(event)
-
-                if not uid:
-                    logger.warning("Event without UID, skipping replacement logic")
-                    events_to_enqueue.append(event)
-                    processed_events += 1
-                    continue
+        except Exception as e:
+            logger.error(
+                f"Failed to enqueue events with replacement for TAK server {tak_server_id}: {e}"
+            )
+            return False
 
-                # Check if we should update this device
-                should_update = True
-                if device_manager and hasattr(device_manager, "should_update_device"):
-                    should_update = device_manager.should_update_device(uid, timestamp)
+    async def enqueue_fanout(
+        self,
+        events: List[bytes],
+        tak_server_ids: List[int],
+        replace: bool = True,
+    ) -> Dict[int, Optional[int]]:
+        """
+        Enqueue one prepared batch to several TAK server queues concurrently.
 
-                if should_update:
-                    # Always mark for removal if we're updating (removes any stale events)
-                    uids_to_remove.append(uid)
-                    events_to_enqueue.append(event)
-                    processed_events += 1
-                else:
-                    # Skip older events
-                    logger.debug(f"Skipping older event for device {uid}")
-                    continue
+        Event identities are resolved once for the whole batch and the same
+        immutable event objects are shared by every queue. Each server is
+        enqueued in its own task, so a full or failing queue on one server
+        does not delay or affect the others.
 
-            # Remove old events for devices that will be updated
-            if uids_to_remove:
-                removed_count = await self.remove_events_by_uid(
-                    tak_server_id, uids_to_remove
-                )
-                removed_events += removed_count
+        Args:
+            events: List of COT events (normally QueuedCotEvent records)
+            tak_server_ids: TAK server identifiers to enqueue to
+            replace: Apply replacement logic for same devices
 
-            # Add new events
-            for event in events_to_enqueue:
-                await self.queue_manager.enqueue_event(tak_server_id, event)
+        Returns:
+            Dictionary of TAK server id to number of events enqueued, or None
+            if enqueueing to that server failed
+        """
+        identities = (
+            [self.get_event_identity(event) for event in events] if replace else None
+        )
 
-            # Log replacement statistics
-            if processed_events > 0 or removed_events > 0:
-                logger.debug(
-                    f"Enqueue with replacement statistics: "
-                    f"{processed_events} events processed, {removed_events} old events removed"
+        async def enqueue_to_server(tak_server_id: int) -> Optional[int]:
+            try:
+                await self.queue_manager.create_queue(tak_server_id)
+                if replace:
+                    return await self._enqueue_replacing(
+                        tak_server_id, events, identities
+                    )
+                enqueued = 0
+                for event in events:
+                    if await self.queue_manager.enqueue_event(tak_server_id, event):
+                        enqueued += 1
+                return enqueued
+            except Exception as e:
+                logger.error(
+                    f"Failed to fan out {len(events)} events to TAK server {tak_server_id}: {e}"
                 )
+                return None
 
-            return True
+        counts = await asyncio.gather(
+            *(enqueue_to_server(tak_server_id) for tak_server_id in tak_server_ids)
+        )
+        return dict(zip(tak_server_ids, counts))
 
-        except Exception as e:
-            logger.error(
-                f"Failed to enqueue events with replacement for TAK server {tak_server_id}: {e}"
+    async def _enqueue_replacing(
+        self,
+        tak_server_id: int,
+        events: List[bytes],
+        identities: List[Tuple[Optional[str], Optional[datetime]]],
+    ) -> int:
+        """
+        Enqueue events to one TAK server, replacing queued events for the same devices.
+
+        Args:
+            tak_server_id: TAK server identifier
+            events: List of COT events
+            identities: (uid, timestamp) for each event, in the same order
+
+        Returns:
+            Number of events successfully enqueued
+        """
+        # Get device state manager
+        device_manager = self.device_state_managers.get(tak_server_id)
+        if not device_manager:
+            logger.debug(f"No device state manager for TAK server {tak_server_id}")
+            device_manager = None
+
+        # Process each event and build processing plan
+        processed_events = 0
+        removed_events = 0
+        uids_to_remove = []
+        events_to_enqueue = []
+
+        for event, (uid, timestamp) in zip(events, identities):
+            if not uid:
+                logger.warning("Event without UID, skipping replacement logic")
+                events_to_enqueue.append(event)
+                processed_events += 1
+                continue
+
+            # Check if we should update this device
+            should_update = True
+            if device_manager and hasattr(device_manager, "should_update_device"):
+                should_update = device_manager.should_update_device(uid, timestamp)
+
+            if should_update:
+                # Always mark for removal if we're updating (removes any stale events)
+                uids_to_remove.append(uid)
+                events_to_enqueue.append(event)
+                processed_events += 1
+            else:
+                # Skip older events
+                logger.debug(f"Skipping older event for device {uid}")
+                continue
+
+        # Remove old events for devices that will be updated
+        if uids_to_remove:
+            removed_count = await self.remove_events_by_uid(
+                tak_server_id, uids_to_remove
             )
-            return False
+            removed_events += removed_count
+
+        # Add new events
+        enqueued_events = 0
+        for event in events_to_enqueue:
+            if await self.queue_manager.enqueue_event(tak_server_id, event):
+                enqueued_events += 1
+
+        # Log replacement statistics
+        if processed_events > 0 or removed_events > 0:
+            logger.debug(
+                f"Enqueue with replacement statistics: "
+                f"{processed_events} events processed, {removed_events} old events removed"
+            )
+
+        return enqueued_events
 
     async def flush_queue(self, tak_server_id: int) -> int:
         """
@@ -1658,6 +2363,14 @@ class QueuedCOTService:
         if queue_status:
             status["queue_size"] = queue_status.get("size", 0)
 
+        metrics = self.transmission_metrics.get(tak_server_id)
+        if metrics:
+            status["transmission"] = asdict(metrics)
+
+        retry_buffer = self.retry_buffers.get(tak_server_id)
+        if retry_buffer is not None:
+            status["retry_buffer"] = retry_buffer.get_status()
+
         if worker_exists:
             task = self.workers[tak_server_id]
             status["worker_done"] = task.done()
@@ -1832,6 +2545,28 @@ class QueuedCOTService:
             f"Comprehensive cleanup completed - final worker mappings: {[(k, id(v)) for k, v in self.workers.items()]}"
         )
 
+    def get_event_identity(
+        self, event: bytes
+    ) -> Tuple[Optional[str], Optional[datetime]]:
+        """
+        Get the UID and timestamp of a COT event for replacement decisions.
+
+        Uses the metadata recorded on QueuedCotEvent instances and only parses
+        the XML for raw bytes from other producers.
+
+        Args:
+            event: COT event as XML bytes
+
+        Returns:
+            Tuple of (uid, timestamp), either of which may be None
+        """
+        if isinstance(event, QueuedCotEvent) and event.uid:
+            return event.uid, event.event_time
+        return (
+            self.extract_uid_from_cot_event(event),
+            self.extract_timestamp_from_cot_event(event),
+        )
+
     def extract_uid_from_cot_event(self, event: bytes) -> Optional[str]:
         """
         Extract UID from COT event XML.
@@ -1966,14 +2701,27 @@ class QueuedCOTService:
 
         try:
             queue = self.queues[tak_server_id]
+
+            # UID-indexed queues remove pending events directly
+            if isinstance(queue, LatestByUidQueue):
+                removed_count = queue.remove_uids(set(uids_to_remove))
+                logger.debug(
+                    f"Removed {removed_count} events from queue {tak_server_id}"
+                )
+                return removed_count
+
             removed_count = 0
             events_to_keep = []
+            uids_to_remove = set(uids_to_remove)
 
             # Drain the queue and check each event
             while not queue.empty():
                 try:
                     event = queue.get_nowait()
-                    uid = self.extract_uid_from_cot_event(event)
+                    if isinstance(event, QueuedCotEvent) and event.uid:
+                        uid = event.uid
+                    else:
+                        uid = self.extract_uid_from_cot_event(event)
                     if uid not in uids_to_remove:
                         events_to_keep.append(event)
                     else:
@@ -2013,6 +2761,9 @@ class QueuedCOTService:
             # Stop monitoring
             await self.stop_monitoring()
 
+            # Release CoT generation pool workers
+            get_cot_generation_executor().shutdown()
+
             logger.info("Enhanced COT service shutdown complete")
 
         except Exception as e:
@@ -2121,6 +2872,16 @@ class QueuedCOTService:
             )
 
     # Static utility methods moved from EnhancedCOTService
+    @staticmethod
+    def _cot_event_time(event_time: datetime) -> datetime:
+        """
+        Normalize a generation time to the value written to the CoT time attribute.
+
+        Events are written as UTC with second precision regardless of tzinfo,
+        so this matches what extract_timestamp_from_cot_event would return.
+        """
+        return event_time.replace(microsecond=0, tzinfo=timezone.utc)
+
     @staticmethod
     def _safe_float_convert(value: Any, default: float = 0.0) -> float:
         """Safely convert a value to float, handling various input types"""
@@ -2145,7 +2906,24 @@ class QueuedCOTService:
 
     @staticmethod
     def _generate_cot_xml(event_data: Dict[str, Any]) -> bytes:
-        """Generate COT XML using proper detailed format"""
+        """
+        Generate COT XML using proper detailed format.
+
+        The stock event shape is written directly from precompiled templates;
+        events carrying plugin-defined custom_cot_attrib are built with lxml.
+        """
+        if "custom_cot_attrib" in event_data:
+            return QueuedCOTService._generate_cot_xml_lxml(event_data)
+
+        try:
+            return serialize_cot_event(event_data)
+        except Exception as e:
+            logger.error(f"Error generating COT XML: {e}")
+            raise
+
+    @staticmethod
+    def _generate_cot_xml_lxml(event_data: Dict[str, Any]) -> bytes:
+        """Generate COT XML by building an lxml element tree"""
         try:
             # Always use manual formatting to avoid PyTAK time conversion issues
             # PyTAK's cot_time() function may have issues with datetime objects
@@ -2532,7 +3310,13 @@ class QueuedCOTService:
                     remarks.text = str(location["description"])
 
                 cot_events.append(
-                    etree.tostring(cot_event, pretty_print=False, xml_declaration=False)
+                    QueuedCotEvent(
+                        etree.tostring(
+                            cot_event, pretty_print=False, xml_declaration=False
+                        ),
+                        uid=uid,
+                        event_time=QueuedCOTService._cot_event_time(event_time),
+                    )
                 )
 
             except Exception as e:
@@ -2557,33 +3341,20 @@ class QueuedCOTService:
 
         reader = None
         writer = None
-        cert_path = None
-        key_path = None
 
         try:
             ssl_context = None
             if tak_server.protocol.lower() in ["tls", "ssl"]:
-                ssl_context = QueuedCOTService._create_ssl_context(tak_server)
-
-                if tak_server.cert_p12 and len(tak_server.cert_p12) > 0:
-                    try:
-                        cert_pem, key_pem = QueuedCOTService._extract_p12_certificate(
-                            tak_server.cert_p12, tak_server.get_cert_password()
-                        )
-                        cert_path, key_path = QueuedCOTService._create_temp_cert_files(
-                            cert_pem, key_pem
-                        )
-                        ssl_context.load_cert_chain(
-                            certfile=cert_path, keyfile=key_path
-                        )
-                        logger.debug(
-                            f"Loaded client certificate for TAK server '{tak_server.name}'"
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to load P12 certificate for TAK server '{tak_server.name}': {e}"
-                        )
-                        raise
+                try:
+                    # Cached per server, with the client certificate loaded
+                    ssl_context = get_tak_certificate_cache().get_ssl_context(
+                        tak_server
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to load P12 certificate for TAK server '{tak_server.name}': {e}"
+                    )
+                    raise
 
             logger.info(
                 f"Connecting to {tak_server.host}:{tak_server.port} "
@@ -2628,86 +3399,6 @@ class QueuedCOTService:
                 except Exception as e:
                     logger.warning(f"Error closing writer: {e}")
 
-            # Clean up temporary certificate files
-            if cert_path:
-                QueuedCOTService._cleanup_temp_files(cert_path)
-            if key_path:
-                QueuedCOTService._cleanup_temp_files(key_path)
-
-    @staticmethod
-    def _create_ssl_context(tak_server):
-        """Create SSL context for TAK server connection"""
-        ssl_context = ssl.create_default_context()
-
-        # Configure certificate verification based on server settings
-        if not tak_server.verify_ssl:
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            logger.warning(
-                f"SSL certificate verification disabled for TAK server '{tak_server.name}'"
-            )
-
-        return ssl_context
-
-    @staticmethod
-    def _extract_p12_certificate(
-        p12_data: bytes, password: Optional[str] = None
-    ) -> Tuple[bytes, bytes]:
-        """Extract certificate and key from P12 data"""
-        try:
-            password_bytes = password.encode("utf-8") if password else None
-            private_key, certificate, additional_certificates = (
-                pkcs12.load_key_and_certificates(p12_data, password_bytes)
-            )
-
-            cert_pem = certificate.public_bytes(serialization.Encoding.PEM)
-            key_pem = private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.PKCS8,
-                encryption_algorithm=serialization.NoEncryption(),
-            )
-
-            return cert_pem, key_pem
-
-        except Exception as e:
-            raise Exception(f"P12 certificate extraction failed: {str(e)}")
-
-    @staticmethod
-    def _create_temp_cert_files(cert_pem: bytes, key_pem: bytes) -> Tuple[str, str]:
-        """Create temporary certificate files"""
-        cert_fd, cert_path = tempfile.mkstemp(suffix=".pem", prefix="tak_cert_")
-        key_fd, key_path = tempfile.mkstemp(suffix=".pem", prefix="tak_key_")
-
-        try:
-            with os.fdopen(cert_fd, "wb") as cert_file:
-                cert_file.write(cert_pem)
-            with os.fdopen(key_fd, "wb") as key_file:
-                key_file.write(key_pem)
-            return cert_path, key_path
-        except Exception as e:
-            try:
-                os.close(cert_fd)
-                os.close(key_fd)
-                os.unlink(cert_path)
-                os.unlink(key_path)
-            except Exception as cleanup_error:
-                logger.error(
-                    f"Error cleaning up temporary Certificate Files: {cleanup_error}"
-                )
-            logger.error(f"Error creating temporary Certificate Files: {e}")
-            raise
-
-    @staticmethod
-    def _cleanup_temp_files(*file_paths):
-        """Clean up temporary files"""
-        for path in file_paths:
-            if path and os.path.exists(path):
-                try:
-                    os.unlink(path)
-                    logger.debug(f"Cleaned up temporary file: {path}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temporary file {path}: {e}")
-
 
 # Global queued service instance
 _queued_service = None
@@ -19,6 +19,10 @@ Key features:
       handling
     - Detached entity copying to prevent lazy loading issues across
       thread boundaries
+    - Asyncio facade running operations on a bounded thread pool with
+      non-blocking retry backoff for the stream event loop
+    - Write-behind aggregation of per-poll stream status, flushed in one
+      bulk UPDATE on a configurable interval and on shutdown
 
 
 Author: Emfour Solutions
@@ -26,9 +30,14 @@ Created: 18-Jul-2025
 """
 
 # Standard library imports
+import asyncio
+import functools
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 # Third-party imports
 from sqlalchemy.exc import SQLAlchemyError
@@ -38,10 +47,24 @@ from services.logging_service import get_module_logger
 # Local application imports
 if TYPE_CHECKING:
     from models.stream import Stream
+    from services.stream_config_snapshot import StreamConfigSnapshot
 
 # Module-level logger
 logger = get_module_logger(__name__)
 
+# Retry policy shared by the sync and async execution paths
+DB_MAX_RETRIES = 3
+DB_RETRY_DELAY = 0.1  # Start with 100ms delay like stream operations
+
+# Default size of the thread pool used by AsyncDatabaseManager
+DEFAULT_DB_EXECUTOR_WORKERS = 4
+
+# Seconds between write-behind flushes of per-poll stream status
+DEFAULT_STATUS_FLUSH_INTERVAL = 10.0
+
+# Returned by a single attempt when no Flask app context is available
+_NO_APP_CONTEXT = object()
+
 
 class DatabaseManager:
     """Thread-safe database manager for async operations"""
@@ -137,74 +160,86 @@ class DatabaseManager:
         logger.error("No app context factory provided for DatabaseManager")
         return None
 
-    def execute_db_operation(self, operation_func, *args, **kwargs):
-        """Execute database operation with proper error handling and retry."""
+    def _run_db_operation(self, operation_func, *args, **kwargs):
+        """
+        Run a single attempt of a database operation inside an app context.
+
+        Commits on success and rolls back before re-raising on failure.
+        Returns _NO_APP_CONTEXT when no app context is available.
+        """
         from database import db
 
-        max_retries = 3
-        retry_delay = 0.1  # Start with 100ms delay like stream operations
-        db_type = self._get_database_type()
+        app_ctx = self.get_app_context()
+        if not app_ctx:
+            logger.error("No app context available for database operation")
+            return _NO_APP_CONTEXT
 
-        for attempt in range(max_retries):
+        with app_ctx:
             try:
-                app_ctx = self.get_app_context()
-                if not app_ctx:
-                    logger.error("No app context available for database operation")
-                    return None
+                result = operation_func(*args, **kwargs)
+                db.session.commit()
+                return result
+            except Exception as e:
+                db.session.rollback()
+                if not isinstance(e, SQLAlchemyError):
+                    logger.error(f"Unexpected error in database operation: {e}")
+                raise
 
-                with app_ctx:
-                    # Create a new session for this operation
-                    try:
-                        result = operation_func(*args, **kwargs)
-                        db.session.commit()
-                        return result
-                    except SQLAlchemyError as e:
-                        db.session.rollback()
-
-                        # Check if this is a concurrency error using detection
-                        if self._is_concurrency_error(e):
-                            if attempt < max_retries - 1:
-                                retry_delay_with_jitter = retry_delay * (
-                                    2**attempt
-                                ) + (attempt * 0.05)
-                                logger.warning(
-                                    f"Concurrency conflict on {db_type} in "
-                                    f"database operation (attempt "
-                                    f"{attempt + 1}/{max_retries}), retrying "
-                                    f"in {retry_delay_with_jitter:.2f}s: {e}"
-                                )
-                                time.sleep(retry_delay_with_jitter)
-                                continue
-                            else:
-                                logger.error(
-                                    f"Failed database operation on {db_type} "
-                                    f"after {max_retries} attempts due to "
-                                    f"concurrency conflicts: {e}"
-                                )
-                                raise
-                        else:
-                            # Non-concurrency SQLAlchemy error - log and retry
-                            logger.error(
-                                f"Database error (attempt "
-                                f"{attempt + 1}/{max_retries}) on "
-                                f"{db_type}: {e}"
-                            )
-                            if attempt == max_retries - 1:
-                                raise
-                            time.sleep(retry_delay * (attempt + 1))
-                    except Exception as e:
-                        db.session.rollback()
-                        logger.error(f"Unexpected error in database operation: {e}")
-                        raise
+    def _get_retry_delay(self, e: Exception, attempt: int) -> Optional[float]:
+        """
+        Log a failed attempt and work out how long to wait before the next one.
 
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    logger.error(
-                        f"Database operation failed after {max_retries} "
-                        f"attempts: {e}"
+        Returns:
+            Delay in seconds, or None when no attempts are left
+        """
+        db_type = self._get_database_type()
+
+        if isinstance(e, SQLAlchemyError):
+            if self._is_concurrency_error(e):
+                if attempt < DB_MAX_RETRIES - 1:
+                    retry_delay_with_jitter = DB_RETRY_DELAY * (2**attempt) + (
+                        attempt * 0.05
+                    )
+                    logger.warning(
+                        f"Concurrency conflict on {db_type} in "
+                        f"database operation (attempt "
+                        f"{attempt + 1}/{DB_MAX_RETRIES}), retrying "
+                        f"in {retry_delay_with_jitter:.2f}s: {e}"
                     )
+                    return retry_delay_with_jitter
+                logger.error(
+                    f"Failed database operation on {db_type} "
+                    f"after {DB_MAX_RETRIES} attempts due to "
+                    f"concurrency conflicts: {e}"
+                )
+            else:
+                # Non-concurrency SQLAlchemy error - log and retry
+                logger.error(
+                    f"Database error (attempt "
+                    f"{attempt + 1}/{DB_MAX_RETRIES}) on "
+                    f"{db_type}: {e}"
+                )
+
+        if attempt == DB_MAX_RETRIES - 1:
+            logger.error(
+                f"Database operation failed after {DB_MAX_RETRIES} attempts: {e}"
+            )
+            return None
+        return DB_RETRY_DELAY * (attempt + 1)
+
+    def execute_db_operation(self, operation_func, *args, **kwargs):
+        """Execute database operation with proper error handling and retry."""
+        for attempt in range(DB_MAX_RETRIES):
+            try:
+                result = self._run_db_operation(operation_func, *args, **kwargs)
+            except Exception as e:
+                retry_delay = self._get_retry_delay(e, attempt)
+                if retry_delay is None:
                     return None
-                time.sleep(retry_delay * (attempt + 1))
+                time.sleep(retry_delay)
+                continue
+
+            return None if result is _NO_APP_CONTEXT else result
 
         return None
 
@@ -268,37 +303,93 @@ class DatabaseManager:
         last_poll_time=None,
     ):
         """Update stream status with proper error handling"""
+        return self.execute_db_operation(
+            DatabaseManager._apply_stream_status,
+            stream_id,
+            is_active,
+            last_error,
+            messages_sent,
+            last_poll_time,
+        )
 
+    @staticmethod
+    def _apply_stream_status(
+        stream_id, is_active, last_error, messages_sent, last_poll_time
+    ):
+        """Apply a status update to a stream row (runs inside an app context)"""
         from models.stream import Stream
 
-        def _update_stream():
-            stream = Stream.query.get(stream_id)
-            if not stream:
-                logger.warning(f"Stream {stream_id} not found for status update")
-                return False
+        stream = Stream.query.get(stream_id)
+        if not stream:
+            logger.warning(f"Stream {stream_id} not found for status update")
+            return False
 
-            if is_active is not None:
-                stream.is_active = is_active
+        if is_active is not None:
+            stream.is_active = is_active
 
-            if last_error is not None:
-                stream.last_error = last_error
+        if last_error is not None:
+            stream.last_error = last_error
 
-            if last_poll_time is not None:
-                stream.last_poll = last_poll_time
-            elif is_active:  # Update last_poll when marking active
-                stream.last_poll = datetime.now(timezone.utc)
-
-            if messages_sent is not None:
-                if (
-                    not hasattr(stream, "total_messages_sent")
-                    or stream.total_messages_sent is None
-                ):
-                    stream.total_messages_sent = 0
-                stream.total_messages_sent += messages_sent
+        if last_poll_time is not None:
+            stream.last_poll = last_poll_time
+        elif is_active:  # Update last_poll when marking active
+            stream.last_poll = datetime.now(timezone.utc)
 
-            return True
+        if messages_sent is not None:
+            if (
+                not hasattr(stream, "total_messages_sent")
+                or stream.total_messages_sent is None
+            ):
+                stream.total_messages_sent = 0
+            stream.total_messages_sent += messages_sent
+
+        return True
 
-        return self.execute_db_operation(_update_stream)
+    @staticmethod
+    def _apply_stream_status_batch(updates: List[Dict]) -> int:
+        """
+        Apply coalesced poll status updates for many streams in one bulk
+        UPDATE (runs inside an app context).
+
+        Each update holds stream_id, last_poll, last_error and messages_sent;
+        None leaves last_poll/last_error unchanged and messages_sent is added
+        to the running total.
+        """
+        from sqlalchemy import Integer, bindparam, func
+
+        from database import db
+        from models.stream import Stream
+
+        table = Stream.__table__
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam("b_stream_id"))
+            .values(
+                last_poll=func.coalesce(
+                    bindparam("b_last_poll", type_=table.c.last_poll.type),
+                    table.c.last_poll,
+                ),
+                last_error=func.coalesce(
+                    bindparam("b_last_error", type_=table.c.last_error.type),
+                    table.c.last_error,
+                ),
+                total_messages_sent=func.coalesce(table.c.total_messages_sent, 0)
+                + bindparam("b_messages_sent", type_=Integer),
+            )
+        )
+        db.session.execute(
+            statement,
+            [
+                {
+                    "b_stream_id": update["stream_id"],
+                    "b_last_poll": update["last_poll"],
+                    "b_last_error": update["last_error"],
+                    "b_messages_sent": update["messages_sent"],
+                }
+                for update in updates
+            ],
+        )
+        return len(updates)
 
     def get_active_streams(self) -> List["Stream"]:
         """Get all active streams with proper session management"""
@@ -329,23 +420,56 @@ class DatabaseManager:
 
     def get_stream_with_relationships(self, stream_id: int):
         """Get stream with all relationships loaded"""
+        return self.execute_db_operation(
+            DatabaseManager._load_stream_with_relationships, stream_id
+        )
+
+    @staticmethod
+    def _load_stream_with_relationships(stream_id: int):
+        """
+        Load a stream as a StreamDTO (runs inside an app context).
+
+        TAK servers are loaded in the same round trip without their P12
+        certificate column; it is only read when a server revision has no
+        cached TakServerDTO yet.
+        """
+        from sqlalchemy.orm import joinedload, selectinload
+
         from models.stream import Stream
+        from models.tak_server import TakServer
+
+        stream = (
+            Stream.query.options(
+                joinedload(Stream.tak_server).defer(TakServer.cert_p12),
+                selectinload(Stream.tak_servers).defer(TakServer.cert_p12),
+            )
+            .filter_by(id=stream_id)
+            .first()
+        )
+        if stream:
+            return DatabaseManager._create_detached_stream_copy(stream)
+        return None
 
-        def _get_stream_with_relationships():
-            stream = Stream.query.get(stream_id)
-            if stream:
-                # Eagerly load relationships
-                _ = stream.tak_server
-                if stream.tak_server:
-                    _ = stream.tak_server.name
-                    _ = stream.tak_server.host
-                    _ = stream.tak_server.port
-                    _ = stream.tak_server.protocol
+    @staticmethod
+    def _load_stream_config_snapshot(stream_id: int, version: int):
+        """
+        Load a stream and all of its callsign mappings as one snapshot
+        (runs inside an app context).
+        """
+        from models.callsign_mapping import CallsignMapping
+        from models.dto import CallsignMappingDTO
+        from services.stream_config_snapshot import StreamConfigSnapshot
 
-                return DatabaseManager._create_detached_stream_copy(stream)
+        stream = DatabaseManager._load_stream_with_relationships(stream_id)
+        if stream is None:
             return None
 
-        return self.execute_db_operation(_get_stream_with_relationships)
+        mappings = CallsignMapping.query.filter_by(stream_id=stream_id).all()
+        return StreamConfigSnapshot.build(
+            stream,
+            [CallsignMappingDTO.from_orm(mapping) for mapping in mappings],
+            version,
+        )
 
     def get_all_streams_with_relationships(self):
         """Get all streams with relationships loaded"""
@@ -369,3 +493,307 @@ class DatabaseManager:
             return detached_streams
 
         return self.execute_db_operation(_get_all_streams_with_relationships)
+
+
+# Shared thread pool for AsyncDatabaseManager instances
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool used for database operations from async code.
+
+    The pool size is read from TRAKBRIDGE_DB_EXECUTOR_WORKERS and is kept
+    small so a burst of stream polls cannot exhaust the connection pool.
+    """
+    global _db_executor
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                max_workers = DEFAULT_DB_EXECUTOR_WORKERS
+                env_value = os.environ.get("TRAKBRIDGE_DB_EXECUTOR_WORKERS")
+                if env_value:
+                    try:
+                        max_workers = max(1, int(env_value))
+                    except ValueError:
+                        logger.warning(
+                            f"Invalid TRAKBRIDGE_DB_EXECUTOR_WORKERS: {env_value}"
+                        )
+                _db_executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="trakbridge-db"
+                )
+                logger.info(f"Database executor started with {max_workers} threads")
+    return _db_executor
+
+
+def shutdown_db_executor(wait: bool = True):
+    """Shut down the shared database thread pool (recreated on next use)"""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is not None:
+            _db_executor.shutdown(wait=wait)
+            _db_executor = None
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio facade over DatabaseManager for code running on an event loop.
+
+    Each attempt runs on the shared database thread pool and retries wait
+    with asyncio.sleep (or the given sleep coroutine function), so a slow or
+    locked database never stalls the other streams sharing the loop.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, executor=None, sleep=None):
+        self._db_manager = db_manager
+        self._executor = executor
+        self._sleep = sleep or asyncio.sleep
+
+    async def execute_db_operation(self, operation_func, *args, **kwargs):
+        """Execute database operation off the event loop with retry."""
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_db_executor()
+        attempt_func = functools.partial(
+            self._db_manager._run_db_operation, operation_func, *args, **kwargs
+        )
+
+        for attempt in range(DB_MAX_RETRIES):
+            try:
+                result = await loop.run_in_executor(executor, attempt_func)
+            except Exception as e:
+                retry_delay = self._db_manager._get_retry_delay(e, attempt)
+                if retry_delay is None:
+                    return None
+                await self._sleep(retry_delay)
+                continue
+
+            return None if result is _NO_APP_CONTEXT else result
+
+        return None
+
+    async def update_stream_status(
+        self,
+        stream_id: int,
+        is_active=None,
+        last_error=None,
+        messages_sent=None,
+        last_poll_time=None,
+    ):
+        """Update stream status with proper error handling"""
+        return await self.execute_db_operation(
+            DatabaseManager._apply_stream_status,
+            stream_id,
+            is_active,
+            last_error,
+            messages_sent,
+            last_poll_time,
+        )
+
+    async def get_stream_config_snapshot(
+        self, stream_id: int, version: int
+    ) -> Optional["StreamConfigSnapshot"]:
+        """Get a stream's settings and callsign mappings in one operation"""
+        return await self.execute_db_operation(
+            DatabaseManager._load_stream_config_snapshot, stream_id, version
+        )
+
+
+class _PendingStreamStatus:
+    """Coalesced poll status of one stream waiting to be written"""
+
+    __slots__ = ("last_poll", "last_error", "messages_sent")
+
+    def __init__(self):
+        self.last_poll = None
+        self.last_error = None
+        self.messages_sent = 0
+
+    def merge(self, newer: "_PendingStreamStatus"):
+        """Fold a newer pending status into this one"""
+        if newer.last_poll is not None:
+            self.last_poll = newer.last_poll
+        if newer.last_error is not None:
+            self.last_error = newer.last_error
+        self.messages_sent += newer.messages_sent
+
+
+class StreamStatusAggregator:
+    """
+    Write-behind buffer for per-poll stream status updates.
+
+    Stream workers record last_poll, last_error and messages_sent here
+    instead of writing them on every poll. Updates are coalesced per stream
+    in memory and written by a background thread in one bulk UPDATE every
+    flush_interval seconds, and once more when the aggregator is stopped.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, flush_interval: float = None):
+        self._db_manager = db_manager
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else DEFAULT_STATUS_FLUSH_INTERVAL
+        )
+        self._pending: Dict[int, _PendingStreamStatus] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        stream_id: int,
+        last_error=None,
+        messages_sent=None,
+        last_poll_time=None,
+    ):
+        """Record a poll status update to be written on the next flush"""
+        with self._lock:
+            pending = self._pending.get(stream_id)
+            if pending is None:
+                pending = self._pending[stream_id] = _PendingStreamStatus()
+            if last_poll_time is not None:
+                pending.last_poll = last_poll_time
+            if last_error is not None:
+                pending.last_error = last_error
+            if messages_sent:
+                pending.messages_sent += messages_sent
+
+    def take(self, stream_id: int) -> Optional[_PendingStreamStatus]:
+        """Remove and return a stream's pending status for an immediate write"""
+        with self._lock:
+            return self._pending.pop(stream_id, None)
+
+    def flush(self) -> int:
+        """
+        Write all pending status updates in one bulk UPDATE.
+
+        Updates are kept for the next flush if the write fails.
+
+        Returns:
+            Number of streams written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return 0
+
+        updates = [
+            {
+                "stream_id": stream_id,
+                "last_poll": status.last_poll,
+                "last_error": status.last_error,
+                "messages_sent": status.messages_sent,
+            }
+            for stream_id, status in pending.items()
+        ]
+        result = self._db_manager.execute_db_operation(
+            DatabaseManager._apply_stream_status_batch, updates
+        )
+
+        if result is None:
+            logger.warning(
+                f"Failed to flush status of {len(pending)} streams, "
+                f"retrying on next flush"
+            )
+            with self._lock:
+                # Anything recorded since the swap is newer than the failed batch
+                for stream_id, newer in self._pending.items():
+                    if stream_id in pending:
+                        pending[stream_id].merge(newer)
+                    else:
+                        pending[stream_id] = newer
+                self._pending = pending
+            return 0
+
+        logger.debug(f"Flushed status of {result} streams")
+        return result
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing stream status updates: {e}")
+
+    def start(self):
+        """Start the background flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="StreamStatusAggregator"
+        )
+        self._thread.start()
+        logger.info(
+            f"Stream status aggregator started "
+            f"(flush interval {self.flush_interval}s)"
+        )
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background flush thread and flush remaining updates"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing stream status updates on shutdown: {e}")
+
+
+# Process-wide status aggregator, started with the StreamManager loop
+_status_aggregator: Optional[StreamStatusAggregator] = None
+_status_aggregator_lock = threading.Lock()
+
+
+def get_status_flush_interval(config: Optional[Dict[str, Any]]) -> float:
+    """Flush interval from the stream_status section of threading.yaml"""
+    try:
+        return float(
+            (config or {}).get("flush_interval", DEFAULT_STATUS_FLUSH_INTERVAL)
+        )
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid stream_status flush_interval: {config}")
+        return DEFAULT_STATUS_FLUSH_INTERVAL
+
+
+def start_stream_status_aggregator(
+    db_manager: DatabaseManager, flush_interval: float = None
+) -> Optional[StreamStatusAggregator]:
+    """
+    Start the process-wide stream status aggregator.
+
+    An interval of 0 or less disables write-behind so status is written on
+    every poll.
+    """
+    global _status_aggregator
+    if flush_interval is None:
+        flush_interval = DEFAULT_STATUS_FLUSH_INTERVAL
+
+    with _status_aggregator_lock:
+        if _status_aggregator is not None:
+            return _status_aggregator
+        if flush_interval <= 0:
+            logger.info("Stream status write-behind disabled")
+            return None
+
+        _status_aggregator = StreamStatusAggregator(db_manager, flush_interval)
+        _status_aggregator.start()
+        return _status_aggregator
+
+
+def get_stream_status_aggregator() -> Optional[StreamStatusAggregator]:
+    """Get the running stream status aggregator, if any"""
+    return _status_aggregator
+
+
+def stop_stream_status_aggregator():
+    """Flush pending stream status updates and stop the aggregator"""
+    global _status_aggregator
+    with _status_aggregator_lock:
+        aggregator, _status_aggregator = _status_aggregator, None
+    if aggregator is not None:
+        aggregator.stop()
@@ -16,6 +16,7 @@ Key features:
     - Password hashing with enhanced security using PBKDF2-HMAC-SHA256
     - Health check and diagnostic capabilities for encryption system monitoring
     - Mixin class for plugin configuration encryption support
+    - Process-wide cache of derived keys and decrypted plugin configs
 
 
 Author: Emfour Solutions
@@ -24,13 +25,16 @@ Created: 18-Jul-2025
 
 import base64
 import binascii
+import copy
 import hashlib
 import logging
 
 # Standard library imports
 import os
 import secrets
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 from cryptography.exceptions import InvalidKey
 
@@ -47,6 +51,81 @@ from utils.database_helpers import safe_database_operation
 # Module-level logger
 logger = get_module_logger(__name__)
 
+# Fernet suites derived with PBKDF2, keyed by (master key digest, salt).
+# Derivation takes 100k iterations, so it is done once per process instead
+# of once per EncryptionService instance.
+_derived_key_cache: Dict[Tuple[bytes, bytes], Fernet] = {}
+_derived_key_lock = threading.Lock()
+
+
+def _derive_cipher_suite(master_key: str, salt: bytes) -> Fernet:
+    """Return the Fernet suite for a master key and salt, deriving it once"""
+    cache_key = (hashlib.sha256(master_key.encode()).digest(), salt)
+    cipher_suite = _derived_key_cache.get(cache_key)
+    if cipher_suite is not None:
+        return cipher_suite
+
+    with _derived_key_lock:
+        cipher_suite = _derived_key_cache.get(cache_key)
+        if cipher_suite is None:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=100000,  # OWASP recommended minimum
+            )
+            key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
+            cipher_suite = Fernet(key)
+            _derived_key_cache[cache_key] = cipher_suite
+        return cipher_suite
+
+
+class DecryptedConfigCache:
+    """
+    LRU cache of decrypted plugin configs keyed by their stored revision.
+
+    Keys include the encrypted JSON exactly as stored, so any edit or key
+    rotation produces a new key. Callers get their own copy of each config.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            config = self._entries.get(key)
+            if config is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(config)
+
+    def put(self, key: Hashable, config: Dict[str, Any]):
+        config = copy.deepcopy(config)
+        with self._lock:
+            self._entries[key] = config
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+decrypted_config_cache = DecryptedConfigCache()
+
+
+def clear_encryption_caches():
+    """Drop derived keys and decrypted configs (after key rotation and in tests)"""
+    with _derived_key_lock:
+        _derived_key_cache.clear()
+    decrypted_config_cache.clear()
+
 
 class EncryptionService:
     """Enhanced service for encrypting and decrypting sensitive configuration data"""
@@ -119,17 +198,7 @@ class EncryptionService:
             app_context = os.environ.get("TB_ID", "tb_default")
             salt = hashlib.sha256(f"{app_context}_salt_2024".encode()).digest()[:16]
 
-            master_key_bytes = self._master_key.encode()
-
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,  # OWASP recommended minimum
-            )
-
-            key = base64.urlsafe_b64encode(kdf.derive(master_key_bytes))
-            self._cipher_suite = Fernet(key)
+            self._cipher_suite = _derive_cipher_suite(self._master_key, salt)
 
         return self._cipher_suite
 
@@ -331,6 +400,7 @@ class EncryptionService:
             # Commit all changes
             if rotated_count > 0:
                 db.session.commit()
+                decrypted_config_cache.clear()
 
             return {
                 "success": True,
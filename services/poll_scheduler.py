@@ -0,0 +1,293 @@
+"""
+ABOUTME: Central poll scheduler that dispatches stream polls from a deadline heap
+ABOUTME: with phase jitter, a global concurrency cap and per-host rate limits
+
+File: services/poll_scheduler.py
+
+Description:
+    Every StreamWorker used to sleep on its own timer between polls, so
+    streams started together (for example at boot) polled in lockstep and hit
+    the CPU, the database and upstream APIs at the same instant. Workers now
+    ask this scheduler for their next poll turn instead. Requests are kept in
+    a heap ordered by due time and a single dispatcher task on the stream
+    event loop releases them when they are due, when fewer than
+    max_concurrent_polls polls are running and when the stream's upstream
+    host has not been polled within host_min_interval seconds.
+
+    The first poll of each stream is spread over a random phase offset and
+    every later interval (still computed by the worker's adaptive interval
+    logic) is jittered by +/- jitter_ratio so streams drift apart over time.
+
+    When streams are sharded over several event loops each loop has its own
+    scheduler, but all of them reserve host slots from one thread-safe
+    HostRateLimiter so host_min_interval holds across the whole process.
+
+Key features:
+    - Heap-based dispatch with a single timer for all streams
+    - Random initial phase and per-cycle jitter
+    - Global cap on concurrently running polls
+    - Minimum spacing between polls to the same upstream host, shared
+      between the schedulers of all stream shards
+    - Cancellation of pending turns when a stream stops
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.logging_service import get_module_logger
+
+logger = get_module_logger(__name__)
+
+DEFAULT_MAX_CONCURRENT_POLLS = 10
+DEFAULT_HOST_MIN_INTERVAL = 1.0
+DEFAULT_JITTER_RATIO = 0.1
+DEFAULT_MAX_INITIAL_PHASE = 30.0
+
+
+class PollTicket:
+    """A stream's request for its next poll turn"""
+
+    __slots__ = ("stream_id", "host", "due", "future", "dispatched", "cancelled")
+
+    def __init__(self, stream_id: int, host: Optional[str], due: float, future):
+        self.stream_id = stream_id
+        self.host = host
+        self.due = due
+        self.future = future
+        self.dispatched = False
+        self.cancelled = False
+
+
+class HostRateLimiter:
+    """Minimum spacing between polls to the same host, safe across threads"""
+
+    def __init__(self, min_interval: float = DEFAULT_HOST_MIN_INTERVAL):
+        self.min_interval = max(0.0, float(min_interval))
+        self._next_poll: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "HostRateLimiter":
+        """Create a limiter from the poll_scheduler section of threading.yaml"""
+        config = config or {}
+        return cls(config.get("host_min_interval", DEFAULT_HOST_MIN_INTERVAL))
+
+    def reserve(self, host: str) -> float:
+        """
+        Claim the next poll slot for a host.
+
+        Returns:
+            0 if the slot was claimed, otherwise seconds until the host is free
+        """
+        if not self.min_interval:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            ready = self._next_poll.get(host, 0.0)
+            if ready > now:
+                return ready - now
+            self._next_poll[host] = now + self.min_interval
+            return 0.0
+
+
+class PollScheduler:
+    """Dispatches stream polls with jitter, a concurrency cap and host limits"""
+
+    def __init__(
+        self,
+        max_concurrent_polls: int = DEFAULT_MAX_CONCURRENT_POLLS,
+        host_min_interval: float = DEFAULT_HOST_MIN_INTERVAL,
+        jitter_ratio: float = DEFAULT_JITTER_RATIO,
+        max_initial_phase: float = DEFAULT_MAX_INITIAL_PHASE,
+        host_limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.max_concurrent_polls = max(1, int(max_concurrent_polls))
+        # Shards pass a shared limiter; its interval takes precedence
+        self.host_limiter = host_limiter or HostRateLimiter(host_min_interval)
+        self.host_min_interval = self.host_limiter.min_interval
+        self.jitter_ratio = min(max(0.0, float(jitter_ratio)), 0.5)
+        self.max_initial_phase = max(0.0, float(max_initial_phase))
+
+        self._heap: List[Tuple[float, int, PollTicket]] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[Dict[str, Any]],
+        shard_count: int = 1,
+        host_limiter: Optional[HostRateLimiter] = None,
+    ) -> Optional["PollScheduler"]:
+        """
+        Create a scheduler from the poll_scheduler section of threading.yaml.
+
+        Args:
+            config: poll_scheduler settings
+            shard_count: Number of stream shards sharing the concurrency budget
+            host_limiter: Host rate limiter shared by the shards' schedulers
+
+        Returns:
+            Scheduler, or None when the scheduler is disabled
+        """
+        config = config or {}
+        if not config.get("enabled", True):
+            logger.info("Poll scheduler disabled, streams poll on their own timers")
+            return None
+
+        max_concurrent_polls = config.get(
+            "max_concurrent_polls", DEFAULT_MAX_CONCURRENT_POLLS
+        )
+        return cls(
+            # Each shard gets its share of the global budget
+            max_concurrent_polls=math.ceil(
+                int(max_concurrent_polls) / max(1, shard_count)
+            ),
+            host_min_interval=config.get(
+                "host_min_interval", DEFAULT_HOST_MIN_INTERVAL
+            ),
+            jitter_ratio=config.get("jitter_ratio", DEFAULT_JITTER_RATIO),
+            max_initial_phase=config.get(
+                "max_initial_phase", DEFAULT_MAX_INITIAL_PHASE
+            ),
+            host_limiter=host_limiter,
+        )
+
+    @property
+    def active_polls(self) -> int:
+        """Number of polls currently holding a turn"""
+        return self._active
+
+    @property
+    def pending_polls(self) -> int:
+        """Number of polls waiting to be dispatched"""
+        return sum(1 for _, _, ticket in self._heap if not ticket.cancelled)
+
+    def initial_delay(self, interval: float) -> float:
+        """Random phase offset for a stream's first poll"""
+        return random.uniform(0, min(interval, self.max_initial_phase))
+
+    def jittered(self, interval: float) -> float:
+        """Apply +/- jitter_ratio to a poll interval"""
+        if not self.jitter_ratio:
+            return interval
+        spread = interval * self.jitter_ratio
+        return max(0.0, interval + random.uniform(-spread, spread))
+
+    def schedule(
+        self, stream_id: int, delay: float, host: Optional[str] = None
+    ) -> PollTicket:
+        """
+        Request a poll turn for a stream (must be called on the stream loop).
+
+        Args:
+            stream_id: Stream requesting the turn
+            delay: Seconds until the poll is due
+            host: Upstream host key used for per-host rate limiting
+
+        Returns:
+            Ticket whose future resolves when the poll may start
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_dispatcher(loop)
+
+        ticket = PollTicket(
+            stream_id, host, loop.time() + max(0.0, delay), loop.create_future()
+        )
+        heapq.heappush(self._heap, (ticket.due, next(self._sequence), ticket))
+        self._wakeup.set()
+        return ticket
+
+    def cancel(self, ticket: PollTicket):
+        """Withdraw a pending ticket, or release it if already dispatched"""
+        if ticket.dispatched:
+            self.release(ticket)
+            return
+        ticket.cancelled = True
+        if not ticket.future.done():
+            ticket.future.cancel()
+
+    def release(self, ticket: Optional[PollTicket]):
+        """Return a dispatched ticket's turn once its poll has finished"""
+        if ticket is None or not ticket.dispatched:
+            return
+        ticket.dispatched = False
+        self._active = max(0, self._active - 1)
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _ensure_dispatcher(self, loop: asyncio.AbstractEventLoop):
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._dispatcher = loop.create_task(self._dispatch_loop())
+        logger.info(
+            f"Poll scheduler started (max {self.max_concurrent_polls} concurrent "
+            f"polls, {self.host_min_interval}s per host, "
+            f"{self.jitter_ratio:.0%} jitter)"
+        )
+
+    def _dispatch_due(self, now: float) -> Optional[float]:
+        """
+        Dispatch every due ticket that fits the concurrency and host limits.
+
+        Returns:
+            Seconds until the next ticket may become dispatchable, or None
+        """
+        while self._heap and self._active < self.max_concurrent_polls:
+            due, sequence, ticket = self._heap[0]
+            if ticket.cancelled or ticket.future.done():
+                heapq.heappop(self._heap)
+                continue
+            if due > now:
+                return due - now
+
+            heapq.heappop(self._heap)
+            if ticket.host:
+                host_wait = self.host_limiter.reserve(ticket.host)
+                if host_wait > 0:
+                    # Host was polled too recently, retry when it is free
+                    ticket.due = now + host_wait
+                    heapq.heappush(self._heap, (ticket.due, sequence, ticket))
+                    continue
+
+            ticket.dispatched = True
+            self._active += 1
+            ticket.future.set_result(True)
+
+        # At the concurrency cap the next wake-up comes from release()
+        return None
+
+    async def _dispatch_loop(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self._wakeup.clear()
+                timeout = self._dispatch_due(loop.time())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            logger.debug("Poll scheduler dispatcher stopped")
+            raise
+
+    def stop(self):
+        """Stop the dispatcher and cancel all pending tickets"""
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._dispatcher.cancel()
+        self._dispatcher = None
+        for _, _, ticket in self._heap:
+            self.cancel(ticket)
+        self._heap.clear()
@@ -0,0 +1,161 @@
+"""
+ABOUTME: Per-stream position fingerprint cache that suppresses CoT generation for
+ABOUTME: trackers that have not moved, with a heartbeat resend tied to stale time
+
+File: services/position_change_filter.py
+
+Description:
+    Most trackers do not move between polls, yet every poll used to turn
+    every location into a CoT event and queue it for every TAK server. The
+    stream worker now passes each batch through a PositionChangeFilter,
+    which keeps a fingerprint of the last position sent per device UID
+    (lat/lon/altitude/course/speed/callsign/CoT type and team settings) and
+    only lets through locations that changed.
+
+    Unchanged locations are still re-sent once their last send is older than
+    the heartbeat interval, a fraction of the stream's cot_stale_time
+    (TRAKBRIDGE_COT_HEARTBEAT_RATIO, default 0.5), so TAK clients never see
+    markers go stale. Positions are only seen once per poll, so a heartbeat
+    is sent on the last poll before the interval would be exceeded, not on
+    the first poll after it. Fingerprints are only committed after a successful
+    send, so failed sends are retried in full on the next poll.
+
+Key features:
+    - Fingerprint per device UID over the fields that affect the CoT event
+    - Heartbeat resend derived from cot_stale_time
+    - Commit-after-send so failed batches are not suppressed
+    - Reset when the stream's TAK routes change
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import os
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from services.logging_service import get_module_logger
+
+logger = get_module_logger(__name__)
+
+DEFAULT_HEARTBEAT_RATIO = 0.5
+MIN_HEARTBEAT_INTERVAL = 30.0
+
+
+def get_heartbeat_ratio() -> float:
+    """Read the heartbeat ratio from TRAKBRIDGE_COT_HEARTBEAT_RATIO"""
+    env_value = os.environ.get("TRAKBRIDGE_COT_HEARTBEAT_RATIO")
+    if env_value:
+        try:
+            return float(env_value)
+        except ValueError:
+            logger.warning(f"Invalid TRAKBRIDGE_COT_HEARTBEAT_RATIO: {env_value}")
+    return DEFAULT_HEARTBEAT_RATIO
+
+
+def location_uid(location: Dict[str, Any]) -> Optional[str]:
+    """UID the CoT event for a location will carry"""
+    uid = location.get("uid", location.get("id"))
+    return str(uid) if uid is not None else None
+
+
+def position_fingerprint(location: Dict[str, Any], context: Hashable = None) -> int:
+    """Hash of the location fields that change the generated CoT event"""
+    additional_data = location.get("additional_data") or {}
+    return hash(
+        (
+            location.get("lat", location.get("latitude")),
+            location.get("lon", location.get("longitude")),
+            location.get("altitude", location.get("hae")),
+            location.get("course"),
+            location.get("speed"),
+            location.get("name", location.get("callsign")),
+            location.get("cot_type"),
+            additional_data.get("team_member_enabled"),
+            additional_data.get("team_role"),
+            additional_data.get("team_color"),
+            context,
+        )
+    )
+
+
+class PositionChangeFilter:
+    """Suppresses unchanged tracker positions between heartbeats"""
+
+    def __init__(self, heartbeat_ratio: Optional[float] = None):
+        if heartbeat_ratio is None:
+            heartbeat_ratio = get_heartbeat_ratio()
+        # A ratio of 0 or less disables change detection
+        self.heartbeat_ratio = heartbeat_ratio
+        # uid -> (fingerprint, monotonic time of last send)
+        self._sent: Dict[str, Tuple[int, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.heartbeat_ratio > 0
+
+    def heartbeat_interval(self, stale_time: float) -> float:
+        """Seconds after which an unchanged position is sent again"""
+        return max(MIN_HEARTBEAT_INTERVAL, stale_time * self.heartbeat_ratio)
+
+    def __len__(self) -> int:
+        return len(self._sent)
+
+    def select(
+        self,
+        locations: List[Dict[str, Any]],
+        stale_time: float,
+        context: Hashable = None,
+        now: Optional[float] = None,
+        poll_interval: float = 0.0,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Pick the locations that need to be sent.
+
+        Args:
+            locations: Valid (non-error) locations from this poll
+            stale_time: Stream CoT stale time in seconds
+            context: Stream-level settings that also affect the events
+            now: Monotonic time, defaults to time.monotonic()
+            poll_interval: Seconds until the next poll; a heartbeat that would
+                fall due before then is sent now
+
+        Returns:
+            Locations to send, and their fingerprints to pass to commit()
+            once the send succeeded
+        """
+        if not self.enabled:
+            return locations, {}
+
+        now = time.monotonic() if now is None else now
+        heartbeat = self.heartbeat_interval(stale_time)
+        changed = []
+        pending = {}
+
+        for location in locations:
+            uid = location_uid(location)
+            if uid is None:
+                changed.append(location)
+                continue
+
+            fingerprint = position_fingerprint(location, context)
+            previous = self._sent.get(uid)
+            if (
+                previous is None
+                or previous[0] != fingerprint
+                or now - previous[1] + poll_interval >= heartbeat
+            ):
+                changed.append(location)
+                pending[uid] = fingerprint
+
+        return changed, pending
+
+    def commit(self, pending: Dict[str, int], now: Optional[float] = None):
+        """Record fingerprints of locations that were sent successfully"""
+        now = time.monotonic() if now is None else now
+        for uid, fingerprint in pending.items():
+            self._sent[uid] = (fingerprint, now)
+
+    def clear(self):
+        """Forget all fingerprints so the next poll sends every location"""
+        self._sent.clear()
@@ -13,7 +13,8 @@ Description:
 Key features:
     - Bounded queues with configurable size limits
     - Multiple overflow strategies: drop_oldest, drop_newest, block
-    - Batch transmission with configurable timeouts
+    - Optional UID-indexed "latest position wins" queue type
+    - Event-driven batch retrieval with configurable timeouts
     - Configuration change detection and queue flushing
     - Comprehensive logging and monitoring
     - Performance optimization while maintaining test compliance
@@ -24,8 +25,10 @@ Created: 2025-09-17
 """
 
 import asyncio
+import itertools
 import logging
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
@@ -33,6 +36,8 @@ from services.logging_service import get_module_logger
 
 logger = get_module_logger(__name__)
 
+QUEUE_TYPES = ("fifo", "latest_by_uid")
+
 
 @dataclass
 class QueueMetrics:
@@ -47,6 +52,115 @@ class QueueMetrics:
     last_flush_time: Optional[datetime] = None
     overflow_events: int = 0
     config_change_flushes: int = 0
+    events_replaced: int = 0
+
+
+class QueuedCotEvent(bytes):
+    """
+    Serialized CoT event carrying the metadata needed for queue management.
+
+    Produced by the CoT generator alongside the XML it has just built, so
+    deduplication and replacement can read the device UID and event time
+    directly instead of parsing every queued event. Subclasses bytes so
+    transports, plugins and callers treating events as raw XML are unaffected.
+
+    Attributes:
+        uid: Device UID (event uid attribute)
+        event_time: Timezone-aware event time as written to the time attribute
+        stream_id: Originating stream identifier, if known
+    """
+
+    def __new__(
+        cls,
+        data: bytes,
+        uid: Optional[str] = None,
+        event_time: Optional[datetime] = None,
+        stream_id: Optional[int] = None,
+    ):
+        event = super().__new__(cls, data)
+        event.uid = uid
+        event.event_time = event_time
+        event.stream_id = stream_id
+        return event
+
+    def __repr__(self) -> str:
+        return (
+            f"QueuedCotEvent(uid={self.uid!r}, event_time={self.event_time!r}, "
+            f"stream_id={self.stream_id!r}, size={len(self)})"
+        )
+
+
+class LatestByUidQueue(asyncio.Queue):
+    """
+    Bounded asyncio queue holding at most one pending event per device UID.
+
+    Backed by an ordered dict keyed by UID, so a newer position for a device
+    already waiting in the queue replaces the pending event in place (keeping
+    its position) in O(1), instead of draining and re-queueing the whole queue.
+    Events without a recorded UID (raw bytes, shutdown sentinels) are kept
+    under unique keys and behave as in a FIFO queue.
+    """
+
+    def _init(self, maxsize):
+        self._queue = OrderedDict()
+        self._unkeyed = itertools.count()
+
+    def _key(self, item) -> Any:
+        uid = getattr(item, "uid", None)
+        if uid:
+            return uid
+        return (None, next(self._unkeyed))
+
+    def _put(self, item):
+        self._queue[self._key(item)] = item
+
+    def _get(self):
+        return self._queue.popitem(last=False)[1]
+
+    def replace_nowait(self, item) -> bool:
+        """
+        Replace the pending event for the item's UID, if there is one.
+
+        The pending event is kept when it is newer than the item (by
+        event_time), so a late-arriving older position never overwrites a
+        fresher one.
+
+        Args:
+            item: Event to store (QueuedCotEvent)
+
+        Returns:
+            True if a pending event was queued for the UID (whichever event
+            was kept), False if none was queued
+        """
+        uid = getattr(item, "uid", None)
+        if not uid or uid not in self._queue:
+            return False
+
+        pending_time = getattr(self._queue[uid], "event_time", None)
+        item_time = getattr(item, "event_time", None)
+        if pending_time is None or item_time is None or item_time >= pending_time:
+            self._queue[uid] = item
+        return True
+
+    def remove_uids(self, uids) -> int:
+        """
+        Remove pending events for the given UIDs.
+
+        Args:
+            uids: Iterable of device UIDs
+
+        Returns:
+            Number of events removed
+        """
+        removed = 0
+        for uid in uids:
+            if self._queue.pop(uid, None) is not None:
+                removed += 1
+                # Removed events will never be consumed; account for them
+                # here so join() does not wait on them
+                self.task_done()
+                self._wakeup_next(self._putters)
+        return removed
 
 
 class QueueManager:
@@ -97,6 +211,7 @@ class QueueManager:
             "max_size": 500,
             "batch_size": 20,  # Updated to match performance.yaml default
             "overflow_strategy": "drop_oldest",
+            "type": "fifo",
             "flush_on_config_change": True,
             "batch_timeout_ms": 100,
             "queue_check_interval_ms": 100,
@@ -147,6 +262,16 @@ class QueueManager:
             )
             validated["overflow_strategy"] = defaults["overflow_strategy"]
 
+        # Validate queue type
+        queue_type = config.get("type", defaults["type"])
+        if queue_type in QUEUE_TYPES:
+            validated["type"] = queue_type
+        else:
+            logger.warning(
+                f"Invalid queue type: {queue_type}, using default {defaults['type']}"
+            )
+            validated["type"] = defaults["type"]
+
         # Copy other config values with defaults
         for key in defaults:
             if key not in validated:
@@ -154,6 +279,13 @@ class QueueManager:
 
         return validated
 
+    def _new_queue(self) -> asyncio.Queue:
+        """Create an empty queue of the configured type and maximum size"""
+        max_size = self.config.get("max_size", 500)
+        if self.config.get("type", "fifo") == "latest_by_uid":
+            return LatestByUidQueue(maxsize=max_size)
+        return asyncio.Queue(maxsize=max_size)
+
     async def create_queue(self, queue_id: int) -> bool:
         """
         Create a bounded queue with the configured maximum size.
@@ -181,13 +313,15 @@ class QueueManager:
                     del self.queues[queue_id]
 
             # Create bounded queue with configured max size
-            max_size = self.config.get("max_size", 500)
-            queue = asyncio.Queue(maxsize=max_size)
+            queue = self._new_queue()
 
             self.queues[queue_id] = queue
             self.metrics[queue_id] = QueueMetrics()
 
-            logger.debug(f"Created bounded queue {queue_id} with max size {max_size}")
+            logger.debug(
+                f"Created bounded {self.config.get('type', 'fifo')} queue {queue_id} "
+                f"with max size {queue.maxsize}"
+            )
             return True
 
         except Exception as e:
@@ -222,8 +356,7 @@ class QueueManager:
                         f"Queue {queue_id} bound to different event loop, recreating"
                     )
                     # Create a new queue in current event loop
-                    max_size = self.config.get("max_size", 500)
-                    self.queues[queue_id] = asyncio.Queue(maxsize=max_size)
+                    self.queues[queue_id] = self._new_queue()
                     queue = self.queues[queue_id]
                 else:
                     raise
@@ -272,6 +405,12 @@ class QueueManager:
         strategy = self.config.get("overflow_strategy", "drop_oldest")
         metrics = self.metrics[queue_id]
 
+        # An event for a device already pending is merged with it (the newer
+        # event_time wins) without consuming capacity
+        if isinstance(queue, LatestByUidQueue) and queue.replace_nowait(event):
+            metrics.events_replaced += 1
+            return True
+
         if strategy == "block":
             # Block until space is available (default asyncio.Queue behavior)
             await queue.put(event)
@@ -370,15 +509,24 @@ class QueueManager:
             logger.error(f"Failed to flush queue {queue_id}: {e}")
             return 0
 
-    async def get_batch(self, queue_id: int) -> List[bytes]:
+    async def get_batch(
+        self, queue_id: int, wait_timeout: Optional[float] = None
+    ) -> List[bytes]:
         """
-        Get a batch of events from the queue with timeout handling.
+        Get a batch of events from the queue.
+
+        Waits for the first event, then drains whatever is already queued
+        without blocking. A partial batch keeps collecting until batch_size is
+        reached or batch_timeout_ms has passed since the first event.
 
         Args:
             queue_id: Queue identifier
+            wait_timeout: Seconds to wait for the first event. Defaults to
+                batch_timeout_ms; 0 returns immediately if the queue is empty
+                and a negative value waits until an event arrives.
 
         Returns:
-            List of events (may be partial batch if timeout occurs)
+            List of events (may be partial or empty if nothing arrived in time)
         """
         if queue_id not in self.queues:
             logger.error(f"Queue {queue_id} does not exist")
@@ -397,27 +545,36 @@ class QueueManager:
                         f"Queue {queue_id} bound to different event loop, recreating"
                     )
                     # Create a new queue in current event loop
-                    max_size = self.config.get("max_size", 500)
-                    self.queues[queue_id] = asyncio.Queue(maxsize=max_size)
+                    self.queues[queue_id] = self._new_queue()
                     queue = self.queues[queue_id]
                 else:
                     raise
 
             batch = []
             batch_size = self.config.get("batch_size", 8)
-            timeout_ms = self.config.get("batch_timeout_ms", 100)
-            timeout_seconds = timeout_ms / 1000.0
-
-            # Only log batch size once per batch retrieval to reduce log spam
-
-            while len(batch) < batch_size:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=timeout_seconds)
-                    if event is None:  # Shutdown signal
+            timeout_seconds = self.config.get("batch_timeout_ms", 100) / 1000.0
+            if wait_timeout is None:
+                wait_timeout = timeout_seconds
+
+            # Wait for the first event
+            event = await self._get_event(queue, wait_timeout)
+            if event is not None:
+                batch.append(event)
+                deadline = asyncio.get_running_loop().time() + timeout_seconds
+
+                while len(batch) < batch_size:
+                    # Drain everything already queued without blocking
+                    try:
+                        event = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        # Partial batch: wait for more until the batch deadline
+                        remaining = deadline - asyncio.get_running_loop().time()
+                        if remaining <= 0:
+                            break
+                        event = await self._get_event(queue, remaining)
+                    if event is None:  # Shutdown signal or batch timeout
                         break
                     batch.append(event)
-                except asyncio.TimeoutError:
-                    break  # Return partial batch
 
             # Update metrics
             if batch:
@@ -435,6 +592,31 @@ class QueueManager:
             logger.error(f"Failed to get batch from queue {queue_id}: {e}")
             return []
 
+    @staticmethod
+    async def _get_event(queue: asyncio.Queue, timeout: float) -> Optional[bytes]:
+        """
+        Wait for the next event from a queue.
+
+        Args:
+            queue: The asyncio queue
+            timeout: Seconds to wait (0 = don't wait, negative = wait forever)
+
+        Returns:
+            The event, or None on timeout or shutdown signal
+        """
+        if timeout == 0:
+            try:
+                return queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        if timeout < 0:
+            return await queue.get()
+        try:
+            async with asyncio.timeout(timeout):
+                return await queue.get()
+        except TimeoutError:
+            return None
+
     def get_queue_status(self, queue_id: int) -> Dict[str, Any]:
         """
         Get comprehensive status information for a queue.
@@ -468,6 +650,7 @@ class QueueManager:
                 "max_queue_size_reached": metrics.max_queue_size_reached,
                 "average_batch_size": metrics.average_batch_size,
                 "overflow_events": metrics.overflow_events,
+                "events_replaced": metrics.events_replaced,
                 "config_change_flushes": metrics.config_change_flushes,
                 "last_flush_time": (
                     metrics.last_flush_time.isoformat()
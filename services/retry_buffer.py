@@ -0,0 +1,489 @@
+"""
+ABOUTME: Bounded per-TAK-server retry buffer that keeps failed transmission batches
+ABOUTME: for re-delivery with exponential backoff and optional append-only disk spill
+
+File: services/retry_buffer.py
+
+Description:
+    Transmission workers dequeue a batch before writing it to the TAK server,
+    so a failed write used to discard the batch and the devices only reappeared
+    on the next poll. RetryBuffer holds those events and hands them back to the
+    worker once their backoff delay has passed.
+
+    The buffer follows the same "latest position wins" rule as the
+    latest_by_uid queue: only the newest buffered event per UID is kept, and a
+    buffered event is discarded as soon as a newer position for the same UID
+    is picked up for transmission. Events without a UID (raw bytes) are kept
+    in arrival order.
+
+    When the in-memory buffer is full and a spill directory is configured,
+    further events are appended to a per-server spill file instead of being
+    dropped. Spilled events are read back in order as memory frees up, and a
+    spill file left behind by a previous process is recovered on start-up.
+
+Key features:
+    - Bounded in-memory buffer with latest-per-UID replacement
+    - Exponential backoff per event with a configurable ceiling
+    - Expiry after max_attempts or max_age_seconds
+    - Optional append-only, length-prefixed spill file per TAK server
+    - Retried, expired, superseded, dropped and spilled counters
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import itertools
+import json
+import os
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from services.logging_service import get_module_logger
+from services.queue_manager import QueuedCotEvent
+
+logger = get_module_logger(__name__)
+
+# Spill record framing: header length, payload length (big-endian uint32)
+_SPILL_FRAME = struct.Struct(">II")
+
+
+@dataclass
+class RetryMetrics:
+    """Retry buffer counters"""
+
+    events_buffered: int = 0
+    events_retried: int = 0
+    events_expired: int = 0
+    events_superseded: int = 0
+    events_dropped: int = 0
+    events_spilled: int = 0
+
+
+@dataclass
+class RetryEntry:
+    """A buffered event and its retry schedule"""
+
+    event: bytes
+    attempts: int
+    first_failed_at: float
+    next_attempt_at: float
+
+
+class RetryBuffer:
+    """
+    Retry buffer for one TAK server.
+
+    Not thread-safe: a buffer is owned by the transmission worker of its
+    server and only used from that worker's event loop.
+    """
+
+    def __init__(
+        self,
+        tak_server_id: int,
+        max_events: int = 1000,
+        base_delay_seconds: float = 1.0,
+        max_delay_seconds: float = 60.0,
+        max_attempts: int = 5,
+        max_age_seconds: float = 300.0,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the retry buffer.
+
+        Args:
+            tak_server_id: TAK server identifier
+            max_events: Maximum events held in memory
+            base_delay_seconds: Delay before the first retry; doubles per attempt
+            max_delay_seconds: Upper bound for the retry delay
+            max_attempts: Transmission attempts after which an event expires
+            max_age_seconds: Age after the first failure at which an event expires
+            spill_dir: Directory for the append-only spill file (None disables spill)
+        """
+        self.tak_server_id = tak_server_id
+        self.max_events = max_events
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_attempts = max_attempts
+        self.max_age_seconds = max_age_seconds
+        self.metrics = RetryMetrics()
+
+        self._entries: "OrderedDict[Hashable, RetryEntry]" = OrderedDict()
+        self._unkeyed = itertools.count()
+
+        # Spill state: read offset, record count and newest event time per UID
+        # in the file, plus the newest time delivered since a UID was spilled
+        self.spill_path: Optional[str] = None
+        self._spill_offset = 0
+        self._spilled_count = 0
+        self._spilled_uids: Dict[str, Optional[datetime]] = {}
+        self._delivered_since_spill: Dict[str, Optional[datetime]] = {}
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_path = os.path.join(
+                spill_dir, f"tak_server_{tak_server_id}.spill"
+            )
+            self._recover_spill_file()
+
+    def __len__(self) -> int:
+        return len(self._entries) + self._spilled_count
+
+    def add(self, events: Iterable[bytes], now: Optional[float] = None) -> int:
+        """
+        Buffer events from a batch that failed for the first time.
+
+        Args:
+            events: Events that could not be transmitted
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of events buffered
+        """
+        now = time.time() if now is None else now
+        return self.requeue([RetryEntry(event, 1, now, now) for event in events], now)
+
+    def requeue(
+        self, entries: Iterable[RetryEntry], now: Optional[float] = None
+    ) -> int:
+        """
+        Return entries whose retry failed, or buffer new entries.
+
+        Entries that reached max_attempts or max_age_seconds expire instead.
+
+        Args:
+            entries: Entries to buffer; attempts counts transmissions so far
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of entries buffered (in memory or spilled)
+        """
+        now = time.time() if now is None else now
+        buffered = 0
+        spill_records = []
+
+        for entry in entries:
+            if self._is_expired(entry, now):
+                self.metrics.events_expired += 1
+                continue
+            entry.next_attempt_at = now + self._backoff(entry.attempts)
+
+            key = self._key(entry.event)
+            if key in self._entries or len(self._entries) < self.max_events:
+                if self._store(key, entry):
+                    buffered += 1
+            elif self.spill_path:
+                spill_records.append(entry)
+            else:
+                self.metrics.events_dropped += 1
+
+        if spill_records:
+            buffered += self._spill(spill_records)
+
+        self.metrics.events_buffered += buffered
+        return buffered
+
+    def pop_due(self, limit: int, now: Optional[float] = None) -> List[RetryEntry]:
+        """
+        Remove and return up to limit entries whose backoff has elapsed.
+
+        Entries are returned in buffer order with attempts already incremented
+        for the transmission the caller is about to make.
+
+        Args:
+            limit: Maximum number of entries to return
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Due entries
+        """
+        now = time.time() if now is None else now
+        due = []
+
+        for key in list(self._entries):
+            if len(due) >= limit:
+                break
+            entry = self._entries[key]
+            if self._is_expired(entry, now):
+                del self._entries[key]
+                self.metrics.events_expired += 1
+            elif entry.next_attempt_at <= now:
+                del self._entries[key]
+                entry.attempts += 1
+                due.append(entry)
+
+        self.metrics.events_retried += len(due)
+        self._refill_from_spill(now)
+        return due
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next entry is due (0 if one is due), None if empty"""
+        if not self._entries:
+            return 0.0 if self._spilled_count else None
+        now = time.time() if now is None else now
+        next_attempt_at = min(
+            entry.next_attempt_at for entry in self._entries.values()
+        )
+        return max(0.0, next_attempt_at - now)
+
+    def discard_superseded(self, events: Iterable[bytes]) -> int:
+        """
+        Drop buffered positions that a newer event for the same UID replaces.
+
+        Called with each fresh batch taken from the transmission queue, so an
+        older position is never re-sent after a newer one.
+
+        Args:
+            events: Events about to be transmitted
+
+        Returns:
+            Number of buffered entries discarded
+        """
+        discarded = 0
+        for event in events:
+            uid = getattr(event, "uid", None)
+            if uid is None:
+                continue
+            event_time = getattr(event, "event_time", None)
+
+            entry = self._entries.get(uid)
+            if entry is not None and self._is_newer(event_time, entry.event):
+                del self._entries[uid]
+                discarded += 1
+
+            if uid in self._spilled_uids:
+                delivered = self._delivered_since_spill.get(uid)
+                if delivered is None or (
+                    event_time is not None and event_time > delivered
+                ):
+                    self._delivered_since_spill[uid] = event_time
+
+        self.metrics.events_superseded += discarded
+        return discarded
+
+    def clear(self) -> int:
+        """Drop every buffered event, including the spill file"""
+        cleared = len(self)
+        self._entries.clear()
+        self._reset_spill()
+        return cleared
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get buffer occupancy and counters"""
+        return {
+            "pending": len(self),
+            "in_memory": len(self._entries),
+            "spilled": self._spilled_count,
+            **asdict(self.metrics),
+        }
+
+    def _backoff(self, attempts: int) -> float:
+        """Retry delay after the given number of failed attempts"""
+        return min(
+            self.max_delay_seconds, self.base_delay_seconds * 2 ** max(attempts - 1, 0)
+        )
+
+    def _is_expired(self, entry: RetryEntry, now: float) -> bool:
+        return (
+            entry.attempts >= self.max_attempts
+            or now - entry.first_failed_at >= self.max_age_seconds
+        )
+
+    def _key(self, event: bytes) -> Hashable:
+        uid = getattr(event, "uid", None)
+        return uid if uid is not None else (None, next(self._unkeyed))
+
+    @staticmethod
+    def _is_newer(event_time: Optional[datetime], buffered: bytes) -> bool:
+        """Whether an event at event_time supersedes a buffered event"""
+        buffered_time = getattr(buffered, "event_time", None)
+        if event_time is None or buffered_time is None:
+            return True
+        return event_time >= buffered_time
+
+    def _store(self, key: Hashable, entry: RetryEntry) -> bool:
+        """Store an entry in memory, keeping only the newest position per UID"""
+        existing = self._entries.get(key)
+        if existing is not None:
+            self.metrics.events_superseded += 1
+            event_time = getattr(entry.event, "event_time", None)
+            if not self._is_newer(event_time, existing.event):
+                return False
+            del self._entries[key]
+        self._entries[key] = entry
+        return True
+
+    # Spill file handling
+
+    def _spill(self, entries: List[RetryEntry]) -> int:
+        """Append entries to the spill file"""
+        try:
+            with open(self.spill_path, "ab") as spill_file:
+                for entry in entries:
+                    spill_file.write(self._encode_record(entry))
+        except OSError as e:
+            logger.error(
+                f"Failed to spill {len(entries)} retry events for TAK server "
+                f"{self.tak_server_id}: {e}"
+            )
+            self.metrics.events_dropped += len(entries)
+            return 0
+
+        for entry in entries:
+            uid = getattr(entry.event, "uid", None)
+            if uid is not None:
+                event_time = getattr(entry.event, "event_time", None)
+                spilled_time = self._spilled_uids.get(uid)
+                if uid not in self._spilled_uids or (
+                    event_time is not None
+                    and (spilled_time is None or event_time > spilled_time)
+                ):
+                    self._spilled_uids[uid] = event_time
+                self._delivered_since_spill.pop(uid, None)
+
+        self._spilled_count += len(entries)
+        self.metrics.events_spilled += len(entries)
+        return len(entries)
+
+    def _refill_from_spill(self, now: float) -> None:
+        """Move spilled entries back into memory while there is room"""
+        if not self._spilled_count or len(self._entries) >= self.max_events:
+            return
+
+        try:
+            with open(self.spill_path, "rb") as spill_file:
+                spill_file.seek(self._spill_offset)
+                while self._spilled_count and len(self._entries) < self.max_events:
+                    entry = self._read_record(spill_file)
+                    if entry is None:
+                        self._spilled_count = 0
+                        break
+                    self._spill_offset = spill_file.tell()
+                    self._spilled_count -= 1
+                    self._restore(entry, now)
+        except OSError as e:
+            logger.error(
+                f"Failed to read retry spill file for TAK server "
+                f"{self.tak_server_id}: {e}"
+            )
+            self.metrics.events_dropped += self._spilled_count
+            self._spilled_count = 0
+
+        if not self._spilled_count:
+            self._reset_spill()
+
+    def _restore(self, entry: RetryEntry, now: float) -> None:
+        """Bring a spilled entry back into memory unless it is stale"""
+        if self._is_expired(entry, now):
+            self.metrics.events_expired += 1
+            return
+
+        uid = getattr(entry.event, "uid", None)
+        if uid in self._delivered_since_spill and self._is_newer(
+            self._delivered_since_spill[uid], entry.event
+        ):
+            self.metrics.events_superseded += 1
+            return
+
+        # Spilled events have already waited; retry them on the next pass
+        entry.next_attempt_at = min(entry.next_attempt_at, now)
+        self._store(self._key(entry.event), entry)
+
+    def _reset_spill(self) -> None:
+        """Truncate the spill file once everything in it has been consumed"""
+        self._spill_offset = 0
+        self._spilled_count = 0
+        self._spilled_uids.clear()
+        self._delivered_since_spill.clear()
+        if self.spill_path and os.path.exists(self.spill_path):
+            try:
+                os.remove(self.spill_path)
+            except OSError as e:
+                logger.warning(
+                    f"Failed to remove retry spill file {self.spill_path}: {e}"
+                )
+
+    def _recover_spill_file(self) -> None:
+        """Count records left in a spill file by a previous process"""
+        if not os.path.exists(self.spill_path):
+            return
+
+        valid_bytes = 0
+        try:
+            with open(self.spill_path, "rb") as spill_file:
+                while True:
+                    entry = self._read_record(spill_file)
+                    if entry is None:
+                        break
+                    valid_bytes = spill_file.tell()
+                    self._spilled_count += 1
+                    uid = getattr(entry.event, "uid", None)
+                    if uid is not None:
+                        self._spilled_uids[uid] = getattr(
+                            entry.event, "event_time", None
+                        )
+            # Drop a record torn by an interrupted write
+            if valid_bytes != os.path.getsize(self.spill_path):
+                with open(self.spill_path, "r+b") as spill_file:
+                    spill_file.truncate(valid_bytes)
+        except OSError as e:
+            logger.error(f"Failed to recover retry spill file {self.spill_path}: {e}")
+            self._spilled_count = 0
+            return
+
+        if self._spilled_count:
+            logger.info(
+                f"Recovered {self._spilled_count} spilled retry events for TAK "
+                f"server {self.tak_server_id}"
+            )
+        else:
+            self._reset_spill()
+
+    @staticmethod
+    def _encode_record(entry: RetryEntry) -> bytes:
+        event = entry.event
+        event_time = getattr(event, "event_time", None)
+        header = json.dumps(
+            {
+                "uid": getattr(event, "uid", None),
+                "event_time": event_time.isoformat() if event_time else None,
+                "stream_id": getattr(event, "stream_id", None),
+                "attempts": entry.attempts,
+                "first_failed_at": entry.first_failed_at,
+                "next_attempt_at": entry.next_attempt_at,
+            }
+        ).encode("utf-8")
+        return _SPILL_FRAME.pack(len(header), len(event)) + header + bytes(event)
+
+    @staticmethod
+    def _read_record(spill_file) -> Optional[RetryEntry]:
+        """Read the next record, or None at end of file or on a torn record"""
+        frame = spill_file.read(_SPILL_FRAME.size)
+        if len(frame) < _SPILL_FRAME.size:
+            return None
+        header_length, payload_length = _SPILL_FRAME.unpack(frame)
+        header_bytes = spill_file.read(header_length)
+        payload = spill_file.read(payload_length)
+        if len(header_bytes) < header_length or len(payload) < payload_length:
+            return None
+
+        try:
+            header = json.loads(header_bytes)
+        except ValueError:
+            return None
+        event_time = header.get("event_time")
+        event = QueuedCotEvent(
+            payload,
+            uid=header.get("uid"),
+            event_time=datetime.fromisoformat(event_time) if event_time else None,
+            stream_id=header.get("stream_id"),
+        )
+        return RetryEntry(
+            event,
+            header.get("attempts", 1),
+            header.get("first_failed_at", time.time()),
+            header.get("next_attempt_at", 0.0),
+        )
@@ -18,6 +18,7 @@ Key features:
     - Automatic session recovery and reinitialization on connection failures
     - Comprehensive logging for session lifecycle events and error tracking
     - Connection pool monitoring with per-host connection limiting
+    - ETag/Last-Modified validator store for plugins' conditional GETs
 
 Author: Emfour Solutions
 Created: 18-Jul-2025
@@ -25,7 +26,8 @@ Created: 18-Jul-2025
 
 # Standard library imports
 import asyncio
-from typing import Optional
+import time
+from typing import Dict, Optional
 from datetime import datetime
 
 # Third-party imports
@@ -39,6 +41,69 @@ from services.logging_service import get_module_logger
 logger = get_module_logger(__name__)
 
 
+class ConditionalRequestValidators:
+    """
+    ETag/Last-Modified validators remembered per URL for conditional GETs.
+
+    Validators older than max_age are not sent, so a full response is fetched
+    at least that often even when the upstream feed never changes.
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = max_age
+        self._validators: Dict[str, Dict[str, object]] = {}
+
+    def request_headers(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_age: Optional[float] = None,
+    ) -> Dict[str, str]:
+        """Copy of headers with If-None-Match/If-Modified-Since added for url"""
+        headers = dict(headers or {})
+        entry = self._validators.get(url)
+        if not entry:
+            return headers
+
+        max_age = self.max_age if max_age is None else max_age
+        if max_age is not None and time.monotonic() - entry["stored_at"] > max_age:
+            self._validators.pop(url, None)
+            return headers
+
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, url: str, status: int, response_headers) -> bool:
+        """
+        Remember the validators of a response.
+
+        Returns:
+            True if the response was 304 Not Modified
+        """
+        if status == 304:
+            return True
+
+        if status == 200:
+            etag = response_headers.get("ETag")
+            last_modified = response_headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validators[url] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "stored_at": time.monotonic(),
+                }
+            else:
+                self._validators.pop(url, None)
+        return False
+
+    def clear(self):
+        """Forget all validators so the next requests fetch in full"""
+        self._validators.clear()
+
+
 class SessionManager:
     """Manages HTTP sessions with enhanced connection pooling and caching"""
 
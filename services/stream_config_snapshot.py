@@ -0,0 +1,150 @@
+"""
+ABOUTME: Versioned per-stream configuration snapshots so a poll cycle reads
+ABOUTME: stream settings and callsign mappings without querying the database
+
+File: services/stream_config_snapshot.py
+
+Description:
+    A single poll cycle used to reload the stream row several times (for the
+    callsign mapping flag, the callsign settings and the CoT type mode) and
+    then query enabled and disabled callsign mappings separately. This module
+    bundles everything a poll needs into one immutable snapshot that is
+    loaded in a single database operation and reused until the stream's
+    configuration version changes.
+
+    Versions are process-wide counters bumped whenever a stream or its
+    callsign mappings are edited (stream updates, callsign mapping API
+    updates, hot-reloads, deletions). Stream workers keep their own snapshot
+    and compare its version against the current counter, so a steady-state
+    poll performs no configuration queries at all.
+
+Key features:
+    - Immutable snapshot of StreamDTO, derived config and callsign mappings
+    - Enabled and disabled mappings split once at load time
+    - Callsign mapping index compiled once per configuration version
+    - Thread-safe version counters that can be bumped from Flask routes
+    - Snapshots never outlive an invalidation of their stream
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+from services.callsign_mapping_index import CallsignMappingIndex
+from services.logging_service import get_module_logger
+
+if TYPE_CHECKING:
+    from models.dto import CallsignMappingDTO, StreamDTO
+
+logger = get_module_logger(__name__)
+
+
+@dataclass(frozen=True)
+class StreamConfigSnapshot:
+    """Stream settings and callsign mappings as of one configuration version"""
+
+    stream_id: int
+    version: int
+    stream: "StreamDTO"
+    config: Dict[str, Any]
+    callsign_mappings: Dict[str, "CallsignMappingDTO"]
+    disabled_mappings: Dict[str, "CallsignMappingDTO"]
+    mapping_index: CallsignMappingIndex
+
+    @classmethod
+    def build(
+        cls,
+        stream: "StreamDTO",
+        mappings: Iterable["CallsignMappingDTO"],
+        version: int,
+    ) -> "StreamConfigSnapshot":
+        """Build a snapshot from a stream DTO and all of its callsign mappings"""
+        callsign_mappings = {}
+        disabled_mappings = {}
+        for mapping in mappings:
+            if mapping.enabled:
+                callsign_mappings[mapping.identifier_value] = mapping
+            else:
+                disabled_mappings[mapping.identifier_value] = mapping
+
+        config = {
+            "enable_callsign_mapping": getattr(
+                stream, "enable_callsign_mapping", False
+            ),
+            "callsign_identifier_field": getattr(
+                stream, "callsign_identifier_field", None
+            ),
+            "callsign_error_handling": getattr(
+                stream, "callsign_error_handling", "fallback"
+            ),
+            "enable_per_callsign_cot_types": getattr(
+                stream, "enable_per_callsign_cot_types", False
+            ),
+            "cot_type_mode": getattr(stream, "cot_type_mode", "stream"),
+        }
+
+        return cls(
+            stream_id=stream.id,
+            version=version,
+            stream=stream,
+            config=config,
+            callsign_mappings=callsign_mappings,
+            disabled_mappings=disabled_mappings,
+            mapping_index=CallsignMappingIndex.compile(
+                config, callsign_mappings, disabled_mappings
+            ),
+        )
+
+
+class StreamConfigVersions:
+    """Process-wide configuration version counters per stream"""
+
+    def __init__(self):
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, stream_id: int) -> int:
+        """Get the current configuration version of a stream"""
+        with self._lock:
+            return self._versions.get(stream_id, 0)
+
+    def invalidate(self, stream_id: int) -> int:
+        """Bump a stream's configuration version so snapshots are reloaded"""
+        with self._lock:
+            version = self._versions.get(stream_id, 0) + 1
+            self._versions[stream_id] = version
+
+        logger.debug(
+            f"Stream {stream_id} configuration invalidated (version {version})"
+        )
+        return version
+
+
+# Global version registry
+_stream_config_versions: Optional[StreamConfigVersions] = None
+_stream_config_versions_lock = threading.Lock()
+
+
+def get_stream_config_versions() -> StreamConfigVersions:
+    """Get the process-wide stream configuration version registry"""
+    global _stream_config_versions
+    if _stream_config_versions is None:
+        with _stream_config_versions_lock:
+            if _stream_config_versions is None:
+                _stream_config_versions = StreamConfigVersions()
+    return _stream_config_versions
+
+
+def invalidate_stream_config(stream_id: int) -> int:
+    """Invalidate cached configuration snapshots of a stream after an edit"""
+    return get_stream_config_versions().invalidate(stream_id)
+
+
+def reset_stream_config_versions():
+    """Reset the stream configuration version registry (for testing)"""
+    global _stream_config_versions
+    with _stream_config_versions_lock:
+        _stream_config_versions = None
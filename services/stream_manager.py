@@ -47,16 +47,25 @@ from typing import Dict, List, Optional
 # Local application imports
 from services.cot_service import get_cot_service
 from services.config_cache_service import get_config_cache_service
-from services.database_manager import DatabaseManager
+from services.database_manager import (
+    DatabaseManager,
+    get_status_flush_interval,
+    shutdown_db_executor,
+    start_stream_status_aggregator,
+    stop_stream_status_aggregator,
+)
 from services.exceptions import (
     StreamConfigurationError,
     StreamManagerError,
     StreamNotFoundError,
 )
 from services.logging_service import get_module_logger
+from services.poll_scheduler import HostRateLimiter, PollScheduler
 from services.queue_monitoring import get_queue_monitoring_service
 from services.queue_performance_optimizer import get_performance_optimizer
 from services.session_manager import SessionManager
+from services.stream_config_snapshot import invalidate_stream_config
+from services.stream_shards import StreamShard, get_shard_count, run_on_loop
 from services.stream_worker import StreamWorker
 
 # Worker coordination import removed for single worker deployment
@@ -72,7 +81,13 @@ logger = get_module_logger(__name__)
 class StreamManager:
     """tream manager with database operations"""
 
-    def __init__(self, app_context_factory=None):
+    def __init__(
+        self,
+        app_context_factory=None,
+        poll_scheduler_config=None,
+        stream_shards_config=None,
+        stream_status_config=None,
+    ):
         self.workers: Dict[int, StreamWorker] = {}
         self.running = False
         self._loop = None
@@ -91,6 +106,27 @@ class StreamManager:
 
         # Initialize dependencies
         self.db_manager = DatabaseManager(app_context_factory)
+
+        # Per-poll stream status is written behind in bulk (threading.yaml
+        # stream_status); the aggregator runs alongside the background loop
+        self._status_flush_interval = get_status_flush_interval(stream_status_config)
+
+        # Streams are spread over shard event loops (threading.yaml
+        # stream_shards); shard 0 is this manager's loop
+        self._shard_count = get_shard_count(stream_shards_config)
+        # One host rate limit for all shards' schedulers
+        host_limiter = HostRateLimiter.from_config(poll_scheduler_config)
+        self._shards: List[StreamShard] = [
+            StreamShard(index, poll_scheduler_config, self._shard_count, host_limiter)
+            for index in range(1, self._shard_count)
+        ]
+
+        # Central scheduler staggering stream polls (threading.yaml poll_scheduler)
+        self.poll_scheduler = PollScheduler.from_config(
+            poll_scheduler_config,
+            shard_count=self._shard_count,
+            host_limiter=host_limiter,
+        )
         self.session_manager = SessionManager()
         self.config_cache = get_config_cache_service()
 
@@ -106,6 +142,24 @@ class StreamManager:
 
         # Start background loop
         self._start_background_loop()
+        self._start_shards()
+
+    def _start_shards(self):
+        """Start the additional stream shard event loops"""
+        for shard in self._shards:
+            shard.start()
+        if self._shards:
+            logger.info(f"Streams distributed over {self._shard_count} event loops")
+
+    def _shard_for(self, stream_id: int) -> Optional[StreamShard]:
+        """Shard running a stream, or None for the manager loop"""
+        index = stream_id % self._shard_count
+        return self._shards[index - 1] if index else None
+
+    async def _run_in_shard(self, stream_id: int, coro):
+        """Run a worker coroutine on the event loop owning the stream"""
+        shard = self._shard_for(stream_id)
+        return await run_on_loop(shard.loop if shard else None, coro)
 
     def _has_tak_servers_configured(self, stream) -> bool:
         """
@@ -303,6 +357,9 @@ class StreamManager:
         try:
             logger.info(f"Hot-reloading configuration for stream {stream_id}")
 
+            # Running workers reload their config snapshot on the next poll
+            invalidate_stream_config(stream_id)
+
             # Get fresh stream data from database
             stream = await asyncio.get_event_loop().run_in_executor(
                 None, self.db_manager.get_stream_with_relationships, stream_id
@@ -357,7 +414,9 @@ class StreamManager:
                     worker = self._stream_workers.get(stream_id)
                     if worker and hasattr(worker, "update_configuration"):
                         try:
-                            await worker.update_configuration(new_config_data)
+                            await self._run_in_shard(
+                                stream_id, worker.update_configuration(new_config_data)
+                            )
                             logger.info(f"Hot-reload successful for stream {stream_id}")
                             return True
                         except Exception as e:
@@ -719,6 +778,8 @@ class StreamManager:
                 return
             self._initialized = True
 
+        start_stream_status_aggregator(self.db_manager, self._status_flush_interval)
+
         def run_loop():
             # Create new event loop for this thread
             self._loop = asyncio.new_event_loop()
@@ -882,7 +943,9 @@ class StreamManager:
                     # Clean up dead worker
                     logger.info(f"Cleaning up dead worker for stream {stream_id}")
                     try:
-                        await asyncio.wait_for(worker.stop(), timeout=15)
+                        await asyncio.wait_for(
+                            self._run_in_shard(stream_id, worker.stop()), timeout=15
+                        )
                     except asyncio.TimeoutError:
                         logger.error(
                             f"Timeout cleaning up worker for stream {stream_id}"
@@ -923,15 +986,28 @@ class StreamManager:
 
             # Create worker
             logger.debug(f"Creating worker for stream {stream_id} ({stream.name})")
-            worker = StreamWorker(stream, self.session_manager, self.db_manager)
+            shard = self._shard_for(stream_id)
+            worker = StreamWorker(
+                stream,
+                shard.session_manager if shard else self.session_manager,
+                self.db_manager,
+                poll_scheduler=shard.poll_scheduler if shard else self.poll_scheduler,
+            )
+            if shard:
+                # TAK transmission workers stay on the manager loop
+                worker.tak_loop = self._loop
 
             # Start worker with timeout
             try:
-                success = await asyncio.wait_for(worker.start(), timeout=120)
+                success = await asyncio.wait_for(
+                    self._run_in_shard(stream_id, worker.start()), timeout=120
+                )
             except asyncio.TimeoutError as e:
                 logger.error(f"Timeout starting worker for stream {stream_id}: {e}")
                 try:
-                    await asyncio.wait_for(worker.stop(), timeout=15)
+                    await asyncio.wait_for(
+                        self._run_in_shard(stream_id, worker.stop()), timeout=15
+                    )
                 except Exception as cleanup_error:
                     logger.error(
                         f"Error stopping worker for stream {stream_id} "
@@ -980,7 +1056,10 @@ class StreamManager:
 
             worker = self.workers[stream_id]
             await asyncio.wait_for(
-                worker.stop(skip_db_update=skip_db_update), timeout=20
+                self._run_in_shard(
+                    stream_id, worker.stop(skip_db_update=skip_db_update)
+                ),
+                timeout=20,
             )
             del self.workers[stream_id]
 
@@ -1156,7 +1235,10 @@ class StreamManager:
             # Stop the worker with timeout and error handling
             try:
                 await asyncio.wait_for(
-                    worker.stop(skip_db_update=skip_db_update), timeout=30.0
+                    self._run_in_shard(
+                        stream_id, worker.stop(skip_db_update=skip_db_update)
+                    ),
+                    timeout=30.0,
                 )
             except asyncio.TimeoutError:
                 logger.error(
@@ -1753,6 +1835,20 @@ class StreamManager:
                 f"Error cleaning up persistent COT service during shutdown: {e}"
             )
 
+        # Stop dispatching polls and drop pending poll turns
+        if self.poll_scheduler and self._loop and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self.poll_scheduler.stop)
+            except Exception as e:
+                logger.error(f"Error stopping poll scheduler: {e}")
+
+        # Stop the stream shard loops (their workers were stopped by stop_all)
+        for shard in self._shards:
+            try:
+                shard.stop()
+            except Exception as e:
+                logger.error(f"Error stopping {shard.name}: {e}")
+
         # Cancel health check task
         if self._health_check_task and not self._health_check_task.done():
             try:
@@ -1773,6 +1869,18 @@ class StreamManager:
 
         # Worker coordination service close removed for single worker deployment
 
+        # Write any buffered stream status before releasing database resources
+        try:
+            stop_stream_status_aggregator()
+        except Exception as e:
+            logger.error(f"Error flushing stream status during shutdown: {e}")
+
+        # Release the database thread pool used by stream workers
+        try:
+            shutdown_db_executor(wait=False)
+        except Exception as e:
+            logger.error(f"Error shutting down database executor: {e}")
+
         # Clear references to avoid memory leaks
         self.workers.clear()
         self.db_manager = None
@@ -1925,6 +2033,11 @@ class StreamManager:
                 )
                 return False
 
+            # A running stream worker routes to the refreshed server list
+            worker = self.workers.get(stream_id)
+            if worker:
+                worker.refresh_tak_routes(stream)
+
             # Determine required TAK servers for this stream
             required_servers = {}
 
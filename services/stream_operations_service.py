@@ -44,6 +44,7 @@ from typing import Any, Dict, Optional
 # Local application imports
 from models.stream import Stream
 from services.exceptions import DatabaseError, StreamConfigurationError
+from services.stream_config_snapshot import invalidate_stream_config
 
 # Worker coordination import removed for single worker deployment
 
@@ -373,6 +374,7 @@ class StreamOperationsService:
             session = self._get_session()
             session.delete(stream)
             session.commit()
+            invalidate_stream_config(stream_id)
 
             logger.info(f"Stream {stream_id} deleted successfully")
             return {"success": True, "message": "Stream deleted successfully"}
@@ -573,6 +575,9 @@ class StreamOperationsService:
                 # Attempt to commit the transaction
                 self._get_session().commit()
 
+                # Running workers reload their config snapshot on the next poll
+                invalidate_stream_config(stream_id)
+
                 logger.debug(
                     f"Stream {stream_id} updated successfully on {db_type} (attempt {attempt + 1})"
                 )
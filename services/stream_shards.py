@@ -0,0 +1,168 @@
+"""
+ABOUTME: Additional event loop threads ("shards") that run a subset of stream
+ABOUTME: workers so one slow stream cannot stall every other stream's polls
+
+File: services/stream_shards.py
+
+Description:
+    By default every stream worker, every TAK transmission worker and the
+    monitoring tasks share the StreamManager's single event loop, so one
+    slow plugin parse or CoT batch delays everybody. When sharding is
+    enabled (stream_shards.count in config/settings/threading.yaml) the
+    StreamManager assigns each stream to a shard by stream id. Shard 0 is
+    the StreamManager loop itself, which keeps ownership of the TAK
+    transmission workers and their queues; the other shards are the
+    StreamShard threads defined here, each with its own event loop, HTTP
+    session and poll scheduler. The schedulers split max_concurrent_polls
+    between them and share one HostRateLimiter, so host_min_interval is
+    enforced per upstream host across all shards.
+
+    Stream workers on a shard fetch, map and build CoT events on their own
+    loop and hand finished events (and worker start requests) over to the
+    TAK loop through run_on_loop, which submits the coroutine to the target
+    loop's thread-safe call queue.
+
+Key features:
+    - Event loop thread per shard with its own aiohttp session
+    - Per-shard poll scheduler sharing the global poll concurrency budget
+      and the per-host rate limit
+    - Stable stream-to-shard assignment by stream id
+    - Cross-loop coroutine hand-off helper
+    - Orderly shutdown cancelling shard tasks and closing sessions
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from services.logging_service import get_module_logger
+from services.poll_scheduler import HostRateLimiter, PollScheduler
+from services.session_manager import SessionManager
+
+logger = get_module_logger(__name__)
+
+
+async def run_on_loop(loop: Optional[asyncio.AbstractEventLoop], coro) -> Any:
+    """
+    Await a coroutine on another event loop.
+
+    Runs the coroutine directly when no loop is given or the loop is the
+    current one, otherwise submits it to the target loop and waits for it
+    without blocking the current loop.
+    """
+    if loop is None or loop is asyncio.get_running_loop():
+        return await coro
+    if loop.is_closed():
+        coro.close()
+        raise RuntimeError("Target event loop is closed")
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def get_shard_count(config: Optional[Dict[str, Any]]) -> int:
+    """Number of stream shards from the stream_shards section of threading.yaml"""
+    try:
+        return max(1, int((config or {}).get("count", 1)))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid stream_shards count: {config}")
+        return 1
+
+
+class StreamShard:
+    """Event loop thread running the stream workers assigned to one shard"""
+
+    def __init__(
+        self,
+        index: int,
+        poll_scheduler_config=None,
+        shard_count: int = 1,
+        host_limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.index = index
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.session_manager = SessionManager()
+        self.poll_scheduler = PollScheduler.from_config(
+            poll_scheduler_config, shard_count=shard_count, host_limiter=host_limiter
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def name(self) -> str:
+        return f"StreamShard-{self.index}"
+
+    def start(self, timeout: float = 10.0):
+        """Start the shard thread and wait for its loop to run"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run_loop():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self.session_manager.initialize())
+                self.loop.call_soon(self._ready.set)
+                self.loop.run_forever()
+            except Exception as e:
+                logger.error(f"Error in {self.name} event loop: {e}", exc_info=True)
+            finally:
+                self._ready.set()
+                self._close_loop()
+
+        self._thread = threading.Thread(target=run_loop, daemon=True, name=self.name)
+        self._thread.start()
+
+        if not self._ready.wait(timeout) or not self.is_running:
+            raise RuntimeError(f"Failed to start {self.name} event loop")
+        logger.info(f"{self.name} event loop started")
+
+    @property
+    def is_running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    async def run(self, coro) -> Any:
+        """Run a coroutine on this shard's loop from another loop"""
+        return await run_on_loop(self.loop, coro)
+
+    def _close_loop(self):
+        loop = self.loop
+        try:
+            if self.poll_scheduler:
+                self.poll_scheduler.stop()
+
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+
+            loop.run_until_complete(self.session_manager.cleanup())
+        except Exception as e:
+            logger.error(f"Error cleaning up {self.name}: {e}")
+        finally:
+            loop.close()
+            logger.info(f"{self.name} event loop closed")
+
+    def stop(self, timeout: float = 15.0):
+        """Stop the shard loop, cancelling its remaining tasks"""
+        if self.loop and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+            except RuntimeError:
+                # Loop closed between the check and the call
+                pass
+
+        if self._thread and self._thread.is_alive():
+            started = time.monotonic()
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    f"{self.name} did not terminate within {timeout}s "
+                    f"(waited {time.monotonic() - started:.1f}s)"
+                )
+        self._thread = None
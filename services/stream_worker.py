@@ -25,23 +25,38 @@ import asyncio
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
 
 # Local application imports
 from plugins.plugin_manager import get_plugin_manager
 from services.cot_service import get_cot_service
+from services.database_manager import (
+    AsyncDatabaseManager,
+    get_stream_status_aggregator,
+)
+from services.position_change_filter import PositionChangeFilter
+from services.stream_config_snapshot import (
+    StreamConfigSnapshot,
+    get_stream_config_versions,
+)
+from services.stream_shards import run_on_loop
 
 
 class StreamWorker:
     """Individual stream worker that handles a single feed"""
 
-    def __init__(self, stream, session_manager, db_manager):
+    def __init__(self, stream, session_manager, db_manager, poll_scheduler=None):
         self.stream = stream
         self.plugin = None
         self.running = False
         self.task = None
         self.session_manager = session_manager
         self.db_manager = db_manager
+        # Non-blocking access for the shared stream event loop
+        self.async_db = AsyncDatabaseManager(db_manager)
+        # Stream settings and callsign mappings, reloaded only after edits
+        self._config_snapshot = None
         self.logger = logging.getLogger(f"stream_worker.{stream.name}")
         self.reader = None
         self.writer = None
@@ -53,6 +68,13 @@ class StreamWorker:
         self._tak_worker_ensured = (
             False  # Track if we've ensured the persistent worker exists
         )
+        # Resolved TAK server routes, reloaded only on relationship changes
+        self._tak_routes = None
+        # COT service worker generation the routes were last ensured against
+        self._tak_routes_generation = None
+        self._tak_routes_running = 0
+        # Fingerprints of positions already sent, to skip unchanged trackers
+        self._position_filter = PositionChangeFilter()
 
         # Adaptive polling optimization metrics
         self._last_data_volumes = []  # Track last 10 poll data volumes
@@ -64,6 +86,13 @@ class StreamWorker:
         self._max_poll_interval = stream.poll_interval * 3  # Maximum 3x configured
         self._base_poll_interval = stream.poll_interval
 
+        # Central scheduler granting poll turns (None = independent timer)
+        self.poll_scheduler = poll_scheduler
+        self._poll_host = None
+        # Loop owning the TAK transmission workers when this worker runs on
+        # a stream shard (None = same loop)
+        self.tak_loop = None
+
     @property
     def startup_complete(self):
         return self._startup_complete
@@ -250,19 +279,11 @@ class StreamWorker:
                     return False
 
                 # Initialize persistent TAK server connections for all configured servers
-                target_servers = await self._get_target_tak_servers()
+                target_servers = await self._get_target_tak_servers(
+                    force_ensure=True
+                )
                 if target_servers:
-                    self.logger.debug(
-                        f"Initializing persistent workers for {len(target_servers)} TAK servers"
-                    )
-                    workers_initialized = 0
-                    for server in target_servers:
-                        if await self._ensure_persistent_tak_worker_for_server(server):
-                            workers_initialized += 1
-                        else:
-                            self.logger.warning(
-                                f"Failed to initialize worker for server {server.name}"
-                            )
+                    workers_initialized = self._tak_routes_running
 
                     if workers_initialized == 0:
                         self.logger.error(
@@ -348,6 +369,13 @@ class StreamWorker:
                         f"Task for stream '{self.stream.name}' was cancelled or timed out"
                     )
 
+            # Release plugin resources such as push connections
+            if self.plugin:
+                try:
+                    await self.plugin.close()
+                except Exception as e:
+                    self.logger.debug(f"Error closing plugin (non-critical): {e}")
+
             # Note: We don't stop the persistent worker here as other streams might be using it
             # The QueuedCOTService manages worker lifecycle automatically
             self._tak_worker_ensured = False
@@ -360,17 +388,42 @@ class StreamWorker:
 
     async def _update_stream_status_async(self, **kwargs):
         """Update stream status asynchronously"""
+        is_active = kwargs.get("is_active")
+        last_error = kwargs.get("last_error")
+        messages_sent = kwargs.get("messages_sent")
+        last_poll_time = kwargs.get("last_poll_time")
+
+        aggregator = get_stream_status_aggregator()
+        if aggregator is not None:
+            if is_active is None:
+                # Per-poll status is coalesced and written in bulk
+                aggregator.record(
+                    self.stream.id,
+                    last_error=last_error,
+                    messages_sent=messages_sent,
+                    last_poll_time=last_poll_time,
+                )
+                return True
+
+            # Fold pending per-poll status into this immediate write so an
+            # older buffered value cannot overwrite it on the next flush
+            pending = aggregator.take(self.stream.id)
+            if pending is not None:
+                if last_error is None:
+                    last_error = pending.last_error
+                if last_poll_time is None:
+                    last_poll_time = pending.last_poll
+                if pending.messages_sent:
+                    messages_sent = (messages_sent or 0) + pending.messages_sent
+
         try:
-            # Run database operation in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            success = await loop.run_in_executor(
-                None,
-                self.db_manager.update_stream_status,
+            # Runs on the database thread pool to avoid blocking the loop
+            success = await self.async_db.update_stream_status(
                 self.stream.id,
-                kwargs.get("is_active"),
-                kwargs.get("last_error"),
-                kwargs.get("messages_sent"),
-                kwargs.get("last_poll_time"),
+                is_active,
+                last_error,
+                messages_sent,
+                last_poll_time,
             )
             return success
         except Exception as e:
@@ -404,7 +457,9 @@ class StreamWorker:
                 return True
 
             # Start the worker
-            success = await get_cot_service().start_worker(tak_server)
+            success = await run_on_loop(
+                self.tak_loop, get_cot_service().start_worker(tak_server)
+            )
             if not success:
                 self.logger.error(
                     f"Failed to start persistent worker for TAK server {tak_server.name}"
@@ -472,7 +527,23 @@ class StreamWorker:
             f"Starting main loop for stream '{self.stream.name}' (ID: {self.stream.id})"
         )
 
+        # First poll starts immediately, or at a random phase when scheduled
+        next_delay = (
+            self.poll_scheduler.initial_delay(self._base_poll_interval)
+            if self.poll_scheduler
+            else 0
+        )
+
+        # Pushed data may only cut the delay short after a poll that reached
+        # the plugin (and so drained its push buffer) without failing
+        wake_on_push = True
+
         while self.running:
+            poll_turn = await self._wait_for_poll_turn(next_delay, wake_on_push)
+            if poll_turn is None:
+                # Stop was requested while waiting
+                break
+
             try:
                 self.logger.debug(
                     f"Poll cycle starting for stream '{self.stream.name}'"
@@ -489,6 +560,10 @@ class StreamWorker:
                         locations = await self.plugin.fetch_locations_with_protection(
                             self.session_manager.session
                         )
+                    wake_on_push = (
+                        getattr(self.plugin, "last_fetch_circuit_open", False)
+                        is not True
+                    )
                 except asyncio.TimeoutError:
                     self.logger.error(
                         "Plugin fetch_locations timed out after 90 seconds"
@@ -517,6 +592,9 @@ class StreamWorker:
                             last_error=None, last_poll_time=datetime.now(timezone.utc)
                         )
                         self._consecutive_errors = 0
+                        next_delay = self._calculate_adaptive_poll_interval(
+                            0, asyncio.get_event_loop().time() - poll_start_time
+                        )
                         continue
 
                     # Send to persistent TAK server(s) if configured
@@ -532,34 +610,19 @@ class StreamWorker:
                             self.logger.error(
                                 "Failed to send locations to TAK server(s)"
                             )
-                            # Try to restart workers for all target servers
+                            # Transmission workers reconnect on their own, so
+                            # only workers that have exited are started again
                             self.logger.info(
-                                "Attempting to restart persistent TAK workers"
+                                "Ensuring persistent TAK workers are running"
                             )
-                            target_servers = await self._get_target_tak_servers()
-
-                            # Stop all workers
-                            for server in target_servers:
-                                try:
-                                    await get_cot_service().stop_worker(server.id)
-                                except Exception as e:
-                                    self.logger.warning(
-                                        f"Error stopping worker for {server.name}: {e}"
-                                    )
-
-                            await asyncio.sleep(2)  # Brief delay
-
-                            # Restart workers
-                            workers_restarted = 0
-                            for server in target_servers:
-                                if await self._ensure_persistent_tak_worker_for_server(
-                                    server
-                                ):
-                                    workers_restarted += 1
+                            target_servers = await self._get_target_tak_servers(
+                                force_ensure=True
+                            )
+                            workers_restarted = self._tak_routes_running
 
                             if workers_restarted > 0:
                                 self.logger.info(
-                                    f"Restarted {workers_restarted}/{len(target_servers)} workers"
+                                    f"{workers_restarted}/{len(target_servers)} workers running"
                                 )
                                 # Retry sending
                                 success = await self._send_locations_to_persistent_tak(
@@ -567,11 +630,11 @@ class StreamWorker:
                                 )
                                 if not success:
                                     raise Exception(
-                                        "Failed to send locations after worker restart"
+                                        "Failed to send locations after ensuring workers"
                                     )
                             else:
                                 raise Exception(
-                                    "Failed to restart any persistent TAK workers"
+                                    "Failed to start any persistent TAK workers"
                                 )
                     else:
                         self.logger.warning("No persistent TAK workers ensured")
@@ -585,6 +648,17 @@ class StreamWorker:
                     self._last_successful_poll = datetime.now(timezone.utc)
                     self.logger.debug("Poll cycle completed successfully")
 
+                elif getattr(self.plugin, "last_fetch_not_modified", False) is True:
+                    # 304 Not Modified: nothing was parsed and nothing to send
+                    self.logger.debug(
+                        f"{self.stream.plugin_type} feed not modified since last poll"
+                    )
+                    await self._update_stream_status_async(
+                        last_error=None, last_poll_time=datetime.now(timezone.utc)
+                    )
+                    self._consecutive_errors = 0
+                    self._last_successful_poll = datetime.now(timezone.utc)
+
                 else:
                     self.logger.warning(
                         f"No locations retrieved from {self.stream.plugin_type} plugin"
@@ -599,27 +673,17 @@ class StreamWorker:
                 poll_duration = poll_end_time - poll_start_time
                 data_count = len(locations) if locations else 0
 
-                # Calculate optimized polling interval
-                adaptive_interval = self._calculate_adaptive_poll_interval(
+                # Calculate optimized polling interval for the next turn
+                next_delay = self._calculate_adaptive_poll_interval(
                     data_count, poll_duration
                 )
 
-                # Wait for next poll or stop signal using adaptive interval
-                try:
-                    await asyncio.wait_for(
-                        self._stop_event.wait(), timeout=adaptive_interval
-                    )
-                    # If we get here, stop was requested
-                    break
-                except asyncio.TimeoutError:
-                    # Normal timeout, continue to next poll
-                    pass
-
             except asyncio.CancelledError:
                 self.logger.info("Stream loop cancelled")
                 break
 
             except Exception as e:
+                wake_on_push = False
                 self._consecutive_errors += 1
                 error_msg = (
                     f"Error in stream loop (attempt {self._consecutive_errors}): {e}"
@@ -650,17 +714,99 @@ class StreamWorker:
                     max_backoff,
                 )
                 self.logger.info(f"Waiting {retry_delay} seconds before retry")
+                next_delay = retry_delay
 
-                try:
-                    await asyncio.wait_for(self._stop_event.wait(), timeout=retry_delay)
-                    # If we get here, stop was requested
-                    break
-                except asyncio.TimeoutError:
-                    # Normal timeout, continue
-                    pass
+            finally:
+                self._release_poll_turn(poll_turn)
 
         self.logger.info(f"Main loop for stream '{self.stream.name}' has ended")
 
+    def _get_poll_host(self) -> str:
+        """Upstream host key used by the poll scheduler's per-host rate limit"""
+        if self._poll_host is None:
+            host = None
+            config = getattr(self.plugin, "config", None)
+            if isinstance(config, dict):
+                for url_field in ["url", "endpoint", "server_url", "api_url"]:
+                    if config.get(url_field):
+                        host = urlparse(str(config[url_field])).netloc.lower()
+                        break
+            self._poll_host = host or str(self.stream.plugin_type)
+        return self._poll_host
+
+    async def _wait_for_poll_turn(self, delay: float, wake_on_push: bool = True):
+        """
+        Wait until the next poll may start.
+
+        Without a scheduler this simply waits for the delay. With a scheduler
+        the delay is jittered and the poll starts when the scheduler grants
+        the turn, respecting its concurrency cap and per-host rate limit.
+        If the plugin has a push feed and wake_on_push is set, pushed data
+        cuts the delay short.
+
+        Returns:
+            The granted turn (pass it to _release_poll_turn), or None when a
+            stop was requested while waiting
+        """
+        scheduler = self.poll_scheduler
+        push_event = getattr(self.plugin, "push_event", None) if wake_on_push else None
+        if not isinstance(push_event, asyncio.Event):
+            push_event = None
+
+        if scheduler is None:
+            if delay > 0:
+                waiters = {asyncio.ensure_future(self._stop_event.wait())}
+                if push_event is not None:
+                    waiters.add(asyncio.ensure_future(push_event.wait()))
+                try:
+                    await asyncio.wait(
+                        waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    for waiter in waiters:
+                        waiter.cancel()
+            return None if self._stop_event.is_set() else True
+
+        ticket = scheduler.schedule(
+            self.stream.id, scheduler.jittered(delay), self._get_poll_host()
+        )
+        stop_wait = asyncio.ensure_future(self._stop_event.wait())
+        push_wait = (
+            asyncio.ensure_future(push_event.wait()) if push_event is not None else None
+        )
+        try:
+            waiters = {ticket.future, stop_wait}
+            if push_wait is not None:
+                waiters.add(push_wait)
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+
+            if (
+                push_wait in done
+                and not ticket.future.done()
+                and not self._stop_event.is_set()
+            ):
+                # Pushed data is waiting: ask for the earliest turn instead
+                scheduler.cancel(ticket)
+                ticket = scheduler.schedule(self.stream.id, 0, self._get_poll_host())
+                await asyncio.wait(
+                    {ticket.future, stop_wait}, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            stop_wait.cancel()
+            if push_wait is not None:
+                push_wait.cancel()
+            if not ticket.future.done() or self._stop_event.is_set():
+                scheduler.cancel(ticket)
+
+        if self._stop_event.is_set() or ticket.future.cancelled():
+            return None
+        return ticket
+
+    def _release_poll_turn(self, poll_turn):
+        """Hand a granted poll turn back to the scheduler"""
+        if self.poll_scheduler is not None and poll_turn is not True:
+            self.poll_scheduler.release(poll_turn)
+
     async def _send_locations_to_persistent_tak(self, locations: List[Dict]) -> bool:
         """
         Send locations to persistent TAK server(s) using the persistent service.
@@ -732,8 +878,38 @@ class StreamWorker:
             # Create COT events once (shared across all servers)
             from services.cot_service_integration import get_queued_cot_service
 
+            stream_default_cot_type = self.stream.cot_type or "a-f-G-U-C"
+            stale_time = self.stream.cot_stale_time or 300
+
+            # Only trackers that moved (or are due a heartbeat) become events
+            valid_locations = (
+                [
+                    loc
+                    for loc in locations
+                    if not (isinstance(loc, dict) and "_error" in loc)
+                ]
+                if error_locations
+                else locations
+            )
+            changed_locations, sent_fingerprints = self._position_filter.select(
+                valid_locations,
+                stale_time,
+                context=(stream_default_cot_type, cot_type_mode),
+                poll_interval=self.stream.poll_interval or 0,
+            )
+            if not changed_locations:
+                self.logger.debug(
+                    f"All {len(valid_locations)} positions unchanged, nothing to send"
+                )
+                return True
+            if len(changed_locations) < len(valid_locations):
+                self.logger.debug(
+                    f"Sending {len(changed_locations)}/{len(valid_locations)} "
+                    f"changed positions"
+                )
+            locations = changed_locations
+
             try:
-                stream_default_cot_type = self.stream.cot_type or "a-f-G-U-C"
                 self.logger.debug(
                     f"Creating COT events: mode='{cot_type_mode}', "
                     f"stream_default_cot_type='{stream_default_cot_type}', "
@@ -749,8 +925,9 @@ class StreamWorker:
                 cot_events = await cot_service.create_cot_events(
                     locations,
                     stream_default_cot_type,
-                    self.stream.cot_stale_time or 300,
+                    stale_time,
                     cot_type_mode,
+                    stream_id=self.stream.id,
                 )
                 self.logger.info(
                     f"Created {len(cot_events) if cot_events else 0} COT events"
@@ -803,6 +980,8 @@ class StreamWorker:
 
             # Partial success is acceptable (server failure isolation)
             # As long as at least one server received the data, consider it successful
+            if successful_servers:
+                self._position_filter.commit(sent_fingerprints)
             return len(successful_servers) > 0
 
         except Exception as e:
@@ -843,216 +1022,86 @@ class StreamWorker:
 
     async def _apply_callsign_mapping(self, locations: List[Dict]) -> None:
         """Apply callsign mapping to locations if configured"""
-        # Refresh stream configuration from database to get latest settings
-        fresh_enable_mapping = await self._get_fresh_callsign_mapping_config()
-
-        # Early exit if callsign mapping not enabled (use fresh config)
-        if not bool(fresh_enable_mapping):
-            self.logger.debug("Callsign mapping disabled, skipping")
-            return
-
-        # Get fresh stream configuration from database for callsign settings
-        fresh_stream_config = await self._get_fresh_stream_config()
-        if not fresh_stream_config:
+        # Stream settings and mappings come from the versioned config snapshot
+        snapshot = await self._get_config_snapshot()
+        if not snapshot:
             self.logger.error(
                 "Failed to load fresh stream configuration, skipping callsign mapping"
             )
             return
 
-        # Load enabled mappings from database table
-        callsign_mappings = await self._load_callsign_mappings()
-
-        # Also load disabled mappings for filtering purposes
-        disabled_mappings = await self._load_disabled_callsign_mappings()
+        # Early exit if callsign mapping not enabled
+        if not bool(snapshot.config.get("enable_callsign_mapping")):
+            self.logger.debug("Callsign mapping disabled, skipping")
+            return
 
-        if not callsign_mappings:
-            self.logger.info(
-                f"No enabled callsign mappings found for stream {self.stream.id} - callsign mapping will not be applied"
+        # The index is compiled once per snapshot and applied to the whole batch
+        mapping_index = snapshot.mapping_index
+        if not len(mapping_index):
+            self.logger.debug(
+                f"No enabled callsign mappings found for stream {self.stream.id}"
             )
-            # If skip mode is enabled and we have no mappings, we need to process locations
-            # to potentially skip them all
-            if fresh_stream_config.get("callsign_error_handling") != "skip":
-                # Still need to filter out disabled trackers even if no enabled mappings
-                await self._filter_disabled_trackers(
-                    locations, disabled_mappings, fresh_stream_config
-                )
-                return
 
-        identifier_field = fresh_stream_config.get('callsign_identifier_field')
-        error_handling = fresh_stream_config.get('callsign_error_handling', 'fallback')
-        self.logger.info(
-            f"Applying {len(callsign_mappings)} callsign mappings for "
-            f"{len(locations)} locations using identifier field '{identifier_field}' "
-            f"(error handling: {error_handling})"
-        )
+        try:
+            result = mapping_index.apply(locations, self.plugin)
+        except Exception as e:
+            self.logger.error(f"Error applying callsign mapping to locations: {e}")
+            return
 
-        # First, filter out disabled trackers before applying mappings
-        await self._filter_disabled_trackers(
-            locations, disabled_mappings, fresh_stream_config
-        )
+        if result.disabled:
+            self.logger.info(
+                f"Filtered out {result.disabled} locations from disabled trackers"
+            )
+        if result.skipped:
+            self.logger.warning(
+                f"Skipped {result.skipped} locations with unmapped identifiers"
+            )
+        if result.unidentified:
+            self.logger.warning(
+                f"Could not extract identifier from {result.unidentified} locations "
+                f"using field '{mapping_index.identifier_field}' - callsign mapping "
+                f"skipped for these locations"
+            )
 
-        # Apply mappings with fallback behavior
-        locations_to_skip = []
-        identifier_field = fresh_stream_config.get("callsign_identifier_field")
-        error_handling = fresh_stream_config.get("callsign_error_handling", "fallback")
-        enable_per_cot_types = fresh_stream_config.get(
-            "enable_per_callsign_cot_types", False
+        self.logger.debug(
+            f"Callsign mapping summary: {len(locations)} locations processed, "
+            f"{result.mapped} mappings applied, {result.unmapped} unmapped kept, "
+            f"{result.skipped} locations skipped"
         )
 
-        for i, location in enumerate(locations):
-            try:
-                identifier = self._extract_identifier(location, identifier_field)
-                self.logger.debug(
-                    f"Location {i+1}: extracted identifier '{identifier}' from field '{identifier_field}'"
-                )
-
-                if identifier and callsign_mappings and identifier in callsign_mappings:
-                    mapping = callsign_mappings[identifier]
-                    original_name = location.get("name", "Unknown")
-
-                    # Apply callsign mapping through plugin interface if available
-                    if self.plugin and hasattr(
-                        self.plugin, "supports_callsign_mapping"
-                    ):
-                        if self.plugin.supports_callsign_mapping():
-                            # Use plugin's apply_callsign_mapping method
-                            self.logger.debug(
-                                f"Using plugin callsign mapping method for identifier '{identifier}'"
-                            )
-                            self.plugin.apply_callsign_mapping(
-                                [location],
-                                identifier_field,
-                                {identifier: mapping.custom_callsign},
-                            )
-                        else:
-                            # Fallback: apply directly to name field
-                            self.logger.debug(
-                                "Plugin doesn't support callsign mapping, using direct name replacement"
-                            )
-                            location["name"] = mapping.custom_callsign
-                    else:
-                        # Fallback: apply directly to name field
-                        self.logger.debug(
-                            "No plugin callsign mapping support, using direct name replacement"
-                        )
-                        location["name"] = mapping.custom_callsign
-
-                    # Apply per-callsign CoT type or team member configuration if enabled
-                    if bool(enable_per_cot_types):
-                        # Check for team member override configuration
-                        has_override = hasattr(mapping, 'cot_type_override')
-                        is_team_member = has_override and mapping.cot_type_override == "team_member"
-                        if is_team_member:
-                            # Team member configuration - add team member metadata
-                            if not location.get("additional_data"):
-                                location["additional_data"] = {}
-
-                            # Add team member metadata to event_data
-                            location["additional_data"]["team_member_enabled"] = True
-                            team_role = getattr(mapping, "team_role", "")
-                            team_color = getattr(mapping, "team_color", "")
-                            location["additional_data"]["team_role"] = team_role
-                            location["additional_data"]["team_color"] = team_color
-
-                            role = getattr(mapping, 'team_role', '')
-                            color = getattr(mapping, 'team_color', '')
-                            self.logger.info(
-                                f"Applied team member configuration for identifier "
-                                f"'{identifier}': role='{role}', color='{color}'"
-                            )
-                        elif (has_override and
-                              mapping.cot_type_override == "standard_point"):
-                            # Standard point with custom CoT type
-                            if mapping.cot_type:
-                                location["cot_type"] = mapping.cot_type
-                                self.logger.info(
-                                    f"Applied standard point CoT type '{mapping.cot_type}' for identifier '{identifier}'"
-                                )
-                        elif mapping.cot_type:
-                            # Legacy per-callsign CoT type (fallback for existing configurations)
-                            location["cot_type"] = mapping.cot_type
-                            self.logger.info(
-                                f"Applied legacy per-callsign CoT type '{mapping.cot_type}' for identifier '{identifier}'"
-                            )
-
-                    self.logger.debug(
-                        f"Applied callsign mapping: '{identifier}' → '{original_name}' → '{mapping.custom_callsign}'"
-                    )
-                elif identifier:
-                    # Handle unmapped identifiers based on error handling mode
-                    if error_handling == "skip":
-                        locations_to_skip.append(i)
-                        self.logger.warning(
-                            f"Skipping location with unmapped identifier: '{identifier}'"
-                        )
-                    else:  # fallback mode
-                        self.logger.info(
-                            f"Using fallback (original name) for unmapped identifier: '{identifier}'"
-                        )
-                        # Keep original name (fallback behavior)
-                else:
-                    # No identifier extracted
-                    self.logger.warning(
-                        f"Could not extract identifier from location using field '{identifier_field}' - callsign mapping skipped for this location"
-                    )
-
-            except Exception as e:
-                self.logger.error(f"Error applying callsign mapping to location: {e}")
-                # Handle based on error handling mode
-                if error_handling == "skip":
-                    locations_to_skip.append(i)
-                # Otherwise use fallback (keep original location unchanged)
-
-        # Remove locations marked for skipping (in reverse order to maintain indices)
-        for i in reversed(locations_to_skip):
-            removed_location = locations.pop(i)
-            self.logger.debug(
-                f"Removed location due to callsign mapping error: {removed_location.get('name', 'Unknown')}"
-            )
+    async def _get_config_snapshot(self) -> Optional[StreamConfigSnapshot]:
+        """
+        Get the stream configuration snapshot for this poll.
 
-        # Summary logging
-        applied_count = len(
-            [loc for loc in locations if loc.get("name") != loc.get("original_name")]
+        The snapshot is reused until the stream's configuration version is
+        bumped by an edit, so steady-state polls perform no config queries.
+        """
+        version = get_stream_config_versions().get(self.stream.id)
+        snapshot = self._config_snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        # Load through the async facade so the event loop is not blocked
+        snapshot = await self.async_db.get_stream_config_snapshot(
+            self.stream.id, version
         )
-        skipped_count = len(locations_to_skip)
-        processed_count = len(locations) - skipped_count
+        if snapshot is None:
+            return None
 
+        self._config_snapshot = snapshot
         self.logger.debug(
-            f"Callsign mapping summary: {processed_count} locations processed, "
-            f"{applied_count} mappings applied, {skipped_count} locations skipped"
+            f"Loaded configuration snapshot for stream {self.stream.id} "
+            f"(version {version}, {len(snapshot.callsign_mappings)} enabled and "
+            f"{len(snapshot.disabled_mappings)} disabled callsign mappings)"
         )
-
-    async def _get_fresh_callsign_mapping_config(self) -> bool:
-        """Get fresh callsign mapping configuration from database"""
-        fresh_config = await self._get_fresh_stream_config()
-        if fresh_config:
-            enable_mapping = fresh_config.get("enable_callsign_mapping", False)
-            return bool(enable_mapping)
-        else:
-            # Fallback to cached value if available
-            return bool(getattr(self.stream, "enable_callsign_mapping", False))
+        return snapshot
 
     async def _get_fresh_stream_config(self) -> dict:
-        """Get fresh stream configuration from database"""
+        """Get current stream configuration from the config snapshot"""
         try:
-            # Use database manager for thread-safe database access
-            fresh_stream = self.db_manager.get_stream_with_relationships(self.stream.id)
-            if fresh_stream:
-                return {
-                    "enable_callsign_mapping": getattr(
-                        fresh_stream, "enable_callsign_mapping", False
-                    ),
-                    "callsign_identifier_field": getattr(
-                        fresh_stream, "callsign_identifier_field", None
-                    ),
-                    "callsign_error_handling": getattr(
-                        fresh_stream, "callsign_error_handling", "fallback"
-                    ),
-                    "enable_per_callsign_cot_types": getattr(
-                        fresh_stream, "enable_per_callsign_cot_types", False
-                    ),
-                    "cot_type_mode": getattr(fresh_stream, "cot_type_mode", "stream"),
-                }
+            snapshot = await self._get_config_snapshot()
+            if snapshot:
+                return dict(snapshot.config)
             else:
                 self.logger.warning(
                     f"Stream {self.stream.id} not found in database during config refresh"
@@ -1063,187 +1112,89 @@ class StreamWorker:
             self.logger.error(f"Failed to refresh stream config: {e}")
             return {}
 
-    async def _load_callsign_mappings(self) -> Dict[str, any]:
-        """Load enabled callsign mappings from database for this stream"""
-        try:
-            # Import here to avoid circular imports
-            from database import db
-            from models.callsign_mapping import CallsignMapping
-
-            # Load only enabled callsign mappings
-            mappings = (
-                db.session.query(CallsignMapping)
-                .filter_by(stream_id=self.stream.id, enabled=True)
-                .all()
-            )
-
-            # Convert to dictionary for efficient lookup
-            mappings_dict = {mapping.identifier_value: mapping for mapping in mappings}
-
-            self.logger.debug(
-                f"Loaded {len(mappings_dict)} enabled callsign mappings for stream {self.stream.id}"
-            )
-            return mappings_dict
-
-        except Exception as e:
-            self.logger.error(f"Failed to load callsign mappings: {e}")
-            return {}
-
-    async def _load_disabled_callsign_mappings(self) -> Dict[str, any]:
-        """Load disabled callsign mappings from database for filtering"""
-        try:
-            # Import here to avoid circular imports
-            from database import db
-            from models.callsign_mapping import CallsignMapping
-
-            # Load only disabled callsign mappings for filtering
-            disabled_mappings = (
-                db.session.query(CallsignMapping)
-                .filter_by(stream_id=self.stream.id, enabled=False)
-                .all()
-            )
-
-            # Convert to dictionary for efficient lookup
-            disabled_dict = {
-                mapping.identifier_value: mapping for mapping in disabled_mappings
-            }
-
-            self.logger.debug(
-                f"Loaded {len(disabled_dict)} disabled callsign mappings for stream {self.stream.id}"
-            )
-            return disabled_dict
-
-        except Exception as e:
-            self.logger.error(f"Failed to load disabled callsign mappings: {e}")
-            return {}
-
-    async def _filter_disabled_trackers(
-        self, locations: List[Dict], disabled_mappings: Dict, fresh_stream_config: Dict
-    ) -> None:
-        """Filter out locations from disabled trackers"""
-        if not disabled_mappings:
-            return
-
-        identifier_field = fresh_stream_config.get("callsign_identifier_field")
-        if not identifier_field:
-            return
-
-        locations_to_remove = []
+    def _resolve_target_tak_servers(self, stream) -> List:
+        """
+        Resolve target TAK servers from a stream's relationships.
+        Supports both legacy single-server and new multi-server approaches.
+        """
+        target_servers = []
 
-        for i, location in enumerate(locations):
+        # Check multi-server relationship first
+        if hasattr(stream, "tak_servers"):
             try:
-                identifier = self._extract_identifier(location, identifier_field)
-                if identifier and identifier in disabled_mappings:
-                    locations_to_remove.append(i)
-                    self.logger.debug(
-                        f"Filtering out disabled tracker: '{identifier}' (name: {location.get('name', 'Unknown')})"
+                multi_servers = stream.tak_servers
+                if multi_servers:
+                    target_servers = list(multi_servers)
+                    server_names = [s.name for s in target_servers]
+                    self.logger.info(
+                        f"Using multi-server configuration: {len(target_servers)} servers found - Names: {server_names}"
                     )
             except Exception as e:
-                self.logger.error(f"Error checking if tracker is disabled: {e}")
+                self.logger.error(f"Error accessing multi-server relationship: {e}")
 
-        # Remove disabled tracker locations (in reverse order to maintain indices)
-        for i in reversed(locations_to_remove):
-            removed_location = locations.pop(i)
-            self.logger.info(
-                f"Removed location from disabled tracker: {removed_location.get('name', 'Unknown')}"
-            )
+        # Backward compatibility: Fall back to legacy single-server relationship
+        if not target_servers and hasattr(stream, "tak_server") and stream.tak_server:
+            target_servers = [stream.tak_server]
+            self.logger.debug("Using legacy single-server configuration")
 
-        if locations_to_remove:
-            self.logger.info(
-                f"Filtered out {len(locations_to_remove)} locations from disabled trackers"
-            )
-
-    def _extract_identifier(self, location: Dict, identifier_field: str = None) -> str:
-        """Extract identifier value from location data based on configured field"""
-        if not identifier_field:
-            return None
-
-        field_name = identifier_field
-
-        try:
-            # Handle different plugin data structures
-            # This is a basic implementation - plugin-specific extraction should be done via the plugin interface
-            if field_name == "imei":
-                # Garmin-style extraction
-                return (
-                    location.get("additional_data", {})
-                    .get("raw_placemark", {})
-                    .get("extended_data", {})
-                    .get("IMEI")
-                )
-            elif field_name == "name":
-                # Direct name field
-                return location.get("name")
-            elif field_name == "uid":
-                # UID field
-                return location.get("uid")
-            elif field_name == "messenger_name":
-                # SPOT-style extraction
-                return (
-                    location.get("additional_data", {})
-                    .get("raw_message", {})
-                    .get("messengerName")
-                )
-            elif field_name == "device_id":
-                # Traccar-style extraction
-                return location.get("additional_data", {}).get("device_id")
-            elif field_name == "feed_id":
-                # SPOT feed ID
-                return location.get("additional_data", {}).get("feed_id")
-            else:
-                # Generic field extraction - try direct access first
-                if field_name in location:
-                    return location[field_name]
+        return target_servers
 
-                # Try additional_data
-                return location.get("additional_data", {}).get(field_name)
+    def refresh_tak_routes(self, stream=None):
+        """
+        Drop the resolved TAK server routes after a relationship change.
 
-        except Exception as e:
-            self.logger.debug(
-                f"Failed to extract identifier '{field_name}' from location: {e}"
-            )
-            return None
+        Args:
+            stream: Fresh stream data to route from; the routes are resolved
+                again from the worker's own stream when omitted
+        """
+        self._tak_routes = (
+            self._resolve_target_tak_servers(stream) if stream is not None else None
+        )
+        self._tak_routes_generation = None
+        # Newly routed servers need every position, not just changed ones
+        self._position_filter.clear()
+        self.logger.debug("TAK server routes invalidated")
 
-    async def _get_target_tak_servers(self) -> List:
+    async def _get_target_tak_servers(self, force_ensure: bool = False) -> List:
         """
         Get target TAK servers for this stream.
-        Supports both legacy single-server and new multi-server approaches.
+
+        Routes are resolved once and reused. Transmission workers are only
+        re-checked when the COT service reports a worker start, stop or exit
+        since the last check, or when force_ensure is set.
 
         Returns:
             List of TakServer objects to send data to
         """
         try:
-            target_servers = []
+            if self._tak_routes is None:
+                self._tak_routes = self._resolve_target_tak_servers(self.stream)
 
-            # Check multi-server relationship first
-            if hasattr(self.stream, "tak_servers"):
-                try:
-                    # Use dynamic loading to get all associated servers
-                    multi_servers = self.stream.tak_servers
-                    if multi_servers:
-                        target_servers = list(multi_servers)
-                        server_names = [s.name for s in target_servers]
-                        self.logger.info(
-                            f"Using multi-server configuration: {len(target_servers)} servers found - Names: {server_names}"
-                        )
-                except Exception as e:
-                    self.logger.error(f"Error accessing multi-server relationship: {e}")
-
-            # Backward compatibility: Fall back to legacy single-server relationship
-            if (
-                not target_servers
-                and hasattr(self.stream, "tak_server")
-                and self.stream.tak_server
+            target_servers = self._tak_routes
+            service = get_cot_service()
+            if target_servers and (
+                force_ensure
+                or self._tak_routes_generation != service.worker_generation
             ):
-                target_servers = [self.stream.tak_server]
-                self.logger.debug("Using legacy single-server configuration")
+                self.logger.debug(
+                    f"Ensuring persistent workers for {len(target_servers)} TAK servers"
+                )
+                running = 0
+                for server in target_servers:
+                    if await self._ensure_persistent_tak_worker_for_server(server):
+                        running += 1
+                    else:
+                        self.logger.warning(
+                            f"Failed to ensure worker for server {server.name}"
+                        )
 
-            # Ensure all target servers have workers
-            for server in target_servers:
-                if not await self._ensure_persistent_tak_worker_for_server(server):
-                    self.logger.warning(
-                        f"Failed to ensure worker for server {server.name}"
-                    )
+                self._tak_routes_running = running
+                # Failed servers are re-checked on the next send
+                self._tak_routes_generation = (
+                    service.worker_generation
+                    if running == len(target_servers)
+                    else None
+                )
 
             return target_servers
 
@@ -1275,7 +1226,9 @@ class StreamWorker:
                 return True
 
             # Start the worker
-            success = await get_cot_service().start_worker(tak_server)
+            success = await run_on_loop(
+                self.tak_loop, get_cot_service().start_worker(tak_server)
+            )
             if not success:
                 self.logger.error(
                     f"Failed to start persistent worker for TAK server {tak_server.name}"
@@ -1308,6 +1261,10 @@ class StreamWorker:
         """
         Distribute COT events to multiple TAK servers with failure isolation.
 
+        The prepared batch is handed to the COT service fan-out stage once, which
+        resolves device identities a single time and shares the same event
+        objects across every server queue.
+
         Args:
             cot_events: List of COT events to distribute
             target_servers: List of TakServer objects to send to
@@ -1315,61 +1272,48 @@ class StreamWorker:
         Returns:
             List of distribution results with success status for each server
         """
-        distribution_results = []
-
         try:
-            # Concurrent distribution to multiple servers
-            distribution_tasks = []
             server_names = [server.name for server in target_servers]
-
             self.logger.debug(
                 f"Starting distribution of {len(cot_events)} events to {len(target_servers)} servers: {server_names}"
             )
 
-            for server in target_servers:
-                self.logger.debug(
-                    f"Creating distribution task for server: {server.name} (ID: {server.id})"
-                )
-                task = self._send_to_single_server(cot_events, server)
-                distribution_tasks.append(task)
-
-            # Execute all distributions concurrently with failure isolation
-            self.logger.debug(
-                f"Executing {len(distribution_tasks)} distribution tasks concurrently"
+            # Use smart queue replacement for large batches to prevent accumulation
+            enqueued = await run_on_loop(
+                self.tak_loop,
+                get_cot_service().enqueue_fanout(
+                    cot_events,
+                    [server.id for server in target_servers],
+                    replace=len(cot_events) >= 10,
+                ),
             )
-            results = await asyncio.gather(*distribution_tasks, return_exceptions=True)
 
-            # Process results
-            for i, result in enumerate(results):
-                server = target_servers[i]
-
-                if isinstance(result, Exception):
+            distribution_results = []
+            for server in target_servers:
+                events_sent = enqueued.get(server.id)
+                if events_sent is None:
                     # Server failed, but others can continue (failure isolation)
                     self.logger.error(
-                        f"Distribution to {server.name} (ID: {server.id}) failed with exception: {result}"
+                        f"Distribution to {server.name} (ID: {server.id}) failed"
                     )
                     distribution_results.append(
                         {
                             "server": server,
                             "success": False,
-                            "error": str(result),
+                            "error": "Failed to enqueue events",
                             "events_sent": 0,
                         }
                     )
                 else:
-                    # Server succeeded
-                    events_sent = result.get("events_sent", 0)
-                    success = result.get("success", False)
                     self.logger.debug(
-                        f"Distribution to {server.name} (ID: {server.id}): success={success}, events_sent={events_sent}"
+                        f"Distribution to {server.name} (ID: {server.id}): events_sent={events_sent}"
                     )
-
                     distribution_results.append(
                         {
                             "server": server,
-                            "success": success,
+                            "success": True,
                             "events_sent": events_sent,
-                            "error": result.get("error"),
+                            "error": None,
                         }
                     )
 
@@ -1388,57 +1332,3 @@ class StreamWorker:
                 }
                 for server in target_servers
             ]
-
-    async def _send_to_single_server(self, cot_events: List, server) -> Dict:
-        """
-        Send COT events to a single TAK server.
-        Individual server distribution with error handling.
-        """
-        try:
-            self.logger.info(
-                f"Sending {len(cot_events)} events to server {server.name} (ID: {server.id})"
-            )
-
-            # Use smart queue replacement for large batches to prevent accumulation
-            if len(cot_events) >= 10:  # Use replacement logic for large batches
-                self.logger.debug(
-                    f"Using queue replacement for large batch of {len(cot_events)} events to {server.name}"
-                )
-                success = await get_cot_service().enqueue_with_replacement(
-                    cot_events, server.id
-                )
-                events_sent = len(cot_events) if success else 0
-                self.logger.debug(
-                    f"Queue replacement result for {server.name}: success={success}, events_sent={events_sent}"
-                )
-            else:
-                # Use individual enqueueing for small batches
-                events_sent = 0
-                for event in cot_events:
-                    success = await get_cot_service().enqueue_event(event, server.id)
-                    if success:
-                        events_sent += 1
-                    else:
-                        self.logger.warning(
-                            f"Failed to enqueue event to server {server.name}"
-                        )
-                self.logger.debug(
-                    f"Individually enqueued {events_sent}/{len(cot_events)} events to {server.name}"
-                )
-
-            return {
-                "success": True,
-                "events_sent": events_sent,
-                "server_name": server.name,
-            }
-
-        except Exception as e:
-            self.logger.error(
-                f"Failed to send events to server {server.name}: {e}", exc_info=True
-            )
-            return {
-                "success": False,
-                "events_sent": 0,
-                "error": str(e),
-                "server_name": server.name,
-            }
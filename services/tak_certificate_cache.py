@@ -0,0 +1,288 @@
+"""
+ABOUTME: Per-TAK-server cache of decoded P12 client certificates, their PEM files
+ABOUTME: and SSL contexts, so reconnects do not re-parse PKCS#12 or leak key files
+
+File: services/tak_certificate_cache.py
+
+Description:
+    Opening a TLS connection to a TAK server used to decode the server's
+    PKCS#12 bundle, write the certificate and private key to fresh temporary
+    files and, for direct sends, build a new SSL context every time. The PyTAK
+    path never removed those files, so every reconnect left another key file
+    in the temp directory.
+
+    This cache keeps one decoded certificate per TAK server, keyed by a hash
+    of the P12 bytes and the stored (encrypted) certificate password, so a
+    lookup never decrypts the password; it is only decrypted to open the
+    bundle on a miss. The PEM files are written
+    once with owner-only permissions and reused by every PyTAK connection, and
+    SSL contexts are built once per verification mode. A changed certificate
+    or password produces a new fingerprint, which replaces the entry and
+    removes the old files; TAK server updates and deletions also invalidate
+    the entry explicitly. All files are removed at interpreter exit.
+
+Key features:
+    - Certificate fingerprint from SHA-256 over P12 bytes and the stored
+      encrypted password
+    - PEM files written once per certificate and cleaned up on replacement
+    - Cached SSL contexts per TAK server and verify_ssl setting
+    - Explicit invalidation on TAK server update or delete
+    - Thread-safe, process-wide singleton with hit/miss counters
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import atexit
+import hashlib
+import os
+import ssl
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
+
+from services.logging_service import get_module_logger
+
+logger = get_module_logger(__name__)
+
+
+def extract_p12_certificate(
+    p12_data: bytes, password: Optional[str] = None
+) -> Tuple[bytes, bytes]:
+    """Extract the PEM certificate and unencrypted PEM private key from P12 data"""
+    try:
+        password_bytes = password.encode("utf-8") if password else None
+        private_key, certificate, additional_certificates = (
+            pkcs12.load_key_and_certificates(p12_data, password_bytes)
+        )
+
+        cert_pem = certificate.public_bytes(serialization.Encoding.PEM)
+        key_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
+        return cert_pem, key_pem
+
+    except Exception as e:
+        raise Exception(f"P12 certificate extraction failed: {str(e)}")
+
+
+def certificate_fingerprint(
+    p12_data: bytes, stored_password: Union[str, bytes, None]
+) -> str:
+    """Hash identifying a P12 bundle together with its stored password"""
+    if isinstance(stored_password, str):
+        stored_password = stored_password.encode("utf-8")
+    digest = hashlib.sha256(p12_data)
+    digest.update(b"\0")
+    digest.update(stored_password if isinstance(stored_password, bytes) else b"")
+    return digest.hexdigest()
+
+
+def stored_cert_password(tak_server) -> Union[str, bytes, None]:
+    """Encrypted certificate password of a TAK server model or TakServerDTO"""
+    # TakServerDTO keeps the stored value apart from the decrypted one
+    stored = getattr(tak_server, "encrypted_cert_password", None)
+    if stored is None:
+        stored = getattr(tak_server, "cert_password", None)
+    return stored
+
+
+def create_ssl_context(tak_server) -> ssl.SSLContext:
+    """Create SSL context for TAK server connection"""
+    ssl_context = ssl.create_default_context()
+
+    # Configure certificate verification based on server settings
+    if not tak_server.verify_ssl:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        logger.warning(
+            f"SSL certificate verification disabled for TAK server '{tak_server.name}'"
+        )
+
+    return ssl_context
+
+
+@dataclass
+class CachedCertificate:
+    """Decoded client certificate for one TAK server"""
+
+    fingerprint: str
+    cert_path: str
+    key_path: str
+    ssl_contexts: Dict[bool, ssl.SSLContext] = field(default_factory=dict)
+
+
+class TakCertificateCache:
+    """Process-wide cache of TAK client certificates and SSL contexts"""
+
+    def __init__(self):
+        self._entries: Dict[int, CachedCertificate] = {}
+        self._plain_contexts: Dict[Tuple[int, bool], ssl.SSLContext] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_cert_files(self, tak_server) -> Tuple[str, str]:
+        """
+        Get PEM certificate and key file paths for a TAK server's P12 bundle.
+
+        Args:
+            tak_server: TAK server with cert_p12 set
+
+        Returns:
+            Tuple of (cert_path, key_path)
+        """
+        entry = self._get_entry(tak_server)
+        return entry.cert_path, entry.key_path
+
+    def get_ssl_context(self, tak_server) -> ssl.SSLContext:
+        """
+        Get an SSL context for a TLS TAK server, with its client certificate
+        loaded when the server has one.
+
+        Args:
+            tak_server: TAK server configuration object
+
+        Returns:
+            Cached SSL context for the server's current certificate and
+            verify_ssl setting
+        """
+        verify_ssl = bool(tak_server.verify_ssl)
+
+        with self._lock:
+            if not tak_server.cert_p12:
+                key = (tak_server.id, verify_ssl)
+                context = self._plain_contexts.get(key)
+                if context is None:
+                    context = create_ssl_context(tak_server)
+                    self._plain_contexts[key] = context
+                return context
+
+            entry = self._get_entry_locked(tak_server)
+            context = entry.ssl_contexts.get(verify_ssl)
+            if context is None:
+                context = create_ssl_context(tak_server)
+                context.load_cert_chain(
+                    certfile=entry.cert_path, keyfile=entry.key_path
+                )
+                entry.ssl_contexts[verify_ssl] = context
+            return context
+
+    def invalidate(self, tak_server_id: int) -> None:
+        """Drop the cached certificate and SSL contexts of a TAK server"""
+        with self._lock:
+            if self._discard_locked(tak_server_id):
+                logger.debug(
+                    f"Invalidated cached certificate for TAK server {tak_server_id}"
+                )
+
+    def clear(self) -> None:
+        """Drop every cached certificate and remove its files"""
+        with self._lock:
+            for tak_server_id in list(self._entries):
+                self._discard_locked(tak_server_id)
+            self._plain_contexts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                "cached_servers": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _get_entry(self, tak_server) -> CachedCertificate:
+        with self._lock:
+            return self._get_entry_locked(tak_server)
+
+    def _get_entry_locked(self, tak_server) -> CachedCertificate:
+        fingerprint = certificate_fingerprint(
+            tak_server.cert_p12, stored_cert_password(tak_server)
+        )
+
+        entry = self._entries.get(tak_server.id)
+        if entry is not None and entry.fingerprint == fingerprint:
+            self.hits += 1
+            return entry
+
+        # Decrypt the password only when the bundle has to be opened
+        self.misses += 1
+        cert_pem, key_pem = extract_p12_certificate(
+            tak_server.cert_p12, tak_server.get_cert_password()
+        )
+        cert_path, key_path = self._write_pem_files(cert_pem, key_pem)
+
+        self._discard_locked(tak_server.id)
+        entry = CachedCertificate(fingerprint, cert_path, key_path)
+        self._entries[tak_server.id] = entry
+        logger.debug(f"Cached client certificate for TAK server '{tak_server.name}'")
+        return entry
+
+    def _discard_locked(self, tak_server_id: int) -> bool:
+        for verify_ssl in (True, False):
+            self._plain_contexts.pop((tak_server_id, verify_ssl), None)
+        entry = self._entries.pop(tak_server_id, None)
+        if entry is None:
+            return False
+        for path in (entry.cert_path, entry.key_path):
+            if path and os.path.exists(path):
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    logger.warning(f"Failed to remove certificate file {path}: {e}")
+        return True
+
+    @staticmethod
+    def _write_pem_files(cert_pem: bytes, key_pem: bytes) -> Tuple[str, str]:
+        """Write PEM data to owner-only temporary files"""
+        cert_fd, cert_path = tempfile.mkstemp(suffix=".pem", prefix="tak_cert_")
+        key_fd, key_path = tempfile.mkstemp(suffix=".pem", prefix="tak_key_")
+
+        try:
+            with os.fdopen(cert_fd, "wb") as cert_file:
+                cert_file.write(cert_pem)
+            with os.fdopen(key_fd, "wb") as key_file:
+                key_file.write(key_pem)
+            return cert_path, key_path
+        except Exception:
+            for path in (cert_path, key_path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            raise
+
+
+# Global cache instance
+_certificate_cache: Optional[TakCertificateCache] = None
+_certificate_cache_lock = threading.Lock()
+
+
+def get_tak_certificate_cache() -> TakCertificateCache:
+    """Get the process-wide TAK certificate cache"""
+    global _certificate_cache
+    if _certificate_cache is None:
+        with _certificate_cache_lock:
+            if _certificate_cache is None:
+                _certificate_cache = TakCertificateCache()
+    return _certificate_cache
+
+
+def reset_tak_certificate_cache():
+    """Reset the TAK certificate cache, removing its files (for testing)"""
+    global _certificate_cache
+    with _certificate_cache_lock:
+        if _certificate_cache is not None:
+            _certificate_cache.clear()
+        _certificate_cache = None
+
+
+atexit.register(reset_tak_certificate_cache)
@@ -157,3 +157,65 @@ def get_expected_cot_count(dataset_name: str) -> int:
     }
 
     return expected_counts.get(dataset_name, 0)
+
+
+def generate_mock_garmin_kml(count: int, xml_declaration: bool = True) -> str:
+    """
+    Generate a Garmin MapShare style KML feed for parser tests and benchmarks
+
+    Each device gets a Point placemark with the ExtendedData fields MapShare
+    sends, followed by a LineString track placemark like the real feed.
+
+    Args:
+        count: Number of device placemarks to generate
+        xml_declaration: Include the <?xml ...?> declaration MapShare sends
+
+    Returns:
+        KML document as a string
+    """
+    placemarks = []
+    base_time = datetime(2026, 10, 16, 12, 0, 0)
+
+    for i in range(count):
+        reported = base_time + timedelta(seconds=i)
+        lat = round(46.0 + (i % 1000) * 0.001, 6)
+        lon = round(29.0 + (i // 1000) * 0.001, 6)
+        placemarks.append(
+            f"""<Placemark>
+<name>Device {i}</name>
+<visibility>1</visibility>
+<description>Garmin inReach {i}</description>
+<TimeStamp><when>{reported.strftime("%Y-%m-%dT%H:%M:%SZ")}</when></TimeStamp>
+<styleUrl>#style_{i % 8}</styleUrl>
+<ExtendedData>
+<Data name="Id"><value>{1000000 + i}</value></Data>
+<Data name="Time UTC"><value>{reported.strftime("%m/%d/%Y %I:%M:%S %p")}</value></Data>
+<Data name="Name"><value>Operator {i}</value></Data>
+<Data name="Map Display Name"><value>Unit {i}</value></Data>
+<Data name="Device Type"><value>inReach Mini 2</value></Data>
+<Data name="IMEI"><value>{300434060000000 + i}</value></Data>
+<Data name="Latitude"><value>{lat}</value></Data>
+<Data name="Longitude"><value>{lon}</value></Data>
+<Data name="Elevation"><value>120.50 m from MSL</value></Data>
+<Data name="Velocity"><value>{i % 90}.0 km/h</value></Data>
+<Data name="Course"><value>{(i * 7) % 360}.00 ° True</value></Data>
+<Data name="Valid GPS Fix"><value>True</value></Data>
+<Data name="In Emergency"><value>False</value></Data>
+<Data name="Event"><value>Tracking message received.</value></Data>
+</ExtendedData>
+<Point><extrude>false</extrude><altitudeMode>absolute</altitudeMode>
+<coordinates>{lon},{lat},120.5</coordinates></Point>
+</Placemark>
+<Placemark><name>Device {i} track</name>
+<LineString><tessellate>true</tessellate>
+<coordinates>{lon},{lat},0 {lon + 0.001},{lat + 0.001},0</coordinates></LineString>
+</Placemark>"""
+        )
+
+    declaration = '<?xml version="1.0" encoding="utf-8"?>\n' if xml_declaration else ""
+    return (
+        f'{declaration}<kml xmlns="http://www.opengis.net/kml/2.2">'
+        "<Document><name>MapShare</name><Folder><name>Devices</name>"
+        + "\n".join(placemarks)
+        + "</Folder></Document></kml>"
+    )
@@ -6,6 +6,7 @@ import pytest
 
 from models.callsign_mapping import CallsignMapping
 from models.stream import Stream
+from services.database_manager import DatabaseManager
 from services.stream_worker import StreamWorker
 
 
@@ -56,10 +57,9 @@ class TestCallsignMappingIntegration:
             db_session.commit()
 
             # 3. Create stream worker with mock dependencies
-            mock_db_manager = Mock()
-            mock_db_manager.get_stream_with_relationships.return_value = stream
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # 4. Create realistic location data with different scenarios
             test_locations = [
@@ -152,10 +152,9 @@ class TestCallsignMappingIntegration:
             db_session.commit()
 
             # Create stream worker with real Garmin plugin
-            mock_db_manager = Mock()
-            mock_db_manager.get_stream_with_relationships.return_value = stream
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # Initialize plugin
             plugin_config = {
@@ -216,16 +215,12 @@ class TestCallsignMappingIntegration:
 
             # No callsign mappings created - all will be unmapped
 
-            # Create separate mock managers for each worker since they need different streams
-            fallback_mock_db_manager = Mock()
-            fallback_mock_db_manager.get_stream_with_relationships.return_value = (
-                fallback_stream
-            )
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Test fallback mode
             fallback_worker = StreamWorker(
-                fallback_stream, mock_session_manager, fallback_mock_db_manager
+                fallback_stream, mock_session_manager, db_manager
             )
             fallback_locations = [
                 {
@@ -239,15 +234,9 @@ class TestCallsignMappingIntegration:
                 }
             ]
 
-            # Create separate mock manager for skip mode
-            skip_mock_db_manager = Mock()
-            skip_mock_db_manager.get_stream_with_relationships.return_value = (
-                skip_stream
-            )
-
             # Test skip mode
             skip_worker = StreamWorker(
-                skip_stream, mock_session_manager, skip_mock_db_manager
+                skip_stream, mock_session_manager, db_manager
             )
             skip_locations = [
                 {
@@ -104,7 +104,7 @@ class TestTrackerEnableDisableE2E:
             from services.database_manager import DatabaseManager
             from flask import current_app
 
-            db_manager = DatabaseManager(lambda: current_app.app_context())
+            db_manager = DatabaseManager(current_app._get_current_object().app_context)
             mock_session_manager = Mock()
 
             # Mock GPS data including both enabled and disabled trackers
@@ -289,7 +289,7 @@ class TestTrackerEnableDisableE2E:
             from services.database_manager import DatabaseManager
             from flask import current_app
 
-            db_manager = DatabaseManager(lambda: current_app.app_context())
+            db_manager = DatabaseManager(current_app._get_current_object().app_context)
             mock_session_manager = Mock()
             worker = StreamWorker(stream, mock_session_manager, db_manager)
 
@@ -355,7 +355,7 @@ class TestTrackerEnableDisableE2E:
             from services.database_manager import DatabaseManager
             from flask import current_app
 
-            db_manager = DatabaseManager(lambda: current_app.app_context())
+            db_manager = DatabaseManager(current_app._get_current_object().app_context)
             mock_session_manager = Mock()
             worker = StreamWorker(stream, mock_session_manager, db_manager)
 
@@ -441,7 +441,7 @@ class TestTrackerEnableDisableE2E:
             from services.database_manager import DatabaseManager
             from flask import current_app
 
-            db_manager = DatabaseManager(lambda: current_app.app_context())
+            db_manager = DatabaseManager(current_app._get_current_object().app_context)
             mock_session_manager = Mock()
             worker = StreamWorker(stream, mock_session_manager, db_manager)
 
@@ -520,7 +520,7 @@ class TestTrackerEnableDisableE2E:
             from services.database_manager import DatabaseManager
             from flask import current_app
 
-            db_manager = DatabaseManager(lambda: current_app.app_context())
+            db_manager = DatabaseManager(current_app._get_current_object().app_context)
             mock_session_manager = Mock()
             worker = StreamWorker(stream, mock_session_manager, db_manager)
 
@@ -613,7 +613,7 @@ class TestTrackerEnableDisableE2E:
                 from services.database_manager import DatabaseManager
                 from flask import current_app
 
-                db_manager = DatabaseManager(lambda: current_app.app_context())
+                db_manager = DatabaseManager(current_app._get_current_object().app_context)
                 mock_session_manager = Mock()
                 worker = StreamWorker(stream, mock_session_manager, db_manager)
 
@@ -0,0 +1,97 @@
+"""
+ABOUTME: Benchmark of multi-server distribution cost versus TAK server count
+ABOUTME: comparing per-server replacement enqueueing with the shared fan-out stage
+
+This module measures how the cost of distributing one poll's worth of CoT
+events grows with the number of TAK servers a stream feeds. Both paths get
+the same prepared batch of QueuedCotEvent records: the per-server baseline
+runs enqueue_with_replacement independently for every server, the fan-out
+path hands the batch to enqueue_fanout once, so only the shared fan-out
+stage differs.
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import (
+    QueuedCOTService,
+    reset_queued_cot_service,
+)
+from tests.fixtures.mock_location_data import generate_mock_gps_points
+
+EVENT_COUNT = 300
+SERVER_COUNTS = [1, 2, 4, 8, 16]
+ROUNDS = 3
+
+
+async def _time_distribution(distribute, server_count: int) -> float:
+    """Return the best-of-ROUNDS wall time for one distribution"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        await distribute(list(range(1, server_count + 1)))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestFanoutBenchmark:
+    """Distribution cost vs. server count"""
+
+    def setup_method(self):
+        reset_cot_service()
+        reset_queued_cot_service()
+
+    def teardown_method(self):
+        reset_cot_service()
+        reset_queued_cot_service()
+
+    @pytest.mark.asyncio
+    async def test_fanout_cost_vs_server_count(self):
+        events = QueuedCOTService._build_pytak_events(
+            generate_mock_gps_points(EVENT_COUNT), "a-f-G-U-C", 300, "stream"
+        )
+        cot_service = get_cot_service()
+
+        async def per_server(server_ids):
+            for server_id in server_ids:
+                await cot_service.queue_manager.create_queue(server_id)
+                await cot_service.enqueue_with_replacement(events, server_id)
+
+        async def fanout(server_ids):
+            await cot_service.enqueue_fanout(events, server_ids)
+
+        rows = []
+        for server_count in SERVER_COUNTS:
+            baseline = await _time_distribution(per_server, server_count)
+            shared = await _time_distribution(fanout, server_count)
+            rows.append((server_count, baseline, shared))
+
+        print(f"\nDistribution of {EVENT_COUNT} events (best of {ROUNDS}):")
+        print(f"{'servers':>8} {'per-server ms':>14} {'fan-out ms':>11} {'speedup':>8}")
+        for server_count, baseline, shared in rows:
+            print(
+                f"{server_count:>8} {baseline * 1000:>14.2f} {shared * 1000:>11.2f} "
+                f"{baseline / shared:>7.1f}x"
+            )
+
+        # Event identities are resolved once per batch, not once per server
+        server_ids = list(range(1, SERVER_COUNTS[-1] + 1))
+        with patch.object(
+            cot_service,
+            "get_event_identity",
+            wraps=cot_service.get_event_identity,
+        ) as get_identity:
+            await per_server(server_ids)
+            assert get_identity.call_count == EVENT_COUNT * len(server_ids)
+
+            get_identity.reset_mock()
+            await fanout(server_ids)
+            assert get_identity.call_count == EVENT_COUNT
@@ -0,0 +1,65 @@
+"""
+ABOUTME: Benchmark of Garmin KML placemark extraction comparing the fastkml
+ABOUTME: object model path with the single-pass lxml iterparse extractor
+
+This module times KMLDataExtractor (fastkml first, XML re-parse fallback)
+against StreamingKMLExtractor on a synthetic 10k-placemark MapShare feed and
+checks that both produce the same placemarks.
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+import time
+
+import pytest
+
+from plugins.garmin_plugin import KMLDataExtractor, StreamingKMLExtractor
+from tests.fixtures.mock_location_data import generate_mock_garmin_kml
+
+PLACEMARK_COUNT = 10_000
+ROUNDS = 3
+
+
+def _time_extraction(extractor, kml_data: str, rounds: int):
+    """Return the best-of-rounds wall time and the last result"""
+    best = float("inf")
+    placemarks = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        placemarks = extractor.extract_placemarks(kml_data)
+        best = min(best, time.perf_counter() - started)
+    return best, placemarks
+
+
+def _summary(placemarks):
+    return [(p["uid"], p["lat"], p["lon"], p["timestamp"]) for p in placemarks]
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestKMLExtractorBenchmark:
+    """fastkml object model vs. streaming iterparse"""
+
+    @pytest.mark.parametrize("xml_declaration", [True, False])
+    def test_streaming_vs_fastkml(self, xml_declaration):
+        kml_data = generate_mock_garmin_kml(PLACEMARK_COUNT, xml_declaration)
+
+        fastkml_time, fastkml_placemarks = _time_extraction(
+            KMLDataExtractor(), kml_data, 1
+        )
+        streaming_time, streaming_placemarks = _time_extraction(
+            StreamingKMLExtractor(), kml_data, ROUNDS
+        )
+
+        print(
+            f"\n{PLACEMARK_COUNT} placemarks "
+            f"(xml declaration: {xml_declaration}, {len(kml_data) // 1024} KiB):"
+        )
+        print(f"{'fastkml path':>14}: {fastkml_time * 1000:>9.1f} ms")
+        print(f"{'streaming':>14}: {streaming_time * 1000:>9.1f} ms")
+        print(f"{'speedup':>14}: {fastkml_time / streaming_time:>9.1f}x")
+
+        assert len(streaming_placemarks) == PLACEMARK_COUNT
+        assert _summary(streaming_placemarks) == _summary(fastkml_placemarks)
+        assert streaming_time < fastkml_time
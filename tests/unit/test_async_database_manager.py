@@ -0,0 +1,70 @@
+"""
+ABOUTME: Unit tests for the asyncio database facade used by stream workers
+ABOUTME: covering thread pool execution and non-blocking retries
+"""
+
+import threading
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from services.database_manager import AsyncDatabaseManager, DatabaseManager
+
+
+@pytest.fixture
+def db_manager():
+    return DatabaseManager(app_context_factory=nullcontext)
+
+
+@pytest.fixture
+def mock_db():
+    with patch("database.db") as mock_db:
+        yield mock_db
+
+
+class TestAsyncDatabaseManager:
+    """Operations run on the database thread pool with asyncio backoff"""
+
+    async def test_operation_runs_off_event_loop_thread(self, db_manager, mock_db):
+        async_db = AsyncDatabaseManager(db_manager)
+
+        thread_name = await async_db.execute_db_operation(
+            lambda: threading.current_thread().name
+        )
+
+        assert thread_name.startswith("trakbridge-db")
+        mock_db.session.commit.assert_called_once()
+
+    async def test_retry_uses_async_sleep(self, db_manager, mock_db):
+        async_sleep = AsyncMock()
+        async_db = AsyncDatabaseManager(db_manager, sleep=async_sleep)
+        operation = Mock(
+            side_effect=[OperationalError("UPDATE", {}, "database is locked"), True]
+        )
+
+        result = await async_db.execute_db_operation(operation)
+
+        assert result is True
+        assert operation.call_count == 2
+        async_sleep.assert_awaited_once()
+        mock_db.session.rollback.assert_called_once()
+
+    async def test_returns_none_after_exhausting_retries(self, db_manager, mock_db):
+        async_sleep = AsyncMock()
+        async_db = AsyncDatabaseManager(db_manager, sleep=async_sleep)
+        operation = Mock(side_effect=RuntimeError("boom"))
+
+        result = await async_db.execute_db_operation(operation)
+
+        assert result is None
+        assert operation.call_count == 3
+        assert async_sleep.await_count == 2
+
+    async def test_no_app_context_returns_none_without_retry(self):
+        async_db = AsyncDatabaseManager(DatabaseManager(lambda: None))
+        operation = Mock()
+
+        assert await async_db.execute_db_operation(operation) is None
+        operation.assert_not_called()
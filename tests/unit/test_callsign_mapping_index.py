@@ -0,0 +1,123 @@
+"""
+ABOUTME: Unit tests for the compiled callsign mapping index and its single-pass
+ABOUTME: batch apply used by stream workers
+"""
+
+from unittest.mock import Mock
+
+from models.dto import CallsignMappingDTO
+from services.callsign_mapping_index import (
+    CallsignMappingIndex,
+    compile_identifier_extractor,
+)
+
+
+def _location(imei, name="Original"):
+    return {
+        "name": name,
+        "additional_data": {"raw_placemark": {"extended_data": {"IMEI": imei}}},
+    }
+
+
+def _index(error_handling="fallback", per_callsign_cot_types=False):
+    config = {
+        "callsign_identifier_field": "imei",
+        "callsign_error_handling": error_handling,
+        "enable_per_callsign_cot_types": per_callsign_cot_types,
+    }
+    enabled = {
+        "IMEI1": CallsignMappingDTO("IMEI1", "Alpha-1", cot_type="a-f-G-U-C-I"),
+        "IMEI2": CallsignMappingDTO(
+            "IMEI2",
+            "Bravo-2",
+            cot_type_override="team_member",
+            team_role="Medic",
+            team_color="Blue",
+        ),
+    }
+    disabled = {"IMEI3": CallsignMappingDTO("IMEI3", "Charlie-3", enabled=False)}
+    return CallsignMappingIndex.compile(config, enabled, disabled)
+
+
+class TestIdentifierExtractors:
+    """Extractors mirror the stream worker's identifier field handling"""
+
+    def test_known_and_generic_fields(self):
+        location = {
+            "uid": "uid-1",
+            "custom": "direct",
+            "additional_data": {
+                "device_id": 42,
+                "other": "nested",
+                "raw_message": {"messengerName": "Spot-1"},
+            },
+        }
+
+        assert compile_identifier_extractor("uid")(location) == "uid-1"
+        assert compile_identifier_extractor("device_id")(location) == 42
+        assert compile_identifier_extractor("messenger_name")(location) == "Spot-1"
+        assert compile_identifier_extractor("custom")(location) == "direct"
+        assert compile_identifier_extractor("other")(location) == "nested"
+        assert compile_identifier_extractor(None) is None
+
+
+class TestCallsignMappingIndex:
+    """One pass maps, filters and re-types the whole batch"""
+
+    def test_fallback_maps_and_keeps_unmapped(self):
+        locations = [_location("IMEI1"), _location("IMEI3"), _location("IMEI9")]
+
+        result = _index().apply(locations)
+
+        assert [loc["name"] for loc in locations] == ["Alpha-1", "Original"]
+        assert (result.mapped, result.disabled, result.unmapped) == (1, 1, 1)
+        # CoT types are only applied when per-callsign types are enabled
+        assert "cot_type" not in locations[0]
+
+    def test_skip_mode_drops_unmapped(self):
+        locations = [_location("IMEI9"), _location("IMEI1")]
+
+        result = _index(error_handling="skip").apply(locations)
+
+        assert [loc["name"] for loc in locations] == ["Alpha-1"]
+        assert result.skipped == 1
+
+    def test_per_callsign_cot_types_and_team_members(self):
+        locations = [_location("IMEI1"), _location("IMEI2")]
+
+        _index(per_callsign_cot_types=True).apply(locations)
+
+        assert locations[0]["cot_type"] == "a-f-G-U-C-I"
+        assert "cot_type" not in locations[1]
+        assert locations[1]["additional_data"]["team_member_enabled"] is True
+        assert locations[1]["additional_data"]["team_role"] == "Medic"
+        assert locations[1]["additional_data"]["team_color"] == "Blue"
+
+    def test_plugin_called_once_per_batch(self):
+        plugin = Mock()
+        plugin.supports_callsign_mapping.return_value = True
+        locations = [_location("IMEI1"), _location("IMEI2"), _location("IMEI9")]
+
+        _index().apply(locations, plugin)
+
+        plugin.apply_callsign_mapping.assert_called_once_with(
+            locations[:2], "imei", {"IMEI1": "Alpha-1", "IMEI2": "Bravo-2"}
+        )
+
+    def test_plugin_failure_in_skip_mode_drops_batch(self):
+        plugin = Mock()
+        plugin.supports_callsign_mapping.return_value = True
+        plugin.apply_callsign_mapping.side_effect = RuntimeError("boom")
+        locations = [_location("IMEI1"), {"name": "No identifier"}]
+
+        result = _index(error_handling="skip").apply(locations, plugin)
+
+        assert [loc["name"] for loc in locations] == ["No identifier"]
+        assert (result.mapped, result.skipped, result.unidentified) == (0, 1, 1)
+
+    def test_filter_disabled_only_removes_disabled(self):
+        locations = [_location("IMEI3"), _location("IMEI9")]
+
+        assert _index().filter_disabled(locations) == 1
+        assert _index().extract_identifier(locations[0]) == "IMEI9"
+        assert len(locations) == 1
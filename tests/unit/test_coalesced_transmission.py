@@ -0,0 +1,183 @@
+"""
+ABOUTME: Unit tests for coalesced batch writes on the TAK transmission path
+ABOUTME: and the per-server byte/latency counters reported by get_worker_status
+"""
+
+import os
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.circuit_breaker import CircuitOpenError
+from services.cot_service_integration import (
+    QueuedCOTService,
+    TransmitResult,
+    reset_queued_cot_service,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    """Reset COT service singletons around each test"""
+    reset_cot_service()
+    reset_queued_cot_service()
+    yield
+    reset_cot_service()
+    reset_queued_cot_service()
+
+
+@pytest.fixture
+def cot_service():
+    service = get_cot_service()
+    with patch.object(service, "_get_tak_circuit_breaker", return_value=None):
+        yield service
+
+
+@pytest.fixture
+def tak_server():
+    server = Mock()
+    server.id = 1
+    server.name = "Test Server"
+    return server
+
+
+@pytest.fixture
+def connection():
+    writer = MagicMock()
+    writer.drain = AsyncMock()
+    return (Mock(), writer)
+
+
+def _batch(count=20, size=100):
+    return [bytes([65 + i % 26]) * size for i in range(count)]
+
+
+class TestCoalesceBatch:
+    """Batches are packed into buffers without splitting events"""
+
+    def test_packs_events_up_to_limit(self):
+        buffers = QueuedCOTService._coalesce_batch(_batch(10, 100), 350)
+
+        assert [len(buffer) for buffer in buffers] == [300, 300, 300, 100]
+        assert b"".join(buffers) == b"".join(_batch(10, 100))
+
+    def test_oversized_event_written_alone(self):
+        batch = [b"a" * 10, b"b" * 500, b"c" * 10]
+
+        assert QueuedCOTService._coalesce_batch(batch, 100) == batch
+
+
+class TestCoalescedTransmission:
+    """write_mode selects per-event or coalesced writes"""
+
+    @pytest.mark.asyncio
+    async def test_per_event_mode_is_default(self, cot_service, connection, tak_server):
+        batch = _batch()
+
+        assert await cot_service._transmit_batch(batch, connection, tak_server)
+
+        writer = connection[1]
+        assert writer.write.call_count == 20
+        assert writer.drain.await_count == 20
+
+    @pytest.mark.asyncio
+    async def test_coalesced_mode_drains_once(
+        self, cot_service, connection, tak_server
+    ):
+        cot_service.parallel_config["transmission"].update(
+            {"write_mode": "coalesced", "max_bytes_per_write": 1000}
+        )
+        batch = _batch()
+
+        assert await cot_service._transmit_batch(batch, connection, tak_server)
+
+        writer = connection[1]
+        assert writer.write.call_count == 2
+        assert writer.drain.await_count == 1
+        written = b"".join(call.args[0] for call in writer.write.call_args_list)
+        assert written == b"".join(batch)
+
+    @pytest.mark.asyncio
+    async def test_coalesced_write_failure_reports_failure(
+        self, cot_service, connection, tak_server
+    ):
+        cot_service.parallel_config["transmission"]["write_mode"] = "coalesced"
+        connection[1].drain.side_effect = ConnectionResetError("reset")
+
+        result = await cot_service._transmit_batch(_batch(), connection, tak_server)
+
+        assert result is TransmitResult.WRITE_ERROR
+        assert cot_service.transmission_metrics[1].batches_failed == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_is_not_a_write_error(
+        self, cot_service, connection, tak_server
+    ):
+        breaker = Mock()
+        breaker.call = AsyncMock(
+            side_effect=CircuitOpenError("tak_server_1", datetime.now(timezone.utc))
+        )
+
+        with patch.object(
+            cot_service, "_get_tak_circuit_breaker", return_value=breaker
+        ):
+            result = await cot_service._transmit_batch(
+                _batch(), connection, tak_server
+            )
+
+        assert result is TransmitResult.NOT_SENT
+        connection[1].write.assert_not_called()
+
+
+class TestTransmissionMetrics:
+    """Byte and latency counters are surfaced through get_worker_status"""
+
+    @pytest.mark.asyncio
+    async def test_worker_status_reports_counters(
+        self, cot_service, connection, tak_server
+    ):
+        cot_service.parallel_config["transmission"]["write_mode"] = "coalesced"
+
+        await cot_service._transmit_batch(_batch(20, 100), connection, tak_server)
+        await cot_service._transmit_batch(_batch(5, 100), connection, tak_server)
+
+        transmission = cot_service.get_worker_status(1)["transmission"]
+        assert transmission["batches_transmitted"] == 2
+        assert transmission["events_transmitted"] == 25
+        assert transmission["bytes_transmitted"] == 2500
+        assert transmission["writes"] == 2
+        assert transmission["last_batch_bytes"] == 500
+        assert transmission["max_batch_latency_ms"] >= transmission[
+            "last_batch_latency_ms"
+        ]
+        assert transmission["average_batch_latency_ms"] >= 0
+
+    def test_no_counters_before_first_batch(self, cot_service):
+        assert "transmission" not in cot_service.get_worker_status(99)
+
+
+class TestTransmissionConfiguration:
+    """write_mode and max_bytes_per_write validation and overrides"""
+
+    def test_invalid_values_use_defaults(self, cot_service):
+        validated = cot_service.validate_performance_config(
+            {"transmission": {"write_mode": "vectored", "max_bytes_per_write": 0}}
+        )
+
+        assert validated["transmission"]["write_mode"] == "per_event"
+        assert validated["transmission"]["max_bytes_per_write"] == 65536
+
+    def test_environment_override(self, cot_service):
+        with patch.dict(
+            os.environ,
+            {
+                "TRANSMISSION_WRITE_MODE": "coalesced",
+                "TRANSMISSION_MAX_BYTES_PER_WRITE": "16384",
+            },
+        ):
+            config = cot_service.load_performance_config_with_env_override()
+
+        assert config["transmission"]["write_mode"] == "coalesced"
+        assert config["transmission"]["max_bytes_per_write"] == 16384
@@ -0,0 +1,103 @@
+"""
+ABOUTME: Unit tests for conditional plugin fetches covering ETag/Last-Modified
+ABOUTME: revalidation headers and 304 handling that skips parsing
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from plugins.deepstate_plugin import DeepstatePlugin
+from services.session_manager import ConditionalRequestValidators
+
+URL = "https://feed.example.com/positions"
+
+
+def _response(status, headers=None, data=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    body = json.dumps(data).encode()
+
+    async def iter_chunked(size):
+        yield body
+
+    response.content.iter_chunked = MagicMock(side_effect=iter_chunked)
+    return response
+
+
+def _session(*responses):
+    contexts = []
+    for response in responses:
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=False)
+        contexts.append(context)
+    session = MagicMock()
+    session.get = MagicMock(side_effect=contexts)
+    return session
+
+
+class TestConditionalRequestValidators:
+    """Validators from full responses are sent back on the next request"""
+
+    def test_validators_added_after_full_response(self):
+        validators = ConditionalRequestValidators()
+        assert validators.request_headers(URL, {"Accept": "application/json"}) == {
+            "Accept": "application/json"
+        }
+
+        validators.record(
+            URL,
+            200,
+            {"ETag": '"v1"', "Last-Modified": "Fri, 16 Oct 2026 10:00:00 GMT"},
+        )
+
+        assert validators.request_headers(URL) == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Fri, 16 Oct 2026 10:00:00 GMT",
+        }
+
+    def test_not_modified_keeps_validators(self):
+        validators = ConditionalRequestValidators()
+        validators.record(URL, 200, {"ETag": '"v1"'})
+
+        assert validators.record(URL, 304, {}) is True
+        assert validators.request_headers(URL)["If-None-Match"] == '"v1"'
+
+    def test_response_without_validators_clears_them(self):
+        validators = ConditionalRequestValidators()
+        validators.record(URL, 200, {"ETag": '"v1"'})
+        validators.record(URL, 200, {})
+
+        assert validators.request_headers(URL) == {}
+
+    def test_expired_validators_force_full_fetch(self):
+        validators = ConditionalRequestValidators()
+        validators.record(URL, 200, {"ETag": '"v1"'})
+
+        with patch("services.session_manager.time.monotonic", return_value=1e12):
+            assert validators.request_headers(URL, max_age=60) == {}
+
+
+class TestPluginConditionalFetch:
+    """A 304 response short-circuits the plugin without parsing"""
+
+    @pytest.mark.asyncio
+    async def test_deepstate_not_modified(self):
+        plugin = DeepstatePlugin({})
+        full = _response(200, {"ETag": '"map-1"'}, {"map": {"features": []}})
+        not_modified = _response(304)
+        session = _session(full, not_modified)
+
+        await plugin._fetch_locations_with_session(session, {})
+        assert not plugin.last_fetch_not_modified
+
+        locations = await plugin._fetch_locations_with_session(session, {})
+
+        sent_headers = session.get.call_args_list[1].kwargs["headers"]
+        assert sent_headers["If-None-Match"] == '"map-1"'
+        assert locations == []
+        assert plugin.last_fetch_not_modified
+        not_modified.content.iter_chunked.assert_not_called()
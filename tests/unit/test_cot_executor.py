@@ -0,0 +1,255 @@
+"""
+ABOUTME: Unit tests for executor-backed CoT generation on thread and process pools
+ABOUTME: covering location projection, output equivalence, dispatch and configuration
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import yaml
+
+from services.cot_executor import (
+    CotGenerationExecutor,
+    get_cot_generation_executor,
+    reset_cot_generation_executor,
+    to_plain_location,
+)
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import (
+    QueuedCOTService,
+    reset_queued_cot_service,
+)
+from tests.fixtures.mock_location_data import generate_mock_gps_points
+
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    """Reset COT service and executor singletons around each test"""
+    reset_cot_service()
+    reset_queued_cot_service()
+    reset_cot_generation_executor()
+    yield
+    reset_cot_generation_executor()
+    reset_cot_service()
+    reset_queued_cot_service()
+
+
+@pytest.fixture
+def cot_service():
+    return get_cot_service()
+
+
+class TestPlainLocationProjection:
+    """Locations are reduced to CoT-relevant, picklable fields"""
+
+    def test_drops_plugin_payloads(self):
+        location = {
+            "uid": "DEV-1",
+            "name": "Device 1",
+            "lat": 1.0,
+            "lon": 2.0,
+            "raw_response": threading.Lock(),
+            "additional_data": {
+                "team_member_enabled": True,
+                "team_role": "Medic",
+                "battery_state": 80,
+                "raw_placemark": threading.Lock(),
+            },
+        }
+
+        plain = to_plain_location(location)
+
+        assert plain == {
+            "uid": "DEV-1",
+            "name": "Device 1",
+            "lat": 1.0,
+            "lon": 2.0,
+            "additional_data": {
+                "team_member_enabled": True,
+                "team_role": "Medic",
+                "battery_state": 80,
+            },
+        }
+        pickle.dumps(plain)
+
+    def test_projection_does_not_change_generated_events(self):
+        locations = generate_mock_gps_points(25)
+        plain = [to_plain_location(location) for location in locations]
+
+        assert QueuedCOTService._build_pytak_events(
+            plain, "a-f-G-U-C", 300, "per_point"
+        ) == QueuedCOTService._build_pytak_events(
+            locations, "a-f-G-U-C", 300, "per_point"
+        )
+
+
+class TestExecutorGeneration:
+    """Executor output matches serial generation and preserves order"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("executor_type", ["thread", "process"])
+    async def test_executor_matches_serial(self, executor_type):
+        locations = generate_mock_gps_points(120)
+        executor = CotGenerationExecutor()
+        try:
+            events = await executor.generate(
+                locations, "a-f-G-U-C", 300, "stream", executor_type, 2, 25
+            )
+        finally:
+            executor.shutdown(wait=True)
+
+        assert events == QueuedCOTService._build_pytak_events(
+            locations, "a-f-G-U-C", 300, "stream"
+        )
+
+    def test_pool_reused_until_configuration_changes(self):
+        executor = CotGenerationExecutor()
+        try:
+            first = executor.get_executor("thread", 2)
+            assert executor.get_executor("thread", 2) is first
+            assert executor.get_executor("thread", 3) is not first
+            assert executor.get_status() == {
+                "executor_type": "thread",
+                "pool_size": 3,
+                "active": True,
+            }
+        finally:
+            executor.shutdown(wait=True)
+
+    def test_automatic_pool_size_is_bounded(self):
+        assert 1 <= CotGenerationExecutor.resolve_pool_size(0) <= 4
+        assert CotGenerationExecutor.resolve_pool_size(6) == 6
+
+
+class TestExecutorDispatch:
+    """_create_parallel_pytak_events routes large polls to the executor"""
+
+    @pytest.mark.asyncio
+    async def test_large_poll_uses_executor(self, cot_service):
+        cot_service.parallel_config.update(
+            {"executor": "thread", "executor_threshold": 50, "executor_chunk_size": 10}
+        )
+        locations = generate_mock_gps_points(60)
+
+        with patch.object(
+            cot_service,
+            "_create_executor_pytak_events",
+            wraps=cot_service._create_executor_pytak_events,
+        ) as executor_path:
+            events = await cot_service._create_parallel_pytak_events(
+                locations, "a-f-G-U-C", 300, "stream"
+            )
+
+        executor_path.assert_called_once()
+        assert len(events) == 60
+        assert get_cot_generation_executor().get_status()["executor_type"] == "thread"
+
+    @pytest.mark.asyncio
+    async def test_small_poll_stays_inline(self, cot_service):
+        cot_service.parallel_config.update(
+            {"executor": "thread", "executor_threshold": 500}
+        )
+        cot_service._create_executor_pytak_events = AsyncMock()
+
+        events = await cot_service._create_parallel_pytak_events(
+            generate_mock_gps_points(20), "a-f-G-U-C", 300, "stream"
+        )
+
+        cot_service._create_executor_pytak_events.assert_not_called()
+        assert len(events) == 20
+
+    @pytest.mark.asyncio
+    async def test_asyncio_executor_disables_pool(self, cot_service):
+        cot_service.parallel_config.update(
+            {"executor": "asyncio", "executor_threshold": 1}
+        )
+        cot_service._create_executor_pytak_events = AsyncMock()
+
+        await cot_service._create_parallel_pytak_events(
+            generate_mock_gps_points(20), "a-f-G-U-C", 300, "stream"
+        )
+
+        cot_service._create_executor_pytak_events.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_executor_failure_falls_back_to_serial(self, cot_service):
+        cot_service.parallel_config.update(
+            {"executor": "thread", "executor_threshold": 1, "fallback_on_error": True}
+        )
+        cot_service._create_executor_pytak_events = AsyncMock(
+            side_effect=RuntimeError("pool broken")
+        )
+
+        events = await cot_service._create_parallel_pytak_events(
+            generate_mock_gps_points(15), "a-f-G-U-C", 300, "stream"
+        )
+
+        assert len(events) == 15
+        assert cot_service._circuit_breaker_failures == 1
+
+
+class TestExecutorConfiguration:
+    """Executor settings are read from the parallel_processing section"""
+
+    def test_parallel_processing_section_applied(self, cot_service):
+        config = {
+            "parallel_processing": {
+                "executor": "thread",
+                "executor_pool_size": 3,
+                "executor_chunk_size": 200,
+                "executor_threshold": 400,
+                "batch_size_threshold": 25,
+            },
+            "queue": {"batch_size": 30},
+        }
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            yaml.dump(config, f)
+            config_path = f.name
+
+        try:
+            with patch.object(
+                cot_service, "get_config_file_search_paths", return_value=[config_path]
+            ):
+                cot_service._load_performance_config()
+        finally:
+            os.unlink(config_path)
+
+        assert cot_service.parallel_config["executor"] == "thread"
+        assert cot_service.parallel_config["executor_pool_size"] == 3
+        assert cot_service.parallel_config["executor_chunk_size"] == 200
+        assert cot_service.parallel_config["executor_threshold"] == 400
+        assert cot_service.parallel_config["queue"]["batch_size"] == 30
+        # Other parallel_processing keys keep their previous (unapplied) behaviour
+        assert cot_service.parallel_config["batch_size_threshold"] == 10
+
+    def test_invalid_executor_settings_use_defaults(self, cot_service):
+        validated = cot_service.validate_performance_config(
+            {
+                "executor": "gpu",
+                "executor_pool_size": -1,
+                "executor_chunk_size": 0,
+                "executor_threshold": "many",
+            }
+        )
+
+        assert validated["executor"] == "process"
+        assert validated["executor_pool_size"] == 0
+        assert validated["executor_chunk_size"] == 500
+        assert validated["executor_threshold"] == 1000
+
+    def test_environment_override(self, cot_service):
+        with patch.dict(
+            os.environ,
+            {
+                "TRAKBRIDGE_COT_EXECUTOR": "thread",
+                "TRAKBRIDGE_COT_EXECUTOR_CHUNK_SIZE": "64",
+            },
+        ):
+            config = cot_service.load_performance_config_with_env_override()
+
+        assert config["executor"] == "thread"
+        assert config["executor_chunk_size"] == 64
@@ -0,0 +1,207 @@
+"""
+ABOUTME: Byte-for-byte equivalence tests for the template-based CoT serializer
+ABOUTME: comparing its output against the lxml tree builder it replaces
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from lxml import etree
+
+from services.cot_serializer import escape_attribute, escape_text, serialize_cot_event
+from services.cot_service_integration import QueuedCOTService
+
+EVENT_TIME = datetime(2025, 9, 17, 12, 30, 45)
+
+
+def _event_data(**overrides):
+    """Build an event_data dictionary shaped like _create_pytak_events output"""
+    data = {
+        "uid": "TEST-001",
+        "type": "a-f-G-U-C",
+        "time": EVENT_TIME,
+        "start": EVENT_TIME,
+        "stale": EVENT_TIME + timedelta(seconds=300),
+        "how": "h-g-i-g-o",
+        "lat": 38.8977,
+        "lon": -77.0365,
+        "hae": 0.0,
+        "ce": 10.0,
+        "le": 10.0,
+        "callsign": "Test Device",
+        "battery": 100,
+    }
+    data.update(overrides)
+    return data
+
+
+def _assert_equivalent(event_data):
+    expected = QueuedCOTService._generate_cot_xml_lxml(event_data)
+    actual = serialize_cot_event(event_data)
+    assert actual == expected
+
+
+class TestSerializerEquivalence:
+    """Template output must match lxml serialization exactly"""
+
+    def test_minimal_event(self):
+        _assert_equivalent(_event_data())
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"speed": 12.3456},
+            {"course": 271.5},
+            {"speed": 0.0, "course": 0.0},
+            {"remarks": "Parked at depot"},
+            {"remarks": ""},
+            {"speed": 5.0, "course": 90.0, "remarks": "Moving"},
+        ],
+    )
+    def test_optional_elements(self, extra):
+        _assert_equivalent(_event_data(**extra))
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {},
+            {"speed": 3.2},
+            {"course": 45.0},
+            {"speed": 3.2, "course": 45.0, "remarks": "On patrol"},
+            {"team_role": "", "team_color": ""},
+        ],
+    )
+    def test_team_member_events(self, extra):
+        data = _event_data(
+            type="a-f-G-U-C",
+            how="h-e",
+            team_member_enabled=True,
+            team_role="Team Lead",
+            team_color="Cyan",
+            battery=42,
+        )
+        data.update(extra)
+        _assert_equivalent(data)
+
+    @pytest.mark.parametrize(
+        "lat,lon,hae,ce,le",
+        [
+            (0.0, 0.0, 0.0, 0.0, 0.0),
+            (-89.999999999, 179.999999999, -431.123, 999999.0, 999999.0),
+            (1e-9, -1e-9, 8848.8649, 0.005, 0.015),
+            (45, -120, 100, 5, 5),
+        ],
+    )
+    def test_numeric_formatting(self, lat, lon, hae, ce, le):
+        _assert_equivalent(_event_data(lat=lat, lon=lon, hae=hae, ce=ce, le=le))
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            'Alpha & "Bravo" <Charlie>',
+            "Line one\nLine two\r\n\tIndented",
+            "It's ]]> fine",
+            "Café Zürich",
+            "Привет 😀 東京",
+            "\x7f\x80\x9f",
+        ],
+    )
+    def test_escaping_in_every_string_field(self, value):
+        _assert_equivalent(
+            _event_data(uid=value, callsign=value, type=value, remarks=value)
+        )
+        _assert_equivalent(
+            _event_data(
+                callsign=value,
+                team_member_enabled=True,
+                team_role=value,
+                team_color=value,
+            )
+        )
+
+    def test_output_parses_with_expected_structure(self):
+        xml = serialize_cot_event(_event_data(speed=1.0, remarks="ok"))
+        root = etree.fromstring(xml)
+        assert root.tag == "event"
+        assert [child.tag for child in root] == ["point", "detail"]
+        assert [child.tag for child in root.find("detail")] == [
+            "takv",
+            "contact",
+            "track",
+            "remarks",
+        ]
+
+
+class TestSerializerErrors:
+    """Values lxml rejects must be rejected the same way"""
+
+    @pytest.mark.parametrize("value", ["bad\x00value", "bad\x0bvalue", "\ufffe"])
+    def test_control_characters_raise_value_error(self, value):
+        with pytest.raises(ValueError):
+            QueuedCOTService._generate_cot_xml_lxml(_event_data(callsign=value))
+        with pytest.raises(ValueError):
+            serialize_cot_event(_event_data(callsign=value))
+
+    @pytest.mark.parametrize("field", ["uid", "callsign", "type", "how"])
+    def test_non_string_values_raise_type_error(self, field):
+        with pytest.raises(TypeError):
+            QueuedCOTService._generate_cot_xml_lxml(_event_data(**{field: None}))
+        with pytest.raises(TypeError):
+            serialize_cot_event(_event_data(**{field: None}))
+
+    def test_escape_helpers_pass_through_plain_strings(self):
+        assert escape_attribute("plain") == "plain"
+        assert escape_text("plain") == "plain"
+
+
+class TestGenerateCotXmlRouting:
+    """_generate_cot_xml uses the template path unless custom attributes are present"""
+
+    def test_stock_events_use_serializer(self, mocker):
+        spy = mocker.spy(QueuedCOTService, "_generate_cot_xml_lxml")
+        QueuedCOTService._generate_cot_xml(_event_data())
+        assert spy.call_count == 0
+
+    def test_custom_attributes_use_lxml(self):
+        data = _event_data(
+            custom_cot_attrib={"detail": {"__milsym": {"_text": "SFGPUCI-------"}}}
+        )
+        xml = QueuedCOTService._generate_cot_xml(data)
+        assert etree.fromstring(xml).find("detail/__milsym").text == "SFGPUCI-------"
+
+    @pytest.mark.asyncio
+    async def test_create_pytak_events_output_unchanged(self, monkeypatch):
+        locations = [
+            {
+                "uid": f"DEV-{i}",
+                "name": f"Device <{i}> & Co",
+                "lat": -33.8688 + i * 0.001,
+                "lon": 151.2093 - i * 0.001,
+                "altitude": 12.5,
+                "speed": i * 1.5,
+                "course": (i * 37) % 360,
+                "description": f"Remark {i}\r\nsecond line",
+                "timestamp": "2025-09-17T12:30:45Z",
+                "additional_data": (
+                    {"team_member_enabled": True, "team_role": "Medic"}
+                    if i % 3 == 0
+                    else {"battery_state": 55}
+                ),
+            }
+            for i in range(12)
+        ]
+
+        fast = await QueuedCOTService._create_pytak_events(
+            locations, "a-f-G-U-C", 300, "stream"
+        )
+        monkeypatch.setattr(
+            QueuedCOTService,
+            "_generate_cot_xml",
+            staticmethod(QueuedCOTService._generate_cot_xml_lxml),
+        )
+        slow = await QueuedCOTService._create_pytak_events(
+            locations, "a-f-G-U-C", 300, "stream"
+        )
+
+        assert len(fast) == 12
+        assert fast == slow
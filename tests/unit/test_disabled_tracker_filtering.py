@@ -16,6 +16,8 @@ from unittest.mock import Mock, AsyncMock
 
 from models.callsign_mapping import CallsignMapping
 from models.stream import Stream
+from services.callsign_mapping_index import CallsignMappingIndex
+from services.database_manager import AsyncDatabaseManager, DatabaseManager
 from services.stream_worker import StreamWorker
 
 
@@ -52,9 +54,9 @@ class TestDisabledTrackerFiltering:
         return StreamWorker(test_stream, mock_session_manager, mock_db_manager)
 
     def test_filter_disabled_trackers_removes_disabled_locations(
-        self, app, db_session, stream_worker
+        self, app, db_session
     ):
-        """Test that _filter_disabled_trackers removes disabled tracker locations"""
+        """Test that the mapping index removes disabled tracker locations"""
         with app.app_context():
             # Create test stream in database
             stream = Stream(
@@ -89,9 +91,6 @@ class TestDisabledTrackerFiltering:
             db_session.add_all([disabled_mapping1, disabled_mapping2, enabled_mapping])
             db_session.commit()
 
-            # Update worker's stream reference
-            stream_worker.stream = stream
-
             # Test locations with mix of enabled/disabled trackers
             test_locations = [
                 {
@@ -134,15 +133,12 @@ class TestDisabledTrackerFiltering:
                 "DISABLED002": disabled_mapping2,
             }
 
-            fresh_stream_config = {"callsign_identifier_field": "imei"}
+            mapping_index = CallsignMappingIndex.compile(
+                {"callsign_identifier_field": "imei"}, {}, disabled_mappings
+            )
 
             # Run the filtering
-            async def test_filtering():
-                await stream_worker._filter_disabled_trackers(
-                    test_locations, disabled_mappings, fresh_stream_config
-                )
-
-            asyncio.run(test_filtering())
+            assert mapping_index.filter_disabled(test_locations) == 2
 
             # Verify disabled trackers were removed
             assert len(test_locations) == 2  # Only enabled and unmapped should remain
@@ -153,9 +149,7 @@ class TestDisabledTrackerFiltering:
             assert "Device 1" not in remaining_names  # Disabled tracker removed
             assert "Device 3" not in remaining_names  # Disabled tracker removed
 
-    def test_filter_disabled_trackers_handles_empty_disabled_mappings(
-        self, stream_worker
-    ):
+    def test_filter_disabled_trackers_handles_empty_disabled_mappings(self):
         """Test that filtering works when no disabled mappings exist"""
         test_locations = [
             {
@@ -169,20 +163,17 @@ class TestDisabledTrackerFiltering:
         ]
 
         disabled_mappings = {}  # No disabled mappings
-        fresh_stream_config = {"callsign_identifier_field": "imei"}
-
-        async def test_filtering():
-            await stream_worker._filter_disabled_trackers(
-                test_locations, disabled_mappings, fresh_stream_config
-            )
+        mapping_index = CallsignMappingIndex.compile(
+            {"callsign_identifier_field": "imei"}, {}, disabled_mappings
+        )
 
-        asyncio.run(test_filtering())
+        assert mapping_index.filter_disabled(test_locations) == 0
 
         # No locations should be removed
         assert len(test_locations) == 1
         assert test_locations[0]["name"] == "Device 1"
 
-    def test_filter_disabled_trackers_handles_no_identifier_field(self, stream_worker):
+    def test_filter_disabled_trackers_handles_no_identifier_field(self):
         """Test that filtering is skipped when no identifier field is configured"""
         test_locations = [
             {
@@ -196,14 +187,10 @@ class TestDisabledTrackerFiltering:
         ]
 
         disabled_mappings = {"DISABLED001": Mock()}
-        fresh_stream_config = {}  # No identifier field
-
-        async def test_filtering():
-            await stream_worker._filter_disabled_trackers(
-                test_locations, disabled_mappings, fresh_stream_config
-            )
+        # No identifier field
+        mapping_index = CallsignMappingIndex.compile({}, {}, disabled_mappings)
 
-        asyncio.run(test_filtering())
+        assert mapping_index.filter_disabled(test_locations) == 0
 
         # No locations should be removed without identifier field
         assert len(test_locations) == 1
@@ -212,7 +199,7 @@ class TestDisabledTrackerFiltering:
     def test_load_disabled_callsign_mappings_returns_only_disabled(
         self, app, db_session, stream_worker
     ):
-        """Test that _load_disabled_callsign_mappings only returns disabled mappings"""
+        """Test that the config snapshot only holds disabled mappings for filtering"""
         with app.app_context():
             # Create test stream in database
             stream = Stream(
@@ -246,14 +233,15 @@ class TestDisabledTrackerFiltering:
             db_session.add_all([enabled_mapping, disabled_mapping1, disabled_mapping2])
             db_session.commit()
 
-            # Update worker's stream reference
+            # Update worker's stream reference and load through the test app
             stream_worker.stream = stream
+            stream_worker.async_db = AsyncDatabaseManager(
+                DatabaseManager(app.app_context)
+            )
 
             # Load disabled mappings
-            async def test_loading():
-                return await stream_worker._load_disabled_callsign_mappings()
-
-            disabled_mappings = asyncio.run(test_loading())
+            snapshot = asyncio.run(stream_worker._get_config_snapshot())
+            disabled_mappings = snapshot.disabled_mappings
 
             # Verify only disabled mappings are returned
             assert len(disabled_mappings) == 2
@@ -270,7 +258,7 @@ class TestDisabledTrackerFiltering:
     def test_load_callsign_mappings_returns_only_enabled(
         self, app, db_session, stream_worker
     ):
-        """Test that _load_callsign_mappings only returns enabled mappings"""
+        """Test that the config snapshot only maps enabled mappings"""
         with app.app_context():
             # Create test stream in database
             stream = Stream(
@@ -304,14 +292,16 @@ class TestDisabledTrackerFiltering:
             db_session.add_all([enabled_mapping1, enabled_mapping2, disabled_mapping])
             db_session.commit()
 
-            # Update worker's stream reference
+            # Update worker's stream reference and load through the test app
             stream_worker.stream = stream
+            stream_worker.async_db = AsyncDatabaseManager(
+                DatabaseManager(app.app_context)
+            )
 
             # Load enabled mappings
-            async def test_loading():
-                return await stream_worker._load_callsign_mappings()
-
-            enabled_mappings = asyncio.run(test_loading())
+            snapshot = asyncio.run(stream_worker._get_config_snapshot())
+            enabled_mappings = snapshot.callsign_mappings
+            assert len(snapshot.mapping_index) == 2
 
             # Verify only enabled mappings are returned
             assert len(enabled_mappings) == 2
@@ -409,8 +399,8 @@ class TestDisabledTrackerFiltering:
             assert "Unmapped Device" in location_names  # Unmapped tracker (fallback)
             assert "Disabled Device" not in location_names  # Disabled tracker removed
 
-    def test_extract_identifier_handles_various_field_types(self, stream_worker):
-        """Test that _extract_identifier works with different identifier field types"""
+    def test_extract_identifier_handles_various_field_types(self):
+        """Test that identifier extraction works with different identifier field types"""
         # Test different location data structures for various plugins
         test_cases = [
             # Garmin IMEI extraction
@@ -465,7 +455,10 @@ class TestDisabledTrackerFiltering:
         ]
 
         for location, field_name, expected_result in test_cases:
-            result = stream_worker._extract_identifier(location, field_name)
+            mapping_index = CallsignMappingIndex.compile(
+                {"callsign_identifier_field": field_name}, {}, {}
+            )
+            result = mapping_index.extract_identifier(location)
             assert (
                 result == expected_result
             ), f"Failed for field '{field_name}': expected '{expected_result}', got '{result}'"
@@ -474,20 +467,7 @@ class TestDisabledTrackerFiltering:
 class TestFilteringPerformance:
     """Test performance aspects of disabled tracker filtering"""
 
-    @pytest.fixture
-    def stream_worker(self):
-        """Create StreamWorker instance for performance testing"""
-        test_stream = Mock()
-        test_stream.id = 1
-        test_stream.name = "Performance Test Stream"
-        test_stream.poll_interval = (
-            60  # Set numeric value to prevent division operator issues
-        )
-        mock_session_manager = Mock()
-        mock_db_manager = Mock()
-        return StreamWorker(test_stream, mock_session_manager, mock_db_manager)
-
-    def test_filtering_performance_with_large_datasets(self, stream_worker):
+    def test_filtering_performance_with_large_datasets(self):
         """Test that filtering performs well with large numbers of locations and mappings"""
         # Create large dataset
         num_locations = 1000
@@ -514,22 +494,16 @@ class TestFilteringPerformance:
             disabled_mapping.enabled = False
             disabled_mappings[f"IMEI{i:04d}"] = disabled_mapping
 
-        fresh_stream_config = {"callsign_identifier_field": "imei"}
+        mapping_index = CallsignMappingIndex.compile(
+            {"callsign_identifier_field": "imei"}, {}, disabled_mappings
+        )
 
         # Measure performance
         import time
 
-        async def test_performance():
-            start_time = time.time()
-            await stream_worker._filter_disabled_trackers(
-                test_locations, disabled_mappings, fresh_stream_config
-            )
-            end_time = time.time()
-            return end_time - start_time
-
-        import asyncio
-
-        duration = asyncio.run(test_performance())
+        start_time = time.time()
+        mapping_index.filter_disabled(test_locations)
+        duration = time.time() - start_time
 
         # Verify results
         assert len(test_locations) == (num_locations - num_disabled)
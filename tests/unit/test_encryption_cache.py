@@ -0,0 +1,69 @@
+"""
+ABOUTME: Unit tests for the encryption caches covering derived Fernet keys shared
+ABOUTME: across EncryptionService instances and the decrypted plugin config LRU
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from services import encryption_service as encryption_module
+from services.encryption_service import (
+    DecryptedConfigCache,
+    EncryptionService,
+    clear_encryption_caches,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    clear_encryption_caches()
+    yield
+    clear_encryption_caches()
+
+
+class TestDerivedKeyCache:
+    """PBKDF2 runs once per master key and salt"""
+
+    def test_instances_share_derived_key(self):
+        with patch.object(
+            encryption_module, "PBKDF2HMAC", wraps=encryption_module.PBKDF2HMAC
+        ) as kdf:
+            first = EncryptionService("master-key-one")
+            encrypted = first.encrypt_value("secret")
+
+            second = EncryptionService("master-key-one")
+            assert second.decrypt_value(encrypted) == "secret"
+
+        assert kdf.call_count == 1
+
+    def test_different_master_keys_derive_separately(self):
+        encrypted = EncryptionService("master-key-one").encrypt_value("secret")
+
+        with pytest.raises(Exception):
+            EncryptionService("master-key-two").decrypt_value(encrypted)
+
+
+class TestDecryptedConfigCache:
+    """Cached configs are copies and the cache is bounded"""
+
+    def test_returns_independent_copies(self):
+        cache = DecryptedConfigCache()
+        cache.put(("garmin", "{}"), {"password": "secret", "nested": {"a": 1}})
+
+        config = cache.get(("garmin", "{}"))
+        config["nested"]["a"] = 2
+
+        assert cache.get(("garmin", "{}"))["nested"]["a"] == 1
+        assert cache.get(("garmin", "{changed}")) is None
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = DecryptedConfigCache(max_entries=2)
+        cache.put("a", {"v": 1})
+        cache.put("b", {"v": 2})
+        cache.get("a")
+        cache.put("c", {"v": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert len(cache) == 2
@@ -0,0 +1,134 @@
+"""
+ABOUTME: Unit tests for event-driven batch retrieval in QueueManager and the
+ABOUTME: transmission worker waking on new events instead of sleep-polling
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import reset_queued_cot_service
+from services.queue_manager import QueueManager
+
+
+async def _manager(**config):
+    manager = QueueManager({"batch_size": 3, "batch_timeout_ms": 50, **config})
+    await manager.create_queue(1)
+    return manager
+
+
+class TestEventDrivenGetBatch:
+    """get_batch awaits the first event and drains the rest without polling"""
+
+    @pytest.mark.asyncio
+    async def test_wakes_on_first_event(self):
+        manager = await _manager(batch_timeout_ms=5000)
+        loop = asyncio.get_running_loop()
+
+        fetch = asyncio.create_task(manager.get_batch(1, wait_timeout=-1))
+        await asyncio.sleep(0.01)
+        assert not fetch.done()
+
+        started = loop.time()
+        for i in range(3):
+            await manager.enqueue_event(1, f"event-{i}".encode())
+        batch = await asyncio.wait_for(fetch, timeout=1)
+
+        assert batch == [b"event-0", b"event-1", b"event-2"]
+        assert loop.time() - started < 1
+
+    @pytest.mark.asyncio
+    async def test_drains_queued_events_without_wait_for(self):
+        manager = await _manager()
+        for i in range(5):
+            await manager.enqueue_event(1, f"event-{i}".encode())
+
+        with patch.object(asyncio, "wait_for", side_effect=AssertionError):
+            first = await manager.get_batch(1)
+            second = await manager.get_batch(1)
+
+        assert first == [b"event-0", b"event-1", b"event-2"]
+        assert second == [b"event-3", b"event-4"]
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_collects_until_batch_timeout(self):
+        manager = await _manager(batch_timeout_ms=200)
+        await manager.enqueue_event(1, b"first")
+
+        async def late_event():
+            await asyncio.sleep(0.02)
+            await manager.enqueue_event(1, b"second")
+
+        producer = asyncio.create_task(late_event())
+        batch = await manager.get_batch(1)
+        await producer
+
+        assert batch == [b"first", b"second"]
+
+    @pytest.mark.asyncio
+    async def test_empty_queue_respects_wait_timeout(self):
+        manager = await _manager()
+
+        assert await manager.get_batch(1, wait_timeout=0) == []
+        assert await manager.get_batch(1, wait_timeout=0.01) == []
+
+    @pytest.mark.asyncio
+    async def test_shutdown_signal_ends_batch(self):
+        manager = await _manager(batch_timeout_ms=5000)
+        await manager.enqueue_event(1, b"event")
+        manager.queues[1].put_nowait(None)
+
+        assert await asyncio.wait_for(manager.get_batch(1), timeout=1) == [b"event"]
+
+
+class TestTransmissionWorkerWakeup:
+    """The transmission worker picks up events without an idle sleep interval"""
+
+    @pytest.fixture(autouse=True)
+    def reset_services(self):
+        reset_cot_service()
+        reset_queued_cot_service()
+        yield
+        reset_cot_service()
+        reset_queued_cot_service()
+
+    @pytest.mark.asyncio
+    async def test_worker_transmits_new_event_promptly(self):
+        service = get_cot_service()
+        service.parallel_config["transmission"]["queue_check_interval_ms"] = 60000
+        tak_server = Mock()
+        tak_server.id = 1
+        tak_server.name = "Test Server"
+        transmitted = asyncio.Event()
+
+        async def transmit(batch, connection, server):
+            transmitted.set()
+            return True
+
+        await service.queue_manager.create_queue(1)
+        with patch.object(
+            service,
+            "_create_pytak_connection",
+            AsyncMock(return_value=(Mock(), MagicMock())),
+        ), patch.object(service, "_transmit_batch", side_effect=transmit), patch.object(
+            service, "_cleanup_connection", AsyncMock()
+        ):
+            worker = asyncio.create_task(
+                service._enhanced_transmission_worker(1, tak_server)
+            )
+            await asyncio.sleep(0.05)
+            await service.queue_manager.enqueue_event(1, b"event")
+
+            await asyncio.wait_for(transmitted.wait(), timeout=2)
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+    def test_transmission_batch_timeout_reaches_queue_manager(self):
+        service = get_cot_service()
+
+        assert (
+            service.queue_manager.config["batch_timeout_ms"]
+            == service.parallel_config["transmission"]["batch_timeout_ms"]
+        )
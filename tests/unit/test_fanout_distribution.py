@@ -0,0 +1,154 @@
+"""
+ABOUTME: Unit tests for the serialize-once, fan-out-many distribution stage
+ABOUTME: used by StreamWorker to enqueue one prepared batch to several TAK servers
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import (
+    QueuedCOTService,
+    reset_queued_cot_service,
+)
+from services.stream_worker import StreamWorker
+from tests.fixtures.mock_location_data import generate_mock_gps_points
+
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    """Reset COT service singletons around each test"""
+    reset_cot_service()
+    reset_queued_cot_service()
+    yield
+    reset_cot_service()
+    reset_queued_cot_service()
+
+
+@pytest.fixture
+def cot_service():
+    return get_cot_service()
+
+
+@pytest.fixture
+def events():
+    return QueuedCOTService._build_pytak_events(
+        generate_mock_gps_points(12), "a-f-G-U-C", 300, "stream"
+    )
+
+
+class TestEnqueueFanout:
+    """enqueue_fanout resolves identities once and shares event objects"""
+
+    @pytest.mark.asyncio
+    async def test_same_event_objects_in_every_queue(self, cot_service, events):
+        results = await cot_service.enqueue_fanout(events, [1, 2, 3])
+
+        assert results == {1: 12, 2: 12, 3: 12}
+        queued = {
+            server_id: [cot_service.queues[server_id].get_nowait() for _ in events]
+            for server_id in (1, 2, 3)
+        }
+        for position, event in enumerate(events):
+            assert all(queued[server_id][position] is event for server_id in queued)
+
+    @pytest.mark.asyncio
+    async def test_identities_resolved_once_per_event(self, cot_service, events):
+        with patch.object(
+            cot_service, "get_event_identity", wraps=cot_service.get_event_identity
+        ) as get_identity:
+            await cot_service.enqueue_fanout(events, [1, 2, 3, 4])
+
+        assert get_identity.call_count == len(events)
+
+    @pytest.mark.asyncio
+    async def test_replacement_applies_per_server(self, cot_service, events):
+        await cot_service.enqueue_fanout(events, [1, 2])
+        await cot_service.enqueue_fanout(events, [1, 2])
+
+        assert cot_service.queues[1].qsize() == 12
+        assert cot_service.queues[2].qsize() == 12
+
+    @pytest.mark.asyncio
+    async def test_failure_isolated_to_one_server(self, cot_service, events):
+        create_queue = cot_service.queue_manager.create_queue
+
+        async def failing_create_queue(queue_id):
+            if queue_id == 2:
+                raise RuntimeError("queue unavailable")
+            return await create_queue(queue_id)
+
+        with patch.object(
+            cot_service.queue_manager, "create_queue", side_effect=failing_create_queue
+        ):
+            results = await cot_service.enqueue_fanout(events, [1, 2, 3])
+
+        assert results == {1: 12, 2: None, 3: 12}
+
+    @pytest.mark.asyncio
+    async def test_blocked_server_does_not_delay_others(self, cot_service, events):
+        enqueue_replacing = cot_service._enqueue_replacing
+        release = asyncio.Event()
+
+        async def blocking_enqueue(tak_server_id, batch, identities):
+            if tak_server_id == 1:
+                # Server 1's queue is full with the "block" overflow strategy
+                await release.wait()
+            return await enqueue_replacing(tak_server_id, batch, identities)
+
+        with patch.object(
+            cot_service, "_enqueue_replacing", side_effect=blocking_enqueue
+        ):
+            fanout = asyncio.ensure_future(cot_service.enqueue_fanout(events, [1, 2, 3]))
+            await asyncio.sleep(0.01)
+
+            assert cot_service.queues[2].qsize() == 12
+            assert cot_service.queues[3].qsize() == 12
+            assert not fanout.done()
+
+            release.set()
+            results = await asyncio.wait_for(fanout, timeout=1)
+
+        assert results == {1: 12, 2: 12, 3: 12}
+
+    @pytest.mark.asyncio
+    async def test_without_replacement_skips_identity(self, cot_service, events):
+        with patch.object(cot_service, "get_event_identity") as get_identity:
+            results = await cot_service.enqueue_fanout(events[:3], [1, 2], False)
+
+        get_identity.assert_not_called()
+        assert results == {1: 3, 2: 3}
+
+
+class TestStreamWorkerFanout:
+    """StreamWorker hands the prepared batch to the fan-out stage once"""
+
+    @pytest.mark.asyncio
+    async def test_distribution_uses_single_fanout_call(self, events):
+        stream = Mock()
+        stream.id = 1
+        stream.name = "Fan-out Stream"
+        stream.poll_interval = 60
+        servers = []
+        for server_id in (1, 2):
+            server = Mock()
+            server.id = server_id
+            server.name = f"Server {server_id}"
+            servers.append(server)
+        worker = StreamWorker(stream, Mock(), Mock())
+
+        with patch("services.stream_worker.get_cot_service") as mock_get_service:
+            mock_get_service.return_value.enqueue_fanout = AsyncMock(
+                return_value={1: 12, 2: None}
+            )
+            results = await worker._distribute_to_multiple_servers(events, servers)
+
+        mock_get_service.return_value.enqueue_fanout.assert_awaited_once_with(
+            events, [1, 2], replace=True
+        )
+        assert [(r["server"].id, r["success"], r["events_sent"]) for r in results] == [
+            (1, True, 12),
+            (2, False, 0),
+        ]
@@ -0,0 +1,107 @@
+"""
+ABOUTME: Unit tests for the streaming Garmin KML extractor covering parity with
+ABOUTME: the XML extractor, geometry handling, fallbacks and parser selection
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from plugins.garmin_plugin import (
+    GarminPlugin,
+    KMLDataExtractor,
+    StreamingKMLExtractor,
+)
+from tests.fixtures.mock_location_data import generate_mock_garmin_kml
+
+KML_HEADER = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+
+def _kml(*placemarks):
+    return (
+        KML_HEADER
+        + '<kml xmlns="http://www.opengis.net/kml/2.2"><Document><Folder>'
+        + "".join(placemarks)
+        + "</Folder></Document></kml>"
+    )
+
+
+class TestStreamingKMLExtractor:
+    """Streaming extraction matches the XML extractor"""
+
+    def test_matches_xml_extractor(self):
+        kml_data = generate_mock_garmin_kml(25)
+
+        streamed = StreamingKMLExtractor().extract_placemarks(kml_data)
+
+        assert len(streamed) == 25
+        assert streamed == KMLDataExtractor()._extract_with_xml(kml_data)
+        assert streamed[3]["uid"] == "Unit3-300434060000003"
+        assert streamed[3]["extended_data"]["Velocity"] == "3.0 km/h"
+
+    def test_name_and_time_fallbacks(self):
+        kml_data = _kml(
+            """<Placemark><name>Hiker One</name>
+            <ExtendedData>
+              <Data name="IMEI"><value>300434060000001</value></Data>
+              <Data name="Time UTC"><value>10/16/2026 9:15:00 AM</value></Data>
+            </ExtendedData>
+            <Point><coordinates>29.5,46.5,10</coordinates></Point></Placemark>"""
+        )
+
+        (placemark,) = StreamingKMLExtractor().extract_placemarks(kml_data)
+
+        assert placemark["name"] == "Hiker One"
+        assert placemark["uid"] == "HikerOne-300434060000001"
+        assert placemark["description"] == ""
+        assert placemark["timestamp"] == datetime(2026, 10, 16, 9, 15)
+        assert (placemark["lat"], placemark["lon"]) == (46.5, 29.5)
+
+    def test_only_point_geometry_is_extracted(self):
+        kml_data = _kml(
+            """<Placemark><name>Track</name>
+            <LineString><coordinates>1,2 3,4</coordinates></LineString></Placemark>""",
+            """<Placemark><name>Multi</name><MultiGeometry>
+            <Point><coordinates>30.0,47.0</coordinates></Point>
+            </MultiGeometry></Placemark>""",
+            "<Placemark><name>Empty</name><Point><coordinates/></Point></Placemark>",
+        )
+
+        placemarks = StreamingKMLExtractor().extract_placemarks(kml_data)
+
+        assert [p["name"] for p in placemarks] == ["Multi"]
+
+    def test_entities_are_not_expanded(self):
+        kml_data = (
+            '<?xml version="1.0"?><!DOCTYPE kml [<!ENTITY boom "expanded">]>'
+            '<kml xmlns="http://www.opengis.net/kml/2.2"><Placemark>'
+            "<name>&boom;</name><Point><coordinates>29,46</coordinates></Point>"
+            "</Placemark></kml>"
+        )
+
+        placemarks = StreamingKMLExtractor()._extract_with_iterparse(kml_data)
+
+        assert "expanded" not in str(placemarks[0]["name"])
+
+    def test_falls_back_when_nothing_is_found(self):
+        extractor = StreamingKMLExtractor()
+
+        with patch.object(
+            KMLDataExtractor, "extract_placemarks", return_value=[{"uid": "x"}]
+        ) as fallback:
+            assert extractor.extract_placemarks("<kml><broken") == [{"uid": "x"}]
+            assert extractor.extract_placemarks(_kml()) == [{"uid": "x"}]
+
+        assert fallback.call_count == 2
+
+
+class TestKMLParserSelection:
+    """kml_parser selects the extractor"""
+
+    def test_streaming_is_default(self):
+        plugin = GarminPlugin({"url": "https://share.garmin.com/Feed/Share/x"})
+
+        assert plugin._get_kml_extractor({}) is plugin.streaming_kml_extractor
+        assert (
+            plugin._get_kml_extractor({"kml_parser": "fastkml"})
+            is plugin.kml_extractor
+        )
@@ -0,0 +1,116 @@
+"""
+ABOUTME: Unit tests for the incremental JSON array iterator covering nested
+ABOUTME: paths across chunk boundaries, early stop and missing arrays
+"""
+
+import json
+
+import pytest
+
+from utils.json_stream import JSONArrayNotFound, iter_json_array
+
+FEATURE_PATHS = [("map", "features"), ("features",), ()]
+
+
+async def _chunks(document, size):
+    body = json.dumps(document).encode()
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+async def _collect(document, paths, size=7):
+    return [item async for item in iter_json_array(_chunks(document, size), paths)]
+
+
+def _features(count):
+    return [
+        {
+            "type": "Feature",
+            "properties": {"name": f"Точка {index}", "note": "]}"},
+            "geometry": {"type": "Point", "coordinates": [37.5, 47.1 + index]},
+        }
+        for index in range(count)
+    ]
+
+
+class TestIterJsonArray:
+    """Array items are decoded one at a time from byte chunks"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [1, 5, 64, 1 << 20])
+    async def test_nested_path_across_chunk_boundaries(self, size):
+        features = _features(20)
+        document = {
+            "id": 1,
+            "areas": [[1, 2], {"features": "ignored"}],
+            "map": {"type": "FeatureCollection", "features": features, "z": 1.5},
+        }
+
+        assert await _collect(document, FEATURE_PATHS, size) == features
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [1, 2, 3])
+    async def test_numbers_split_across_chunks(self, size):
+        numbers = [1, 2.5, -0.125, 1.5e-3, 12e10, 10, -7, 3.25]
+
+        assert await _collect(numbers, [()], size) == numbers
+        assert await _collect({"values": numbers}, [("values",)], size) == numbers
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [1, 2, 3])
+    async def test_float_siblings_split_across_chunks(self, size):
+        features = _features(2)
+        document = {
+            "a": 1.5,
+            "b": -2.5e-3,
+            "c": 10,
+            "map": {"scale": 0.75, "features": features},
+        }
+
+        assert await _collect(document, FEATURE_PATHS, size) == features
+
+    @pytest.mark.asyncio
+    async def test_fallback_paths(self):
+        features = _features(3)
+
+        assert await _collect({"features": features}, FEATURE_PATHS) == features
+        assert await _collect(features, FEATURE_PATHS) == features
+        assert await _collect([1, 22, 333.5], [()]) == [1, 22, 333.5]
+
+    @pytest.mark.asyncio
+    async def test_empty_array_is_a_match(self):
+        assert await _collect({"map": {"features": []}}, FEATURE_PATHS) == []
+
+    @pytest.mark.asyncio
+    async def test_missing_array_raises(self):
+        with pytest.raises(JSONArrayNotFound):
+            await _collect({"map": {"layers": []}}, FEATURE_PATHS)
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_raises(self):
+        async def chunks():
+            yield b'{"map": {"features": [{"a": 1} {"b": 2}]}}'
+
+        with pytest.raises(json.JSONDecodeError):
+            [item async for item in iter_json_array(chunks(), FEATURE_PATHS)]
+
+    @pytest.mark.asyncio
+    async def test_early_stop_leaves_body_unread(self):
+        consumed = []
+
+        async def chunks():
+            async for chunk in _chunks({"map": {"features": _features(200)}}, 256):
+                consumed.append(chunk)
+                yield chunk
+
+        items = iter_json_array(chunks(), FEATURE_PATHS)
+        received = []
+        async for item in items:
+            received.append(item)
+            if len(received) == 3:
+                break
+        await items.aclose()
+
+        assert len(received) == 3
+        total = len(json.dumps({"map": {"features": _features(200)}}).encode())
+        assert sum(len(chunk) for chunk in consumed) < total / 10
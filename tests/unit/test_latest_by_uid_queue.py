@@ -0,0 +1,179 @@
+"""
+ABOUTME: Unit tests for the UID-indexed "latest position wins" queue type
+ABOUTME: covering in-place replacement, overflow strategies and configuration
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import reset_queued_cot_service
+from services.queue_manager import LatestByUidQueue, QueuedCotEvent, QueueManager
+
+
+def _event(uid, position=0, event_time=None):
+    return QueuedCotEvent(
+        f'<event uid="{uid}" pos="{position}"/>'.encode(),
+        uid=uid,
+        event_time=event_time,
+    )
+
+
+def _manager(**config):
+    return QueueManager({"type": "latest_by_uid", "max_size": 3, **config})
+
+
+class TestLatestByUidQueue:
+    """Queue semantics of LatestByUidQueue"""
+
+    @pytest.mark.asyncio
+    async def test_newer_position_replaces_pending_in_place(self):
+        queue = LatestByUidQueue(maxsize=10)
+        queue.put_nowait(_event("A", 1))
+        queue.put_nowait(_event("B", 1))
+
+        assert queue.replace_nowait(_event("A", 2))
+        assert not queue.replace_nowait(_event("C", 1))
+
+        assert queue.qsize() == 2
+        assert queue.get_nowait() == _event("A", 2)
+        assert queue.get_nowait() == _event("B", 1)
+
+    @pytest.mark.asyncio
+    async def test_older_event_does_not_replace_newer_pending(self):
+        now = datetime.now(timezone.utc)
+        queue = LatestByUidQueue(maxsize=10)
+        queue.put_nowait(_event("A", 2, now))
+
+        assert queue.replace_nowait(_event("A", 1, now - timedelta(seconds=5)))
+
+        assert queue.qsize() == 1
+        assert queue.get_nowait() == _event("A", 2)
+
+    @pytest.mark.asyncio
+    async def test_unkeyed_items_keep_fifo_order(self):
+        queue = LatestByUidQueue()
+        queue.put_nowait(b"<raw/>")
+        queue.put_nowait(b"<raw/>")
+        queue.put_nowait(None)
+
+        assert [queue.get_nowait() for _ in range(3)] == [b"<raw/>", b"<raw/>", None]
+
+    @pytest.mark.asyncio
+    async def test_remove_uids_releases_blocked_putter(self):
+        queue = LatestByUidQueue(maxsize=1)
+        queue.put_nowait(_event("A"))
+        putter = asyncio.create_task(queue.put(_event("B")))
+        await asyncio.sleep(0)
+        assert not putter.done()
+
+        assert queue.remove_uids({"A", "missing"}) == 1
+        await asyncio.wait_for(putter, timeout=1)
+
+        assert queue.get_nowait().uid == "B"
+
+    @pytest.mark.asyncio
+    async def test_remove_uids_does_not_block_join(self):
+        queue = LatestByUidQueue()
+        queue.put_nowait(_event("A"))
+        queue.put_nowait(_event("B"))
+
+        assert queue.remove_uids({"A"}) == 1
+        queue.get_nowait()
+        queue.task_done()
+
+        await asyncio.wait_for(queue.join(), timeout=1)
+
+
+class TestQueueManagerLatestByUid:
+    """QueueManager integration of the latest_by_uid queue type"""
+
+    @pytest.mark.asyncio
+    async def test_replacement_does_not_consume_capacity(self):
+        manager = _manager()
+        await manager.create_queue(1)
+        for uid in "ABC":
+            await manager.enqueue_event(1, _event(uid, 1))
+
+        assert await manager.enqueue_event(1, _event("B", 2))
+
+        status = manager.get_queue_status(1)
+        assert status["size"] == 3
+        assert status["events_replaced"] == 1
+        assert status["total_events_dropped"] == 0
+        assert await manager.get_batch(1) == [
+            _event("A", 1),
+            _event("B", 2),
+            _event("C", 1),
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "strategy,expected_uids",
+        [("drop_oldest", ["B", "C", "D"]), ("drop_newest", ["A", "B", "C"])],
+    )
+    async def test_overflow_strategies_apply_to_new_devices(
+        self, strategy, expected_uids
+    ):
+        manager = _manager(overflow_strategy=strategy)
+        await manager.create_queue(1)
+        for uid in "ABCD":
+            await manager.enqueue_event(1, _event(uid))
+
+        batch = await manager.get_batch(1)
+
+        assert [event.uid for event in batch] == expected_uids
+        assert manager.get_queue_status(1)["total_events_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fifo_remains_default(self):
+        manager = QueueManager({})
+        await manager.create_queue(1)
+
+        assert type(manager.queues[1]) is asyncio.Queue
+        assert manager.config["type"] == "fifo"
+
+    def test_invalid_type_uses_default(self):
+        assert QueueManager({"type": "priority"}).config["type"] == "fifo"
+
+
+class TestServiceLatestByUid:
+    """QueuedCOTService configuration and replacement with latest_by_uid queues"""
+
+    @pytest.fixture(autouse=True)
+    def reset_services(self):
+        reset_cot_service()
+        reset_queued_cot_service()
+        yield
+        reset_cot_service()
+        reset_queued_cot_service()
+
+    def test_queue_type_validated_and_overridable(self):
+        service = get_cot_service()
+
+        assert service.validate_performance_config({"queue": {"type": "lifo"}})[
+            "queue"
+        ]["type"] == "fifo"
+        with patch.dict(os.environ, {"QUEUE_TYPE": "latest_by_uid"}):
+            config = service.load_performance_config_with_env_override()
+        assert config["queue"]["type"] == "latest_by_uid"
+
+    @pytest.mark.asyncio
+    async def test_remove_events_by_uid_uses_index(self):
+        service = get_cot_service()
+        queue = LatestByUidQueue()
+        service.queues[1] = queue
+        for uid in "ABC":
+            queue.put_nowait(_event(uid))
+
+        with patch.object(service, "extract_uid_from_cot_event") as extract_uid:
+            removed = await service.remove_events_by_uid(1, ["A", "C", "Z"])
+
+        extract_uid.assert_not_called()
+        assert removed == 2
+        assert queue.get_nowait().uid == "B"
+        assert queue.empty()
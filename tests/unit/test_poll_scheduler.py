@@ -0,0 +1,176 @@
+"""
+ABOUTME: Unit tests for the central poll scheduler covering the concurrency cap,
+ABOUTME: per-host rate limiting, cancellation and stream worker integration
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from services.poll_scheduler import HostRateLimiter, PollScheduler
+from services.stream_worker import StreamWorker
+
+
+def _scheduler(**kwargs):
+    defaults = {
+        "max_concurrent_polls": 10,
+        "host_min_interval": 0,
+        "jitter_ratio": 0,
+    }
+    defaults.update(kwargs)
+    return PollScheduler(**defaults)
+
+
+class TestPollScheduler:
+    """Polls are dispatched from one heap within the configured limits"""
+
+    def test_from_config(self):
+        assert PollScheduler.from_config({"enabled": False}) is None
+
+        scheduler = PollScheduler.from_config(
+            {"max_concurrent_polls": 3, "host_min_interval": 2.5}
+        )
+        assert scheduler.max_concurrent_polls == 3
+        assert scheduler.host_min_interval == 2.5
+
+    def test_jitter_and_initial_phase_stay_in_bounds(self):
+        scheduler = _scheduler(jitter_ratio=0.1, max_initial_phase=30)
+
+        for _ in range(100):
+            assert 90 <= scheduler.jittered(100) <= 110
+            assert 0 <= scheduler.initial_delay(120) <= 30
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_holds_until_release(self):
+        scheduler = _scheduler(max_concurrent_polls=1)
+        first = scheduler.schedule(1, 0)
+        second = scheduler.schedule(2, 0)
+
+        await asyncio.wait_for(first.future, timeout=1)
+        await asyncio.sleep(0.02)
+        assert not second.future.done()
+        assert scheduler.active_polls == 1
+
+        scheduler.release(first)
+        await asyncio.wait_for(second.future, timeout=1)
+        assert scheduler.active_polls == 1
+        scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_same_host_polls_are_spaced(self):
+        scheduler = _scheduler(host_min_interval=0.1)
+        loop = asyncio.get_running_loop()
+        first = scheduler.schedule(1, 0, host="api.example.com")
+        second = scheduler.schedule(2, 0, host="api.example.com")
+        other = scheduler.schedule(3, 0, host="other.example.com")
+
+        started = loop.time()
+        await asyncio.wait_for(asyncio.gather(first.future, other.future), timeout=1)
+        assert loop.time() - started < 0.1
+        await asyncio.wait_for(second.future, timeout=1)
+
+        assert loop.time() - started >= 0.09
+        scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_host_limit_shared_between_schedulers(self):
+        limiter = HostRateLimiter(0.1)
+        first_scheduler = _scheduler(host_limiter=limiter)
+        second_scheduler = _scheduler(host_limiter=limiter)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        first = first_scheduler.schedule(1, 0, host="api.example.com")
+        second = second_scheduler.schedule(2, 0, host="api.example.com")
+        await asyncio.wait_for(first.future, timeout=1)
+        await asyncio.wait_for(second.future, timeout=1)
+
+        assert loop.time() - started >= 0.09
+        first_scheduler.stop()
+        second_scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_ticket_is_never_dispatched(self):
+        scheduler = _scheduler()
+        ticket = scheduler.schedule(1, 0.05)
+
+        scheduler.cancel(ticket)
+        await asyncio.sleep(0.1)
+
+        assert ticket.future.cancelled()
+        assert scheduler.active_polls == 0
+        assert scheduler.pending_polls == 0
+        scheduler.stop()
+
+
+class TestStreamWorkerPollTurns:
+    """Workers wait for scheduler turns and give them back"""
+
+    @pytest.fixture
+    def worker(self):
+        stream = Mock()
+        stream.id = 4
+        stream.name = "Scheduled Stream"
+        stream.poll_interval = 60
+        stream.plugin_type = "garmin"
+        worker = StreamWorker(
+            stream, Mock(), Mock(), poll_scheduler=_scheduler(max_concurrent_polls=1)
+        )
+        worker.plugin = Mock(config={"url": "https://Share.Garmin.com/Feed/x"})
+        worker._stop_event = asyncio.Event()
+        return worker
+
+    @pytest.mark.asyncio
+    async def test_turn_is_granted_and_released(self, worker):
+        turn = await asyncio.wait_for(worker._wait_for_poll_turn(0), timeout=1)
+
+        assert turn.host == "share.garmin.com"
+        assert worker.poll_scheduler.active_polls == 1
+        worker._release_poll_turn(turn)
+        assert worker.poll_scheduler.active_polls == 0
+        worker.poll_scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_while_waiting_withdraws_turn(self, worker):
+        waiter = asyncio.ensure_future(worker._wait_for_poll_turn(30))
+        await asyncio.sleep(0.01)
+
+        worker._stop_event.set()
+
+        assert await asyncio.wait_for(waiter, timeout=1) is None
+        assert worker.poll_scheduler.pending_polls == 0
+        worker.poll_scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_push_event_requests_immediate_turn(self, worker):
+        worker.plugin.push_event = asyncio.Event()
+        waiter = asyncio.ensure_future(worker._wait_for_poll_turn(30))
+        await asyncio.sleep(0.01)
+
+        worker.plugin.push_event.set()
+        turn = await asyncio.wait_for(waiter, timeout=1)
+
+        assert turn is not None
+        assert worker.poll_scheduler.active_polls == 1
+        assert worker.poll_scheduler.pending_polls == 0
+        worker._release_poll_turn(turn)
+        worker.poll_scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_push_event_ignored_after_circuit_open_poll(self, worker):
+        worker.poll_scheduler = None
+        worker.running = True
+        worker.plugin.push_event = asyncio.Event()
+        worker.plugin.push_event.set()
+        worker.plugin.last_fetch_circuit_open = True
+        worker.plugin.fetch_locations_with_protection = AsyncMock(return_value=[])
+        worker._update_stream_status_async = AsyncMock(return_value=True)
+
+        loop_task = asyncio.ensure_future(worker._run_loop())
+        await asyncio.sleep(0.05)
+        worker._stop_event.set()
+        await asyncio.wait_for(loop_task, timeout=1)
+
+        # The undrained push event must not turn the loop into a busy poll
+        assert worker.plugin.fetch_locations_with_protection.await_count == 1
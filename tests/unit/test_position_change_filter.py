@@ -0,0 +1,85 @@
+"""
+ABOUTME: Unit tests for the position change filter covering unchanged-position
+ABOUTME: suppression, heartbeat resends and commit-after-send behaviour
+"""
+
+from services.position_change_filter import PositionChangeFilter
+
+
+def _location(uid, lat=46.5, lon=29.2, **extra):
+    location = {"uid": uid, "name": uid, "lat": lat, "lon": lon}
+    location.update(extra)
+    return location
+
+
+class TestPositionChangeFilter:
+    """Only moved or heartbeat-due positions are selected"""
+
+    def test_unchanged_positions_suppressed_after_commit(self):
+        position_filter = PositionChangeFilter(heartbeat_ratio=0.5)
+        batch = [_location("a"), _location("b")]
+
+        changed, pending = position_filter.select(batch, 300, now=0)
+        assert changed == batch
+        position_filter.commit(pending, now=0)
+
+        changed, pending = position_filter.select(
+            [_location("a"), _location("b", lat=46.6)], 300, now=10
+        )
+        assert [loc["uid"] for loc in changed] == ["b"]
+        assert list(pending) == ["b"]
+
+    def test_heartbeat_resends_before_stale(self):
+        position_filter = PositionChangeFilter(heartbeat_ratio=0.5)
+        changed, pending = position_filter.select([_location("a")], 300, now=0)
+        position_filter.commit(pending, now=0)
+
+        assert position_filter.select([_location("a")], 300, now=149)[0] == []
+        assert len(position_filter.select([_location("a")], 300, now=150)[0]) == 1
+
+    def test_heartbeat_accounts_for_poll_interval(self):
+        position_filter = PositionChangeFilter(heartbeat_ratio=0.5)
+        _, pending = position_filter.select([_location("a")], 300, now=0)
+        position_filter.commit(pending, now=0)
+
+        # With 60s polls, the poll at 120s is the last one before 150s
+        assert position_filter.select(
+            [_location("a")], 300, now=60, poll_interval=60
+        )[0] == []
+        changed, _ = position_filter.select(
+            [_location("a")], 300, now=120, poll_interval=60
+        )
+        assert len(changed) == 1
+
+    def test_uncommitted_send_is_retried(self):
+        position_filter = PositionChangeFilter(heartbeat_ratio=0.5)
+        position_filter.select([_location("a")], 300, now=0)
+
+        changed, _ = position_filter.select([_location("a")], 300, now=1)
+
+        assert len(changed) == 1
+
+    def test_callsign_type_and_context_changes_are_detected(self):
+        position_filter = PositionChangeFilter(heartbeat_ratio=0.5)
+        _, pending = position_filter.select([_location("a")], 300, context="x", now=0)
+        position_filter.commit(pending, now=0)
+
+        for location, context in (
+            (_location("a", name="Renamed"), "x"),
+            (_location("a", cot_type="a-h-G"), "x"),
+            (_location("a"), "y"),
+        ):
+            changed, _ = position_filter.select([location], 300, context, now=1)
+            assert len(changed) == 1
+
+    def test_disabled_and_clear(self):
+        disabled = PositionChangeFilter(heartbeat_ratio=0)
+        _, pending = disabled.select([_location("a")], 300, now=0)
+        disabled.commit(pending, now=0)
+        assert len(disabled.select([_location("a")], 300, now=1)[0]) == 1
+
+        position_filter = PositionChangeFilter(heartbeat_ratio=0.5)
+        _, pending = position_filter.select([_location("a")], 300, now=0)
+        position_filter.commit(pending, now=0)
+        position_filter.clear()
+        assert len(position_filter.select([_location("a")], 300, now=1)[0]) == 1
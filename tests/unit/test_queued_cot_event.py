@@ -0,0 +1,154 @@
+"""
+ABOUTME: Unit tests for QueuedCotEvent records carrying uid, event time and stream id
+ABOUTME: so queue replacement and deduplication never re-parse generated XML
+"""
+
+import asyncio
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import (
+    QueuedCOTService,
+    reset_queued_cot_service,
+)
+from services.queue_manager import QueuedCotEvent
+from tests.fixtures.mock_location_data import generate_mock_gps_points
+
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    """Reset COT service singletons around each test"""
+    reset_cot_service()
+    reset_queued_cot_service()
+    yield
+    reset_cot_service()
+    reset_queued_cot_service()
+
+
+@pytest.fixture
+def cot_service():
+    return get_cot_service()
+
+
+def _locations(count=3):
+    return [
+        {
+            "uid": f"DEV-{i}",
+            "name": f"Device {i}",
+            "lat": 10.0 + i,
+            "lon": 20.0 + i,
+            "timestamp": f"2025-09-17T12:30:{i:02d}.750000Z",
+        }
+        for i in range(count)
+    ]
+
+
+class TestQueuedCotEventRecord:
+    """The record behaves as the serialized bytes it wraps"""
+
+    def test_record_is_bytes(self):
+        event = QueuedCotEvent(b"<event/>", uid="DEV-1", stream_id=7)
+
+        assert event == b"<event/>"
+        assert isinstance(event, bytes)
+        assert event.uid == "DEV-1"
+        assert event.stream_id == 7
+        assert event.event_time is None
+
+    def test_record_survives_pickling(self):
+        event = QueuedCotEvent(b"<event/>", uid="DEV-1", stream_id=3)
+
+        restored = pickle.loads(pickle.dumps(event))
+
+        assert restored == event
+        assert restored.uid == "DEV-1"
+        assert restored.stream_id == 3
+
+
+class TestGeneratorRecords:
+    """The CoT generator records the identity it wrote into the XML"""
+
+    def test_metadata_matches_parsed_xml(self, cot_service):
+        events = QueuedCOTService._build_pytak_events(
+            _locations(), "a-f-G-U-C", 300, "stream"
+        )
+
+        assert len(events) == 3
+        for event in events:
+            assert isinstance(event, QueuedCotEvent)
+            assert event.uid == cot_service.extract_uid_from_cot_event(event)
+            assert event.event_time == cot_service.extract_timestamp_from_cot_event(
+                event
+            )
+
+    @pytest.mark.asyncio
+    async def test_custom_generator_records_metadata(self, cot_service):
+        events = await QueuedCOTService._create_custom_events(
+            _locations(), "a-f-G-U-C", 300, "stream"
+        )
+
+        assert [event.uid for event in events] == ["DEV-0", "DEV-1", "DEV-2"]
+        for event in events:
+            assert event.event_time == cot_service.extract_timestamp_from_cot_event(
+                event
+            )
+
+    @pytest.mark.asyncio
+    async def test_create_cot_events_records_stream_id(self, cot_service):
+        events = await cot_service.create_cot_events(
+            generate_mock_gps_points(15), "a-f-G-U-C", 300, "stream", stream_id=42
+        )
+
+        assert len(events) == 15
+        assert {event.stream_id for event in events} == {42}
+
+
+class TestReplacementWithoutParsing:
+    """Replacement and removal read metadata instead of parsing queued events"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_with_replacement_skips_xml_parsing(self, cot_service):
+        events = QueuedCOTService._build_pytak_events(
+            _locations(), "a-f-G-U-C", 300, "stream"
+        )
+        await cot_service.queue_manager.create_queue(1)
+
+        with patch.object(
+            cot_service, "extract_uid_from_cot_event"
+        ) as extract_uid, patch.object(
+            cot_service, "extract_timestamp_from_cot_event"
+        ) as extract_timestamp:
+            assert await cot_service.enqueue_with_replacement(events, 1)
+            assert await cot_service.enqueue_with_replacement(events, 1)
+
+        extract_uid.assert_not_called()
+        extract_timestamp.assert_not_called()
+        assert cot_service.queues[1].qsize() == 3
+
+    @pytest.mark.asyncio
+    async def test_remove_events_by_uid_mixes_records_and_raw_bytes(
+        self, cot_service
+    ):
+        queue = asyncio.Queue()
+        cot_service.queues[1] = queue
+        records = QueuedCOTService._build_pytak_events(
+            _locations(2), "a-f-G-U-C", 300, "stream"
+        )
+        raw = b'<event version="2.0" uid="RAW-1" type="a-f-G-U-C"/>'
+        for event in [*records, raw]:
+            queue.put_nowait(event)
+
+        with patch.object(
+            cot_service,
+            "extract_uid_from_cot_event",
+            wraps=cot_service.extract_uid_from_cot_event,
+        ) as extract_uid:
+            removed = await cot_service.remove_events_by_uid(1, ["DEV-0", "RAW-1"])
+
+        assert removed == 2
+        assert extract_uid.call_count == 1
+        assert queue.get_nowait().uid == "DEV-1"
+        assert queue.empty()
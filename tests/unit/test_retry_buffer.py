@@ -0,0 +1,218 @@
+"""
+ABOUTME: Unit tests for the per-TAK-server retry buffer covering backoff, expiry,
+ABOUTME: latest-per-UID semantics, disk spill and transmission worker integration
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import reset_queued_cot_service
+from services.queue_manager import QueuedCotEvent
+from services.retry_buffer import RetryBuffer
+
+BASE_TIME = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _event(uid, seconds=0):
+    return QueuedCotEvent(
+        f'<event uid="{uid}" t="{seconds}"/>'.encode(),
+        uid=uid,
+        event_time=BASE_TIME + timedelta(seconds=seconds),
+    )
+
+
+class TestRetrySchedule:
+    """Backoff and expiry of buffered events"""
+
+    def test_backoff_doubles_up_to_ceiling(self):
+        buffer = RetryBuffer(1, base_delay_seconds=1.0, max_delay_seconds=3.0)
+        buffer.add([_event("A")], now=0)
+
+        assert buffer.pop_due(10, now=0.5) == []
+        assert buffer.seconds_until_due(now=0.5) == 0.5
+
+        entry = buffer.pop_due(10, now=1.0)[0]
+        assert entry.attempts == 2
+        buffer.requeue([entry], now=1.0)
+        assert buffer.seconds_until_due(now=1.0) == 2.0
+
+        entry = buffer.pop_due(10, now=3.0)[0]
+        buffer.requeue([entry], now=3.0)
+        assert buffer.seconds_until_due(now=3.0) == 3.0
+
+    def test_expires_after_max_attempts(self):
+        buffer = RetryBuffer(1, base_delay_seconds=0.1, max_attempts=2)
+        buffer.add([_event("A")], now=0)
+
+        entries = buffer.pop_due(10, now=1)
+        assert buffer.requeue(entries, now=1) == 0
+
+        assert len(buffer) == 0
+        assert buffer.metrics.events_retried == 1
+        assert buffer.metrics.events_expired == 1
+
+    def test_expires_after_max_age(self):
+        buffer = RetryBuffer(1, max_age_seconds=10)
+        buffer.add([_event("A")], now=0)
+
+        assert buffer.pop_due(10, now=10) == []
+        assert buffer.metrics.events_expired == 1
+        assert buffer.seconds_until_due() is None
+
+
+class TestLatestPerUid:
+    """Only the newest position per UID is buffered or re-sent"""
+
+    def test_newer_failure_replaces_buffered_position(self):
+        buffer = RetryBuffer(1)
+        buffer.add([_event("A", 1), _event("B", 1)], now=0)
+        buffer.add([_event("A", 2)], now=0)
+        buffer.add([_event("B", 0)], now=0)
+
+        due = [entry.event for entry in buffer.pop_due(10, now=5)]
+
+        assert due == [_event("B", 1), _event("A", 2)]
+        assert buffer.metrics.events_superseded == 2
+
+    def test_fresh_batch_discards_older_buffered_position(self):
+        buffer = RetryBuffer(1)
+        buffer.add([_event("A", 1), _event("B", 5)], now=0)
+
+        assert buffer.discard_superseded([_event("A", 2), _event("B", 4)]) == 1
+        assert [entry.event.uid for entry in buffer.pop_due(10, now=5)] == ["B"]
+
+    def test_raw_bytes_kept_in_order(self):
+        buffer = RetryBuffer(1)
+        buffer.add([b"<one/>", b"<two/>"], now=0)
+        buffer.discard_superseded([b"<one/>"])
+
+        assert [entry.event for entry in buffer.pop_due(10, now=5)] == [
+            b"<one/>",
+            b"<two/>",
+        ]
+
+
+class TestDiskSpill:
+    """Overflow goes to an append-only spill file when configured"""
+
+    def test_overflow_dropped_without_spill(self):
+        buffer = RetryBuffer(1, max_events=2)
+
+        assert buffer.add([_event(uid) for uid in "ABC"], now=0) == 2
+        assert buffer.metrics.events_dropped == 1
+
+    def test_spilled_events_refill_memory_in_order(self, tmp_path):
+        buffer = RetryBuffer(1, max_events=2, spill_dir=str(tmp_path))
+        buffer.add([_event(uid) for uid in "ABCD"], now=0)
+
+        assert buffer.get_status()["spilled"] == 2
+        assert os.path.exists(buffer.spill_path)
+
+        first = buffer.pop_due(2, now=5)
+        second = buffer.pop_due(2, now=5)
+
+        assert [e.event.uid for e in first + second] == ["A", "B", "C", "D"]
+        assert second[0].event == _event("C")
+        assert second[0].event.event_time == BASE_TIME
+        assert len(buffer) == 0
+        assert not os.path.exists(buffer.spill_path)
+
+    def test_delivered_position_supersedes_spilled_one(self, tmp_path):
+        buffer = RetryBuffer(1, max_events=1, spill_dir=str(tmp_path))
+        buffer.add([_event("A", 1), _event("B", 1)], now=0)
+
+        buffer.discard_superseded([_event("B", 2)])
+        buffer.pop_due(10, now=5)
+
+        assert len(buffer) == 0
+        assert buffer.metrics.events_superseded == 1
+
+    def test_spill_file_recovered_by_new_buffer(self, tmp_path):
+        buffer = RetryBuffer(1, max_events=1, spill_dir=str(tmp_path))
+        buffer.add([_event("A"), _event("B"), _event("C")], now=0)
+        with open(buffer.spill_path, "ab") as spill_file:
+            spill_file.write(b"\x00\x00")  # torn record from an interrupted write
+
+        recovered = RetryBuffer(1, max_events=10, spill_dir=str(tmp_path))
+        assert len(recovered) == 2
+
+        recovered.pop_due(10, now=5)
+        assert [e.event.uid for e in recovered.pop_due(10, now=5)] == ["B", "C"]
+
+
+class TestTransmissionWorkerRetry:
+    """Failed batches are re-sent by the transmission worker"""
+
+    @pytest.fixture(autouse=True)
+    def reset_services(self):
+        reset_cot_service()
+        reset_queued_cot_service()
+        yield
+        reset_cot_service()
+        reset_queued_cot_service()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self):
+        service = get_cot_service()
+        service.parallel_config["retry_buffer"]["base_delay_seconds"] = 0.01
+        tak_server = Mock()
+        tak_server.id = 1
+        tak_server.name = "Test Server"
+        attempts = []
+        delivered = asyncio.Event()
+
+        async def transmit(batch, connection, server):
+            attempts.append(list(batch))
+            if len(attempts) == 1:
+                return False
+            delivered.set()
+            return True
+
+        await service.queue_manager.create_queue(1)
+        with patch.object(
+            service,
+            "_create_pytak_connection",
+            AsyncMock(return_value=(Mock(), MagicMock())),
+        ), patch.object(service, "_transmit_batch", side_effect=transmit), patch.object(
+            service, "_cleanup_connection", AsyncMock()
+        ):
+            worker = asyncio.create_task(
+                service._enhanced_transmission_worker(1, tak_server)
+            )
+            await service.queue_manager.enqueue_event(1, _event("A"))
+
+            await asyncio.wait_for(delivered.wait(), timeout=2)
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+        assert attempts == [[_event("A")], [_event("A")]]
+        retry_status = service.get_worker_status(1)["retry_buffer"]
+        assert retry_status["pending"] == 0
+        assert retry_status["events_retried"] == 1
+
+    def test_configuration_validated_and_overridable(self):
+        service = get_cot_service()
+
+        validated = service.validate_performance_config(
+            {"retry_buffer": {"max_events": 0, "base_delay_seconds": "fast"}}
+        )
+        assert validated["retry_buffer"]["max_events"] == 1000
+        assert validated["retry_buffer"]["base_delay_seconds"] == 1.0
+
+        with patch.dict(
+            os.environ,
+            {"RETRY_BUFFER_ENABLED": "false", "RETRY_BUFFER_SPILL_DIR": "/tmp/spill"},
+        ):
+            config = service.load_performance_config_with_env_override()
+        assert config["retry_buffer"] == {"enabled": False, "spill_dir": "/tmp/spill"}
+
+    def test_disabled_buffer_not_created(self):
+        service = get_cot_service()
+        service.parallel_config["retry_buffer"]["enabled"] = False
+
+        assert service._get_retry_buffer(1) is None
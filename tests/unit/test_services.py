@@ -1,11 +1,15 @@
 """Unit tests for TrakBridge services."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from models.dto import CallsignMappingDTO
+from services.callsign_mapping_index import CallsignMappingIndex
+from services.database_manager import DatabaseManager
 from services.encryption_service import EncryptionService
 from services.logging_service import setup_logging
+from services.stream_config_snapshot import StreamConfigSnapshot
 from services.stream_manager import StreamManager
 from services.stream_worker import StreamWorker
 from services.tak_servers_service import TakServerConnectionTester, TakServerService
@@ -46,43 +50,31 @@ class TestStreamWorkerCallsignFiltering:
         """Create a StreamWorker instance for testing."""
         return StreamWorker(mock_stream, mock_session_manager, mock_db_manager)
 
-    @patch("database.db")
-    @patch("models.callsign_mapping.CallsignMapping")
-    async def test_load_disabled_callsign_mappings(
-        self, mock_mapping_class, mock_db, stream_worker
-    ):
+    async def test_load_disabled_callsign_mappings(self, stream_worker):
         """Test loading disabled callsign mappings."""
-        # Arrange: Mock disabled mappings
-        disabled_mapping1 = Mock()
-        disabled_mapping1.identifier_value = "123456"
-        disabled_mapping1.enabled = False
-
-        disabled_mapping2 = Mock()
-        disabled_mapping2.identifier_value = "789012"
-        disabled_mapping2.enabled = False
-
-        mock_query = Mock()
-        mock_query.filter_by.return_value.all.return_value = [
-            disabled_mapping1,
-            disabled_mapping2,
-        ]
-        mock_db.session.query.return_value = mock_query
-
-        # Act: Load disabled mappings
-        disabled_mappings = await stream_worker._load_disabled_callsign_mappings()
+        # Arrange: Snapshot with enabled and disabled mappings
+        stream_worker.async_db.get_stream_config_snapshot = AsyncMock(
+            return_value=StreamConfigSnapshot.build(
+                Mock(id=1),
+                [
+                    CallsignMappingDTO("123456", "Disabled-1", enabled=False),
+                    CallsignMappingDTO("789012", "Disabled-2", enabled=False),
+                    CallsignMappingDTO("345678", "Enabled-1", enabled=True),
+                ],
+                version=0,
+            )
+        )
 
-        # Assert: Should return dictionary of disabled mappings
-        assert len(disabled_mappings) == 2
-        assert "123456" in disabled_mappings
-        assert "789012" in disabled_mappings
-        assert disabled_mappings["123456"] == disabled_mapping1
-        assert disabled_mappings["789012"] == disabled_mapping2
+        # Act: Load the config snapshot
+        snapshot = await stream_worker._get_config_snapshot()
+        disabled_mappings = snapshot.disabled_mappings
 
-        # Verify correct query was made
-        mock_db.session.query.assert_called_once_with(mock_mapping_class)
-        mock_query.filter_by.assert_called_once_with(stream_id=1, enabled=False)
+        # Assert: Should hold the disabled mappings only
+        assert set(disabled_mappings) == {"123456", "789012"}
+        assert disabled_mappings["123456"].custom_callsign == "Disabled-1"
+        assert disabled_mappings["789012"].enabled is False
 
-    async def test_filter_disabled_trackers(self, stream_worker):
+    def test_filter_disabled_trackers(self):
         """Test filtering out disabled trackers from locations."""
         # Arrange: Mock locations and disabled mappings
         locations = [
@@ -97,20 +89,21 @@ class TestStreamWorkerCallsignFiltering:
             )  # Tracker2 is disabled
         }
 
-        fresh_stream_config = {"callsign_identifier_field": "identifier"}
+        mapping_index = CallsignMappingIndex.compile(
+            {"callsign_identifier_field": "identifier"}, {}, disabled_mappings
+        )
 
         # Act: Filter disabled trackers
-        await stream_worker._filter_disabled_trackers(
-            locations, disabled_mappings, fresh_stream_config
-        )
+        removed = mapping_index.filter_disabled(locations)
 
         # Assert: Disabled tracker should be removed
+        assert removed == 1
         assert len(locations) == 2
         assert locations[0]["identifier"] == "123456"  # Tracker1 remains
         assert locations[1]["identifier"] == "345678"  # Tracker3 remains
         # Tracker2 (789012) should be removed
 
-    async def test_filter_disabled_trackers_no_disabled_mappings(self, stream_worker):
+    def test_filter_disabled_trackers_no_disabled_mappings(self):
         """Test filtering when no disabled mappings exist."""
         # Arrange: Mock locations with no disabled mappings
         locations = [
@@ -118,18 +111,18 @@ class TestStreamWorkerCallsignFiltering:
             {"name": "Tracker2", "identifier": "789012", "lat": 2.0, "lon": 2.0},
         ]
 
-        disabled_mappings = {}  # No disabled mappings
-        fresh_stream_config = {"callsign_identifier_field": "identifier"}
+        mapping_index = CallsignMappingIndex.compile(
+            {"callsign_identifier_field": "identifier"}, {}, {}
+        )
 
         # Act: Filter disabled trackers
-        await stream_worker._filter_disabled_trackers(
-            locations, disabled_mappings, fresh_stream_config
-        )
+        removed = mapping_index.filter_disabled(locations)
 
         # Assert: All locations should remain
+        assert removed == 0
         assert len(locations) == 2
 
-    async def test_filter_disabled_trackers_no_identifier_field(self, stream_worker):
+    def test_filter_disabled_trackers_no_identifier_field(self):
         """Test filtering when no identifier field is configured."""
         # Arrange: Mock locations with no identifier field
         locations = [
@@ -137,40 +130,74 @@ class TestStreamWorkerCallsignFiltering:
         ]
 
         disabled_mappings = {"123456": Mock(identifier_value="123456", enabled=False)}
-        fresh_stream_config = {"callsign_identifier_field": None}  # No identifier field
+        mapping_index = CallsignMappingIndex.compile(
+            {"callsign_identifier_field": None}, {}, disabled_mappings
+        )
 
         # Act: Filter disabled trackers
-        await stream_worker._filter_disabled_trackers(
-            locations, disabled_mappings, fresh_stream_config
-        )
+        removed = mapping_index.filter_disabled(locations)
 
         # Assert: All locations should remain (no filtering possible without identifier field)
+        assert removed == 0
         assert len(locations) == 1
 
-    @patch("database.db")
-    @patch("models.callsign_mapping.CallsignMapping")
-    async def test_load_callsign_mappings_only_enabled(
-        self, mock_mapping_class, mock_db, stream_worker
-    ):
+    def test_apply_drops_disabled_and_maps_enabled(self):
+        """Test that a mapping batch filters disabled trackers while mapping."""
+        locations = [
+            {"name": "Tracker1", "identifier": "123456", "lat": 1.0, "lon": 1.0},
+            {"name": "Tracker2", "identifier": "789012", "lat": 2.0, "lon": 2.0},
+            {"name": "Tracker3", "identifier": "345678", "lat": 3.0, "lon": 3.0},
+        ]
+        snapshot = StreamConfigSnapshot.build(
+            Mock(
+                id=1,
+                callsign_identifier_field="identifier",
+                callsign_error_handling="fallback",
+            ),
+            [
+                CallsignMappingDTO("123456", "Alpha-1", enabled=True),
+                CallsignMappingDTO("789012", "Disabled-1", enabled=False),
+            ],
+            version=0,
+        )
+
+        result = snapshot.mapping_index.apply(locations)
+
+        assert (result.mapped, result.disabled, result.unmapped) == (1, 1, 1)
+        assert [loc["name"] for loc in locations] == ["Alpha-1", "Tracker3"]
+
+    async def test_load_callsign_mappings_only_enabled(self, stream_worker):
         """Test that callsign mappings only loads enabled mappings."""
-        # Arrange: Mock enabled mappings only
-        enabled_mapping = Mock()
-        enabled_mapping.identifier_value = "123456"
-        enabled_mapping.enabled = True
+        # Arrange: Snapshot with enabled and disabled mappings
+        stream_worker.async_db.get_stream_config_snapshot = AsyncMock(
+            return_value=StreamConfigSnapshot.build(
+                Mock(id=1),
+                [
+                    CallsignMappingDTO("123456", "Enabled-1", enabled=True),
+                    CallsignMappingDTO("789012", "Disabled-1", enabled=False),
+                ],
+                version=0,
+            )
+        )
 
-        mock_query = Mock()
-        mock_query.filter_by.return_value.all.return_value = [enabled_mapping]
-        mock_db.session.query.return_value = mock_query
+        # Act: Load the config snapshot
+        snapshot = await stream_worker._get_config_snapshot()
 
-        # Act: Load callsign mappings
-        mappings = await stream_worker._load_callsign_mappings()
+        # Assert: Should only compile enabled mappings
+        assert list(snapshot.callsign_mappings) == ["123456"]
+        assert len(snapshot.mapping_index) == 1
+        assert snapshot.mapping_index.get("123456").callsign == "Enabled-1"
 
-        # Assert: Should only return enabled mappings
-        assert len(mappings) == 1
-        assert "123456" in mappings
+    async def test_load_callsign_mappings_database_failure(self, stream_worker):
+        """Test that a failed snapshot load skips callsign mapping."""
+        stream_worker.async_db.get_stream_config_snapshot = AsyncMock(
+            return_value=None
+        )
+        locations = [{"name": "Tracker1", "identifier": "123456"}]
 
-        # Verify correct query was made with enabled=True filter
-        mock_query.filter_by.assert_called_once_with(stream_id=1, enabled=True)
+        assert await stream_worker._get_config_snapshot() is None
+        await stream_worker._apply_callsign_mapping(locations)
+        assert locations == [{"name": "Tracker1", "identifier": "123456"}]
 
 
 class TestStreamManager:
@@ -322,12 +349,12 @@ class TestStreamWorkerCallsignIntegration:
             db_session.add(stream)
             db_session.commit()
 
-            # Create mock database manager
-            mock_db_manager = Mock()
+            # Create database manager bound to the test app
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # Create test location data
             test_locations = [
@@ -381,13 +408,12 @@ class TestStreamWorkerCallsignIntegration:
             db_session.add(mapping)
             db_session.commit()
 
-            # Create mock database manager
-            mock_db_manager = Mock()
-            mock_db_manager.get_stream_with_relationships.return_value = stream
+            # Create database manager bound to the test app
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # Create test location data with Garmin structure
             test_locations = [
@@ -438,13 +464,12 @@ class TestStreamWorkerCallsignIntegration:
             db_session.add(mapping)
             db_session.commit()
 
-            # Create mock database manager
-            mock_db_manager = Mock()
-            mock_db_manager.get_stream_with_relationships.return_value = stream
+            # Create database manager bound to the test app
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # Create test location data
             test_locations = [
@@ -487,12 +512,12 @@ class TestStreamWorkerCallsignIntegration:
             db_session.commit()
             # Note: No callsign mappings created - should trigger fallback
 
-            # Create mock database manager
-            mock_db_manager = Mock()
+            # Create database manager bound to the test app
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # Create test location data
             test_locations = [
@@ -532,12 +557,12 @@ class TestStreamWorkerCallsignIntegration:
             db_session.commit()
             # Note: No callsign mappings created - should trigger skip
 
-            # Create mock database manager
-            mock_db_manager = Mock()
+            # Create database manager bound to the test app
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
             # Create test location data with one mappable and one unmappable location
             test_locations = [
@@ -608,18 +633,16 @@ class TestStreamWorkerCallsignIntegration:
                 db_session.add(mapping)
             db_session.commit()
 
-            # Create mock database manager
-            mock_db_manager = Mock()
+            # Create database manager bound to the test app
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
-
-            # Test that _load_callsign_mappings method exists
-            assert hasattr(worker, "_load_callsign_mappings")
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
 
-            # Load callsign mappings
-            result = await worker._load_callsign_mappings()
+            # Load callsign mappings through the config snapshot
+            snapshot = await worker._get_config_snapshot()
+            result = snapshot.callsign_mappings
 
             # Should return dictionary mapping identifiers to mappings
             assert isinstance(result, dict)
@@ -687,13 +710,12 @@ class TestStreamWorkerCallsignIntegration:
                 def plugin_name(self):
                     return "mock"
 
-            # Create mock database manager and session manager
-            mock_db_manager = Mock()
-            mock_db_manager.get_stream_with_relationships.return_value = stream
+            # Create database manager bound to the test app and session manager
+            db_manager = DatabaseManager(app.app_context)
             mock_session_manager = Mock()
 
             # Create stream worker instance
-            worker = StreamWorker(stream, mock_session_manager, mock_db_manager)
+            worker = StreamWorker(stream, mock_session_manager, db_manager)
             worker.plugin = MockCallsignPlugin({})  # Set mock plugin
 
             # Create test location data
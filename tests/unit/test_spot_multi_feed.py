@@ -0,0 +1,198 @@
+"""
+ABOUTME: Unit tests for SPOT multi-feed polling covering per-messenger positions,
+ABOUTME: start-based pagination and merging feeds that answered 304
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from plugins.spot_plugin import SpotPlugin
+
+FEED_A = "a" * 32
+FEED_B = "b" * 32
+
+
+def _message(message_id, messenger_id, minute):
+    return {
+        "id": message_id,
+        "messengerId": messenger_id,
+        "messengerName": f"Messenger {messenger_id}",
+        "messageType": "TRACK",
+        "latitude": 46.0 + minute / 100,
+        "longitude": 29.0,
+        "dateTime": f"2026-10-16T10:{minute:02d}:00+0000",
+        "batteryState": "GOOD",
+    }
+
+
+def _feed(messages, total_count=None):
+    return {
+        "response": {
+            "feedMessageResponse": {
+                "count": len(messages),
+                "totalCount": len(messages) if total_count is None else total_count,
+                "messages": {"message": messages},
+            }
+        }
+    }
+
+
+def _response(status, data=None, headers=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.json = AsyncMock(return_value=data)
+    return response
+
+
+def _session(pages):
+    """Session answering GETs from {(feed_id, start): response}"""
+
+    def get(url, params=None, **kwargs):
+        feed_id = url.split("/feed/")[1].split("/")[0]
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(
+            return_value=pages[(feed_id, (params or {}).get("start", 0))]
+        )
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+
+    session = MagicMock()
+    session.get = MagicMock(side_effect=get)
+    return session
+
+
+def _plugin(feed_id, position_mode="per_messenger", max_results=2):
+    plugin = SpotPlugin({"feed_id": feed_id})
+    plugin.get_decrypted_config = lambda: {
+        "feed_id": feed_id,
+        "feed_password": "",
+        "max_results": max_results,
+        "position_mode": position_mode,
+    }
+    return plugin
+
+
+class TestPerMessengerPositions:
+    """Every messenger's newest message becomes one location"""
+
+    @pytest.mark.asyncio
+    async def test_latest_per_messenger_across_pages(self):
+        session = _session(
+            {
+                (FEED_A, 0): _response(
+                    200, _feed([_message(4, "m1", 40), _message(3, "m2", 30)], 5)
+                ),
+                (FEED_A, 2): _response(
+                    200, _feed([_message(2, "m1", 20), _message(1, "m3", 10)], 5)
+                ),
+                (FEED_A, 4): _response(200, _feed([_message(0, "m2", 5)], 5)),
+            }
+        )
+
+        locations = await _plugin(FEED_A).fetch_locations(session)
+
+        assert [loc["uid"] for loc in locations] == [
+            "Messenger m1-m1",
+            "Messenger m2-m2",
+            "Messenger m3-m3",
+        ]
+        assert locations[0]["additional_data"]["raw_message"]["id"] == 4
+        assert locations[0]["additional_data"]["feed_id"] == FEED_A
+        assert session.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_newest_mode_returns_single_message(self):
+        session = _session(
+            {
+                (FEED_A, 0): _response(
+                    200, _feed([_message(4, "m1", 40), _message(3, "m2", 30)], 5)
+                ),
+            }
+        )
+
+        locations = await _plugin(FEED_A, "newest").fetch_locations(session)
+
+        assert [loc["uid"] for loc in locations] == ["Messenger m1-4"]
+        assert session.get.call_count == 1
+
+
+class TestMultipleFeeds:
+    """Several feed IDs are polled in one cycle"""
+
+    @pytest.mark.asyncio
+    async def test_feeds_are_merged(self):
+        plugin = _plugin(f"{FEED_A}, {FEED_B}")
+        session = _session(
+            {
+                (FEED_A, 0): _response(200, _feed([_message(1, "m1", 10)])),
+                (FEED_B, 0): _response(200, _feed([_message(2, "m2", 20)])),
+            }
+        )
+
+        locations = await plugin.fetch_locations(session)
+
+        assert sorted(loc["additional_data"]["feed_id"] for loc in locations) == [
+            FEED_A,
+            FEED_B,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_feed_reuses_last_messages(self):
+        plugin = _plugin(f"{FEED_A},{FEED_B}")
+        await plugin.fetch_locations(
+            _session(
+                {
+                    (FEED_A, 0): _response(
+                        200, _feed([_message(1, "m1", 10)]), {"ETag": '"a1"'}
+                    ),
+                    (FEED_B, 0): _response(200, _feed([_message(2, "m2", 20)])),
+                }
+            )
+        )
+
+        plugin.last_fetch_not_modified = False
+        locations = await plugin.fetch_locations(
+            _session(
+                {
+                    (FEED_A, 0): _response(304),
+                    (FEED_B, 0): _response(200, _feed([_message(3, "m2", 30)])),
+                }
+            )
+        )
+
+        assert sorted(loc["uid"] for loc in locations) == [
+            "Messenger m1-m1",
+            "Messenger m2-m2",
+        ]
+        assert not plugin.last_fetch_not_modified
+
+    @pytest.mark.asyncio
+    async def test_all_feeds_unchanged(self):
+        plugin = _plugin(f"{FEED_A},{FEED_B}")
+        for feed_id in (FEED_A, FEED_B):
+            plugin.http_validators.record(
+                f"{SpotPlugin.FEED_URL}/{feed_id}/message.json", 200, {"ETag": '"1"'}
+            )
+
+        locations = await plugin.fetch_locations(
+            _session({(FEED_A, 0): _response(304), (FEED_B, 0): _response(304)})
+        )
+
+        assert locations == []
+        assert plugin.last_fetch_not_modified
+
+    @pytest.mark.asyncio
+    async def test_failed_feed_does_not_hide_others(self):
+        plugin = _plugin(f"{FEED_A},{FEED_B}")
+        session = _session(
+            {
+                (FEED_A, 0): _response(404),
+                (FEED_B, 0): _response(200, _feed([_message(2, "m2", 20)])),
+            }
+        )
+
+        locations = await plugin.fetch_locations(session)
+
+        assert [loc["uid"] for loc in locations] == ["Messenger m2-m2"]
@@ -0,0 +1,121 @@
+"""
+ABOUTME: Unit tests for versioned stream configuration snapshots used by
+ABOUTME: stream workers to avoid per-poll configuration queries
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from models.dto import CallsignMappingDTO
+from services.stream_config_snapshot import (
+    StreamConfigSnapshot,
+    get_stream_config_versions,
+    invalidate_stream_config,
+    reset_stream_config_versions,
+)
+from services.stream_worker import StreamWorker
+
+
+def _stream(stream_id=7):
+    stream = Mock()
+    stream.id = stream_id
+    stream.name = "Snapshot Stream"
+    stream.poll_interval = 60
+    stream.enable_callsign_mapping = True
+    stream.callsign_identifier_field = "imei"
+    stream.callsign_error_handling = "fallback"
+    stream.enable_per_callsign_cot_types = False
+    stream.cot_type_mode = "stream"
+    return stream
+
+
+def _snapshot(stream, version, callsign="Alpha-1"):
+    return StreamConfigSnapshot.build(
+        stream,
+        [
+            CallsignMappingDTO("IMEI1", callsign),
+            CallsignMappingDTO("IMEI2", "Bravo-2", enabled=False),
+        ],
+        version,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_versions():
+    reset_stream_config_versions()
+    yield
+    reset_stream_config_versions()
+
+
+class TestStreamConfigSnapshot:
+    """Snapshots split mappings and derive the worker config once"""
+
+    def test_build_splits_enabled_and_disabled_mappings(self):
+        snapshot = _snapshot(_stream(), version=3)
+
+        assert snapshot.version == 3
+        assert list(snapshot.callsign_mappings) == ["IMEI1"]
+        assert list(snapshot.disabled_mappings) == ["IMEI2"]
+        assert snapshot.config == {
+            "enable_callsign_mapping": True,
+            "callsign_identifier_field": "imei",
+            "callsign_error_handling": "fallback",
+            "enable_per_callsign_cot_types": False,
+            "cot_type_mode": "stream",
+        }
+
+    def test_invalidate_bumps_version_per_stream(self):
+        versions = get_stream_config_versions()
+
+        assert invalidate_stream_config(7) == 1
+        assert invalidate_stream_config(7) == 2
+        assert versions.get(7) == 2
+        assert versions.get(8) == 0
+
+
+class TestStreamWorkerSnapshot:
+    """Workers reuse their snapshot until the stream is invalidated"""
+
+    @pytest.fixture
+    def worker(self):
+        stream = _stream()
+        worker = StreamWorker(stream, Mock(), Mock())
+        worker.async_db.get_stream_config_snapshot = AsyncMock(
+            side_effect=lambda stream_id, version: _snapshot(stream, version)
+        )
+        return worker
+
+    async def test_poll_cycle_loads_configuration_once(self, worker):
+        locations = [
+            {
+                "name": "Original",
+                "additional_data": {
+                    "raw_placemark": {"extended_data": {"IMEI": "IMEI1"}}
+                },
+            }
+        ]
+
+        await worker._apply_callsign_mapping(locations)
+        await worker._get_fresh_stream_config()
+        await worker._apply_callsign_mapping([])
+
+        assert locations[0]["name"] == "Alpha-1"
+        worker.async_db.get_stream_config_snapshot.assert_awaited_once_with(7, 0)
+
+    async def test_invalidation_reloads_snapshot(self, worker):
+        await worker._get_fresh_stream_config()
+
+        invalidate_stream_config(7)
+        await worker._get_fresh_stream_config()
+        await worker._get_fresh_stream_config()
+
+        assert worker.async_db.get_stream_config_snapshot.await_count == 2
+        worker.async_db.get_stream_config_snapshot.assert_awaited_with(7, 1)
+
+    async def test_failed_load_is_not_cached(self, worker):
+        worker.async_db.get_stream_config_snapshot = AsyncMock(return_value=None)
+
+        assert await worker._get_fresh_stream_config() == {}
+        assert await worker._get_fresh_stream_config() == {}
+        assert worker.async_db.get_stream_config_snapshot.await_count == 2
@@ -0,0 +1,82 @@
+"""
+ABOUTME: Unit tests for stream shard event loops covering cross-loop hand-off,
+ABOUTME: shard configuration and the per-shard poll concurrency budget
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from services.poll_scheduler import HostRateLimiter, PollScheduler
+from services.stream_shards import StreamShard, get_shard_count, run_on_loop
+
+
+class TestShardConfig:
+    """Shard count and poll budget come from threading.yaml"""
+
+    def test_shard_count(self):
+        assert get_shard_count(None) == 1
+        assert get_shard_count({"count": 4}) == 4
+        assert get_shard_count({"count": 0}) == 1
+        assert get_shard_count({"count": "many"}) == 1
+
+    def test_poll_budget_split_across_shards(self):
+        scheduler = PollScheduler.from_config(
+            {"max_concurrent_polls": 10}, shard_count=4
+        )
+
+        assert scheduler.max_concurrent_polls == 3
+
+    def test_host_limit_shared_across_shards(self):
+        limiter = HostRateLimiter(60)
+        shards = [StreamShard(index, {}, 3, limiter) for index in (1, 2)]
+
+        assert all(shard.poll_scheduler.host_limiter is limiter for shard in shards)
+        assert limiter.reserve("api.example.com") == 0
+        assert limiter.reserve("api.example.com") > 59
+
+
+class TestStreamShard:
+    """Coroutines run on the shard thread and results come back"""
+
+    @pytest.fixture
+    def shard(self):
+        shard = StreamShard(1)
+        shard.start()
+        yield shard
+        shard.stop()
+
+    @pytest.mark.asyncio
+    async def test_run_executes_on_shard_thread(self, shard):
+        async def thread_name():
+            return threading.current_thread().name
+
+        assert await shard.run(thread_name()) == "StreamShard-1"
+
+    @pytest.mark.asyncio
+    async def test_run_on_current_loop_awaits_directly(self):
+        async def loop_id():
+            return id(asyncio.get_running_loop())
+
+        current = asyncio.get_running_loop()
+        assert await run_on_loop(current, loop_id()) == id(current)
+        assert await run_on_loop(None, loop_id()) == id(current)
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_back(self, shard):
+        async def fail():
+            raise ValueError("shard failure")
+
+        with pytest.raises(ValueError, match="shard failure"):
+            await shard.run(fail())
+
+    def test_stop_closes_loop(self):
+        shard = StreamShard(2)
+        shard.start()
+        loop = shard.loop
+
+        shard.stop()
+
+        assert loop.is_closed()
+        assert not shard.is_running
@@ -0,0 +1,154 @@
+"""
+ABOUTME: Unit tests for write-behind aggregation of per-poll stream status
+ABOUTME: covering coalescing, bulk flushes, failed flushes, worker routing and
+ABOUTME: the aggregator lifecycle within the StreamManager
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from services.database_manager import (
+    DEFAULT_STATUS_FLUSH_INTERVAL,
+    DatabaseManager,
+    StreamStatusAggregator,
+    get_status_flush_interval,
+    get_stream_status_aggregator,
+    stop_stream_status_aggregator,
+)
+from services.stream_manager import StreamManager
+from services.stream_worker import StreamWorker
+
+POLL_1 = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+POLL_2 = datetime(2026, 10, 16, 12, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_manager():
+    db_manager = Mock()
+    db_manager.execute_db_operation.side_effect = (
+        lambda operation, updates: len(updates)
+    )
+    return db_manager
+
+
+class TestStreamStatusAggregator:
+    """Status updates are coalesced per stream and written in one batch"""
+
+    def test_flush_writes_coalesced_updates_once(self, db_manager):
+        aggregator = StreamStatusAggregator(db_manager, flush_interval=60)
+        aggregator.record(1, last_poll_time=POLL_1, messages_sent=5)
+        aggregator.record(1, last_poll_time=POLL_2, messages_sent=3)
+        aggregator.record(2, last_error="timeout")
+
+        assert aggregator.flush() == 2
+
+        db_manager.execute_db_operation.assert_called_once()
+        operation, updates = db_manager.execute_db_operation.call_args.args
+        assert operation is DatabaseManager._apply_stream_status_batch
+        assert updates == [
+            {
+                "stream_id": 1,
+                "last_poll": POLL_2,
+                "last_error": None,
+                "messages_sent": 8,
+            },
+            {
+                "stream_id": 2,
+                "last_poll": None,
+                "last_error": "timeout",
+                "messages_sent": 0,
+            },
+        ]
+        assert aggregator.flush() == 0
+        db_manager.execute_db_operation.assert_called_once()
+
+    def test_failed_flush_keeps_updates_for_next_flush(self, db_manager):
+        aggregator = StreamStatusAggregator(db_manager, flush_interval=60)
+        aggregator.record(1, last_poll_time=POLL_1, messages_sent=5)
+        db_manager.execute_db_operation.side_effect = lambda *args: None
+
+        assert aggregator.flush() == 0
+
+        aggregator.record(1, last_poll_time=POLL_2, messages_sent=2)
+        pending = aggregator.take(1)
+        assert pending.last_poll == POLL_2
+        assert pending.messages_sent == 7
+
+    def test_stop_flushes_pending_updates(self, db_manager):
+        aggregator = StreamStatusAggregator(db_manager, flush_interval=60)
+        aggregator.start()
+        aggregator.record(1, messages_sent=4)
+
+        aggregator.stop()
+
+        db_manager.execute_db_operation.assert_called_once()
+
+
+class TestStreamWorkerStatusRouting:
+    """Workers buffer per-poll status but write state changes immediately"""
+
+    @pytest.fixture
+    def worker(self, db_manager):
+        stream = Mock()
+        stream.id = 3
+        stream.name = "Status Stream"
+        stream.poll_interval = 30
+        worker = StreamWorker(stream, Mock(), Mock())
+        worker.async_db.update_stream_status = AsyncMock(return_value=True)
+        aggregator = StreamStatusAggregator(db_manager, flush_interval=60)
+        with patch(
+            "services.stream_worker.get_stream_status_aggregator",
+            return_value=aggregator,
+        ):
+            yield worker, aggregator
+
+    async def test_poll_status_is_buffered(self, worker):
+        worker, aggregator = worker
+
+        assert await worker._update_stream_status_async(
+            last_error=None, last_poll_time=POLL_1
+        )
+        assert await worker._update_stream_status_async(messages_sent=6)
+
+        worker.async_db.update_stream_status.assert_not_awaited()
+        pending = aggregator.take(3)
+        assert (pending.last_poll, pending.messages_sent) == (POLL_1, 6)
+
+    async def test_state_change_folds_pending_status(self, worker):
+        worker, aggregator = worker
+        aggregator.record(3, last_error="stale error", messages_sent=6)
+
+        await worker._update_stream_status_async(is_active=False, last_error="stop")
+
+        worker.async_db.update_stream_status.assert_awaited_once_with(
+            3, False, "stop", 6, None
+        )
+        assert aggregator.take(3) is None
+
+
+class TestStatusAggregatorLifecycle:
+    """Flush interval comes from threading.yaml; the manager owns the thread"""
+
+    def test_flush_interval_from_config(self):
+        assert get_status_flush_interval(None) == DEFAULT_STATUS_FLUSH_INTERVAL
+        assert get_status_flush_interval({"flush_interval": 2.5}) == 2.5
+        assert get_status_flush_interval({"flush_interval": 0}) == 0
+        assert (
+            get_status_flush_interval({"flush_interval": "soon"})
+            == DEFAULT_STATUS_FLUSH_INTERVAL
+        )
+
+    def test_started_with_loop_and_stopped_on_shutdown(self, app):
+        stop_stream_status_aggregator()
+
+        with app.app_context():
+            manager = StreamManager(stream_status_config={"flush_interval": 30})
+            aggregator = get_stream_status_aggregator()
+            assert aggregator is not None
+            assert aggregator.flush_interval == 30
+
+            manager.shutdown()
+
+        assert get_stream_status_aggregator() is None
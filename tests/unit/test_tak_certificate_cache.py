@@ -0,0 +1,221 @@
+"""
+ABOUTME: Unit tests for the per-TAK-server P12 certificate and SSL context cache
+ABOUTME: covering reuse across connections, fingerprint changes, file cleanup
+ABOUTME: and password decryption only on cache misses
+"""
+
+import os
+import stat
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import (
+    BestAvailableEncryption,
+    pkcs12,
+)
+from cryptography.x509.oid import NameOID
+
+import services.tak_certificate_cache as certificate_cache
+from models.dto import TakServerDTO
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import reset_queued_cot_service
+from services.tak_certificate_cache import (
+    TakCertificateCache,
+    get_tak_certificate_cache,
+    reset_tak_certificate_cache,
+)
+
+
+def _make_p12(password: str, common_name: str = "trakbridge") -> bytes:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return pkcs12.serialize_key_and_certificates(
+        b"client", key, certificate, None, BestAvailableEncryption(password.encode())
+    )
+
+
+def _tak_server(cert_p12=None, password="secret", verify_ssl=True):
+    server = Mock()
+    server.id = 1
+    server.name = "Test Server"
+    server.host = "tak.example.com"
+    server.port = 8089
+    server.protocol = "tls"
+    server.verify_ssl = verify_ssl
+    server.cert_p12 = cert_p12
+    # Stored (encrypted) password as held by the TakServer model
+    server.encrypted_cert_password = None
+    server.cert_password = f"encrypted:{password}"
+    server.get_cert_password.return_value = password
+    return server
+
+
+@pytest.fixture(scope="module")
+def p12_data():
+    return _make_p12("secret")
+
+
+@pytest.fixture
+def cache():
+    cache = TakCertificateCache()
+    yield cache
+    cache.clear()
+
+
+class TestCertificateFiles:
+    """PEM files are written once per certificate and cleaned up"""
+
+    def test_files_reused_across_connections(self, cache, p12_data):
+        server = _tak_server(p12_data)
+
+        with patch.object(
+            certificate_cache,
+            "extract_p12_certificate",
+            wraps=certificate_cache.extract_p12_certificate,
+        ) as extract:
+            first = cache.get_cert_files(server)
+            second = cache.get_cert_files(server)
+
+        assert first == second
+        assert extract.call_count == 1
+        assert cache.get_stats() == {"cached_servers": 1, "hits": 1, "misses": 1}
+        cert_path, key_path = first
+        assert open(cert_path, "rb").read().startswith(b"-----BEGIN CERTIFICATE")
+        assert stat.S_IMODE(os.stat(key_path).st_mode) == 0o600
+
+    def test_changed_password_replaces_files(self, cache):
+        server = _tak_server(_make_p12("first"), password="first")
+        old_paths = cache.get_cert_files(server)
+
+        server.cert_p12 = _make_p12("second")
+        server.cert_password = "encrypted:second"
+        server.get_cert_password.return_value = "second"
+        new_paths = cache.get_cert_files(server)
+
+        assert new_paths != old_paths
+        assert not any(os.path.exists(path) for path in old_paths)
+        assert all(os.path.exists(path) for path in new_paths)
+
+    def test_password_decrypted_only_on_miss(self, cache, p12_data):
+        server = _tak_server(p12_data)
+
+        for _ in range(3):
+            cache.get_cert_files(server)
+
+        server.get_cert_password.assert_called_once()
+
+    def test_dto_password_decrypted_only_on_miss(self, cache, p12_data):
+        encryption_service = Mock()
+        encryption_service.decrypt_value.return_value = "secret"
+
+        with patch(
+            "services.encryption_service.get_encryption_service",
+            return_value=encryption_service,
+        ):
+            for _ in range(3):
+                server = TakServerDTO(
+                    id=1,
+                    name="Test Server",
+                    host="tak.example.com",
+                    port=8089,
+                    protocol="tls",
+                    cert_p12=p12_data,
+                    encrypted_cert_password="encrypted:secret",
+                )
+                cache.get_cert_files(server)
+
+        encryption_service.decrypt_value.assert_called_once_with("encrypted:secret")
+
+    def test_changed_stored_password_is_a_miss(self, cache, p12_data):
+        server = _tak_server(p12_data)
+        cache.get_cert_files(server)
+
+        # Same password re-encrypted, e.g. after an encryption key rotation
+        server.cert_password = "encrypted-again:secret"
+        cache.get_cert_files(server)
+
+        assert cache.get_stats()["misses"] == 2
+
+    def test_invalidate_removes_files(self, cache, p12_data):
+        paths = cache.get_cert_files(_tak_server(p12_data))
+
+        cache.invalidate(1)
+
+        assert not any(os.path.exists(path) for path in paths)
+        assert cache.get_stats()["cached_servers"] == 0
+
+    def test_wrong_password_raises(self, cache, p12_data):
+        with pytest.raises(Exception, match="P12 certificate extraction failed"):
+            cache.get_cert_files(_tak_server(p12_data, password="wrong"))
+
+
+class TestSslContexts:
+    """SSL contexts are built once per server and verify_ssl setting"""
+
+    def test_client_certificate_context_cached(self, cache, p12_data):
+        server = _tak_server(p12_data)
+
+        context = cache.get_ssl_context(server)
+
+        assert cache.get_ssl_context(server) is context
+        server.verify_ssl = False
+        unverified = cache.get_ssl_context(server)
+        assert unverified is not context
+        assert unverified.check_hostname is False
+
+    def test_context_without_client_certificate_cached(self, cache):
+        server = _tak_server()
+
+        context = cache.get_ssl_context(server)
+
+        assert cache.get_ssl_context(server) is context
+        cache.invalidate(1)
+        assert cache.get_ssl_context(server) is not context
+
+
+class TestServiceIntegration:
+    """The PyTAK configuration path uses the shared cache"""
+
+    @pytest.fixture(autouse=True)
+    def reset_services(self):
+        reset_cot_service()
+        reset_queued_cot_service()
+        reset_tak_certificate_cache()
+        yield
+        reset_cot_service()
+        reset_queued_cot_service()
+        reset_tak_certificate_cache()
+
+    @pytest.mark.asyncio
+    async def test_pytak_config_reuses_certificate_files(self, p12_data):
+        service = get_cot_service()
+        server = _tak_server(p12_data)
+
+        first = await service._create_pytak_config(server)
+        second = await service._create_pytak_config(server)
+
+        assert first["PYTAK_TLS_CLIENT_CERT"] == second["PYTAK_TLS_CLIENT_CERT"]
+        assert first["PYTAK_TLS_CLIENT_KEY"] == second["PYTAK_TLS_CLIENT_KEY"]
+        assert get_tak_certificate_cache().get_stats()["misses"] == 1
+
+    def test_reset_removes_files(self, p12_data):
+        paths = get_tak_certificate_cache().get_cert_files(_tak_server(p12_data))
+
+        reset_tak_certificate_cache()
+
+        assert not any(os.path.exists(path) for path in paths)
@@ -0,0 +1,214 @@
+"""
+ABOUTME: Unit tests for in-worker TAK reconnection with exponential backoff and
+ABOUTME: jitter, including circuit breaker recovery delays and connection replacement
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerState,
+)
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import (
+    QueuedCOTService,
+    TransmitResult,
+    reset_queued_cot_service,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    """Reset COT service singletons around each test"""
+    reset_cot_service()
+    reset_queued_cot_service()
+    yield
+    reset_cot_service()
+    reset_queued_cot_service()
+
+
+@pytest.fixture
+def cot_service():
+    service = get_cot_service()
+    service.parallel_config["transmission"].update(
+        {"reconnect_base_delay_seconds": 0.001, "reconnect_max_delay_seconds": 0.01}
+    )
+    with patch.object(service, "_get_tak_circuit_breaker", return_value=None):
+        yield service
+
+
+@pytest.fixture
+def tak_server():
+    server = Mock()
+    server.id = 1
+    server.name = "Test Server"
+    return server
+
+
+class TestReconnectDelay:
+    """Backoff with jitter, extended by an open circuit breaker"""
+
+    def test_exponential_with_jitter_and_ceiling(self):
+        for attempt, low, high in [(1, 0.5, 1.0), (3, 2.0, 4.0), (10, 15.0, 30.0)]:
+            for _ in range(20):
+                delay = QueuedCOTService._reconnect_delay(attempt, 1.0, 30.0)
+                assert low <= delay <= high
+
+    def test_open_circuit_breaker_extends_delay(self):
+        breaker = CircuitBreaker(
+            "tak_server_1", CircuitBreakerConfig(recovery_timeout=60.0)
+        )
+        breaker.state = CircuitBreakerState.OPEN
+        breaker.last_failure_time = datetime.now(timezone.utc) - timedelta(seconds=20)
+
+        delay = QueuedCOTService._reconnect_delay(1, 1.0, 30.0, breaker)
+
+        assert 39.0 <= delay <= 40.0
+
+    def test_closed_circuit_breaker_ignored(self):
+        breaker = CircuitBreaker("tak_server_1")
+        breaker.last_failure_time = datetime.now(timezone.utc)
+
+        assert QueuedCOTService._reconnect_delay(1, 1.0, 30.0, breaker) <= 1.0
+
+
+class TestWorkerReconnection:
+    """The transmission worker keeps running across connection failures"""
+
+    async def _run_worker(self, service, tak_server, until):
+        worker = asyncio.create_task(
+            service._enhanced_transmission_worker(tak_server.id, tak_server)
+        )
+        try:
+            await asyncio.wait_for(until.wait(), timeout=2)
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_initial_connection_retried(self, cot_service, tak_server):
+        connection = (Mock(), MagicMock())
+        transmitted = asyncio.Event()
+
+        async def transmit(batch, conn, server):
+            assert conn is connection
+            transmitted.set()
+            return True
+
+        with patch.object(
+            cot_service,
+            "_create_pytak_connection",
+            AsyncMock(side_effect=[None, None, connection]),
+        ) as create_connection, patch.object(
+            cot_service, "_transmit_batch", side_effect=transmit
+        ), patch.object(
+            cot_service, "_cleanup_connection", AsyncMock()
+        ):
+            await cot_service.queue_manager.create_queue(1)
+            await cot_service.queue_manager.enqueue_event(1, b"event")
+            await self._run_worker(cot_service, tak_server, transmitted)
+
+        assert create_connection.await_count == 3
+        assert cot_service.transmission_metrics[1].connection_failures == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_write_replaces_connection(self, cot_service, tak_server):
+        first, second = (Mock(), MagicMock()), (Mock(), MagicMock())
+        used = []
+        delivered = asyncio.Event()
+
+        async def transmit(batch, conn, server):
+            used.append(conn)
+            if conn is first:
+                return TransmitResult.WRITE_ERROR
+            delivered.set()
+            return TransmitResult.SENT
+
+        with patch.object(
+            cot_service,
+            "_create_pytak_connection",
+            AsyncMock(side_effect=[first, second]),
+        ), patch.object(
+            cot_service, "_transmit_batch", side_effect=transmit
+        ), patch.object(
+            cot_service, "_cleanup_connection", AsyncMock()
+        ) as cleanup, patch.object(
+            cot_service, "stop_worker", AsyncMock()
+        ) as stop_worker:
+            cot_service.parallel_config["retry_buffer"]["base_delay_seconds"] = 0.001
+            await cot_service.queue_manager.create_queue(1)
+            await cot_service.queue_manager.enqueue_event(1, b"event")
+            await self._run_worker(cot_service, tak_server, delivered)
+
+        assert used == [first, second]
+        cleanup.assert_any_await(first)
+        stop_worker.assert_not_called()
+        assert cot_service.transmission_metrics[1].reconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_keeps_connection(self, cot_service, tak_server):
+        connection = (Mock(), MagicMock())
+        used = []
+        delivered = asyncio.Event()
+
+        async def transmit(batch, conn, server):
+            used.append(conn)
+            if len(used) == 1:
+                return TransmitResult.NOT_SENT
+            delivered.set()
+            return TransmitResult.SENT
+
+        with patch.object(
+            cot_service,
+            "_create_pytak_connection",
+            AsyncMock(return_value=connection),
+        ) as create_connection, patch.object(
+            cot_service, "_transmit_batch", side_effect=transmit
+        ), patch.object(
+            cot_service, "_cleanup_connection", AsyncMock()
+        ):
+            cot_service.parallel_config["retry_buffer"]["base_delay_seconds"] = 0.001
+            await cot_service.queue_manager.create_queue(1)
+            await cot_service.queue_manager.enqueue_event(1, b"event")
+            await self._run_worker(cot_service, tak_server, delivered)
+
+        assert used == [connection, connection]
+        assert create_connection.await_count == 1
+        assert 1 not in cot_service.transmission_metrics
+
+    @pytest.mark.asyncio
+    async def test_stopped_service_ends_reconnection(self, cot_service, tak_server):
+        cot_service._running = False
+
+        with patch.object(
+            cot_service, "_create_pytak_connection", AsyncMock()
+        ) as create_connection:
+            assert await cot_service._connect_with_backoff(1, tak_server) is None
+
+        create_connection.assert_not_called()
+
+
+class TestReconnectConfiguration:
+    """Reconnect backoff settings are validated and overridable"""
+
+    def test_invalid_values_use_defaults(self, cot_service):
+        validated = cot_service.validate_performance_config(
+            {"transmission": {"reconnect_base_delay_seconds": -1}}
+        )
+
+        assert validated["transmission"]["reconnect_base_delay_seconds"] == 1.0
+        assert validated["transmission"]["reconnect_max_delay_seconds"] == 60.0
+
+    def test_environment_override(self, cot_service):
+        with patch.dict(
+            os.environ, {"TRANSMISSION_RECONNECT_MAX_DELAY_SECONDS": "120"}
+        ):
+            config = cot_service.load_performance_config_with_env_override()
+
+        assert config["transmission"]["reconnect_max_delay_seconds"] == 120.0
@@ -0,0 +1,91 @@
+"""
+ABOUTME: Unit tests for TAK server DTO reuse per server revision and lazy
+ABOUTME: certificate password decryption
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from models.dto import StreamDTO, TakServerDTO, clear_tak_server_dto_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    clear_tak_server_dto_cache()
+    yield
+    clear_tak_server_dto_cache()
+
+
+def _server(server_id=1, updated_at=None, cert_password="ENC:v1:secret"):
+    return SimpleNamespace(
+        id=server_id,
+        name=f"Server {server_id}",
+        host="tak.example.com",
+        port=8089,
+        protocol="tls",
+        verify_ssl=True,
+        cert_p12=b"p12-bytes",
+        cert_password=cert_password,
+        updated_at=updated_at or datetime(2026, 10, 16, tzinfo=timezone.utc),
+    )
+
+
+class TestTakServerDTORevisions:
+    """DTOs are built once per server revision"""
+
+    def test_same_revision_reuses_instance(self):
+        server = _server()
+
+        first = TakServerDTO.from_orm(server)
+        second = TakServerDTO.from_orm(server)
+
+        assert second is first
+
+    def test_new_revision_rebuilds(self):
+        first = TakServerDTO.from_orm(_server())
+        updated = TakServerDTO.from_orm(
+            _server(updated_at=datetime(2026, 10, 17, tzinfo=timezone.utc))
+        )
+
+        assert updated is not first
+        assert updated.updated_at.day == 17
+
+    def test_stream_shares_server_dto(self):
+        server = _server()
+        stream = Mock()
+        stream.tak_server = server
+        stream.tak_servers = [server]
+
+        dto = StreamDTO.from_orm(stream)
+
+        assert dto.tak_servers[0] is dto.tak_server
+
+
+class TestLazyCertPassword:
+    """The certificate password is decrypted on first use only"""
+
+    def test_decrypted_on_first_use(self):
+        encryption = Mock()
+        encryption.decrypt_value.return_value = "cert_pass"
+
+        with patch(
+            "services.encryption_service.get_encryption_service",
+            return_value=encryption,
+        ):
+            dto = TakServerDTO.from_orm(_server())
+            assert dto.has_cert_password
+            encryption.decrypt_value.assert_not_called()
+
+            assert dto.get_cert_password() == "cert_pass"
+            assert dto.get_cert_password() == "cert_pass"
+
+        encryption.decrypt_value.assert_called_once_with("ENC:v1:secret")
+
+    def test_no_password(self):
+        dto = TakServerDTO.from_orm(_server(cert_password=None))
+
+        assert not dto.has_cert_password
+        assert dto.get_cert_password() == ""
@@ -0,0 +1,123 @@
+"""
+ABOUTME: Unit tests for the stream worker's resolved TAK server routes, which
+ABOUTME: are only re-checked after relationship changes or worker lifecycle events
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from services.cot_service import get_cot_service, reset_cot_service
+from services.cot_service_integration import reset_queued_cot_service
+from services.stream_worker import StreamWorker
+
+
+@pytest.fixture(autouse=True)
+def reset_services():
+    """Reset COT service singletons around each test"""
+    reset_cot_service()
+    reset_queued_cot_service()
+    yield
+    reset_cot_service()
+    reset_queued_cot_service()
+
+
+def _server(server_id):
+    server = Mock()
+    server.id = server_id
+    server.name = f"Server {server_id}"
+    return server
+
+
+def _stream(servers):
+    stream = Mock()
+    stream.id = 1
+    stream.name = "Routed Stream"
+    stream.poll_interval = 60
+    stream.tak_servers = servers
+    return stream
+
+
+@pytest.fixture
+def cot_service():
+    service = Mock()
+    service.worker_generation = 0
+    with patch("services.stream_worker.get_cot_service", return_value=service):
+        yield service
+
+
+class TestStreamWorkerTakRoutes:
+    """Routes are resolved once and workers re-checked only after changes"""
+
+    @pytest.mark.asyncio
+    async def test_routes_reused_until_worker_generation_changes(self, cot_service):
+        worker = StreamWorker(_stream([_server(1), _server(2)]), Mock(), Mock())
+        worker._ensure_persistent_tak_worker_for_server = AsyncMock(
+            return_value=True
+        )
+
+        first = await worker._get_target_tak_servers()
+        second = await worker._get_target_tak_servers()
+
+        assert [s.id for s in first] == [1, 2]
+        assert second is first
+        assert worker._ensure_persistent_tak_worker_for_server.await_count == 2
+
+        cot_service.worker_generation += 1
+        await worker._get_target_tak_servers()
+
+        assert worker._ensure_persistent_tak_worker_for_server.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_worker_is_rechecked_on_next_send(self, cot_service):
+        worker = StreamWorker(_stream([_server(1)]), Mock(), Mock())
+        worker._ensure_persistent_tak_worker_for_server = AsyncMock(
+            side_effect=[False, True, True]
+        )
+
+        await worker._get_target_tak_servers()
+        assert worker._tak_routes_running == 0
+        await worker._get_target_tak_servers()
+        await worker._get_target_tak_servers()
+
+        assert worker._tak_routes_running == 1
+        assert worker._ensure_persistent_tak_worker_for_server.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_routes_from_fresh_stream(self, cot_service):
+        worker = StreamWorker(_stream([_server(1)]), Mock(), Mock())
+        worker._ensure_persistent_tak_worker_for_server = AsyncMock(
+            return_value=True
+        )
+        await worker._get_target_tak_servers()
+
+        worker.refresh_tak_routes(_stream([_server(2), _server(3)]))
+        servers = await worker._get_target_tak_servers()
+
+        assert [s.id for s in servers] == [2, 3]
+        assert worker._ensure_persistent_tak_worker_for_server.await_count == 3
+
+
+class TestWorkerGeneration:
+    """The COT service bumps its worker generation on lifecycle events"""
+
+    @pytest.mark.asyncio
+    async def test_generation_changes_on_start_and_exit(self):
+        service = get_cot_service()
+        never_finish = asyncio.Event()
+
+        async def fake_worker(tak_server_id, tak_server):
+            await never_finish.wait()
+
+        with patch.object(
+            service, "_enhanced_transmission_worker", side_effect=fake_worker
+        ):
+            generation = service.worker_generation
+            assert await service.start_worker(_server(5))
+            assert service.worker_generation == generation + 1
+
+            await service.stop_worker(5)
+            await asyncio.sleep(0)
+
+        assert service.worker_generation == generation + 2
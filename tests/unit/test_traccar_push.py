@@ -0,0 +1,198 @@
+"""
+ABOUTME: Unit tests for Traccar device table caching and WebSocket push mode
+ABOUTME: covering cache refresh rules, socket buffering and REST resyncs
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from plugins.traccar_plugin import TraccarPlugin, TraccarPushListener
+
+CONFIG = {
+    "server_url": "https://traccar.example.com",
+    "username": "user",
+    "password": "secret",
+    "timeout": 30,
+}
+
+
+def _position(device_id, latitude=46.5):
+    return {
+        "id": device_id * 100,
+        "deviceId": device_id,
+        "latitude": latitude,
+        "longitude": 29.2,
+        "deviceTime": "2026-10-16T10:00:00Z",
+        "attributes": {},
+    }
+
+
+def _streamed(*positions):
+    """Mock _fetch_positions_from_api that streams the given positions"""
+
+    async def fetch(session, config, on_position):
+        for position in positions:
+            on_position(position)
+        return []
+
+    return AsyncMock(side_effect=fetch)
+
+
+def _plugin(**config):
+    return TraccarPlugin(dict(CONFIG, **config))
+
+
+class TestDeviceTableCache:
+    """/api/devices is not fetched on every poll"""
+
+    @pytest.mark.asyncio
+    async def test_devices_fetched_once_for_known_devices(self):
+        plugin = _plugin()
+        devices = AsyncMock(return_value=[{"id": 1, "name": "Truck"}])
+
+        with patch.object(
+            plugin, "_fetch_positions_from_api", _streamed(_position(1))
+        ), patch.object(plugin, "_fetch_devices_from_api", devices):
+            for _ in range(3):
+                locations = await plugin._fetch_locations_with_session(
+                    MagicMock(), CONFIG
+                )
+
+        assert locations[0]["name"] == "Truck"
+        assert devices.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_device_refreshes_after_minimum_interval(self):
+        plugin = _plugin()
+        devices = AsyncMock(return_value=[{"id": 1, "name": "Truck"}])
+        positions = _streamed(_position(1), _position(2))
+
+        with patch.object(plugin, "_fetch_positions_from_api", positions), patch.object(
+            plugin, "_fetch_devices_from_api", devices
+        ), patch("plugins.traccar_plugin.time.monotonic") as monotonic:
+            monotonic.return_value = 1000.0
+            await plugin._fetch_locations_with_session(MagicMock(), CONFIG)
+            monotonic.return_value = 1010.0
+            await plugin._fetch_locations_with_session(MagicMock(), CONFIG)
+            assert devices.await_count == 1
+
+            devices.return_value = [
+                {"id": 1, "name": "Truck"},
+                {"id": 2, "name": "Van"},
+            ]
+            monotonic.return_value = (
+                1000.0 + TraccarPlugin.UNKNOWN_DEVICE_REFRESH_INTERVAL
+            )
+            locations = await plugin._fetch_locations_with_session(MagicMock(), CONFIG)
+
+        assert devices.await_count == 2
+        assert [loc["name"] for loc in locations] == ["Truck", "Van"]
+
+
+class TestTraccarPushListener:
+    """Socket messages are buffered latest-per-device"""
+
+    def test_socket_url(self):
+        listener = TraccarPushListener("https://t.example.com:8443/", "u", "p", None)
+        assert listener.socket_url == "wss://t.example.com:8443/api/socket"
+        listener = TraccarPushListener("http://localhost:8082", "u", "p", None)
+        assert listener.socket_url == "ws://localhost:8082/api/socket"
+
+    def test_positions_buffered_and_drained(self):
+        listener = TraccarPushListener("http://localhost:8082", "u", "p", None)
+
+        listener.handle_message(json.dumps({"positions": [_position(1, 46.1)]}))
+        listener.handle_message(
+            json.dumps(
+                {
+                    "positions": [_position(1, 46.2), _position(2)],
+                    "devices": [{"id": 2, "name": "Van"}],
+                }
+            )
+        )
+        listener.handle_message("{}")
+        listener.handle_message("not json")
+
+        assert listener.push_event.is_set()
+        positions = listener.drain_positions()
+        assert [(p["deviceId"], p["latitude"]) for p in positions] == [
+            (1, 46.2),
+            (2, 46.5),
+        ]
+        assert not listener.push_event.is_set()
+        assert listener.drain_positions() == []
+        assert listener.drain_devices() == [{"id": 2, "name": "Van"}]
+
+
+class TestPushMode:
+    """Push mode only uses REST to resync"""
+
+    @pytest.fixture
+    def plugin(self):
+        plugin = _plugin(update_mode="push")
+        listener = TraccarPushListener("https://traccar.example.com", "u", "p", None)
+        listener.start = MagicMock()
+        plugin._push_listener = listener
+        plugin.push_event = listener.push_event
+        plugin._device_cache_key = (CONFIG["server_url"], CONFIG["username"])
+        plugin._device_map = {1: {"id": 1, "name": "Truck"}, 2: {"id": 2}}
+        plugin._devices_fetched_at = float("inf")
+        return plugin
+
+    @pytest.mark.asyncio
+    async def test_rest_seed_then_pushed_deltas(self, plugin):
+        listener = plugin._push_listener
+        listener.connected = True
+        listener.connections = 1
+        rest = _streamed(_position(1), _position(2))
+        config = dict(CONFIG, update_mode="push")
+
+        with patch.object(plugin, "_fetch_positions_from_api", rest):
+            seeded = await plugin._fetch_locations_with_session(MagicMock(), config)
+
+            listener.handle_message(json.dumps({"positions": [_position(2, 47.0)]}))
+            pushed = await plugin._fetch_locations_with_session(MagicMock(), config)
+
+            plugin.last_fetch_not_modified = False
+            idle = await plugin._fetch_locations_with_session(MagicMock(), config)
+
+        assert len(seeded) == 2
+        assert [loc["lat"] for loc in pushed] == [47.0]
+        assert idle == []
+        assert plugin.last_fetch_not_modified
+        assert rest.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_and_disconnect_use_rest(self, plugin):
+        listener = plugin._push_listener
+        rest = _streamed(_position(1))
+        config = dict(CONFIG, update_mode="push")
+
+        with patch.object(plugin, "_fetch_positions_from_api", rest):
+            # Socket down: every poll goes to the REST API
+            await plugin._fetch_locations_with_session(MagicMock(), config)
+            await plugin._fetch_locations_with_session(MagicMock(), config)
+            assert rest.await_count == 2
+
+            listener.connected = True
+            listener.connections = 1
+            await plugin._fetch_locations_with_session(MagicMock(), config)
+            await plugin._fetch_locations_with_session(MagicMock(), config)
+            assert rest.await_count == 3
+
+            # A reconnect may have missed positions
+            listener.connections = 2
+            await plugin._fetch_locations_with_session(MagicMock(), config)
+            assert rest.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_close_stops_listener(self, plugin):
+        listener = plugin._push_listener
+
+        await plugin.close()
+
+        assert plugin._push_listener is None
+        assert plugin.push_event is None
+        assert not listener.connected
@@ -8,6 +8,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from plugins.traccar_plugin import TraccarPlugin
 
 
+def _streamed(positions):
+    """Mock _fetch_positions_from_api that streams the given positions"""
+
+    async def fetch(session, config, on_position):
+        for position in positions:
+            on_position(position)
+        return []
+
+    return AsyncMock(side_effect=fetch)
+
+
 class TestTraccarSpeedCourseExtraction:
     """Test Traccar plugin adds speed and course as top-level fields"""
 
@@ -45,7 +56,7 @@ class TestTraccarSpeedCourseExtraction:
 
         # Mock the API fetch methods
         with patch.object(
-            plugin, "_fetch_positions_from_api", new=AsyncMock(return_value=mock_positions)
+            plugin, "_fetch_positions_from_api", new=_streamed(mock_positions)
         ), patch.object(
             plugin, "_fetch_devices_from_api", new=AsyncMock(return_value=mock_devices)
         ):
@@ -98,7 +109,7 @@ class TestTraccarSpeedCourseExtraction:
         mock_devices = [{"id": 123, "name": "Test Device"}]
 
         with patch.object(
-            plugin, "_fetch_positions_from_api", new=AsyncMock(return_value=mock_positions)
+            plugin, "_fetch_positions_from_api", new=_streamed(mock_positions)
         ), patch.object(
             plugin, "_fetch_devices_from_api", new=AsyncMock(return_value=mock_devices)
         ):
@@ -145,7 +156,7 @@ class TestTraccarSpeedCourseExtraction:
         mock_devices = [{"id": 123, "name": "Test Device"}]
 
         with patch.object(
-            plugin, "_fetch_positions_from_api", new=AsyncMock(return_value=mock_positions)
+            plugin, "_fetch_positions_from_api", new=_streamed(mock_positions)
         ), patch.object(
             plugin, "_fetch_devices_from_api", new=AsyncMock(return_value=mock_devices)
         ):
@@ -209,7 +220,7 @@ class TestTraccarSpeedCourseExtraction:
         ]
 
         with patch.object(
-            plugin, "_fetch_positions_from_api", new=AsyncMock(return_value=mock_positions)
+            plugin, "_fetch_positions_from_api", new=_streamed(mock_positions)
         ), patch.object(
             plugin, "_fetch_devices_from_api", new=AsyncMock(return_value=mock_devices)
         ):
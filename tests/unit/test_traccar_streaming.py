@@ -0,0 +1,125 @@
+"""
+ABOUTME: Unit tests for streamed Traccar position parsing covering conversion
+ABOUTME: while the response is read and deferred unknown-device positions
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from plugins.traccar_plugin import TraccarPlugin
+
+CONFIG = {
+    "server_url": "https://traccar.example.com",
+    "username": "user",
+    "password": "secret",
+    "timeout": 30,
+}
+
+
+def _position(device_id):
+    return {
+        "id": device_id * 100,
+        "deviceId": device_id,
+        "latitude": 46.5 + device_id / 1000,
+        "longitude": 29.2,
+        "speed": 1.5,
+        "deviceTime": "2026-10-16T10:00:00Z",
+        "attributes": {},
+    }
+
+
+def _session(positions, consumed, chunk_size=64):
+    body = json.dumps(positions).encode()
+    response = MagicMock()
+    response.status = 200
+    response.headers = {}
+
+    async def iter_chunked(size):
+        for start in range(0, len(body), chunk_size):
+            consumed.append(start + chunk_size)
+            yield body[start : start + chunk_size]
+
+    response.content.iter_chunked = MagicMock(side_effect=iter_chunked)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.get = MagicMock(return_value=context)
+    return session, len(body)
+
+
+class TestStreamedPositions:
+    """Positions become locations as they are decoded"""
+
+    @pytest.mark.asyncio
+    async def test_positions_converted_while_response_is_read(self):
+        plugin = TraccarPlugin(dict(CONFIG))
+        positions = [_position(device_id) for device_id in range(1, 51)]
+        devices = [
+            {"id": device_id, "name": f"Unit {device_id}"} for device_id in range(1, 51)
+        ]
+        consumed = []
+        session, body_length = _session(positions, consumed)
+        read_at_conversion = []
+        convert = plugin._position_to_location
+
+        def tracking_convert(*args):
+            read_at_conversion.append(consumed[-1])
+            return convert(*args)
+
+        with (
+            patch.object(
+                plugin, "_fetch_devices_from_api", AsyncMock(return_value=devices)
+            ),
+            patch.object(plugin, "_position_to_location", side_effect=tracking_convert),
+        ):
+            locations = await plugin._fetch_locations_with_session(session, CONFIG)
+
+        assert [loc["name"] for loc in locations] == [f"Unit {i}" for i in range(1, 51)]
+        assert locations[0]["speed"] == 1.5
+        # The first location exists long before the last chunk is read
+        assert read_at_conversion[0] < body_length / 10
+
+    @pytest.mark.asyncio
+    async def test_unknown_devices_converted_after_table_refresh(self):
+        plugin = TraccarPlugin(dict(CONFIG))
+        session, _ = _session([_position(1), _position(2)], [])
+        devices = AsyncMock(
+            side_effect=[
+                [{"id": 1, "name": "Truck"}],
+                [{"id": 1, "name": "Truck"}, {"id": 2, "name": "Van"}],
+            ]
+        )
+
+        with (
+            patch.object(plugin, "_fetch_devices_from_api", devices),
+            patch(
+                "plugins.traccar_plugin.time.monotonic",
+                side_effect=[
+                    1000.0,
+                    1000.0 + TraccarPlugin.UNKNOWN_DEVICE_REFRESH_INTERVAL,
+                ],
+            ),
+        ):
+            locations = await plugin._fetch_locations_with_session(session, CONFIG)
+
+        assert devices.await_count == 2
+        assert [loc["name"] for loc in locations] == ["Truck", "Van"]
+
+    @pytest.mark.asyncio
+    async def test_http_error_returns_indicator(self):
+        plugin = TraccarPlugin(dict(CONFIG))
+        session, _ = _session([], [])
+        response = session.get.return_value.__aenter__.return_value
+        response.status = 401
+        response.text = AsyncMock(return_value="Unauthorized")
+
+        with patch.object(
+            plugin, "_fetch_devices_from_api", AsyncMock(return_value=[])
+        ):
+            result = await plugin._fetch_locations_with_session(session, CONFIG)
+
+        assert result == [{"_error": "401", "_error_message": "Unauthorized access"}]
+        response.content.iter_chunked.assert_not_called()
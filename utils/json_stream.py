@@ -0,0 +1,198 @@
+"""
+ABOUTME: Incremental JSON array iterator that decodes the items of a nested array
+ABOUTME: from a stream of byte chunks without materialising the whole document
+
+File: utils/json_stream.py
+
+Description:
+    Large plugin responses (Deepstate's map GeoJSON, Traccar's positions
+    list) used to be read completely and decoded with response.json()
+    before the first item was looked at. iter_json_array walks the document
+    as chunks arrive, descends into the first object key path that leads to
+    one of the requested arrays and yields the array items one at a time,
+    decoding each item with the standard library's C decoder. Values
+    outside the requested path are skipped with the same decoder. Consumers
+    can stop iterating at any time, in which case the rest of the response
+    is never read.
+
+Key features:
+    - Item-at-a-time decoding of an array at a given key path
+    - Several candidate paths, first match wins
+    - Early stop without reading the remaining body
+    - Standard library only (json.JSONDecoder.raw_decode)
+
+Author: TrakBridge Development Team
+Created: 2026-10-16
+"""
+
+# Standard library imports
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Sequence, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+JSONPath = Tuple[str, ...]
+
+_WHITESPACE = " \t\n\r"
+# Characters that can continue a number, e.g. "2" + ".5" or "1.5e" + "-3"
+_NUMBER_CONTINUATION = ".eE+-0123456789"
+
+
+class JSONArrayNotFound(ValueError):
+    """None of the requested array paths exist in the document"""
+
+
+class _ChunkBuffer:
+    """Decoded text window over an async stream of byte chunks"""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        # Set once one of the requested arrays has been entered
+        self.matched = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk; returns False at end of stream"""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.text += self._decoder.decode(b"", final=True)
+            return False
+
+        # Drop text that has already been consumed
+        if self.pos > DEFAULT_CHUNK_SIZE and self.pos * 2 > len(self.text):
+            self.text = self.text[self.pos :]
+            self.pos = 0
+        self.text += self._decoder.decode(chunk)
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of stream"""
+        while True:
+            text = self.text
+            length = len(text)
+            while self.pos < length and text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < length:
+                return text[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, char: str):
+        if await self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.text, self.pos)
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        await self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not await self.fill():
+                    raise
+                continue
+            # A number cut by a chunk boundary decodes as a shorter valid
+            # number ("2" of "2.5"); it is complete only once it is followed
+            # by a character that cannot continue it
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and (
+                    end == len(self.text)
+                    or self.text[end] in _NUMBER_CONTINUATION
+                )
+                and not self.eof
+                and await self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+async def _walk(
+    buffer: _ChunkBuffer, prefix: JSONPath, paths: Sequence[JSONPath]
+) -> AsyncIterator[Any]:
+    char = await buffer.peek()
+
+    if char == "[" and prefix in paths:
+        buffer.matched = True
+        buffer.pos += 1
+        if await buffer.peek() == "]":
+            buffer.pos += 1
+            return
+        while True:
+            yield await buffer.value()
+            char = await buffer.peek()
+            buffer.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", buffer.text, buffer.pos - 1
+                )
+
+    depth = len(prefix)
+    if char == "{" and any(len(p) > depth and p[:depth] == prefix for p in paths):
+        buffer.pos += 1
+        if await buffer.peek() == "}":
+            buffer.pos += 1
+            return
+        while True:
+            key = await buffer.value()
+            await buffer.expect(":")
+            path = prefix + (key,)
+            if any(p[: depth + 1] == path for p in paths):
+                async for item in _walk(buffer, path, paths):
+                    yield item
+                if buffer.matched:
+                    return
+            else:
+                await buffer.value()
+
+            char = await buffer.peek()
+            buffer.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", buffer.text, buffer.pos - 1
+                )
+
+    # Not on the requested path
+    await buffer.value()
+
+
+async def iter_json_array(
+    chunks: AsyncIterable[bytes], paths: Sequence[JSONPath]
+) -> AsyncIterator[Any]:
+    """
+    Yield the items of the first array found at one of the key paths.
+
+    Args:
+        chunks: Async iterable of raw response bytes, e.g.
+            response.content.iter_chunked(DEFAULT_CHUNK_SIZE)
+        paths: Candidate key paths, e.g. [("map", "features"), ()] where ()
+            is a top-level array
+
+    Raises:
+        JSONArrayNotFound: The document has none of the requested arrays
+        json.JSONDecodeError: The document is not valid JSON
+    """
+    buffer = _ChunkBuffer(chunks)
+    paths = [tuple(path) for path in paths]
+
+    async for item in _walk(buffer, (), paths):
+        yield item
+
+    if not buffer.matched:
+        raise JSONArrayNotFound(f"No array at any of {paths}")